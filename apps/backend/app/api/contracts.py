@@ -297,17 +297,25 @@ class ContestSimRequest(BaseModel):
     - Lineup scores to evaluate
     - Driver score scenarios for field simulation
     - Contest parameters (field size, buyin, etc.)
+
+    The scenario matrix is sent inline (scenario_driver_scores), as a .npy
+    array in an application/vnd.nascar.matrix body, or by the ID of a matrix
+    uploaded to /scenario-matrices (see app.api.matrix_transport).
     """
     my_lineup_scores: List[float] = Field(
         ...,
         min_items=1,
         description="Scores for my lineups to evaluate"
     )
-    scenario_driver_scores: List[List[float]] = Field(
-        ...,
+    scenario_driver_scores: Optional[List[List[float]]] = Field(
+        None,
         min_items=1,
         description="Driver scores for each scenario (n_scenarios x n_drivers)"
     )
+    scenario_matrix_id: Optional[str] = Field(
+        None,
+        description="ID of an uploaded scenario matrix (instead of scenario_driver_scores)"
+    )
     field_size: int = Field(
         1000,
         gt=0,
@@ -328,6 +336,16 @@ class ContestSimRequest(BaseModel):
         'large',
         description="Contest size tier ('small', 'medium', 'large')"
     )
+    seed: int = Field(
+        42,
+        ge=0,
+        description="Random seed for the field lineup pool (same slate and seed reuse the cached pool)"
+    )
+    self_competition: bool = Field(
+        False,
+        description="Enter all my lineups in the same contest (multi-entry): they compete "
+                    "with each other and split payouts on ties"
+    )
 
     @field_validator('contest_size_tier')
     def contest_size_tier_must_be_valid(cls, v):
@@ -339,6 +357,19 @@ class ContestSimRequest(BaseModel):
             )
         return v
 
+    @field_validator('self_competition')
+    @classmethod
+    def lineups_must_fit_in_contest(cls, v, info):
+        """Ensure all my lineups fit in one contest when they share it."""
+        n_lineups = len(info.data.get('my_lineup_scores') or [])
+        field_size = info.data.get('field_size')
+        if v and field_size is not None and n_lineups > field_size:
+            raise ValueError(
+                f"self_competition needs field_size >= number of lineups "
+                f"({field_size} < {n_lineups})"
+            )
+        return v
+
 
 class ContestSimResponse(BaseModel):
     """
@@ -349,6 +380,7 @@ class ContestSimResponse(BaseModel):
     - Cash and win probabilities
     - Best/worst outcomes
     - Simulation count
+    - Portfolio-level ROI of all entries together
     """
     roi: float = Field(..., description="Expected return on investment (percentage)")
     roi_std: float = Field(..., ge=0, description="Standard deviation of ROI")
@@ -362,6 +394,9 @@ class ContestSimResponse(BaseModel):
     worst_rank: int = Field(..., ge=1, description="Worst finishing position")
     best_payout: float = Field(..., ge=0, description="Best payout achieved")
     n_simulations: int = Field(..., gt=0, description="Total number of simulations run")
+    portfolio_roi: float = Field(..., description="Expected ROI of all lineups together (percentage)")
+    portfolio_roi_std: float = Field(..., ge=0, description="Standard deviation of portfolio ROI across contests")
+    portfolio_cash_pct: float = Field(..., ge=0, le=100, description="Probability that any lineup cashes (percentage)")
 
 
 class ConstraintSpecForLeverage(BaseModel):
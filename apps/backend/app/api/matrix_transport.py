@@ -0,0 +1,326 @@
+"""
+Binary transport for scenario matrices and other large numeric payloads.
+
+A 10,000 x 40 scenario matrix is ~8 MB as a nested JSON list, and parsing
+it costs more than the contest simulation itself. Endpoints that carry
+matrices (/contest-sim, /optimize) also accept and return them in NumPy's
+.npy format, and matrices can be uploaded once and referenced by ID.
+
+Content types:
+- application/x-npy: a single .npy array (matrix upload/download)
+- application/vnd.nascar.matrix: a small JSON header followed by .npy arrays
+
+Framed message layout (application/vnd.nascar.matrix):
+    uint32 (little-endian)  N, the header length in bytes
+    N bytes                 UTF-8 JSON: {"fields": {...}, "arrays": [name, ...]}
+    .npy record per name in "arrays", in order
+
+"fields" holds everything that is not a large array (e.g. the other request
+fields). Clients read it with any .npy reader:
+
+    n = struct.unpack("<I", body[:4])[0]
+    header = json.loads(body[4:4 + n])
+    stream = io.BytesIO(body[4 + n:])
+    arrays = {name: np.load(stream) for name in header["arrays"]}
+
+Matrix IDs are content hashes, so uploading the same matrix twice yields the
+same ID. Uploaded matrices live in the shared ScenarioCache (and its spill
+directory, when SCENARIO_CACHE_DIR is set, so every API worker can find them).
+
+JSON remains the default for every endpoint.
+"""
+import hashlib
+import io
+import json
+import logging
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.portfolio_generator import get_scenario_cache
+
+logger = logging.getLogger(__name__)
+
+NPY_CONTENT_TYPE = "application/x-npy"
+MATRIX_CONTENT_TYPE = "application/vnd.nascar.matrix"
+
+# Upper bound on the JSON header of a framed message
+MAX_HEADER_BYTES = 1 << 20
+
+_HEADER_LENGTH = struct.Struct("<I")
+
+# Create router
+router = APIRouter()
+
+
+def encode_npy(array: np.ndarray) -> bytes:
+    """Serialize one array as .npy bytes."""
+    buffer = io.BytesIO()
+    np.lib.format.write_array(buffer, np.asarray(array), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def decode_npy(body: bytes) -> np.ndarray:
+    """
+    Parse .npy bytes (object arrays are rejected).
+
+    Raises:
+        ValueError: If body is not a valid .npy array
+    """
+    try:
+        return np.lib.format.read_array(io.BytesIO(body), allow_pickle=False)
+    except Exception as e:
+        raise ValueError(f"Invalid .npy payload: {e}") from e
+
+
+def encode_matrix_message(fields: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> bytes:
+    """
+    Build an application/vnd.nascar.matrix message.
+
+    Args:
+        fields: JSON-serializable fields for the header
+        arrays: Named arrays, written as .npy records in insertion order
+
+    Returns:
+        Encoded message
+    """
+    header = json.dumps({"fields": fields, "arrays": list(arrays)}).encode()
+
+    buffer = io.BytesIO()
+    buffer.write(_HEADER_LENGTH.pack(len(header)))
+    buffer.write(header)
+    for array in arrays.values():
+        np.lib.format.write_array(buffer, np.asarray(array), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def decode_matrix_message(body: bytes) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Parse an application/vnd.nascar.matrix message.
+
+    Args:
+        body: Encoded message
+
+    Returns:
+        (fields, arrays by name)
+
+    Raises:
+        ValueError: If the message is truncated or malformed
+    """
+    if len(body) < _HEADER_LENGTH.size:
+        raise ValueError("Matrix message is missing its header length")
+
+    (header_length,) = _HEADER_LENGTH.unpack_from(body)
+    end = _HEADER_LENGTH.size + header_length
+    if header_length > MAX_HEADER_BYTES or end > len(body):
+        raise ValueError(f"Invalid matrix message header length {header_length}")
+
+    try:
+        header = json.loads(body[_HEADER_LENGTH.size:end])
+        fields = header.get("fields", {})
+        names = header.get("arrays", [])
+    except (ValueError, AttributeError) as e:
+        raise ValueError(f"Invalid matrix message header: {e}") from e
+
+    if not isinstance(fields, dict) or not isinstance(names, list):
+        raise ValueError("Matrix message header must hold a 'fields' object and an 'arrays' list")
+
+    stream = io.BytesIO(body)
+    stream.seek(end)
+    arrays = {}
+    for name in names:
+        try:
+            arrays[name] = np.lib.format.read_array(stream, allow_pickle=False)
+        except Exception as e:
+            raise ValueError(f"Invalid .npy record for '{name}': {e}") from e
+
+    return fields, arrays
+
+
+def matrix_id(matrix: np.ndarray) -> str:
+    """Content-hash ID of a matrix (dtype, shape and data)."""
+    matrix = np.ascontiguousarray(matrix)
+    digest = hashlib.sha256()
+    digest.update(f"{matrix.dtype.str}{matrix.shape}".encode())
+    digest.update(memoryview(matrix).cast("B"))
+    return digest.hexdigest()[:32]
+
+
+def as_scenario_matrix(matrix: Any, name: str = "scenario matrix") -> np.ndarray:
+    """
+    Validate a scenario matrix as a finite 2-D float array.
+
+    Raises:
+        ValueError: If it is not 2-D, empty, non-numeric or has NaN/inf
+    """
+    try:
+        matrix = np.asarray(matrix, dtype=np.float64)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{name} must be numeric: {e}") from e
+
+    if matrix.ndim != 2 or matrix.size == 0:
+        raise ValueError(f"{name} must be a non-empty 2-D array, got shape {matrix.shape}")
+    if not np.isfinite(matrix).all():
+        raise ValueError(f"{name} contains NaN or infinite values")
+    return matrix
+
+
+def resolve_scenario_matrix(
+    inline: Optional[Any],
+    scenario_matrix_id: Optional[str],
+    required: bool = True,
+) -> Optional[np.ndarray]:
+    """
+    Pick the scenario matrix a request supplied, inline or by ID.
+
+    Args:
+        inline: Matrix sent with the request (nested lists or ndarray), or None
+        scenario_matrix_id: ID of an uploaded matrix, or None
+        required: Whether one of the two must be given
+
+    Returns:
+        Validated float64 matrix, or None if neither was given and not required
+
+    Raises:
+        ValueError: If both or (when required) neither were given, or the matrix is invalid
+        KeyError: If scenario_matrix_id is unknown
+    """
+    if inline is not None and scenario_matrix_id is not None:
+        raise ValueError("Send either scenario_driver_scores or scenario_matrix_id, not both")
+
+    if scenario_matrix_id is not None:
+        matrix = get_scenario_cache().get(scenario_matrix_id)
+        if matrix is None:
+            raise KeyError(scenario_matrix_id)
+        return as_scenario_matrix(matrix)
+
+    if inline is None:
+        if required:
+            raise ValueError("Either scenario_driver_scores or scenario_matrix_id is required")
+        return None
+
+    return as_scenario_matrix(inline)
+
+
+async def read_request_payload(request: Request) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Read a JSON or framed-matrix request body.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        (fields, arrays); arrays is empty for JSON bodies
+
+    Raises:
+        HTTPException: 422 if the body cannot be parsed, 415 for other content types
+    """
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip()
+    body = await request.body()
+
+    if content_type == MATRIX_CONTENT_TYPE:
+        try:
+            return decode_matrix_message(body)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f"Invalid request: {e}")
+
+    if content_type in ("application/json", ""):
+        try:
+            fields = json.loads(body)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f"Invalid request: {e}")
+        if not isinstance(fields, dict):
+            raise HTTPException(status_code=422, detail="Invalid request: body must be a JSON object")
+        return fields, {}
+
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail=f"Unsupported content type '{content_type}' "
+               f"(use application/json or {MATRIX_CONTENT_TYPE})",
+    )
+
+
+def wants_matrix_response(request: Request) -> bool:
+    """Whether the client asked for a framed-matrix response (Accept header)."""
+    return MATRIX_CONTENT_TYPE in request.headers.get("accept", "")
+
+
+def matrix_response(fields: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> Response:
+    """Framed-matrix HTTP response."""
+    return Response(content=encode_matrix_message(fields, arrays), media_type=MATRIX_CONTENT_TYPE)
+
+
+def _store_uploaded_matrix(body: bytes, content_type: str) -> Tuple[str, np.ndarray]:
+    """Parse, validate, hash and persist an uploaded matrix (blocking)."""
+    if content_type == NPY_CONTENT_TYPE:
+        matrix = decode_npy(body)
+    else:
+        matrix = json.loads(body)
+    matrix = as_scenario_matrix(matrix)
+
+    key = matrix_id(matrix)
+    get_scenario_cache().put(key, matrix, persist=True)
+    return key, matrix
+
+
+@router.post("/scenario-matrices", status_code=status.HTTP_201_CREATED)
+async def upload_scenario_matrix(request: Request) -> Dict[str, Any]:
+    """
+    Upload a scenario matrix once and reference it by ID afterwards.
+
+    The body is a 2-D .npy array (application/x-npy) or a JSON nested list.
+    Pass the returned matrix_id as scenario_matrix_id to /contest-sim or
+    /optimize instead of resending the matrix.
+
+    Args:
+        request: Incoming request with the matrix body
+
+    Returns:
+        Dictionary with matrix_id, shape and dtype
+
+    Raises:
+        HTTPException: 422 if the matrix is invalid, 415 for other content types
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in (NPY_CONTENT_TYPE, "application/json"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported content type '{content_type}' (use {NPY_CONTENT_TYPE} or application/json)",
+        )
+    body = await request.body()
+
+    # Parsing, hashing and the spill-directory write all block; keep them off the event loop
+    try:
+        key, matrix = await run_in_threadpool(_store_uploaded_matrix, body, content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid scenario matrix: {e}")
+
+    logger.info(f"Stored scenario matrix {key} (shape {matrix.shape})")
+
+    return {"matrix_id": key, "shape": list(matrix.shape), "dtype": str(matrix.dtype)}
+
+
+@router.get("/scenario-matrices/{scenario_matrix_id}")
+async def download_scenario_matrix(scenario_matrix_id: str) -> Response:
+    """
+    Download an uploaded scenario matrix as .npy.
+
+    Args:
+        scenario_matrix_id: ID returned by POST /scenario-matrices
+
+    Returns:
+        application/x-npy response
+
+    Raises:
+        HTTPException: 404 if the matrix is not cached
+    """
+    matrix = get_scenario_cache().get(scenario_matrix_id)
+    if matrix is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Scenario matrix {scenario_matrix_id} not found",
+        )
+    return Response(content=encode_npy(matrix), media_type=NPY_CONTENT_TYPE)
@@ -7,13 +7,14 @@ This module provides the headless optimization API:
 - GET /optimize/{run_id}/result: Retrieve optimization results
 
 Key features:
-- Async background processing for long-running optimizations
+- Jobs queued in Redis and executed by separate worker processes (app.worker)
 - Scenario-driven configs with compiled constraints
 - Calibration metrics in response
-- Status polling for job tracking
+- Status polling for job tracking, with progress published by the worker;
+  ?wait=N long-polls on the job's update events instead of busy polling
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks, status, Depends, Request
-from typing import Dict, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
+from typing import Any, Callable, Dict, Optional
 import logging
 import redis
 import uuid
@@ -43,6 +44,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for long-polling GET /optimize/{run_id}/status?wait=...
+MAX_STATUS_WAIT_SECONDS = 60.0
+
 
 def get_job_manager(request: Request) -> JobStateManager:
     """Dependency to get JobStateManager from app state."""
@@ -52,196 +56,185 @@ def get_job_manager(request: Request) -> JobStateManager:
 router = APIRouter()
 
 
-async def run_optimization_background(
+def run_optimization_job(
     run_id: str,
-    request: OptimizeRequest,
-    background_tasks: BackgroundTasks,
-    job_manager: JobStateManager
-) -> None:
+    input_params: Dict[str, Any],
+    report_progress: Optional[Callable[[float], None]] = None
+) -> Dict[str, Any]:
     """
-    Run optimization in background task.
+    Run the optimization pipeline for a queued job.
 
-    This function executes the full optimization pipeline:
+    Executed by queue workers (app.worker), not the API process:
     1. Compile constraints from request
     2. Generate scenarios using SkeletonNarrative
     3. Run optimization using LineupOptimizer
     4. Assess calibration and compute metrics
-    5. Store result in Redis via job_manager
 
     Args:
         run_id: Unique run identifier
-        request: Optimization request with constraints
-        background_tasks: FastAPI BackgroundTasks for chaining
-        job_manager: JobStateManager for persisting job state
-    """
-    try:
-        logger.info(f"Starting background optimization for run_id={run_id}")
+        input_params: OptimizeRequest fields as stored with the job
+        report_progress: Optional callback receiving the fraction complete
 
-        # Update status to running
-        await job_manager.update_job_status(run_id, "running")
+    Returns:
+        OptimizeResponse as a dict (stored as the job result by the worker)
 
-        # Get ontology driver
-        try:
-            ontology_driver = OntologyDriver.get_driver()
-        except Exception as e:
-            await job_manager.update_job_status(
-                run_id,
-                "failed",
-                error=f"Neo4j unavailable: {e}"
-            )
-            logger.error(f"Neo4j unavailable for run_id={run_id}: {e}")
-            return
+    Raises:
+        ConnectionError: If Neo4j is unavailable (the worker retries the job)
+        ValueError: If no valid lineup satisfies the constraints
+    """
+    report_progress = report_progress or (lambda progress: None)
+    request = OptimizeRequest(**input_params)
 
-        # Compile constraints from request
-        logger.info(f"Compiling constraints for {len(request.drivers)} drivers")
-        compiler = ConstraintCompiler(ontology_driver)
+    logger.info(f"Starting optimization for run_id={run_id}")
 
-        driver_ids = [d.driver_id for d in request.drivers]
-        track_ids = [request.scenario_config.track_id]
+    # Get ontology driver
+    try:
+        ontology_driver = OntologyDriver.get_driver()
+    except Exception as e:
+        logger.error(f"Neo4j unavailable for run_id={run_id}: {e}")
+        raise ConnectionError(f"Neo4j unavailable: {e}") from e
 
-        constraint_spec = compiler.compile_spec(
-            slate_id=request.slate_id,
-            driver_ids=driver_ids,
-            track_ids=track_ids
-        )
+    # Compile constraints from request
+    logger.info(f"Compiling constraints for {len(request.drivers)} drivers")
+    compiler = ConstraintCompiler(ontology_driver)
 
-        # Create run config for reproducibility
-        run_config = create_run_config(
-            constraint_spec_hash=constraint_spec.hash,
-            random_seed=request.random_seed or 42,
-            scenario_config={
-                "n_scenarios": request.scenario_config.n_scenarios,
-                "track_id": request.scenario_config.track_id,
-                "race_length": request.scenario_config.race_length,
-                "field_size": request.scenario_config.field_size,
-            }
-        )
+    driver_ids = [d.driver_id for d in request.drivers]
+    track_ids = [request.scenario_config.track_id]
 
-        logger.info(f"Run config created: {run_config.run_id}")
+    constraint_spec = compiler.compile_spec(
+        slate_id=request.slate_id,
+        driver_ids=driver_ids,
+        track_ids=track_ids
+    )
 
-        # Generate scenarios
-        if SCENARIO_GEN_AVAILABLE:
-            logger.info(f"Generating {request.scenario_config.n_scenarios} scenarios")
-            # Note: This is a simplified call - actual implementation would need
-            # to match the scenario_generator interface
-            scenarios = []  # Placeholder
-        else:
-            logger.warning("Scenario generator not available, using mock scenarios")
-            scenarios = []
-
-        # Prepare driver data for optimizer
-        driver_data = []
-        for driver_req in request.drivers:
-            # Get driver constraints from compiled spec
-            driver_constraints = constraint_spec.drivers.get(driver_req.driver_id)
-            if driver_constraints:
-                driver_data.append({
-                    "driver_id": driver_req.driver_id,
-                    "name": driver_req.driver_id,  # Use driver_id as name placeholder
-                    "salary": 8000,  # Default salary - would come from ontology
-                    "projected_points": driver_req.skill * 100,  # Simple projection
-                    "position": 1,  # Default position
-                })
-
-        # Run optimization
-        logger.info("Running lineup optimization")
-        optimizer = LineupOptimizer(
-            drivers=driver_data,
-            salary_cap=request.salary_cap,
-            lineup_size=6
-        )
+    # Create run config for reproducibility
+    run_config = create_run_config(
+        constraint_spec_hash=constraint_spec.hash,
+        random_seed=request.random_seed or 42,
+        scenario_config={
+            "n_scenarios": request.scenario_config.n_scenarios,
+            "track_id": request.scenario_config.track_id,
+            "race_length": request.scenario_config.race_length,
+            "field_size": request.scenario_config.field_size,
+        }
+    )
 
-        result = optimizer.optimize()
-
-        if not result:
-            raise ValueError("No valid lineup found with given constraints")
-
-        # Assess calibration if enabled
-        calibration_metrics = None
-        if request.scenario_config.calibration_enabled and len(scenarios) > 0:
-            try:
-                # Mock calibration assessment
-                # In real implementation, this would use actual predictions vs observations
-                calibration_metrics = {
-                    "crps": 0.05,
-                    "log_score": -2.3,
-                    "coverage_50": 0.48,
-                    "coverage_80": 0.79,
-                    "coverage_95": 0.94,
-                }
-                logger.info(f"Calibration metrics computed: {calibration_metrics}")
-            except Exception as e:
-                logger.warning(f"Calibration assessment failed: {e}")
-
-        # Build scenario diagnostics
-        scenario_diagnostics = ScenarioDiagnostics(
-            n_scenarios_generated=request.scenario_config.n_scenarios,
-            n_valid=int(request.scenario_config.n_scenarios * 0.95),  # Mock 95% valid
-            rejection_rate=0.05,
-            avg_laps_led=45.2,
-            avg_position_differential=3.4,
-            calibration_metrics=calibration_metrics
-        )
+    logger.info(f"Run config created: {run_config.run_id}")
+    report_progress(0.2)
+
+    # Generate scenarios
+    if SCENARIO_GEN_AVAILABLE:
+        logger.info(f"Generating {request.scenario_config.n_scenarios} scenarios")
+        # Note: This is a simplified call - actual implementation would need
+        # to match the scenario_generator interface
+        scenarios = []  # Placeholder
+    else:
+        logger.warning("Scenario generator not available, using mock scenarios")
+        scenarios = []
+
+    report_progress(0.5)
+
+    # Prepare driver data for optimizer
+    driver_data = []
+    for driver_req in request.drivers:
+        # Get driver constraints from compiled spec
+        driver_constraints = constraint_spec.drivers.get(driver_req.driver_id)
+        if driver_constraints:
+            driver_data.append({
+                "driver_id": driver_req.driver_id,
+                "name": driver_req.driver_id,  # Use driver_id as name placeholder
+                "salary": 8000,  # Default salary - would come from ontology
+                "projected_points": driver_req.skill * 100,  # Simple projection
+                "position": 1,  # Default position
+            })
+
+    # Run optimization
+    logger.info("Running lineup optimization")
+    optimizer = LineupOptimizer(
+        drivers=driver_data,
+        salary_cap=request.salary_cap,
+        lineup_size=6
+    )
 
-        # Build lineup selections
-        lineup = [
-            DriverSelection(
-                driver_id=d["driver_id"],
-                name=d["name"],
-                salary=d["salary"],
-                projected_points=d["projected_points"],
-                position=d["position"]
-            )
-            for d in result["drivers"]
-        ]
-
-        # Build response
-        response = OptimizeResponse(
-            lineup=lineup,
-            total_projected_points=result["total_projected_points"],
-            total_salary=result["total_salary"],
-            scenario_diagnostics=scenario_diagnostics,
-            run_id=run_id,
-            status="completed",
-            constraint_spec_hash=constraint_spec.hash
-        )
+    result = optimizer.optimize()
 
-        # Store result in Redis via job_manager
-        await job_manager.update_job_status(
-            run_id,
-            "completed",
-            result=response.dict()
-        )
+    if not result:
+        raise ValueError("No valid lineup found with given constraints")
 
-        logger.info(f"Optimization completed for run_id={run_id}")
+    report_progress(0.8)
 
-    except Exception as e:
-        logger.error(f"Optimization failed for run_id={run_id}: {e}", exc_info=True)
+    # Assess calibration if enabled
+    calibration_metrics = None
+    if request.scenario_config.calibration_enabled and len(scenarios) > 0:
+        try:
+            # Mock calibration assessment
+            # In real implementation, this would use actual predictions vs observations
+            calibration_metrics = {
+                "crps": 0.05,
+                "log_score": -2.3,
+                "coverage_50": 0.48,
+                "coverage_80": 0.79,
+                "coverage_95": 0.94,
+            }
+            logger.info(f"Calibration metrics computed: {calibration_metrics}")
+        except Exception as e:
+            logger.warning(f"Calibration assessment failed: {e}")
+
+    # Build scenario diagnostics
+    scenario_diagnostics = ScenarioDiagnostics(
+        n_scenarios_generated=request.scenario_config.n_scenarios,
+        n_valid=int(request.scenario_config.n_scenarios * 0.95),  # Mock 95% valid
+        rejection_rate=0.05,
+        avg_laps_led=45.2,
+        avg_position_differential=3.4,
+        calibration_metrics=calibration_metrics
+    )
 
-        # Update status to failed in Redis
-        await job_manager.update_job_status(
-            run_id,
-            "failed",
-            error=str(e)
+    # Build lineup selections
+    lineup = [
+        DriverSelection(
+            driver_id=d["driver_id"],
+            name=d["name"],
+            salary=d["salary"],
+            projected_points=d["projected_points"],
+            position=d["position"]
         )
+        for d in result["drivers"]
+    ]
+
+    # Build response
+    response = OptimizeResponse(
+        lineup=lineup,
+        total_projected_points=result["total_projected_points"],
+        total_salary=result["total_salary"],
+        scenario_diagnostics=scenario_diagnostics,
+        run_id=run_id,
+        status="completed",
+        constraint_spec_hash=constraint_spec.hash
+    )
+
+    logger.info(f"Optimization completed for run_id={run_id}")
+
+    return response.dict()
 
 
 @router.post("/optimize", response_model=OptimizationStatus)
 async def submit_optimization(
     request: OptimizeRequest,
-    background_tasks: BackgroundTasks,
+    http_request: Request,
     job_manager: JobStateManager = Depends(get_job_manager)
 ) -> OptimizationStatus:
     """
     Submit optimization request for background processing.
 
     This endpoint accepts scenario-driven optimization configs and returns
-    immediately with a run_id for status polling. The actual optimization
-    runs in a background task to avoid timeouts.
+    immediately with a run_id for status polling. The job is enqueued in
+    Redis and executed by a queue worker (app.worker), so it survives API
+    restarts and runs on whichever worker machine claims it.
 
     Args:
         request: Optimization request with constraints and scenario config
-        background_tasks: FastAPI BackgroundTasks for async execution
+        http_request: Incoming HTTP request (for the correlation ID)
         job_manager: JobStateManager for persisting job state
 
     Returns:
@@ -271,8 +264,8 @@ async def submit_optimization(
         # Store in Redis via job_manager
         try:
             # Get correlation_id from request state if available
-            correlation_id = getattr(request.state, 'correlation_id', None)
-            await job_manager.create_job(run_id, request.dict(), correlation_id)
+            correlation_id = getattr(http_request.state, 'correlation_id', None)
+            await job_manager.create_job(run_id, request.dict(), correlation_id, enqueue=True)
         except redis.ConnectionError as e:
             logger.error(f"Redis unavailable when creating job: {e}")
             raise HTTPException(
@@ -280,16 +273,7 @@ async def submit_optimization(
                 detail={"error": "Redis unavailable", "redis_error": str(e)}
             )
 
-        # Add background task
-        background_tasks.add_task(
-            run_optimization_background,
-            run_id,
-            request,
-            background_tasks,
-            job_manager
-        )
-
-        logger.info(f"Optimization submitted: run_id={run_id}")
+        logger.info(f"Optimization enqueued: run_id={run_id}")
 
         return job_status
 
@@ -306,15 +290,24 @@ async def submit_optimization(
 @router.get("/optimize/{run_id}/status", response_model=OptimizationStatus)
 async def get_optimization_status(
     run_id: str,
+    wait: float = Query(0.0, ge=0.0, le=MAX_STATUS_WAIT_SECONDS),
+    last_status: Optional[str] = None,
+    last_progress: Optional[float] = None,
     job_manager: JobStateManager = Depends(get_job_manager)
 ) -> OptimizationStatus:
     """
     Get optimization job status.
 
-    Poll this endpoint to check optimization progress.
+    Poll this endpoint to check optimization progress. With wait > 0 it
+    long-polls: the response is held until the job's status or progress
+    differs from last_status/last_progress (the values from the previous
+    response), the job finishes, or wait seconds pass.
 
     Args:
         run_id: Run identifier from POST /optimize response
+        wait: Seconds to hold the request for a change (0 returns immediately)
+        last_status: Status from the previous poll
+        last_progress: Progress from the previous poll
         job_manager: JobStateManager for accessing job state
 
     Returns:
@@ -324,7 +317,12 @@ async def get_optimization_status(
         HTTPException: If run_id not found or Redis is unavailable
     """
     try:
-        job = await job_manager.get_job(run_id)
+        if wait > 0:
+            job = await job_manager.wait_for_job_update(
+                run_id, wait, last_status=last_status, last_progress=last_progress
+            )
+        else:
+            job = await job_manager.get_job(run_id)
     except redis.ConnectionError as e:
         logger.error(f"Redis unavailable when getting job status: {e}")
         raise HTTPException(
@@ -343,7 +341,7 @@ async def get_optimization_status(
     return OptimizationStatus(
         run_id=run_id,
         status=job["status"],
-        progress=0.0,  # Progress not stored in current schema
+        progress=float(job.get("progress") or 0.0),
         error=json.loads(job["error_message"]) if job.get("error_message") else None
     )
 
@@ -391,7 +389,7 @@ async def get_optimization_result(
             status_code=status.HTTP_202_ACCEPTED,
             detail={
                 "message": "Optimization still running",
-                "progress": 0.0,
+                "progress": float(job.get("progress") or 0.0),
                 "status": job_status
             }
         )
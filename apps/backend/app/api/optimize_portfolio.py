@@ -9,23 +9,33 @@ This module provides the headless optimization API for CVaR-based portfolio gene
 - Explain artifacts for lineup decisions
 """
 import logging
-from typing import Dict, List, Any, Optional, Union
-from fastapi import HTTPException, BackgroundTasks
+from typing import Dict, List, Any, Optional, Tuple, Union
+from fastapi import HTTPException
 from pydantic import BaseModel, Field
 import numpy as np
 
-from app.portfolio_generator import generate_portfolio, export_lineups_dk_format, ScenarioCache
-from app.tail_metrics import compute_tail_metrics, validate_tail_stability
+from app.portfolio_generator import (
+    generate_portfolio,
+    export_lineups_dk_format,
+    get_scenario_cache,
+    scenario_cache_key,
+)
+from app.tail_metrics import compute_tail_metrics, validate_portfolio_tail_stability
 from app.tail_objectives import build_multi_cvar_objective
 from app.calibration.diagnostics import end_to_end_calibration
 from app.constraints.models import ConstraintSpec, DriverConstraints, TrackConstraints
 from app.kernel import KernelLogic, get_rejection_stats, reset_rejection_stats
 from app.constraints.diversity import compute_portfolio_correlation
+from app.scenario_scoring import score_scenario_stream
+from app.compute import ComputeSaturatedError, get_compute_executor, saturation_http_exception
 
 logger = logging.getLogger(__name__)
 
-# Global scenario cache (shared across requests)
-_scenario_cache = ScenarioCache()
+# Scenarios generated and scored per chunk in _generate_scenarios_for_optimization
+SCORING_CHUNK_SIZE = 10000
+
+# Global scenario cache (shared across requests, bounded, optionally spilling to disk)
+_scenario_cache = get_scenario_cache()
 
 
 class OptimizeRequest(BaseModel):
@@ -47,6 +57,10 @@ class OptimizeRequest(BaseModel):
     random_seed: int = Field(42, description="Random seed for reproducibility")
     include_calibration: bool = Field(True, description="Include calibration metrics")
     validate_tail_objective: bool = Field(True, description="Validate optimizer targets tails not mean")
+    scenario_matrix_id: Optional[str] = Field(
+        None,
+        description="ID of an uploaded scenario matrix to optimize over instead of generating scenarios"
+    )
 
 
 class LineupResponse(BaseModel):
@@ -100,31 +114,76 @@ class OptimizeResponse(BaseModel):
     csv_export_path: Optional[str] = Field(None, description="Path to CSV export (if requested)")
 
 
+# Per-lineup metric columns of the binary /optimize response (lineup_metrics array)
+LINEUP_METRIC_COLUMNS = ["cvar_99", "cvar_95", "top_1pct", "conditional_upside", "total_salary"]
+
+
+def optimize_response_arrays(response: OptimizeResponse) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Split an OptimizeResponse into header fields and arrays for binary transport.
+
+    Arrays:
+    - lineup_drivers: int32 (n_lineups, roster_size) driver IDs
+    - lineup_metrics: float64 (n_lineups, len(LINEUP_METRIC_COLUMNS))
+    - observed_finish_positions: float64 calibration matrix (if calibrated)
+
+    The per-lineup exposure and team_distribution dicts, the column names
+    and every other response field go in the header.
+
+    Args:
+        response: Optimization response
+
+    Returns:
+        (fields, arrays) for app.api.matrix_transport.matrix_response
+    """
+    lineups = response.lineups
+    fields = response.model_dump(mode="json", exclude={"lineups", "calibration_metrics"})
+    fields["lineup_metric_columns"] = LINEUP_METRIC_COLUMNS
+    fields["lineups"] = [
+        {"exposure": lineup.exposure, "team_distribution": lineup.team_distribution}
+        for lineup in lineups
+    ]
+
+    arrays = {
+        "lineup_drivers": np.array([lineup.drivers for lineup in lineups], dtype=np.int32),
+        "lineup_metrics": np.array(
+            [[getattr(lineup, column) for column in LINEUP_METRIC_COLUMNS] for lineup in lineups],
+            dtype=np.float64,
+        ).reshape(len(lineups), len(LINEUP_METRIC_COLUMNS)),
+    }
+
+    calibration = response.calibration_metrics
+    fields["calibration_metrics"] = None
+    if calibration is not None:
+        fields["calibration_metrics"] = calibration.model_dump(exclude={"observed_finish_positions"})
+        arrays["observed_finish_positions"] = np.array(
+            calibration.observed_finish_positions, dtype=np.float64
+        )
+
+    return fields, arrays
+
+
 async def optimize_endpoint(
     request: OptimizeRequest,
-    background_tasks: BackgroundTasks,
-    export_csv: bool = False
+    export_csv: bool = False,
+    scenarios: Optional[np.ndarray] = None
 ) -> OptimizeResponse:
     """
     Generate CVaR-optimized portfolio for NASCAR DFS.
 
-    Pipeline:
-    1. Generate scenarios using Phase 2 CBN with constraint spec
-    2. Run portfolio optimization using Phase 3 CVaR objectives
-    3. Validate tail objective (optimizer targets tails, not mean)
-    4. Compute calibration metrics (optional)
-    5. Generate explain artifacts
+    The pipeline (run_optimization) runs in the compute pool, so the event
+    loop stays free while it works.
 
     Args:
         request: Optimization request with constraint spec and parameters
-        background_tasks: FastAPI background tasks for async work
         export_csv: Export lineups to CSV (returns path in response)
+        scenarios: Client-supplied scenario matrix (skips scenario generation)
 
     Returns:
         OptimizeResponse with lineups, metrics, and explain artifacts
 
     Raises:
-        HTTPException: If optimization fails
+        HTTPException: 429 if the optimize endpoint is saturated, 500 if optimization fails
     """
     logger.info(
         f"Optimization request: {request.n_lineups} lineups, "
@@ -132,7 +191,54 @@ async def optimize_endpoint(
     )
 
     try:
-        # Step 1: Generate scenarios using Phase 2 CBN
+        return await get_compute_executor().run(
+            "optimize", run_optimization, request, export_csv, scenarios
+        )
+    except ComputeSaturatedError as e:
+        raise saturation_http_exception(e)
+    except Exception as e:
+        logger.error(f"Optimization failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
+
+
+def run_optimization(
+    request: OptimizeRequest,
+    export_csv: bool = False,
+    scenarios: Optional[np.ndarray] = None
+) -> OptimizeResponse:
+    """
+    Run the CVaR portfolio optimization pipeline (CPU-bound, runs in a compute worker).
+
+    Pipeline:
+    1. Generate scenarios using Phase 2 CBN with constraint spec
+    2. Run portfolio optimization using Phase 3 CVaR objectives
+    3. Validate tail objective (optimizer targets tails, not mean)
+    4. Compute calibration metrics (optional)
+    5. Generate explain artifacts
+
+    Args:
+        request: Optimization request with constraint spec and parameters
+        export_csv: Export lineups to CSV (returns path in response)
+        scenarios: Client-supplied DFS points matrix (n_scenarios, n_drivers),
+            columns in constraint_spec.drivers order; skips step 1
+
+    Returns:
+        OptimizeResponse with lineups, metrics, and explain artifacts
+
+    Raises:
+        ValueError: If scenarios has the wrong number of driver columns
+        RuntimeError: If no lineups could be generated
+    """
+    # Step 1: Generate scenarios using Phase 2 CBN (unless the client sent them)
+    n_spec_drivers = len(request.constraint_spec.drivers)
+    if scenarios is not None:
+        if scenarios.shape[1] != n_spec_drivers:
+            raise ValueError(
+                f"Scenario matrix has {scenarios.shape[1]} driver columns, "
+                f"constraint spec has {n_spec_drivers} drivers"
+            )
+        logger.info(f"Using client-supplied scenario matrix {scenarios.shape}")
+    else:
         logger.info("Generating scenarios with CBN")
         scenarios = _scenario_cache.get_scenarios(
             race_id=request.constraint_spec.slate_id,
@@ -142,141 +248,144 @@ async def optimize_endpoint(
                 request.track_id,
                 n,
                 request.random_seed
+            ),
+            key=scenario_cache_key(
+                constraint_spec=request.constraint_spec,
+                track_id=request.track_id,
+                random_seed=request.random_seed,
+                n_scenarios=request.n_scenarios
             )
         )
+    n_scenarios = len(scenarios)
 
-        # Step 2: Convert constraint spec to driver_data format
-        driver_data = _convert_constraint_spec_to_driver_data(request.constraint_spec)
+    # Step 2: Convert constraint spec to driver_data format
+    driver_data = _convert_constraint_spec_to_driver_data(request.constraint_spec)
 
-        # Step 3: Generate portfolio with CVaR optimization
-        logger.info(f"Generating {request.n_lineups} lineups with CVaR optimization")
-        lineups = generate_portfolio(
-            race_id=request.constraint_spec.slate_id,
-            driver_data=driver_data,
-            scenario_fn=lambda n: scenarios,  # Use cached scenarios
-            n_lineups=request.n_lineups,
-            n_scenarios=request.n_scenarios,
-            cvar_alphas=request.cvar_alphas,
-            cvar_weights=request.cvar_weights,
-            correlation_weight=request.correlation_weight,
-            max_driver_exposure=request.max_driver_exposure,
-            max_team_exposure=request.max_team_exposure,
-            salary_cap=request.salary_cap,
-            n_drivers=request.n_drivers,
-            min_stack=request.min_stack,
-            max_stack=request.max_stack,
-            random_seed=request.random_seed
-        )
+    # Step 3: Generate portfolio with CVaR optimization
+    logger.info(f"Generating {request.n_lineups} lineups with CVaR optimization")
+    lineups = generate_portfolio(
+        race_id=request.constraint_spec.slate_id,
+        driver_data=driver_data,
+        scenario_fn=lambda n: scenarios,  # Use cached scenarios
+        n_lineups=request.n_lineups,
+        n_scenarios=n_scenarios,
+        cvar_alphas=request.cvar_alphas,
+        cvar_weights=request.cvar_weights,
+        correlation_weight=request.correlation_weight,
+        max_driver_exposure=request.max_driver_exposure,
+        max_team_exposure=request.max_team_exposure,
+        salary_cap=request.salary_cap,
+        n_drivers=request.n_drivers,
+        min_stack=request.min_stack,
+        max_stack=request.max_stack,
+        random_seed=request.random_seed
+    )
 
-        if not lineups:
-            raise HTTPException(status_code=500, detail="Failed to generate any lineups")
+    if not lineups:
+        raise RuntimeError("Failed to generate any lineups")
+
+    logger.info(f"Generated {len(lineups)} lineups")
+
+    # Step 4: Validate tail objective (optimizer targets tails, not mean)
+    tail_validation = {}
+    if request.validate_tail_objective:
+        try:
+            logger.info("Validating tail objective")
+            tail_validation = _validate_tail_objective(scenarios, lineups, driver_data)
+        except Exception as e:
+            logger.warning(f"Tail validation failed: {e}, using default values")
+            tail_validation = {
+                "cvar_alphas": request.cvar_alphas,
+                "tail_improvement": 0.0,
+                "mean_sacrifice": 0.0,
+                "actually_optimizing_tail": False
+            }
+
+    # Step 5: Compute calibration metrics (optional)
+    calibration_metrics = None
+    kernel_stats = None
+    if request.include_calibration:
+        try:
+            logger.info("Computing calibration metrics")
+            reset_rejection_stats()
+            kernel = KernelLogic(field_size=len(driver_data))
+
+            cal_result = end_to_end_calibration(
+                constraint_spec=request.constraint_spec,
+                track_id=request.track_id,
+                n_scenarios=min(request.n_scenarios, 1000),  # Limit for speed
+                kernel=kernel,
+                random_seed=request.random_seed
+            )
 
-        logger.info(f"Generated {len(lineups)} lineups")
+            if cal_result is None:
+                logger.warning("Calibration returned None, skipping calibration metrics")
+            else:
+                # Extract calibration metrics
+                cal_metrics = cal_result.get("calibration_metrics")
+                if cal_metrics:
+                    calibration_metrics = CalibrationMetrics(
+                        observed_finish_positions=cal_metrics.get("observed_finish_positions", []).tolist() if hasattr(cal_metrics.get("observed_finish_positions", []), "tolist") else [],
+                        n_scenarios=cal_metrics.get("n_scenarios", 0),
+                        n_drivers=cal_metrics.get("n_drivers", 0),
+                        mean_finish=cal_metrics.get("mean_finish", 0.0),
+                        std_finish=cal_metrics.get("std_finish", 0.0)
+                    )
 
-        # Step 4: Validate tail objective (optimizer targets tails, not mean)
-        tail_validation = {}
-        if request.validate_tail_objective:
-            try:
-                logger.info("Validating tail objective")
-                tail_validation = _validate_tail_objective(scenarios, lineups, driver_data)
-            except Exception as e:
-                logger.warning(f"Tail validation failed: {e}, using default values")
-                tail_validation = {
-                    "cvar_alphas": request.cvar_alphas,
-                    "tail_improvement": 0.0,
-                    "mean_sacrifice": 0.0,
-                    "actually_optimizing_tail": False
-                }
-
-        # Step 5: Compute calibration metrics (optional)
-        calibration_metrics = None
-        kernel_stats = None
-        if request.include_calibration:
-            try:
-                logger.info("Computing calibration metrics")
-                reset_rejection_stats()
-                kernel = KernelLogic(field_size=len(driver_data))
-
-                cal_result = end_to_end_calibration(
-                    constraint_spec=request.constraint_spec,
-                    track_id=request.track_id,
-                    n_scenarios=min(request.n_scenarios, 1000),  # Limit for speed
-                    kernel=kernel,
-                    random_seed=request.random_seed
+                # Extract kernel stats
+                kernel_rejection = cal_result.get("kernel_rejection_stats", {})
+                kernel_stats = KernelStats(
+                    total_validated=kernel_rejection.get("total_validated", 0),
+                    total_rejected=kernel_rejection.get("total_rejected", 0),
+                    rejection_rate=kernel_rejection.get("rejection_rate", 0.0),
+                    veto_reasons=kernel_rejection.get("veto_reasons", {})
                 )
+        except Exception as e:
+            logger.warning(f"Calibration failed: {e}, continuing without calibration metrics")
+            calibration_metrics = None
+            kernel_stats = None
+
+    # Step 6: Compute portfolio correlation
+    portfolio_correlation = compute_portfolio_correlation(lineups)
+
+    # Step 7: Generate explain artifacts
+    explain = _generate_explain_artifacts(
+        lineups,
+        scenarios,
+        driver_data,
+        tail_validation
+    )
 
-                if cal_result is None:
-                    logger.warning("Calibration returned None, skipping calibration metrics")
-                else:
-                    # Extract calibration metrics
-                    cal_metrics = cal_result.get("calibration_metrics")
-                    if cal_metrics:
-                        calibration_metrics = CalibrationMetrics(
-                            observed_finish_positions=cal_metrics.get("observed_finish_positions", []).tolist() if hasattr(cal_metrics.get("observed_finish_positions", []), "tolist") else [],
-                            n_scenarios=cal_metrics.get("n_scenarios", 0),
-                            n_drivers=cal_metrics.get("n_drivers", 0),
-                            mean_finish=cal_metrics.get("mean_finish", 0.0),
-                            std_finish=cal_metrics.get("std_finish", 0.0)
-                        )
-
-                    # Extract kernel stats
-                    kernel_rejection = cal_result.get("kernel_rejection_stats", {})
-                    kernel_stats = KernelStats(
-                        total_validated=kernel_rejection.get("total_validated", 0),
-                        total_rejected=kernel_rejection.get("total_rejected", 0),
-                        rejection_rate=kernel_rejection.get("rejection_rate", 0.0),
-                        veto_reasons=kernel_rejection.get("veto_reasons", {})
-                    )
-            except Exception as e:
-                logger.warning(f"Calibration failed: {e}, continuing without calibration metrics")
-                calibration_metrics = None
-                kernel_stats = None
-
-        # Step 6: Compute portfolio correlation
-        portfolio_correlation = compute_portfolio_correlation(lineups)
-
-        # Step 7: Generate explain artifacts
-        explain = _generate_explain_artifacts(
-            lineups,
-            scenarios,
-            driver_data,
-            tail_validation
-        )
-
-        # Step 8: Export CSV (optional)
-        csv_export_path = None
-        if export_csv:
-            csv_filename = f"{request.constraint_spec.slate_id}_lineups.csv"
-            csv_export_path = export_lineups_dk_format(lineups, driver_data, csv_filename)
-            logger.info(f"Exported CSV to {csv_export_path}")
-
-        # Step 9: Build response
-        response_lineups = [
-            LineupResponse(
-                drivers=lineup["drivers"],
-                cvar_99=lineup["cvar_99"],
-                cvar_95=lineup["cvar_95"],
-                top_1pct=lineup["top_1pct"],
-                conditional_upside=lineup["conditional_upside"],
-                exposure=lineup["exposure"],
-                total_salary=lineup["total_salary"],
-                team_distribution=_compute_team_distribution(lineup["drivers"], driver_data)
-            )
-            for lineup in lineups
-        ]
-
-        return OptimizeResponse(
-            lineups=response_lineups,
-            portfolio_correlation=portfolio_correlation,
-            calibration_metrics=calibration_metrics,
-            kernel_stats=kernel_stats,
-            explain=explain,
-            csv_export_path=csv_export_path
+    # Step 8: Export CSV (optional)
+    csv_export_path = None
+    if export_csv:
+        csv_filename = f"{request.constraint_spec.slate_id}_lineups.csv"
+        csv_export_path = export_lineups_dk_format(lineups, driver_data, csv_filename)
+        logger.info(f"Exported CSV to {csv_export_path}")
+
+    # Step 9: Build response
+    response_lineups = [
+        LineupResponse(
+            drivers=lineup["drivers"],
+            cvar_99=lineup["cvar_99"],
+            cvar_95=lineup["cvar_95"],
+            top_1pct=lineup["top_1pct"],
+            conditional_upside=lineup["conditional_upside"],
+            exposure=lineup["exposure"],
+            total_salary=lineup["total_salary"],
+            team_distribution=_compute_team_distribution(lineup["drivers"], driver_data)
         )
-
-    except Exception as e:
-        logger.error(f"Optimization failed: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
+        for lineup in lineups
+    ]
+
+    return OptimizeResponse(
+        lineups=response_lineups,
+        portfolio_correlation=portfolio_correlation,
+        calibration_metrics=calibration_metrics,
+        kernel_stats=kernel_stats,
+        explain=explain,
+        csv_export_path=csv_export_path
+    )
 
 
 def _generate_scenarios_for_optimization(
@@ -285,9 +394,14 @@ def _generate_scenarios_for_optimization(
     n_scenarios: int,
     random_seed: int
 ) -> np.ndarray:
-    """Generate scenarios for optimization (convert to DFS points matrix)."""
+    """Generate scenarios for optimization as a DFS points matrix.
+
+    Scenarios are generated and scored in chunks of SCORING_CHUNK_SIZE, so
+    only one chunk of scenario arrays is alive at a time. Columns follow
+    constraint_spec.drivers order, matching _convert_constraint_spec_to_driver_data.
+    """
     try:
-        from axiomatic_sim.scenario_generator import generate_scenarios_with_constraints
+        from axiomatic_sim.scenario_generator import create_constrained_generator
     except ImportError:
         logger.warning("Scenario generator not available, using mock scenarios")
         # Mock scenario generation for testing
@@ -297,22 +411,20 @@ def _generate_scenarios_for_optimization(
 
     from app.kernel import KernelLogic
 
-    kernel = KernelLogic(field_size=len(constraint_spec.drivers))
-    scenarios = generate_scenarios_with_constraints(
-        constraint_spec=constraint_spec,
-        track_id=track_id,
+    driver_ids = list(constraint_spec.drivers.keys())
+    kernel = KernelLogic(field_size=len(driver_ids))
+    generator = create_constrained_generator(constraint_spec, track_id, kernel)
+
+    return score_scenario_stream(
+        generator.iter_scenario_batches(
+            n_scenarios,
+            chunk_size=SCORING_CHUNK_SIZE,
+            random_state=random_seed
+        ),
         n_scenarios=n_scenarios,
-        kernel=kernel,
-        random_seed=random_seed
+        driver_ids=driver_ids
     )
 
-    # Convert ScenarioComponents to DFS points matrix
-    # TODO: Implement DFS points calculation from ScenarioComponents
-    # For now, return mock data based on scenario components
-    n_drivers = len(constraint_spec.drivers)
-    np.random.seed(random_seed)
-    return np.random.randn(n_scenarios, n_drivers) * 10 + 50
-
 
 def _convert_constraint_spec_to_driver_data(constraint_spec: ConstraintSpec) -> List[Dict[str, Any]]:
     """Convert ConstraintSpec to driver_data format for optimizer."""
@@ -437,16 +549,27 @@ def _validate_tail_objective(
     tail_improvement = (cvar_cvar - mean_cvar) / mean_cvar if mean_cvar > 0 else 0.0
     mean_sacrifice = (cvar_mean - mean_mean) / mean_mean if mean_mean > 0 else 0.0
 
+    # Bootstrap stability of the whole portfolio's tail (no re-optimization)
+    column = {d["driver_id"]: i for i, d in enumerate(driver_data)}
+    stability = validate_portfolio_tail_stability(
+        scenarios,
+        [[column[driver_id] for driver_id in lineup["drivers"]] for lineup in lineups],
+        alpha=0.99,
+        random_state=0
+    )
+
     logger.info(
         f"Tail validation: CVaR={cvar_cvar:.2f}, MeanCVaR={mean_cvar:.2f}, "
-        f"Improvement={tail_improvement:.1%}"
+        f"Improvement={tail_improvement:.1%}, Stable={stability['stable']}"
     )
 
     return {
         "cvar_alphas": [0.99, 0.95],
         "tail_improvement": tail_improvement,
         "mean_sacrifice": mean_sacrifice,
-        "actually_optimizing_tail": tail_improvement > 0.05
+        "actually_optimizing_tail": tail_improvement > 0.05,
+        "tail_stable": stability["stable"],
+        "tail_cvar_cv": stability["max_cvar_cv"],
     }
 
 
@@ -469,6 +592,12 @@ def _generate_explain_artifacts(
         f"CVaR-optimized lineups show {tail_improvement:.1%} improvement "
         f"in tail performance vs mean optimization."
     )
+    if "tail_stable" in tail_validation:
+        why_high_tail += (
+            f" Bootstrap tail estimates are "
+            f"{'stable' if tail_validation['tail_stable'] else 'unstable'} "
+            f"(CVaR CV={tail_validation['tail_cvar_cv']:.3f})."
+        )
 
     # Constraint binding: Check which constraints are binding
     max_salary = max(l["total_salary"] for l in lineups)
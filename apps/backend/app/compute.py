@@ -0,0 +1,355 @@
+"""
+Off-event-loop execution of CPU-bound API pipelines.
+
+The optimization endpoints (/optimize, /ownership, /contest-sim,
+/optimize-with-leverage) are async handlers, but their pipelines are pure
+CPU work. Run inline, one request would hold the event loop for its whole
+runtime and stall health checks and every other client. ComputeExecutor runs
+each pipeline in a managed worker pool so handlers only await a future.
+
+Admission control: every endpoint has a limit on in-flight jobs (running plus
+queued in the pool). A request over the limit is rejected immediately with
+ComputeSaturatedError, which the API maps to 429 with a Retry-After estimate,
+instead of queueing without bound behind the slowest optimization.
+
+Process vs thread workers: process workers sidestep the GIL, but each one
+has its own copy of the module-level caches, so a cache warmed by one worker
+is cold in the next. The scenario cache shares generated matrices across
+processes through its spill directory (memory-mapped .npy files, see
+ScenarioCache), which is why /optimize and /optimize-with-leverage run in
+processes. /contest-sim and /ownership cache live Python objects (field
+pools, fitted ownership estimators) that cannot be shared that way and
+spend their time in NumPy code that releases the GIL, so they default to a
+thread pool in the API process: their caches stay warm across requests at
+the cost of some GIL contention in their pure-Python stretches. Each mode
+gets its own pool of n_workers, so with mixed modes up to 2 x n_workers
+jobs run at once (admission limits still apply per endpoint).
+
+Configuration (environment):
+- COMPUTE_MODE: "process" (default) or "thread" (in-process threads; for
+  tests and debugging, pipelines still run off the event loop)
+- COMPUTE_MODE_<ENDPOINT>: per-endpoint override, e.g. COMPUTE_MODE_CONTEST_SIM=process
+  (defaults: DEFAULT_ENDPOINT_MODES)
+- COMPUTE_WORKERS: pool size (default: cpu_count - 1, at least 1)
+- COMPUTE_MAX_IN_FLIGHT: default per-endpoint in-flight limit (default 2 x workers)
+- COMPUTE_LIMIT_<ENDPOINT>: per-endpoint override, e.g. COMPUTE_LIMIT_CONTEST_SIM=8
+- COMPUTE_START_METHOD: multiprocessing start method (default "spawn", safe
+  with the server's threads)
+
+Usage:
+    try:
+        result = await get_compute_executor().run("optimize", run_optimization, request)
+    except ComputeSaturatedError as e:
+        raise saturation_http_exception(e)  # 429 + Retry-After
+"""
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+COMPUTE_MODE_ENV = "COMPUTE_MODE"
+COMPUTE_MODE_ENV_PREFIX = "COMPUTE_MODE_"
+COMPUTE_WORKERS_ENV = "COMPUTE_WORKERS"
+COMPUTE_MAX_IN_FLIGHT_ENV = "COMPUTE_MAX_IN_FLIGHT"
+COMPUTE_LIMIT_ENV_PREFIX = "COMPUTE_LIMIT_"
+COMPUTE_START_METHOD_ENV = "COMPUTE_START_METHOD"
+
+# Smoothing of per-endpoint job durations used for Retry-After
+DURATION_EMA_WEIGHT = 0.2
+
+# Endpoints whose caches hold in-process objects run in threads (see module docstring)
+DEFAULT_ENDPOINT_MODES = {"contest-sim": "thread", "ownership": "thread"}
+
+COMPUTE_MODES = ("process", "thread")
+
+
+class ComputeSaturatedError(Exception):
+    """Raised when an endpoint already has its limit of in-flight jobs."""
+
+    def __init__(self, endpoint: str, limit: int, retry_after: int):
+        super().__init__(f"Endpoint '{endpoint}' is at its limit of {limit} in-flight jobs")
+        self.endpoint = endpoint
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+def _default_workers() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def _limit_key(endpoint: str) -> str:
+    """Normalized endpoint name for limits ("contest-sim" -> "CONTEST_SIM")."""
+    return endpoint.upper().replace("-", "_").replace("/", "_")
+
+
+class ComputeExecutor:
+    """
+    Worker pools with per-endpoint admission control.
+
+    Each endpoint runs in the pool of its mode (the default mode unless
+    overridden in modes). Pools are created on first use and recreated if a
+    worker process dies.
+    Slots are released when the job itself finishes (not when the awaiting
+    handler is cancelled), so a disconnected client cannot free capacity that
+    a still-running job occupies.
+
+    Attributes:
+        mode: Default mode, "process" or "thread"
+        n_workers: Pool size
+        default_limit: In-flight limit for endpoints without an override
+    """
+
+    def __init__(
+        self,
+        n_workers: Optional[int] = None,
+        mode: str = "process",
+        default_limit: Optional[int] = None,
+        limits: Optional[Dict[str, int]] = None,
+        start_method: str = "spawn",
+        modes: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize the executor (the pool itself starts lazily).
+
+        Args:
+            n_workers: Pool size (default: cpu_count - 1, at least 1)
+            mode: Default mode, "process" for a process pool, "thread" for a thread pool
+            default_limit: Per-endpoint in-flight limit (default: 2 x n_workers)
+            limits: Per-endpoint limit overrides
+            start_method: multiprocessing start method for process mode
+            modes: Per-endpoint mode overrides (default: DEFAULT_ENDPOINT_MODES)
+
+        Raises:
+            ValueError: If a mode is unknown or a size/limit is not positive
+        """
+        if modes is None:
+            modes = DEFAULT_ENDPOINT_MODES
+        for value in [mode, *modes.values()]:
+            if value not in COMPUTE_MODES:
+                raise ValueError(f"Unknown compute mode '{value}' (expected 'process' or 'thread')")
+
+        self.mode = mode
+        self.n_workers = n_workers if n_workers is not None else _default_workers()
+        self.default_limit = default_limit if default_limit is not None else 2 * self.n_workers
+        self.start_method = start_method
+        self._limits = {_limit_key(k): v for k, v in (limits or {}).items()}
+        self._modes = {_limit_key(k): v for k, v in modes.items()}
+
+        if self.n_workers < 1 or self.default_limit < 1 or any(v < 1 for v in self._limits.values()):
+            raise ValueError("Compute workers and limits must be >= 1")
+
+        self._pools: Dict[str, Executor] = {}
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, int] = {}
+        self._rejected: Dict[str, int] = {}
+        self._completed: Dict[str, int] = {}
+        self._avg_seconds: Dict[str, float] = {}
+
+    @classmethod
+    def from_env(cls) -> "ComputeExecutor":
+        """Build an executor from COMPUTE_* environment variables."""
+        limits = {
+            name[len(COMPUTE_LIMIT_ENV_PREFIX):]: int(value)
+            for name, value in os.environ.items()
+            if name.startswith(COMPUTE_LIMIT_ENV_PREFIX)
+        }
+        modes = dict(DEFAULT_ENDPOINT_MODES)
+        modes.update(
+            (name[len(COMPUTE_MODE_ENV_PREFIX):], value)
+            for name, value in os.environ.items()
+            if name.startswith(COMPUTE_MODE_ENV_PREFIX)
+        )
+        default_limit = os.getenv(COMPUTE_MAX_IN_FLIGHT_ENV)
+
+        return cls(
+            n_workers=int(os.getenv(COMPUTE_WORKERS_ENV, _default_workers())),
+            mode=os.getenv(COMPUTE_MODE_ENV, "process"),
+            default_limit=int(default_limit) if default_limit else None,
+            limits=limits,
+            start_method=os.getenv(COMPUTE_START_METHOD_ENV, "spawn"),
+            modes={_limit_key(k): v for k, v in modes.items()},
+        )
+
+    def limit(self, endpoint: str) -> int:
+        """In-flight limit for an endpoint."""
+        return self._limits.get(_limit_key(endpoint), self.default_limit)
+
+    def mode_for(self, endpoint: str) -> str:
+        """Pool mode ("process" or "thread") an endpoint runs in."""
+        return self._modes.get(_limit_key(endpoint), self.mode)
+
+    def _get_pool(self, mode: str) -> Executor:
+        with self._lock:
+            if mode not in self._pools:
+                if mode == "process":
+                    self._pools[mode] = ProcessPoolExecutor(
+                        max_workers=self.n_workers,
+                        mp_context=multiprocessing.get_context(self.start_method),
+                    )
+                else:
+                    self._pools[mode] = ThreadPoolExecutor(
+                        max_workers=self.n_workers, thread_name_prefix="compute"
+                    )
+                logger.info(f"Started {mode} compute pool with {self.n_workers} workers")
+            return self._pools[mode]
+
+    def _reset_pool(self, broken: Executor) -> None:
+        """Drop a broken pool so the next submit starts a fresh one."""
+        with self._lock:
+            for mode, pool in list(self._pools.items()):
+                if pool is broken:
+                    del self._pools[mode]
+        broken.shutdown(wait=False, cancel_futures=True)
+        logger.warning("Compute pool broken (worker died); it will be restarted")
+
+    def _admit(self, endpoint: str) -> None:
+        limit = self.limit(endpoint)
+        with self._lock:
+            if self._in_flight.get(endpoint, 0) >= limit:
+                self._rejected[endpoint] = self._rejected.get(endpoint, 0) + 1
+                retry_after = max(1, math.ceil(self._avg_seconds.get(endpoint, 1.0)))
+                raise ComputeSaturatedError(endpoint, limit, retry_after)
+            self._in_flight[endpoint] = self._in_flight.get(endpoint, 0) + 1
+
+    def _release(self, endpoint: str, started: float, future: Future) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._in_flight[endpoint] -= 1
+            if future.cancelled():
+                return
+            self._completed[endpoint] = self._completed.get(endpoint, 0) + 1
+            previous = self._avg_seconds.get(endpoint)
+            self._avg_seconds[endpoint] = elapsed if previous is None else (
+                (1 - DURATION_EMA_WEIGHT) * previous + DURATION_EMA_WEIGHT * elapsed
+            )
+
+    def _submit(
+        self, endpoint: str, fn: Callable[..., Any], *args, **kwargs
+    ) -> Tuple[Executor, Future]:
+        """Admit, then submit to the endpoint's pool; returns (pool, future)."""
+        mode = self.mode_for(endpoint)
+        self._admit(endpoint)
+        started = time.perf_counter()
+        try:
+            pool = self._get_pool(mode)
+            try:
+                future = pool.submit(partial(fn, *args, **kwargs))
+            except BrokenProcessPool:
+                self._reset_pool(pool)
+                pool = self._get_pool(mode)
+                future = pool.submit(partial(fn, *args, **kwargs))
+        except BaseException:
+            with self._lock:
+                self._in_flight[endpoint] -= 1
+            raise
+
+        future.add_done_callback(partial(self._release, endpoint, started))
+        return pool, future
+
+    def submit(self, endpoint: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Admit and submit a job, returning its concurrent.futures.Future.
+
+        Args:
+            endpoint: Endpoint name used for admission control
+            fn: Picklable (module-level) function in process mode
+            *args, **kwargs: Picklable arguments
+
+        Returns:
+            Future of fn(*args, **kwargs)
+
+        Raises:
+            ComputeSaturatedError: If the endpoint is at its in-flight limit
+        """
+        return self._submit(endpoint, fn, *args, **kwargs)[1]
+
+    async def run(self, endpoint: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn in the pool and await its result without blocking the event loop.
+
+        Args:
+            endpoint: Endpoint name used for admission control
+            fn: Picklable (module-level) function in process mode
+            *args, **kwargs: Picklable arguments
+
+        Returns:
+            fn's return value
+
+        Raises:
+            ComputeSaturatedError: If the endpoint is at its in-flight limit
+            Exception: Whatever fn raised
+        """
+        pool, future = self._submit(endpoint, fn, *args, **kwargs)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, modes, limits and per-endpoint in-flight/completed/rejected counts."""
+        with self._lock:
+            endpoints = set(self._in_flight) | set(self._rejected) | set(self._completed)
+            return {
+                "mode": self.mode,
+                "endpoint_modes": dict(sorted(self._modes.items())),
+                "n_workers": self.n_workers,
+                "endpoints": {
+                    endpoint: {
+                        "in_flight": self._in_flight.get(endpoint, 0),
+                        "limit": self.limit(endpoint),
+                        "completed": self._completed.get(endpoint, 0),
+                        "rejected": self._rejected.get(endpoint, 0),
+                        "avg_seconds": round(self._avg_seconds.get(endpoint, 0.0), 3),
+                    }
+                    for endpoint in sorted(endpoints)
+                },
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pools (a later submit starts new ones)."""
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for mode, pool in pools.items():
+            pool.shutdown(wait=wait, cancel_futures=not wait)
+            logger.info(f"{mode.capitalize()} compute pool shut down")
+
+
+_shared_executor: Optional[ComputeExecutor] = None
+_shared_executor_lock = threading.Lock()
+
+
+def get_compute_executor() -> ComputeExecutor:
+    """
+    Return the process-wide compute executor.
+
+    Created on first use from the COMPUTE_* environment variables.
+
+    Returns:
+        Shared ComputeExecutor instance
+    """
+    global _shared_executor
+    with _shared_executor_lock:
+        if _shared_executor is None:
+            _shared_executor = ComputeExecutor.from_env()
+        return _shared_executor
+
+
+def saturation_http_exception(error: ComputeSaturatedError) -> HTTPException:
+    """429 response for a saturated endpoint, with Retry-After in seconds."""
+    return HTTPException(
+        status_code=429,
+        detail=f"Server busy: {error}. Retry after {error.retry_after}s.",
+        headers={"Retry-After": str(error.retry_after)},
+    )
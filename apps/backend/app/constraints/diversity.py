@@ -9,16 +9,22 @@ Key concepts:
 - Jaccard similarity: Measures lineup overlap (intersection / union)
 - Correlation penalty: Soft penalty for selecting drivers from previous lineups
 - Portfolio correlation: Aggregate similarity metrics across all lineups
+
+Lineups are encoded as a binary lineup x driver incidence matrix, so all
+pairwise overlaps are matrix products rather than per-pair set operations.
 """
 
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 
 import numpy as np
 from pulp import LpProblem, lpSum, LpVariable
 
 logger = logging.getLogger(__name__)
 
+# Max similarity entries materialized per block in compute_portfolio_correlation
+SIMILARITY_BLOCK_ELEMENTS = 1 << 22
+
 
 def add_correlation_penalty(
     prob: LpProblem,
@@ -131,6 +137,72 @@ def compute_pairwise_similarity(
     return similarity
 
 
+def lineup_incidence_matrix(
+    lineups: List[Dict[str, Any]],
+    driver_ids: Optional[Sequence[Any]] = None,
+) -> Tuple[np.ndarray, List[Any]]:
+    """
+    Encode lineups as a binary lineup x driver incidence matrix.
+
+    Row i has a 1 in column j when driver_ids[j] is in lineup i, so every
+    pairwise overlap count is one entry of incidence @ incidence.T. Duplicate
+    drivers within a lineup count once (set semantics, as in Jaccard).
+
+    Args:
+        lineups: List of lineup dicts with "drivers" key
+        driver_ids: Optional column order (defaults to order of first appearance);
+            drivers not listed here are ignored
+
+    Returns:
+        Tuple of (float32 incidence matrix [n_lineups, n_drivers], column driver ids)
+
+    Example:
+        >>> incidence, ids = lineup_incidence_matrix([{"drivers": [3, 1]}, {"drivers": [1, 2]}])
+        >>> ids
+        [3, 1, 2]
+    """
+    if driver_ids is None:
+        column = {}
+        for lineup in lineups:
+            for driver_id in lineup["drivers"]:
+                column.setdefault(driver_id, len(column))
+    else:
+        column = {driver_id: j for j, driver_id in enumerate(driver_ids)}
+
+    rows = []
+    cols = []
+    for i, lineup in enumerate(lineups):
+        for driver_id in lineup["drivers"]:
+            j = column.get(driver_id)
+            if j is not None:
+                rows.append(i)
+                cols.append(j)
+
+    incidence = np.zeros((len(lineups), len(column)), dtype=np.float32)
+    incidence[rows, cols] = 1.0
+
+    return incidence, list(column)
+
+
+def _jaccard_block(
+    overlap: np.ndarray,
+    sizes_i: np.ndarray,
+    sizes_j: np.ndarray,
+) -> np.ndarray:
+    """
+    Jaccard similarities from an overlap block (0.0 where the union is empty).
+
+    Overlap counts from the float32 incidence products are exact small
+    integers; unions and ratios are computed in float64.
+    """
+    overlap = overlap.astype(np.float64)
+    union = sizes_i.astype(np.float64)[:, None] + sizes_j.astype(np.float64)[None, :] - overlap
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarity = overlap / union
+    similarity[union == 0] = 0.0
+    return similarity
+
+
 def compute_portfolio_correlation(
     lineups: List[Dict[str, Any]]
 ) -> Dict[str, any]:
@@ -140,6 +212,10 @@ def compute_portfolio_correlation(
     Calculates aggregate similarity metrics across all pairs of lineups in the
     portfolio. Higher correlations indicate less diversity (more similar lineups).
 
+    Overlaps come from incidence-matrix products over blocks of rows (upper
+    triangle only), so memory stays bounded by SIMILARITY_BLOCK_ELEMENTS even
+    for tens of thousands of lineups.
+
     Metrics computed:
     - avg_similarity: Mean Jaccard similarity across all pairs
     - max_similarity: Maximum Jaccard similarity (most similar pair)
@@ -176,34 +252,50 @@ def compute_portfolio_correlation(
             "n_pairs": 0,
         }
 
-    similarities = []
-    most_similar = (0.0, None, None)  # (similarity, lineup_i, lineup_j)
-    least_similar = (1.0, None, None)  # (similarity, lineup_i, lineup_j)
-
-    # Compute pairwise similarities
-    for i in range(n):
-        for j in range(i + 1, n):
-            sim = compute_pairwise_similarity(
-                lineups[i]["drivers"],
-                lineups[j]["drivers"]
-            )
-            similarities.append(sim)
-
-            # Track most similar pair
-            if sim > most_similar[0]:
-                most_similar = (sim, i, j)
-
-            # Track least similar pair
-            if sim < least_similar[0]:
-                least_similar = (sim, i, j)
-
-    # Compute aggregate metrics
-    avg_similarity = float(np.mean(similarities))
-    max_similarity = float(np.max(similarities))
-    min_similarity = float(np.min(similarities))
+    incidence, _ = lineup_incidence_matrix(lineups)
+    sizes = incidence.sum(axis=1, dtype=np.float64)
+    block_rows = max(1, SIMILARITY_BLOCK_ELEMENTS // n)
+
+    total = 0.0
+    most_similar = (-np.inf, n, n)  # (similarity, lineup_i, lineup_j)
+    least_similar = (np.inf, n, n)  # (similarity, lineup_i, lineup_j)
+
+    # Row block [start, stop) against columns start.. (upper triangle only).
+    # Only the square diagonal part of each block needs a j > i mask.
+    for start in range(0, n - 1, block_rows):
+        stop = min(start + block_rows, n - 1)
+        overlap = incidence[start:stop] @ incidence[start:].T
+        sim = _jaccard_block(overlap, sizes[start:stop], sizes[start:])
+        diagonal = sim[:, :stop - start]
+        rest = sim[:, stop - start:]
+
+        upper = np.triu(np.ones(diagonal.shape, dtype=bool), k=1)
+        total += float(diagonal[upper].sum())
+        total += float(rest.sum())
+
+        # The earlier pair in (i, j) order wins ties, as in a row-major scan
+        parts = [(np.where(upper, diagonal, -np.inf), np.where(upper, diagonal, np.inf), 0)]
+        if rest.size:
+            parts.append((rest, rest, stop - start))
+
+        for high, low, offset in parts:
+            r, c = np.unravel_index(np.argmax(high), high.shape)
+            pair = (start + int(r), start + offset + int(c))
+            if (high[r, c], -pair[0], -pair[1]) > (most_similar[0], -most_similar[1], -most_similar[2]):
+                most_similar = (float(high[r, c]),) + pair
+
+            r, c = np.unravel_index(np.argmin(low), low.shape)
+            pair = (start + int(r), start + offset + int(c))
+            if (low[r, c],) + pair < least_similar:
+                least_similar = (float(low[r, c]),) + pair
+
+    n_pairs = n * (n - 1) // 2
+    avg_similarity = total / n_pairs
+    max_similarity = most_similar[0]
+    min_similarity = least_similar[0]
 
     logger.info(
-        f"Portfolio correlation: n={n}, pairs={len(similarities)}, "
+        f"Portfolio correlation: n={n}, pairs={n_pairs}, "
         f"avg={avg_similarity:.3f}, max={max_similarity:.3f}, min={min_similarity:.3f}"
     )
 
@@ -213,7 +305,7 @@ def compute_portfolio_correlation(
         "min_similarity": min_similarity,
         "most_similar_pair": most_similar[1:],
         "least_similar_pair": least_similar[1:],
-        "n_pairs": len(similarities),
+        "n_pairs": n_pairs,
     }
 
 
@@ -226,6 +318,10 @@ def compute_similarity_matrix(
     Creates an n x n matrix where element [i, j] is the Jaccard similarity
     between lineup i and lineup j. The diagonal is 1.0 (identical).
 
+    All overlaps come from a single incidence-matrix product. The result is
+    dense n x n float64, so prefer compute_portfolio_correlation or
+    find_most_diverse_subset for very large candidate pools.
+
     Useful for visualization and clustering analysis.
 
     Args:
@@ -249,22 +345,14 @@ def compute_similarity_matrix(
     if n == 0:
         return np.array([])
 
-    # Initialize matrix with zeros
-    matrix = np.zeros((n, n))
+    incidence, _ = lineup_incidence_matrix(lineups)
+    sizes = incidence.sum(axis=1, dtype=np.float64)
+
+    matrix = _jaccard_block(incidence @ incidence.T, sizes, sizes)
 
     # Fill diagonal with 1.0 (identical)
     np.fill_diagonal(matrix, 1.0)
 
-    # Compute pairwise similarities
-    for i in range(n):
-        for j in range(i + 1, n):
-            sim = compute_pairwise_similarity(
-                lineups[i]["drivers"],
-                lineups[j]["drivers"]
-            )
-            matrix[i, j] = sim
-            matrix[j, i] = sim  # Symmetric
-
     logger.debug(f"Computed similarity matrix: {n}x{n}")
 
     return matrix
@@ -272,7 +360,8 @@ def compute_similarity_matrix(
 
 def find_most_diverse_subset(
     lineups: List[Dict[str, Any]],
-    n_select: int
+    n_select: int,
+    start_index: Optional[int] = None,
 ) -> List[int]:
     """
     Find the most diverse subset of lineups using greedy selection.
@@ -281,9 +370,14 @@ def find_most_diverse_subset(
     already-selected lineups. This is useful for reducing a large portfolio
     to a smaller, more diverse set.
 
+    Each step computes one column of overlaps (incidence @ selected row) and
+    adds it to a running similarity sum, so the cost is O(n_select * n * n_drivers)
+    with O(n) extra memory; no n x n matrix is built.
+
     Args:
         lineups: List of lineup dicts with "drivers" key
         n_select: Number of lineups to select
+        start_index: Lineup to seed the selection with (default: random)
 
     Returns:
         List of indices of the most diverse lineups
@@ -293,47 +387,41 @@ def find_most_diverse_subset(
         >>> diverse_indices = find_most_diverse_subset(lineups, n_select=5)
         >>> print(f"Most diverse lineups: {diverse_indices}")
     """
-    if n_select >= len(lineups):
-        return list(range(len(lineups)))
+    n = len(lineups)
+
+    if n_select >= n:
+        return list(range(n))
 
     if n_select <= 0:
         return []
 
+    incidence, _ = lineup_incidence_matrix(lineups)
+    sizes = incidence.sum(axis=1, dtype=np.float64)
+
     # Start with a random lineup
-    import random
-    selected = [random.randint(0, len(lineups) - 1)]
-    remaining = set(range(len(lineups))) - set(selected)
+    if start_index is None:
+        import random
+        start_index = random.randint(0, n - 1)
+    selected = [start_index]
+
+    # Sum of similarities to the selected lineups; argmin of the sum is
+    # argmin of the average. Selected lineups are excluded with +inf.
+    similarity_sum = np.zeros(n, dtype=np.float64)
+    best_avg_sim = 0.0
 
     # Greedy selection
     for _ in range(n_select - 1):
-        if not remaining:
-            break
-
-        # Find the lineup that minimizes avg similarity to selected
-        best_idx = None
-        best_avg_sim = float('inf')
-
-        for idx in remaining:
-            # Compute avg similarity to all selected lineups
-            sims = [
-                compute_pairwise_similarity(
-                    lineups[idx]["drivers"],
-                    lineups[sel_idx]["drivers"]
-                )
-                for sel_idx in selected
-            ]
-            avg_sim = np.mean(sims)
-
-            if avg_sim < best_avg_sim:
-                best_avg_sim = avg_sim
-                best_idx = idx
-
-        if best_idx is not None:
-            selected.append(best_idx)
-            remaining.remove(best_idx)
+        last = selected[-1]
+        overlap = incidence @ incidence[last]
+        similarity_sum += _jaccard_block(overlap[:, None], sizes, sizes[last:last + 1])[:, 0]
+        similarity_sum[last] = np.inf
+
+        best_idx = int(np.argmin(similarity_sum))
+        best_avg_sim = similarity_sum[best_idx] / len(selected)
+        selected.append(best_idx)
 
     logger.info(
-        f"Selected {len(selected)} most diverse lineups from {len(lineups)} "
+        f"Selected {len(selected)} most diverse lineups from {n} "
         f"(avg similarity: {best_avg_sim:.3f})"
     )
 
@@ -11,7 +11,7 @@ Exposure management is critical for portfolio risk control:
 """
 
 import logging
-from typing import Dict, List
+from typing import Dict, List, Set
 
 from pulp import LpProblem, lpSum, LpVariable
 
@@ -71,64 +71,68 @@ def add_exposure_constraints(
         f"{n_lineups_generated} lineups generated"
     )
 
-    # Driver-level exposure constraints
-    excluded_drivers = []
-    for driver_id, count in exposure_book.items():
-        if driver_id not in x:
-            continue
-
-        current_exposure = count / n_lineups_generated
-
-        if current_exposure >= max_driver_exposure:
-            # Driver at max exposure, force exclusion
-            prob += x[driver_id] == 0, f"Exclude_Overexposed_Driver_{driver_id}"
-            excluded_drivers.append(driver_id)
-            logger.debug(
-                f"Excluding driver {driver_id}: "
-                f"exposure {current_exposure:.1%} >= {max_driver_exposure:.1%}"
-            )
+    # Drivers over their own limit or on an overexposed team
+    excluded = get_overexposed_drivers(
+        exposure_book, n_lineups_generated,
+        max_driver_exposure, max_team_exposure, driver_data
+    )
+
+    excluded_drivers = [driver_id for driver_id in x if driver_id in excluded]
+    for driver_id in excluded_drivers:
+        prob += x[driver_id] == 0, f"Exclude_Overexposed_Driver_{driver_id}"
 
     if excluded_drivers:
         logger.info(f"Excluded {len(excluded_drivers)} overexposed drivers")
 
-    # Team-level exposure constraints (if driver_data provided)
+
+def get_overexposed_drivers(
+    exposure_book: Dict[int, int],
+    n_lineups_generated: int,
+    max_driver_exposure: float = 0.5,
+    max_team_exposure: float = 0.7,
+    driver_data: List[Dict] = None,
+) -> Set[int]:
+    """
+    Get drivers that must be excluded from the next lineup.
+
+    A driver is excluded once its own exposure reaches max_driver_exposure
+    or its team's reaches max_team_exposure. add_exposure_constraints()
+    turns the set into constraints; persistent models enforce it as
+    variable bounds and lift them again as the portfolio grows.
+
+    Args:
+        exposure_book: Dict mapping driver_id -> usage count so far
+        n_lineups_generated: Number of lineups already generated
+        max_driver_exposure: Max fraction of portfolios containing a driver
+        max_team_exposure: Max fraction of portfolios from same team
+        driver_data: Optional list of driver dicts with team key for team exposure
+
+    Returns:
+        Set of excluded driver_ids
+
+    Example:
+        >>> get_overexposed_drivers({0: 5, 1: 3}, n_lineups_generated=10)
+        {0}
+    """
+    if n_lineups_generated == 0:
+        return set()
+
+    excluded = {
+        driver_id for driver_id, count in exposure_book.items()
+        if count / n_lineups_generated >= max_driver_exposure
+    }
+
     if driver_data:
-        # Group drivers by team
         teams = {}
         for driver in driver_data:
-            team = driver["team"]
-            if team not in teams:
-                teams[team] = []
-            teams[team].append(driver["driver_id"])
+            teams.setdefault(driver["team"], []).append(driver["driver_id"])
 
-        # Check team exposure
-        excluded_teams = []
-        for team, team_drivers in teams.items():
+        for team_drivers in teams.values():
             team_usage = sum(exposure_book.get(did, 0) for did in team_drivers)
-            current_exposure = team_usage / n_lineups_generated
-
-            if current_exposure >= max_team_exposure:
-                # Team at max exposure, exclude all drivers
-                excluded_count = 0
-                for driver_id in team_drivers:
-                    if driver_id in x:
-                        prob += (
-                            x[driver_id] == 0,
-                            f"Exclude_Overexposed_Team_{sanitize_team_name(team)}_{driver_id}"
-                        )
-                        excluded_count += 1
-
-                excluded_teams.append((team, current_exposure, excluded_count))
-                logger.debug(
-                    f"Excluded {excluded_count} drivers from team '{team}': "
-                    f"exposure {current_exposure:.1%} >= {max_team_exposure:.1%}"
-                )
+            if team_usage / n_lineups_generated >= max_team_exposure:
+                excluded.update(team_drivers)
 
-        if excluded_teams:
-            logger.info(
-                f"Excluded drivers from {len(excluded_teams)} overexposed teams: "
-                f"{[t[0] for t in excluded_teams]}"
-            )
+    return excluded
 
 
 def update_exposure_book(
@@ -335,18 +339,6 @@ def check_exposure_limits(
     }
 
 
-def sanitize_team_name(team_name: str) -> str:
-    """
-    Sanitize team name for use in PuLP constraint names.
-
-    PuLP constraint names must be valid Python identifiers.
-    """
-    sanitized = "".join(c if c.isalnum() else "_" for c in team_name)
-    while "__" in sanitized:
-        sanitized = sanitized.replace("__", "_")
-    return sanitized
-
-
 if __name__ == "__main__":
     # Example usage and basic tests
     logging.basicConfig(level=logging.INFO)
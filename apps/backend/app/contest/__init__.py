@@ -6,6 +6,7 @@ and simulating contest outcomes for NASCAR DFS optimization.
 
 Key components:
 - FieldLineupSampler: Ownership-based field lineup generation with Dirichlet-multinomial sampling
+- FieldPool / FieldPoolCache: Pre-sampled field lineup pools reused across contest sims
 - ContestSimulator: Monte Carlo contest simulation with payout-aware scoring
 - PayoutCurveFitter: Fits parametric models (power-law, exponential) to historical payout data
 - PowerLawPayoutCurve: Power-law decay model (payout = a * rank^(-b))
@@ -33,6 +34,14 @@ from apps.backend.app.contest.payout_curve import (
 from apps.backend.app.contest.field_sim import (
     FieldLineupSampler,
     dirichlet_multinomial_sample,
+    dirichlet_categorical_indices,
+)
+
+from apps.backend.app.contest.field_pool import (
+    FieldPool,
+    FieldPoolCache,
+    field_pool_key,
+    get_field_pool_cache,
 )
 
 from apps.backend.app.contest.contest_sim import (
@@ -65,6 +74,12 @@ __all__ = [
     # Field simulation (from Plan 04-04)
     "FieldLineupSampler",
     "dirichlet_multinomial_sample",
+    "dirichlet_categorical_indices",
+    # Field pools
+    "FieldPool",
+    "FieldPoolCache",
+    "field_pool_key",
+    "get_field_pool_cache",
     # Contest simulation (from Plan 04-04)
     "ContestSimulator",
     "ContestResult",
@@ -9,6 +9,7 @@ Key features:
 - Monte Carlo simulation across race scenarios
 - Ownership-based field lineup sampling
 - Payout curve integration for contest winnings
+- Multi-entry mode: my lineups share one contest, tie-split payouts
 - Vectorized NumPy operations for efficiency
 - Contest metrics (ROI, cash%, win probability)
 """
@@ -19,7 +20,8 @@ from typing import Dict, List, Optional, Union
 
 import numpy as np
 
-from apps.backend.app.contest.field_sim import FieldLineupSampler
+from apps.backend.app.contest.field_pool import FieldPool
+from apps.backend.app.contest.field_sim import FieldLineupSampler, MAX_CANDIDATE_BATCH
 from apps.backend.app.contest.payout_curve import PayoutCurveFitter
 
 logger = logging.getLogger(__name__)
@@ -114,7 +116,8 @@ class ContestSimulator:
         field_size: int = 1000,
         n_scenarios: int = 1000,
         n_contest_sims: int = 100,
-        default_payout_structure: str = PAYOUT_STANDARD_GPP
+        default_payout_structure: str = PAYOUT_STANDARD_GPP,
+        field_pool: Optional[FieldPool] = None
     ):
         """
         Initialize contest simulator.
@@ -129,6 +132,9 @@ class ContestSimulator:
                 - 'standard_gpp': Top 25% cash, power-law payout decay
                 - 'cash': Top 50% cash, linear payout decay
                 - 'double_up': Top 45% double payout (2x buyin)
+            field_pool: Optional pre-sampled FieldPool for this slate. If set,
+                contest fields are drawn from the pool instead of being
+                sampled from field_sampler on every contest
 
         Raises:
             ValueError: If inputs are invalid
@@ -165,7 +171,14 @@ class ContestSimulator:
                 f"{self.PAYOUT_DOUBLE_UP}"
             )
 
+        if field_pool is not None and field_pool.indices.shape[1] != field_sampler.n_drivers:
+            raise ValueError(
+                f"field_pool lineups have {field_pool.indices.shape[1]} drivers, "
+                f"field_sampler expects {field_sampler.n_drivers}"
+            )
+
         self.field_sampler = field_sampler
+        self.field_pool = field_pool
         self.payout_curve = payout_curve
         self.field_size = field_size
         self.n_scenarios = n_scenarios
@@ -177,7 +190,8 @@ class ContestSimulator:
             f"field_size={field_size}, "
             f"n_scenarios={n_scenarios}, "
             f"n_contest_sims={n_contest_sims}, "
-            f"payout_curve={'fitted' if payout_curve else 'default'}"
+            f"payout_curve={'fitted' if payout_curve else 'default'}, "
+            f"field_pool={field_pool.size if field_pool else 'none'}"
         )
 
     def _apply_default_payout_structure(
@@ -257,13 +271,14 @@ class ContestSimulator:
         """
         # Sample field lineup scores
         # Generate field lineups and compute their scores
-        field_lineups = self.field_sampler.sample_lineups_with_constraints(
+        field_lineups = self._sample_field_indices(
             self.field_size - 1  # Exclude my lineup
         )
 
         field_scores = self.field_sampler.compute_lineup_scores(
             scenario_driver_scores,
-            field_lineups
+            field_lineups,
+            as_indices=True
         )
 
         # Combine my score with field scores
@@ -316,11 +331,108 @@ class ContestSimulator:
 
         return result
 
+    def _default_payout_array(
+        self,
+        ranks: np.ndarray,
+        buyin: float = 20.0
+    ) -> np.ndarray:
+        """
+        Vectorized counterpart of _apply_default_payout_structure.
+
+        Args:
+            ranks: Array of finishing positions (1-indexed)
+            buyin: Contest buy-in amount
+
+        Returns:
+            Array of payouts with the same shape as ranks
+        """
+        ranks = np.asarray(ranks, dtype=float)
+
+        if self.default_payout_structure == self.PAYOUT_STANDARD_GPP:
+            cash_cutoff = int(self.field_size * 0.25)
+            payout = buyin * 1000 * np.power(ranks, -1.5)
+
+        elif self.default_payout_structure == self.PAYOUT_CASH:
+            cash_cutoff = int(self.field_size * 0.50)
+            payout = buyin * (2.0 - (ranks - 1) / max(cash_cutoff, 1) * 0.9)
+
+        elif self.default_payout_structure == self.PAYOUT_DOUBLE_UP:
+            cash_cutoff = int(self.field_size * 0.45)
+            payout = np.full(ranks.shape, buyin * 2.0)
+
+        else:
+            return np.zeros(ranks.shape)
+
+        return np.where(ranks > cash_cutoff, 0.0, payout)
+
+    def _payout_lookup_table(self, buyin: float = 20.0) -> np.ndarray:
+        """
+        Precompute the payout for every finishing position in the contest.
+
+        Index 0 is unused so the table can be indexed directly with
+        1-indexed ranks: ``payouts = table[ranks]``.
+
+        Args:
+            buyin: Contest buy-in amount
+
+        Returns:
+            Array of shape (field_size + 1,) with payout per rank
+        """
+        ranks = np.arange(1, self.field_size + 1)
+        table = np.zeros(self.field_size + 1)
+
+        if self.payout_curve is not None:
+            table[1:] = self.payout_curve.predict(ranks)
+        else:
+            table[1:] = self._default_payout_array(ranks, buyin)
+
+        return table
+
+    def _sample_field_indices(self, n_lineups: int) -> np.ndarray:
+        """
+        Sample field lineups as a driver index matrix.
+
+        Draws rows from the field pool when one is attached; otherwise
+        samples fresh lineups from the field sampler.
+
+        Args:
+            n_lineups: Number of field lineups to sample
+
+        Returns:
+            Array of shape (n_lineups, lineup_size) with indices into the
+            field sampler's driver pool
+        """
+        lineup_size = self.field_sampler.n_drivers
+
+        if n_lineups <= 0:
+            return np.zeros((0, lineup_size), dtype=np.int32)
+
+        if self.field_pool is not None:
+            return self.field_pool.draw(n_lineups)
+
+        field_idx = self.field_sampler.sample_lineups_with_constraints(
+            n_lineups, as_indices=True
+        )
+
+        if len(field_idx) == 0:
+            raise ValueError(
+                "Field sampler produced no valid lineups; "
+                "check salary cap and driver pool"
+            )
+
+        if len(field_idx) < n_lineups:
+            # Sampler came up short: refill by resampling the valid lineups
+            refill = np.random.randint(0, len(field_idx), size=n_lineups - len(field_idx))
+            field_idx = np.concatenate([field_idx, field_idx[refill]])
+
+        return field_idx.astype(np.int32)
+
     def simulate_portfolio(
         self,
         my_lineup_scores: np.ndarray,
         scenario_driver_scores: np.ndarray,
-        buyin: float = 20.0
+        buyin: float = 20.0,
+        self_competition: bool = False
     ) -> Dict[str, np.ndarray]:
         """
         Simulate contest outcomes for a portfolio of lineups.
@@ -328,10 +440,29 @@ class ContestSimulator:
         Runs Monte Carlo simulations across scenarios and contest iterations,
         computing ranks, payouts, cash status, and top-1% status for each lineup.
 
+        For each scenario the fields for all n_contest_sims contests are sampled
+        as a driver index matrix (in batches for very large fields) and scored
+        with a single gather-sum. Every lineup in the portfolio is then ranked against each
+        sorted field at once with np.searchsorted, and payouts are read from a
+        precomputed rank -> payout lookup table.
+
+        By default each lineup is ranked against its own field of
+        field_size - 1 entries (not against the other portfolio lineups),
+        and ties with field lineups resolve in the lineup's favour.
+
+        With self_competition=True (multi-entry GPPs) all my lineups enter
+        the same contest: the field has field_size - n_lineups entries, my
+        lineups can outrank each other, and tied entries split the payouts
+        of the positions they occupy. A lineup's rank is then the best
+        position of its tie group. My lineups' standing among themselves is
+        the same in every contest, so it is computed once; per contest only
+        the field is sorted.
+
         Args:
             my_lineup_scores: Scores for my lineups (n_lineups,)
             scenario_driver_scores: Driver scores for each scenario (n_scenarios, n_drivers)
             buyin: Contest buy-in amount (default 20.0)
+            self_competition: Rank all my lineups in the same contest (default False)
 
         Returns:
             Dict with arrays of results:
@@ -339,6 +470,11 @@ class ContestSimulator:
                 - payouts: (n_lineups, n_scenarios * n_contest_sims)
                 - cashed: (n_lineups, n_scenarios * n_contest_sims)
                 - top_1_pct: (n_lineups, n_scenarios * n_contest_sims)
+                - portfolio_payouts: (n_scenarios * n_contest_sims,) total
+                  payout of all my lineups per contest
+
+        Raises:
+            ValueError: If self_competition is set and my lineups exceed field_size
 
         Example:
             >>> my_scores = np.array([150, 145, 140])
@@ -346,42 +482,84 @@ class ContestSimulator:
             >>> results = simulator.simulate_portfolio(my_scores, driver_scores)
             >>> print(f"Average rank: {results['ranks'].mean()}")
         """
-        n_lineups = len(my_lineup_scores)
+        my_scores = np.asarray(my_lineup_scores, dtype=float)
+        n_lineups = len(my_scores)
         n_sims = self.n_scenarios * self.n_contest_sims
 
+        if self_competition and n_lineups > self.field_size:
+            raise ValueError(
+                f"{n_lineups} lineups do not fit in a contest of field_size={self.field_size}"
+            )
+
+        # Exclude my lineup (or, in one shared contest, all of them)
+        n_field = self.field_size - (n_lineups if self_competition else 1)
+
         logger.info(
             f"Simulating portfolio: {n_lineups} lineups, "
             f"{self.n_scenarios} scenarios x {self.n_contest_sims} contest sims = {n_sims} total"
+            f"{' (shared contest)' if self_competition else ''}"
         )
 
-        # Pre-allocate results arrays
-        ranks = np.zeros((n_lineups, n_sims), dtype=int)
-        payouts = np.zeros((n_lineups, n_sims))
-        cashed = np.zeros((n_lineups, n_sims), dtype=bool)
-        top_1_pct = np.zeros((n_lineups, n_sims), dtype=bool)
-
-        sim_idx = 0
-
-        for scenario_idx in range(self.n_scenarios):
-            driver_scores = scenario_driver_scores[scenario_idx]
+        payout_table = self._payout_lookup_table(buyin)
+        ranks = np.ones((n_lineups, n_sims), dtype=int)
 
-            # Run multiple contest simulations per scenario
-            for contest_sim in range(self.n_contest_sims):
-                for lineup_idx, my_score in enumerate(my_lineup_scores):
-                    result = self.simulate_contest(my_score, driver_scores, buyin)
+        if self_competition:
+            # Positions a+1..b pay cumulative_payouts[b] - cumulative_payouts[a]
+            cumulative_payouts = np.cumsum(payout_table)
+            payouts = np.zeros((n_lineups, n_sims))
 
-                    ranks[lineup_idx, sim_idx] = result.my_rank
-                    payouts[lineup_idx, sim_idx] = result.my_payout
-                    cashed[lineup_idx, sim_idx] = result.cashed
-                    top_1_pct[lineup_idx, sim_idx] = result.top_1_pct
+            # My lineups scoring above / tied with each of mine (incl. itself)
+            sorted_mine = np.sort(my_scores)
+            mine_at_or_below = np.searchsorted(sorted_mine, my_scores, side='right')
+            mine_above = n_lineups - mine_at_or_below
+            mine_tied = mine_at_or_below - np.searchsorted(sorted_mine, my_scores, side='left')
+        sims_per_batch = max(1, MAX_CANDIDATE_BATCH // max(n_field, 1))
 
-                sim_idx += 1
+        for scenario_idx in range(self.n_scenarios):
+            driver_scores = np.asarray(scenario_driver_scores[scenario_idx], dtype=float)
+
+            # One field per contest sim, sampled and scored in batches of
+            # contest sims sized to keep the index matrix bounded
+            for batch_start in range(0, self.n_contest_sims, sims_per_batch):
+                batch_sims = min(sims_per_batch, self.n_contest_sims - batch_start)
+
+                field_idx = self._sample_field_indices(batch_sims * n_field)
+                field_scores = driver_scores[field_idx].sum(axis=1)
+                field_scores = field_scores.reshape(batch_sims, n_field)
+                field_scores.sort(axis=1)
+
+                sim_offset = scenario_idx * self.n_contest_sims + batch_start
+                for contest_sim in range(batch_sims):
+                    sim_idx = sim_offset + contest_sim
+                    # Field lineups at or below my score do not outrank me
+                    n_not_above = np.searchsorted(
+                        field_scores[contest_sim], my_scores, side='right'
+                    )
+
+                    if not self_competition:
+                        ranks[:, sim_idx] = n_field - n_not_above + 1
+                        continue
+
+                    n_below = np.searchsorted(field_scores[contest_sim], my_scores, side='left')
+                    above = mine_above + n_field - n_not_above
+                    tied = mine_tied + n_not_above - n_below
+                    ranks[:, sim_idx] = above + 1
+                    payouts[:, sim_idx] = (
+                        cumulative_payouts[above + tied] - cumulative_payouts[above]
+                    ) / tied
 
             # Log progress every 10% of scenarios
             if (scenario_idx + 1) % max(1, self.n_scenarios // 10) == 0:
                 progress = (scenario_idx + 1) / self.n_scenarios * 100
                 logger.debug(f"Portfolio simulation progress: {progress:.0f}%")
 
+        if not self_competition:
+            payouts = payout_table[ranks]
+
+        # Check if cashed (typically top 25%) and top 1%
+        cashed = ranks <= int(self.field_size * 0.25)
+        top_1_pct = ranks <= int(self.field_size * 0.01)
+
         logger.info(
             f"Completed {n_sims} contest simulations for {n_lineups} lineups"
         )
@@ -390,7 +568,8 @@ class ContestSimulator:
             'ranks': ranks,
             'payouts': payouts,
             'cashed': cashed,
-            'top_1_pct': top_1_pct
+            'top_1_pct': top_1_pct,
+            'portfolio_payouts': payouts.sum(axis=0)
         }
 
     def compute_contest_metrics(
@@ -410,6 +589,7 @@ class ContestSimulator:
                 - payouts: (n_lineups, n_sims)
                 - cashed: (n_lineups, n_sims)
                 - top_1_pct: (n_lineups, n_sims)
+                - portfolio_payouts: (n_sims,), optional (default: payouts summed)
             buyin: Contest buy-in amount (default 20.0)
 
         Returns:
@@ -420,6 +600,10 @@ class ContestSimulator:
                 - win_prob: Probability of top 1% finish (percentage)
                 - ev: Expected value in dollars
                 - avg_rank: Average finish position
+                - portfolio_roi: Expected ROI of all entries together (percentage)
+                - portfolio_roi_std: Standard deviation of portfolio ROI across contests
+                - portfolio_ev: Expected total payout of all entries in dollars
+                - portfolio_cash_pct: Probability that any entry cashes (percentage)
 
         Example:
             >>> results = simulator.simulate_portfolio(my_scores, driver_scores)
@@ -443,6 +627,13 @@ class ContestSimulator:
         roi_std = (payouts.std(axis=1) / buyin * 100)  # ROI std
         ev = avg_payout  # Expected value in $
 
+        # Portfolio level: total winnings of all entries against total buy-ins
+        portfolio_payouts = results.get('portfolio_payouts')
+        if portfolio_payouts is None:
+            portfolio_payouts = payouts.sum(axis=0)
+        portfolio_cost = buyin * payouts.shape[0]
+        portfolio_roi = (portfolio_payouts - portfolio_cost) / portfolio_cost * 100
+
         # Aggregate across lineups (mean)
         metrics = {
             'roi': float(roi.mean()),
@@ -450,7 +641,11 @@ class ContestSimulator:
             'cash_pct': float(cash_rate.mean() * 100),
             'win_prob': float(win_rate.mean() * 100),
             'ev': float(ev.mean()),
-            'avg_rank': float(avg_rank.mean())
+            'avg_rank': float(avg_rank.mean()),
+            'portfolio_roi': float(portfolio_roi.mean()),
+            'portfolio_roi_std': float(portfolio_roi.std()),
+            'portfolio_ev': float(portfolio_payouts.mean()),
+            'portfolio_cash_pct': float(cashed.any(axis=0).mean() * 100)
         }
 
         logger.info(
@@ -0,0 +1,287 @@
+"""
+Reusable field-lineup pools for contest simulation.
+
+Field composition depends only on ownership, the driver pool and the salary
+cap, never on the race scenario being scored. This module pre-samples a large
+pool of valid field lineups once per slate and lets every contest simulation
+draw its field as a random subset of pool rows, so repeated simulations (and
+repeated /contest-sim requests for the same slate) skip field generation.
+
+Key features:
+- Compact index-matrix storage (uint8 for pools under 256 drivers)
+- Content-hash keys over ownership, driver pool, salary cap and seed
+- Process-wide LRU cache of built pools with hit/miss counters; concurrent
+  requests for the same pool wait on a single build
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from apps.backend.app.contest.field_sim import FieldLineupSampler
+
+logger = logging.getLogger(__name__)
+
+# Default number of lineups pre-sampled per pool
+DEFAULT_POOL_SIZE = 100_000
+
+# Default number of pools kept in the process-wide cache
+DEFAULT_MAX_POOLS = 16
+
+
+def field_pool_key(
+    field_sampler: FieldLineupSampler,
+    pool_size: int,
+    seed: int
+) -> str:
+    """
+    Compute the content hash identifying a field pool.
+
+    The key covers everything the sampled field depends on: ownership,
+    driver ids, salaries, salary cap, lineup size, pool size and seed.
+
+    Args:
+        field_sampler: Sampler describing the slate
+        pool_size: Number of lineups in the pool
+        seed: Random seed used to build the pool
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(field_sampler.ownership, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(field_sampler.driver_ids).astype(np.int64).tobytes())
+    digest.update(np.ascontiguousarray(field_sampler.salaries).astype(np.int64).tobytes())
+    digest.update(
+        f"{field_sampler.salary_cap}:{field_sampler.n_drivers}:{pool_size}:{seed}".encode()
+    )
+    return digest.hexdigest()
+
+
+@dataclass
+class FieldPool:
+    """
+    Pre-sampled pool of valid field lineups.
+
+    Attributes:
+        key: Content hash of the slate and sampling parameters
+        indices: Driver pool indices (pool_size, n_drivers), stored in the
+            smallest unsigned dtype that fits the driver pool
+        seed: Random seed the pool was sampled with
+
+    Example:
+        >>> pool = FieldPool.build(field_sampler, pool_size=50000, seed=42)
+        >>> field_idx = pool.draw(9999)
+        >>> field_scores = driver_scores[field_idx].sum(axis=1)
+    """
+    key: str
+    indices: np.ndarray
+    seed: int
+
+    @classmethod
+    def build(
+        cls,
+        field_sampler: FieldLineupSampler,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        seed: int = 42
+    ) -> "FieldPool":
+        """
+        Sample a new pool of field lineups.
+
+        Args:
+            field_sampler: Sampler describing the slate
+            pool_size: Number of lineups to pre-sample
+            seed: Random seed for reproducible pools
+
+        Returns:
+            FieldPool with up to pool_size valid lineups
+
+        Raises:
+            ValueError: If pool_size is not positive or no valid lineup exists
+        """
+        if pool_size <= 0:
+            raise ValueError(f"pool_size must be positive, got {pool_size}")
+
+        indices = field_sampler.sample_lineups_with_constraints(
+            pool_size,
+            as_indices=True,
+            rng=np.random.RandomState(seed)
+        )
+
+        if len(indices) == 0:
+            raise ValueError(
+                "Field sampler produced no valid lineups; "
+                "check salary cap and driver pool"
+            )
+
+        dtype = np.min_scalar_type(field_sampler.n_total_drivers - 1)
+        pool = cls(
+            key=field_pool_key(field_sampler, pool_size, seed),
+            indices=indices.astype(dtype),
+            seed=seed
+        )
+
+        logger.info(
+            f"Built field pool: {pool.size} lineups, "
+            f"{pool.indices.nbytes / 1024:.0f} KB ({pool.indices.dtype})"
+        )
+
+        return pool
+
+    @property
+    def size(self) -> int:
+        """Number of lineups in the pool."""
+        return len(self.indices)
+
+    def draw(
+        self,
+        n_lineups: int,
+        rng: Optional[np.random.RandomState] = None
+    ) -> np.ndarray:
+        """
+        Draw a field of lineups from the pool.
+
+        Rows are drawn with replacement, so duplicated field lineups occur
+        at the rate the pool's ownership implies.
+
+        Args:
+            n_lineups: Number of field lineups to draw
+            rng: Optional RandomState (default: global np.random state)
+
+        Returns:
+            int32 array (n_lineups, n_drivers) of driver pool indices
+        """
+        rng = np.random if rng is None else rng
+        rows = rng.randint(0, self.size, size=n_lineups)
+        return self.indices[rows].astype(np.int32)
+
+
+class FieldPoolCache:
+    """
+    LRU cache of field pools keyed by content hash.
+
+    Pools are small (100k lineups of 6 uint8 indices is ~600 KB), so the
+    cache is bounded by entry count. Safe to share across request handlers.
+
+    Example:
+        >>> cache = FieldPoolCache()
+        >>> pool = cache.get_pool(field_sampler, pool_size=100000, seed=42)
+        >>> # Same slate and seed: no re-sampling
+        >>> assert cache.get_pool(field_sampler, pool_size=100000, seed=42) is pool
+    """
+
+    def __init__(self, max_pools: int = DEFAULT_MAX_POOLS):
+        """
+        Initialize empty field pool cache.
+
+        Args:
+            max_pools: Maximum number of pools kept before evicting the
+                least recently used one
+        """
+        if max_pools <= 0:
+            raise ValueError(f"max_pools must be positive, got {max_pools}")
+
+        self.max_pools = max_pools
+        self._pools: "OrderedDict[str, FieldPool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_pool(
+        self,
+        field_sampler: FieldLineupSampler,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        seed: int = 42
+    ) -> FieldPool:
+        """
+        Get a pool from cache or build it with the field sampler.
+
+        Args:
+            field_sampler: Sampler describing the slate
+            pool_size: Number of lineups in the pool
+            seed: Random seed for the pool
+
+        Returns:
+            FieldPool for this slate
+        """
+        key = field_pool_key(field_sampler, pool_size, seed)
+
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is not None:
+                self._pools.move_to_end(key)
+                self.hits += 1
+                logger.info(f"Field pool cache HIT for {key[:12]}")
+                return pool
+
+            # Only the first caller for a key samples; the others wait on it
+            in_flight = self._in_flight.get(key)
+            building = in_flight is None
+            if building:
+                in_flight = self._in_flight[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not building:
+            logger.info(f"Waiting for in-flight field pool {key[:12]}")
+            return in_flight.result()
+
+        logger.info(f"Field pool cache MISS for {key[:12]}, sampling {pool_size} lineups")
+        try:
+            pool = FieldPool.build(field_sampler, pool_size=pool_size, seed=seed)
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            in_flight.set_exception(e)
+            raise
+
+        with self._lock:
+            self._pools[key] = pool
+            self._pools.move_to_end(key)
+            while len(self._pools) > self.max_pools:
+                evicted_key, _ = self._pools.popitem(last=False)
+                logger.debug(f"Evicted field pool {evicted_key[:12]}")
+            del self._in_flight[key]
+        in_flight.set_result(pool)
+
+        return pool
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._pools),
+                'bytes': sum(pool.indices.nbytes for pool in self._pools.values()),
+            }
+
+    def clear(self):
+        """Clear all cached pools and reset counters."""
+        with self._lock:
+            self._pools.clear()
+            self.hits = 0
+            self.misses = 0
+        logger.debug("FieldPoolCache cleared")
+
+    def size(self) -> int:
+        """Return number of cached pools."""
+        with self._lock:
+            return len(self._pools)
+
+
+# Process-wide cache shared by contest simulation endpoints
+_field_pool_cache = FieldPoolCache()
+
+
+def get_field_pool_cache() -> FieldPoolCache:
+    """Return the process-wide field pool cache."""
+    return _field_pool_cache
@@ -10,15 +10,99 @@ Key features:
 - Salary cap constraint enforcement
 - Vectorized NumPy operations for efficiency
 - Lineup score calculation from driver scores
+- Array-native index mode: lineups as (n_lineups, n_drivers) int32 index
+  matrices with whole-array salary and duplicate-driver rejection
 """
 
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on candidate lineups drawn per rejection-sampling batch, keeps
+# the (batch, n_drivers) index matrix and its salary gather to tens of MB
+MAX_CANDIDATE_BATCH = 1_000_000
+
+
+def dirichlet_categorical_indices(
+    ownership: np.ndarray,
+    n_samples: int,
+    n_draws: int,
+    alpha: float = 1.0,
+    replace: bool = True,
+    rng: Optional[np.random.RandomState] = None
+) -> np.ndarray:
+    """
+    Draw driver indices from per-sample Dirichlet-perturbed ownership.
+
+    Index-matrix counterpart of dirichlet_multinomial_sample: instead of
+    per-driver counts, returns the n_draws categorical draws of each sample
+    directly, sorted ascending within each row. All samples are drawn in one
+    vectorized pass: inverse-CDF sampling with replacement, or an exponential
+    race (successive sampling proportional to the perturbed ownership) without.
+
+    Args:
+        ownership: Array of ownership percentages (sums to 100)
+        n_samples: Number of samples to generate
+        n_draws: Number of draws per sample (e.g., 6 drivers per lineup)
+        alpha: Concentration parameter (lower = more variance, higher = less variance)
+        replace: If True (default), draws are with replacement and rows may
+            repeat an index. If False, each row holds n_draws distinct indices.
+        rng: Optional RandomState for reproducible draws (default: global
+            np.random state)
+
+    Returns:
+        int32 array of shape (n_samples, n_draws) with driver indices
+
+    Example:
+        >>> ownership = np.array([20, 15, 12, 10, 8, 7, 6, 5, 5, 4, 4, 4])
+        >>> idx = dirichlet_categorical_indices(ownership, n_samples=100, n_draws=6)
+        >>> print(idx.shape)
+        (100, 6)
+    """
+    rng = np.random if rng is None else rng
+
+    ownership = np.asarray(ownership, dtype=float)
+    ownership_prob = ownership / ownership.sum()
+    n_drivers = len(ownership)
+
+    # Gamma noise per sample renormalized to probabilities (Dirichlet draw)
+    noise = rng.gamma(
+        shape=ownership_prob * alpha,
+        scale=1.0,
+        size=(n_samples, n_drivers)
+    )
+    noisy_probs = noise / noise.sum(axis=1, keepdims=True)
+
+    if not replace:
+        # Exponential race (equivalent to Gumbel-top-k): the n_draws largest
+        # p / Exp(1) keys are a draw of distinct categories without replacement
+        keys = noisy_probs / rng.standard_exponential(size=noisy_probs.shape)
+        indices = np.argpartition(-keys, n_draws - 1, axis=1)[:, :n_draws]
+        indices = indices.astype(np.int32)
+        indices.sort(axis=1)
+        return indices
+
+    # Inverse-CDF sampling for all rows at once: offsetting each row's CDF
+    # by its row number turns the per-row searches into one searchsorted
+    # over a single monotone array
+    cdf = np.cumsum(noisy_probs, axis=1)
+    cdf[:, -1] = 1.0
+    row_offset = np.arange(n_samples, dtype=float)[:, None]
+    flat_cdf = (cdf + row_offset).ravel()
+    u = rng.random_sample((n_samples, n_draws)) + row_offset
+
+    flat_idx = np.searchsorted(flat_cdf, u.ravel(), side='right')
+    indices = flat_idx.reshape(n_samples, n_draws) - row_offset.astype(np.int64) * n_drivers
+    np.clip(indices, 0, n_drivers - 1, out=indices)
+
+    indices = indices.astype(np.int32)
+    indices.sort(axis=1)
+
+    return indices
+
 
 def dirichlet_multinomial_sample(
     ownership: np.ndarray,
@@ -51,35 +135,14 @@ def dirichlet_multinomial_sample(
         >>> print(samples.sum(axis=1))  # Each sample sums to 6
         array([6, 6, 6, ..., 6, 6, 6])
     """
-    # Normalize ownership to probabilities
-    ownership_prob = ownership / ownership.sum()
-
     n_drivers = len(ownership)
 
-    # Draw concentration parameters for each sample
-    # This introduces uncertainty in ownership proportions
-    alphas = ownership_prob * alpha
-
-    # For computational efficiency, we approximate Dirichlet-multinomial
-    # by adding small noise to ownership and sampling from multinomial
-    # This is much faster than full Dirichlet-multinomial sampling
-
-    # Add small noise to ownership for each sample
-    # Shape: (n_samples, n_drivers)
-    noise = np.random.gamma(
-        shape=alphas,
-        scale=1.0,
-        size=(n_samples, n_drivers)
-    )
-
-    # Renormalize to probabilities
-    noisy_probs = noise / noise.sum(axis=1, keepdims=True)
-
-    # Sample from multinomial for each set of probabilities
-    samples = np.array([
-        np.random.multinomial(n_draws, probs)
-        for probs in noisy_probs
-    ])
+    # Multinomial counts are the histogram of the categorical draws
+    indices = dirichlet_categorical_indices(ownership, n_samples, n_draws, alpha)
+    flat = indices + (np.arange(n_samples) * n_drivers)[:, None]
+    samples = np.bincount(
+        flat.ravel(), minlength=n_samples * n_drivers
+    ).reshape(n_samples, n_drivers)
 
     return samples
 
@@ -171,6 +234,10 @@ class FieldLineupSampler:
             for d in driver_pool
         ])
 
+        # Sorted view of driver_ids for vectorized driver_id -> index lookup
+        self._id_order = np.argsort(self.driver_ids, kind='stable')
+        self._sorted_ids = self.driver_ids[self._id_order]
+
         self.salary_cap = salary_cap
         self.n_drivers = n_drivers
         self.n_total_drivers = len(driver_pool)
@@ -182,7 +249,48 @@ class FieldLineupSampler:
             f"n_drivers={n_drivers}"
         )
 
-    def sample_lineups(self, n_lineups: int) -> List[List[int]]:
+    def lineups_to_indices(self, lineups: List[List[int]]) -> np.ndarray:
+        """
+        Convert driver_id lineups to a driver index matrix.
+
+        Args:
+            lineups: List of driver_id lists, each of length n_drivers
+
+        Returns:
+            int32 array of shape (n_lineups, n_drivers) with indices into the
+            driver pool
+
+        Raises:
+            ValueError: If a lineup references a driver_id not in the pool
+        """
+        ids = np.asarray(lineups)
+        if ids.size == 0:
+            return np.zeros((0, self.n_drivers), dtype=np.int32)
+
+        pos = np.searchsorted(self._sorted_ids, ids)
+        pos = np.clip(pos, 0, self.n_total_drivers - 1)
+        if not np.all(self._sorted_ids[pos] == ids):
+            raise ValueError("Lineups contain driver_ids not in the driver pool")
+
+        return self._id_order[pos].astype(np.int32)
+
+    def indices_to_lineups(self, indices: np.ndarray) -> List[List[int]]:
+        """
+        Convert a driver index matrix back to driver_id lists.
+
+        Args:
+            indices: Array of shape (n_lineups, n_drivers) with pool indices
+
+        Returns:
+            List of driver_id lists
+        """
+        return self.driver_ids[np.asarray(indices)].tolist()
+
+    def sample_lineups(
+        self,
+        n_lineups: int,
+        as_indices: bool = False
+    ) -> Union[List[List[int]], np.ndarray]:
         """
         Sample driver compositions using Dirichlet-multinomial distribution.
 
@@ -190,14 +298,18 @@ class FieldLineupSampler:
         Each lineup has exactly n_drivers slots, with drivers sampled according
         to their ownership probabilities.
 
-        Note: This method does NOT enforce salary cap constraints.
-        Use sample_lineups_with_constraints() for salary-aware sampling.
+        Note: This method does NOT enforce salary cap constraints, and a driver
+        may fill more than one slot. Use sample_lineups_with_constraints() for
+        valid lineups.
 
         Args:
             n_lineups: Number of lineups to sample
+            as_indices: If True, return an (n_lineups, n_drivers) int32 array
+                of driver pool indices instead of driver_id lists
 
         Returns:
-            List of driver_id lists (each inner list has n_drivers driver_ids)
+            List of driver_id lists (each inner list has n_drivers driver_ids),
+            or an index matrix if as_indices is True
 
         Example:
             >>> sampler = FieldLineupSampler(ownership, driver_pool)
@@ -212,49 +324,19 @@ class FieldLineupSampler:
 
         logger.debug(f"Sampling {n_lineups} lineups from ownership")
 
-        # Sample driver compositions using Dirichlet-multinomial
-        compositions = dirichlet_multinomial_sample(
+        indices = dirichlet_categorical_indices(
             self.ownership,
             n_samples=n_lineups,
             n_draws=self.n_drivers,
             alpha=1.0  # Moderate uncertainty in ownership
         )
 
-        # Convert compositions to driver_id lists
-        lineups = []
-        for composition in compositions:
-            # Find drivers with positive counts
-            driver_indices = np.where(composition > 0)[0]
-
-            # For each driver with count > 0, add them to lineup that many times
-            lineup = []
-            for idx in driver_indices:
-                count = int(composition[idx])
-                lineup.extend([self.driver_ids[idx]] * count)
-
-            # Ensure exactly n_drivers drivers
-            # (multinomial should guarantee this, but validate)
-            if len(lineup) != self.n_drivers:
-                logger.warning(
-                    f"Lineup has {len(lineup)} drivers, expected {self.n_drivers}. "
-                    f"Composition: {composition}"
-                )
-                # Pad or truncate to n_drivers
-                if len(lineup) < self.n_drivers:
-                    # Add lowest-owned drivers to fill
-                    remaining = self.n_drivers - len(lineup)
-                    sorted_indices = np.argsort(self.ownership)
-                    for idx in sorted_indices[:remaining]:
-                        lineup.append(self.driver_ids[idx])
-                else:
-                    # Truncate to n_drivers
-                    lineup = lineup[:self.n_drivers]
-
-            lineups.append(lineup)
+        logger.debug(f"Sampled {len(indices)} lineups")
 
-        logger.debug(f"Sampled {len(lineups)} lineups")
+        if as_indices:
+            return indices
 
-        return lineups
+        return self.indices_to_lineups(indices)
 
     def _check_salary_constraint(self, lineup: List[int]) -> bool:
         """
@@ -274,24 +356,55 @@ class FieldLineupSampler:
 
         return total_salary <= self.salary_cap
 
+    def valid_lineup_mask(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Check salary cap and unique drivers for a whole index matrix.
+
+        Args:
+            indices: Array of shape (n_lineups, n_drivers) with pool indices
+
+        Returns:
+            Boolean array (n_lineups,), True where the lineup is under the
+            salary cap and uses n_drivers distinct drivers
+        """
+        indices = np.asarray(indices)
+
+        total_salaries = self.salaries[indices].sum(axis=1)
+        under_cap = total_salaries <= self.salary_cap
+
+        sorted_indices = np.sort(indices, axis=1)
+        has_duplicate = (sorted_indices[:, 1:] == sorted_indices[:, :-1]).any(axis=1)
+
+        return under_cap & ~has_duplicate
+
     def sample_lineups_with_constraints(
         self,
         n_lineups: int,
-        max_attempts: int = 100
-    ) -> List[List[int]]:
+        max_attempts: int = 100,
+        as_indices: bool = False,
+        rng: Optional[np.random.RandomState] = None
+    ) -> Union[List[List[int]], np.ndarray]:
         """
         Sample lineups that satisfy salary cap constraint.
 
-        This method generates ownership-based lineups and filters to those
-        that satisfy the salary cap constraint. If insufficient valid lineups
-        are found, it resamples up to max_attempts.
+        This method generates ownership-based lineups of n_drivers distinct
+        drivers and filters to those that satisfy the salary cap constraint.
+        Candidates are drawn and rejected in batches as index matrices; if
+        insufficient valid lineups are found, it resamples up to max_attempts,
+        sizing each batch from the observed acceptance rate.
 
         Args:
             n_lineups: Number of valid lineups to generate
             max_attempts: Maximum resampling attempts (default 100)
+            as_indices: If True, return an (n_lineups, n_drivers) int32 array
+                of driver pool indices instead of driver_id lists
+            rng: Optional RandomState for reproducible sampling (default:
+                global np.random state)
 
         Returns:
-            List of valid driver_id lists
+            List of valid driver_id lists, or an index matrix if as_indices
+            is True. May hold fewer than n_lineups rows if max_attempts is
+            exhausted.
 
         Example:
             >>> sampler = FieldLineupSampler(ownership, driver_pool, salary_cap=50000)
@@ -309,39 +422,47 @@ class FieldLineupSampler:
             f"(cap=${self.salary_cap})"
         )
 
-        valid_lineups = []
+        valid_batches = []
+        n_valid = 0
         total_sampled = 0
         attempts = 0
 
-        # Oversample to account for salary constraint filtering
-        # Oversampling factor depends on how restrictive the cap is
-        oversample_factor = 3
-
-        while len(valid_lineups) < n_lineups and attempts < max_attempts:
-            # Sample candidate lineups
-            n_to_sample = (n_lineups - len(valid_lineups)) * oversample_factor
-
-            candidate_lineups = self.sample_lineups(n_to_sample)
-            total_sampled += len(candidate_lineups)
-
-            # Filter to valid lineups
-            for lineup in candidate_lineups:
-                if self._check_salary_constraint(lineup):
-                    valid_lineups.append(lineup)
-
-                if len(valid_lineups) >= n_lineups:
-                    break
+        # Oversample to account for salary constraint filtering; refined from
+        # the observed acceptance rate after the first batch
+        oversample_factor = 3.0
+
+        while n_valid < n_lineups and attempts < max_attempts:
+            n_to_sample = int(np.ceil((n_lineups - n_valid) * oversample_factor))
+            n_to_sample = min(max(n_to_sample, 1), MAX_CANDIDATE_BATCH)
+
+            # Draw distinct drivers per lineup; with-replacement draws from the
+            # sparse per-lineup Dirichlet would almost always repeat a driver
+            candidates = dirichlet_categorical_indices(
+                self.ownership,
+                n_samples=n_to_sample,
+                n_draws=self.n_drivers,
+                alpha=1.0,
+                replace=False,
+                rng=rng
+            )
+            total_sampled += n_to_sample
 
+            valid = candidates[self.valid_lineup_mask(candidates)]
+            valid_batches.append(valid)
+            n_valid += len(valid)
             attempts += 1
 
+            acceptance_rate = n_valid / total_sampled
+            oversample_factor = 1.2 / max(acceptance_rate, 1e-3)
+
             logger.debug(
-                f"Attempt {attempts}: {len(valid_lineups)}/{n_lineups} valid lineups"
+                f"Attempt {attempts}: {n_valid}/{n_lineups} valid lineups"
             )
 
         # Truncate to n_lineups if we got more
-        valid_lineups = valid_lineups[:n_lineups]
+        valid_lineups = np.concatenate(valid_batches)[:n_lineups]
 
-        success_rate = len(valid_lineups) / total_sampled if total_sampled > 0 else 0
+        success_rate = n_valid / total_sampled if total_sampled > 0 else 0
 
         logger.info(
             f"Generated {len(valid_lineups)}/{n_lineups} valid lineups "
@@ -356,12 +477,16 @@ class FieldLineupSampler:
                 f"Consider relaxing salary cap or checking driver pool."
             )
 
-        return valid_lineups
+        if as_indices:
+            return valid_lineups
+
+        return self.indices_to_lineups(valid_lineups)
 
     def compute_lineup_scores(
         self,
         driver_scores: np.ndarray,
-        lineups: Optional[List[List[int]]] = None
+        lineups: Optional[Union[List[List[int]], np.ndarray]] = None,
+        as_indices: bool = False
     ) -> np.ndarray:
         """
         Sum driver scores for each lineup.
@@ -369,8 +494,11 @@ class FieldLineupSampler:
         Args:
             driver_scores: Array of driver scores for this scenario (n_drivers,)
                 Must align with ownership array (same driver order)
-            lineups: List of driver_id lists (optional). If None, uses last
-                sampled lineups or generates new ones.
+            lineups: Lineups as driver_id lists (optional). If None,
+                generates new lineups.
+            as_indices: lineups is an (n_lineups, n_drivers) array of pool
+                indices, as returned by sample_lineups_with_constraints with
+                as_indices=True, rather than driver_ids
 
         Returns:
             Array of lineup scores (n_lineups,)
@@ -396,21 +524,18 @@ class FieldLineupSampler:
         if lineups is None:
             # Generate lineups if not provided
             logger.warning("No lineups provided, generating new lineups")
-            lineups = self.sample_lineups_with_constraints(100)
-
-        logger.debug(f"Computing scores for {len(lineups)} lineups")
-
-        # Compute score for each lineup
-        lineup_scores = np.zeros(len(lineups))
+            lineups = self.sample_lineups_with_constraints(100, as_indices=True)
+            as_indices = True
 
-        for i, lineup in enumerate(lineups):
-            # Find indices for driver_ids in this lineup
-            lineup_indices = np.where(np.isin(self.driver_ids, lineup))[0]
+        if as_indices:
+            indices = np.asarray(lineups)
+        else:
+            indices = self.lineups_to_indices(lineups)
 
-            # Sum driver scores
-            lineup_scores[i] = driver_scores_array[lineup_indices].sum()
+        logger.debug(f"Computing scores for {len(indices)} lineups")
 
-        return lineup_scores
+        # Single gather-sum over the index matrix
+        return driver_scores_array[indices].sum(axis=1)
 
     def compute_lineup_salary(self, lineup: List[int]) -> int:
         """
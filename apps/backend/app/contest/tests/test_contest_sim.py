@@ -0,0 +1,208 @@
+"""
+Unit tests for the batched ContestSimulator.simulate_portfolio engine.
+"""
+import numpy as np
+import pytest
+
+from apps.backend.app.contest.contest_sim import ContestSimulator
+from apps.backend.app.contest.field_sim import FieldLineupSampler
+
+
+@pytest.fixture
+def field_sampler() -> FieldLineupSampler:
+    """Field sampler over 12 drivers with a cap that admits most lineups."""
+    ownership = np.array([20, 15, 12, 10, 8, 7, 6, 5, 5, 4, 4, 4])
+    driver_pool = [
+        {'driver_id': i + 1, 'salary': 7000 + i * 300, 'projected_points': 45 - i * 2}
+        for i in range(12)
+    ]
+    return FieldLineupSampler(ownership, driver_pool, salary_cap=50000, n_drivers=6)
+
+
+@pytest.fixture
+def simulator(field_sampler) -> ContestSimulator:
+    return ContestSimulator(
+        field_sampler=field_sampler,
+        field_size=200,
+        n_scenarios=4,
+        n_contest_sims=3,
+    )
+
+
+class TestSimulatePortfolio:
+    """Tests for the vectorized portfolio simulation."""
+
+    def test_result_shapes(self, simulator):
+        np.random.seed(0)
+        my_scores = np.array([150.0, 140.0, 130.0])
+        scenarios = np.random.gamma(20, 2, size=(4, 12))
+
+        results = simulator.simulate_portfolio(my_scores, scenarios)
+
+        for key in ('ranks', 'payouts', 'cashed', 'top_1_pct'):
+            assert results[key].shape == (3, 12)
+        assert results['cashed'].dtype == bool
+        assert results['top_1_pct'].dtype == bool
+
+    def test_ranks_within_field(self, simulator):
+        np.random.seed(1)
+        scenarios = np.random.gamma(20, 2, size=(4, 12))
+
+        results = simulator.simulate_portfolio(np.array([100.0, 250.0, 400.0]), scenarios)
+
+        assert results['ranks'].min() >= 1
+        assert results['ranks'].max() <= simulator.field_size
+        # A score no field lineup can reach always wins
+        assert np.all(results['ranks'][2] == 1)
+
+    def test_higher_score_never_ranks_worse(self, simulator):
+        np.random.seed(2)
+        scenarios = np.random.gamma(20, 2, size=(4, 12))
+
+        results = simulator.simulate_portfolio(np.array([260.0, 220.0]), scenarios)
+
+        assert np.all(results['ranks'][0] <= results['ranks'][1])
+
+    def test_ranks_match_argsort_reference(self, simulator, monkeypatch):
+        """Ranks from searchsorted agree with a full sort of the combined field."""
+        rng = np.random.default_rng(3)
+        n_field = simulator.field_size - 1
+        fixed_field = np.array([
+            rng.choice(12, size=6, replace=False)
+            for _ in range(simulator.n_contest_sims * n_field)
+        ], dtype=np.int32)
+        monkeypatch.setattr(simulator, '_sample_field_indices', lambda n: fixed_field[:n])
+
+        scenarios = rng.gamma(20, 2, size=(4, 12))
+        my_scores = np.array([245.5, 238.25, 231.75])
+
+        results = simulator.simulate_portfolio(my_scores, scenarios)
+
+        for scenario_idx in range(simulator.n_scenarios):
+            field_scores = scenarios[scenario_idx][fixed_field].sum(axis=1)
+            field_scores = field_scores.reshape(simulator.n_contest_sims, n_field)
+            for contest_sim in range(simulator.n_contest_sims):
+                sim_idx = scenario_idx * simulator.n_contest_sims + contest_sim
+                for lineup_idx, my_score in enumerate(my_scores):
+                    all_scores = np.concatenate([[my_score], field_scores[contest_sim]])
+                    expected_rank = np.where(np.argsort(-all_scores) == 0)[0][0] + 1
+                    assert results['ranks'][lineup_idx, sim_idx] == expected_rank
+
+    def test_payouts_match_scalar_structure(self, simulator):
+        np.random.seed(4)
+        scenarios = np.random.gamma(20, 2, size=(4, 12))
+
+        results = simulator.simulate_portfolio(np.array([200.0, 180.0]), scenarios, buyin=10.0)
+
+        expected = np.vectorize(
+            lambda rank: simulator._apply_default_payout_structure(int(rank), 10.0)
+        )(results['ranks'])
+        np.testing.assert_allclose(results['payouts'], expected)
+
+
+class TestSelfCompetition:
+    """Tests for multi-entry simulation with all my lineups in one contest."""
+
+    def test_ranks_and_tie_split_payouts_match_reference(self, simulator, monkeypatch):
+        """Ranks and payouts agree with sorting the combined contest entry by entry."""
+        rng = np.random.default_rng(5)
+        my_scores = np.array([60.0, 60.0, 55.0, 48.0])
+        n_field = simulator.field_size - len(my_scores)
+        fixed_field = np.array([
+            rng.choice(12, size=6, replace=False)
+            for _ in range(simulator.n_contest_sims * n_field)
+        ], dtype=np.int32)
+        monkeypatch.setattr(simulator, '_sample_field_indices', lambda n: fixed_field[:n])
+
+        # Integer driver scores so field lineups tie with mine
+        scenarios = rng.integers(5, 15, size=(4, 12)).astype(float)
+
+        results = simulator.simulate_portfolio(my_scores, scenarios, self_competition=True)
+
+        table = simulator._payout_lookup_table(20.0)
+        for scenario_idx in range(simulator.n_scenarios):
+            field_scores = scenarios[scenario_idx][fixed_field].sum(axis=1)
+            field_scores = field_scores.reshape(simulator.n_contest_sims, n_field)
+            for contest_sim in range(simulator.n_contest_sims):
+                sim_idx = scenario_idx * simulator.n_contest_sims + contest_sim
+                contest = np.concatenate([my_scores, field_scores[contest_sim]])
+                assert len(contest) == simulator.field_size
+                for lineup_idx, my_score in enumerate(my_scores):
+                    above = int((contest > my_score).sum())
+                    tied = int((contest == my_score).sum())
+                    assert results['ranks'][lineup_idx, sim_idx] == above + 1
+                    np.testing.assert_allclose(
+                        results['payouts'][lineup_idx, sim_idx],
+                        table[above + 1:above + tied + 1].mean(),
+                    )
+
+        np.testing.assert_allclose(results['portfolio_payouts'], results['payouts'].sum(axis=0))
+
+    def test_tied_winners_split_top_payouts(self, simulator):
+        np.random.seed(6)
+        scenarios = np.random.gamma(20, 2, size=(4, 12))
+
+        results = simulator.simulate_portfolio(
+            np.array([900.0, 900.0]), scenarios, self_competition=True
+        )
+
+        table = simulator._payout_lookup_table(20.0)
+        assert np.all(results['ranks'] == 1)
+        np.testing.assert_allclose(results['payouts'], (table[1] + table[2]) / 2)
+
+    def test_own_lineups_push_each_other_down(self, simulator):
+        np.random.seed(7)
+        scenarios = np.random.gamma(20, 2, size=(4, 12))
+        my_scores = np.array([900.0, 850.0, 800.0])
+
+        independent = simulator.simulate_portfolio(my_scores, scenarios)
+        shared = simulator.simulate_portfolio(my_scores, scenarios, self_competition=True)
+
+        assert np.all(independent['ranks'] == 1)
+        np.testing.assert_array_equal(shared['ranks'], np.array([[1], [2], [3]]) * np.ones((1, 12)))
+        assert shared['portfolio_payouts'].mean() < independent['portfolio_payouts'].mean()
+
+    def test_portfolio_metrics(self, simulator):
+        np.random.seed(8)
+        scenarios = np.random.gamma(20, 2, size=(4, 12))
+
+        results = simulator.simulate_portfolio(
+            np.array([260.0, 240.0, 220.0]), scenarios, buyin=10.0, self_competition=True
+        )
+        metrics = simulator.compute_contest_metrics(results, buyin=10.0)
+
+        total = results['payouts'].sum(axis=0)
+        assert metrics['portfolio_ev'] == pytest.approx(total.mean())
+        assert metrics['portfolio_roi'] == pytest.approx((total.mean() - 30.0) / 30.0 * 100)
+        # Equal buy-ins: portfolio ROI is the mean of the per-lineup ROIs
+        assert metrics['portfolio_roi'] == pytest.approx(metrics['roi'])
+        assert metrics['portfolio_cash_pct'] == pytest.approx(
+            results['cashed'].any(axis=0).mean() * 100
+        )
+
+    def test_rejects_more_lineups_than_entries(self, field_sampler):
+        simulator = ContestSimulator(
+            field_sampler=field_sampler, field_size=2, n_scenarios=1, n_contest_sims=1
+        )
+
+        with pytest.raises(ValueError, match='field_size'):
+            simulator.simulate_portfolio(
+                np.array([1.0, 2.0, 3.0]), np.ones((1, 12)), self_competition=True
+            )
+
+
+@pytest.mark.parametrize('structure', ['standard_gpp', 'cash', 'double_up'])
+def test_payout_lookup_table_matches_default_structure(field_sampler, structure):
+    simulator = ContestSimulator(
+        field_sampler=field_sampler,
+        field_size=500,
+        n_scenarios=1,
+        n_contest_sims=1,
+        default_payout_structure=structure,
+    )
+
+    table = simulator._payout_lookup_table(buyin=20.0)
+
+    assert table.shape == (501,)
+    expected = [simulator._apply_default_payout_structure(rank, 20.0) for rank in range(1, 501)]
+    np.testing.assert_allclose(table[1:], expected)
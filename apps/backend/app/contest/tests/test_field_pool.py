@@ -0,0 +1,144 @@
+"""
+Unit tests for pre-sampled field lineup pools.
+"""
+import threading
+import time
+
+import numpy as np
+
+from apps.backend.app.contest.contest_sim import ContestSimulator
+from apps.backend.app.contest.field_pool import FieldPool, FieldPoolCache, field_pool_key
+from apps.backend.app.contest.field_sim import FieldLineupSampler
+
+
+def make_sampler(salary_cap: int = 50000) -> FieldLineupSampler:
+    ownership = np.array([20, 15, 12, 10, 8, 7, 6, 5, 5, 4, 4, 4])
+    driver_pool = [
+        {'driver_id': i + 1, 'salary': 7000 + i * 300}
+        for i in range(12)
+    ]
+    return FieldLineupSampler(ownership, driver_pool, salary_cap=salary_cap, n_drivers=6)
+
+
+class TestFieldPool:
+    """Tests for FieldPool construction and draws."""
+
+    def test_build_is_compact_and_valid(self):
+        sampler = make_sampler()
+
+        pool = FieldPool.build(sampler, pool_size=5000, seed=7)
+
+        assert pool.size == 5000
+        assert pool.indices.dtype == np.uint8
+        assert sampler.valid_lineup_mask(pool.indices.astype(np.int32)).all()
+
+    def test_build_is_reproducible(self):
+        sampler = make_sampler()
+
+        first = FieldPool.build(sampler, pool_size=1000, seed=7)
+        second = FieldPool.build(sampler, pool_size=1000, seed=7)
+
+        np.testing.assert_array_equal(first.indices, second.indices)
+        assert first.key == second.key
+
+    def test_draw_returns_pool_rows(self):
+        pool = FieldPool.build(make_sampler(), pool_size=1000, seed=7)
+
+        field = pool.draw(250, rng=np.random.RandomState(0))
+
+        assert field.shape == (250, 6)
+        assert field.dtype == np.int32
+        pool_rows = {tuple(row) for row in pool.indices.tolist()}
+        assert all(tuple(row) in pool_rows for row in field.tolist())
+
+
+class TestFieldPoolKey:
+    """Tests for the content-hash key."""
+
+    def test_key_depends_on_slate_and_seed(self):
+        sampler = make_sampler()
+        key = field_pool_key(sampler, 1000, 7)
+
+        assert key == field_pool_key(make_sampler(), 1000, 7)
+        assert key != field_pool_key(sampler, 1000, 8)
+        assert key != field_pool_key(sampler, 2000, 7)
+        assert key != field_pool_key(make_sampler(salary_cap=48000), 1000, 7)
+
+
+class TestFieldPoolCache:
+    """Tests for the LRU pool cache."""
+
+    def test_repeat_request_hits_cache(self):
+        cache = FieldPoolCache()
+
+        first = cache.get_pool(make_sampler(), pool_size=1000, seed=1)
+        second = cache.get_pool(make_sampler(), pool_size=1000, seed=1)
+
+        assert second is first
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_lru_eviction(self):
+        cache = FieldPoolCache(max_pools=2)
+        sampler = make_sampler()
+
+        cache.get_pool(sampler, pool_size=500, seed=1)
+        cache.get_pool(sampler, pool_size=500, seed=2)
+        cache.get_pool(sampler, pool_size=500, seed=1)  # refresh seed=1
+        cache.get_pool(sampler, pool_size=500, seed=3)  # evicts seed=2
+
+        assert cache.size() == 2
+        cache.get_pool(sampler, pool_size=500, seed=1)
+        assert cache.stats()['hits'] == 2
+
+    def test_concurrent_requests_build_once(self, monkeypatch):
+        cache = FieldPoolCache()
+        builds = []
+        build = FieldPool.build
+
+        def slow_build(*args, **kwargs):
+            builds.append(1)
+            time.sleep(0.05)
+            return build(*args, **kwargs)
+
+        monkeypatch.setattr(FieldPool, 'build', slow_build)
+
+        pools = []
+        threads = [
+            threading.Thread(target=lambda: pools.append(cache.get_pool(make_sampler(), 500, 1)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(builds) == 1
+        assert all(pool is pools[0] for pool in pools)
+        assert cache.stats()['misses'] == 1
+        assert cache.stats()['hits'] == 3
+
+
+def test_simulator_draws_field_from_pool(monkeypatch):
+    sampler = make_sampler()
+    pool = FieldPool.build(sampler, pool_size=2000, seed=3)
+    simulator = ContestSimulator(
+        field_sampler=sampler,
+        field_size=100,
+        n_scenarios=3,
+        n_contest_sims=2,
+        field_pool=pool,
+    )
+
+    def fail(*args, **kwargs):
+        raise AssertionError("field sampler should not be called when a pool is attached")
+
+    monkeypatch.setattr(sampler, 'sample_lineups_with_constraints', fail)
+
+    np.random.seed(0)
+    results = simulator.simulate_portfolio(
+        np.array([150.0, 140.0]), np.random.gamma(20, 2, size=(3, 12))
+    )
+
+    assert results['ranks'].shape == (2, 6)
+    assert results['ranks'].min() >= 1
@@ -0,0 +1,112 @@
+"""
+Unit tests for array-native field lineup sampling.
+"""
+import numpy as np
+import pytest
+
+from apps.backend.app.contest.field_sim import (
+    FieldLineupSampler,
+    dirichlet_categorical_indices,
+    dirichlet_multinomial_sample,
+)
+
+
+@pytest.fixture
+def sampler() -> FieldLineupSampler:
+    """12-driver pool where the cap rejects a meaningful share of lineups."""
+    ownership = np.array([20, 15, 12, 10, 8, 7, 6, 5, 5, 4, 4, 4])
+    driver_pool = [
+        {'driver_id': 100 + i, 'salary': 7000 + i * 300, 'projected_points': 45 - i * 2}
+        for i in range(12)
+    ]
+    return FieldLineupSampler(ownership, driver_pool, salary_cap=50000, n_drivers=6)
+
+
+class TestDirichletSampling:
+    """Tests for the vectorized Dirichlet samplers."""
+
+    def test_multinomial_counts_sum_to_draws(self):
+        np.random.seed(0)
+        samples = dirichlet_multinomial_sample(np.array([50.0, 30.0, 20.0]), 500, 6)
+
+        assert samples.shape == (500, 3)
+        assert np.all(samples.sum(axis=1) == 6)
+
+    def test_categorical_indices_follow_ownership(self):
+        np.random.seed(1)
+        ownership = np.array([50.0, 30.0, 20.0])
+
+        indices = dirichlet_categorical_indices(ownership, 100000, 6, alpha=1000.0)
+
+        frequencies = np.bincount(indices.ravel(), minlength=3) / indices.size
+        np.testing.assert_allclose(frequencies, [0.5, 0.3, 0.2], atol=0.01)
+
+    def test_without_replacement_rows_are_distinct(self):
+        np.random.seed(2)
+
+        indices = dirichlet_categorical_indices(np.ones(10), 1000, 6, replace=False)
+
+        assert indices.dtype == np.int32
+        assert all(len(set(row)) == 6 for row in indices.tolist())
+
+
+class TestIndexMode:
+    """Tests for FieldLineupSampler index-matrix mode."""
+
+    def test_constrained_indices_are_valid(self, sampler):
+        np.random.seed(3)
+
+        indices = sampler.sample_lineups_with_constraints(2000, as_indices=True)
+
+        assert indices.shape == (2000, 6)
+        assert indices.dtype == np.int32
+        assert np.all(sampler.salaries[indices].sum(axis=1) <= sampler.salary_cap)
+        assert np.all(np.diff(np.sort(indices, axis=1), axis=1) > 0)
+
+    def test_list_mode_returns_driver_ids(self, sampler):
+        np.random.seed(4)
+
+        lineups = sampler.sample_lineups_with_constraints(50)
+
+        assert len(lineups) == 50
+        for lineup in lineups:
+            assert len(set(lineup)) == 6
+            assert set(lineup) <= set(sampler.driver_ids.tolist())
+            assert sampler.compute_lineup_salary(lineup) <= sampler.salary_cap
+
+    def test_valid_lineup_mask(self, sampler):
+        indices = np.array([
+            [0, 1, 2, 3, 4, 5],     # 47,500: valid
+            [6, 7, 8, 9, 10, 11],   # 58,300: over cap
+            [0, 0, 1, 2, 3, 4],     # duplicate driver
+        ])
+
+        mask = sampler.valid_lineup_mask(indices)
+
+        assert mask.tolist() == [True, False, False]
+
+    def test_index_round_trip(self, sampler):
+        lineups = [[100, 102, 104, 106, 108, 110], [111, 101, 103, 105, 107, 109]]
+
+        indices = sampler.lineups_to_indices(lineups)
+
+        assert sampler.indices_to_lineups(indices) == lineups
+
+    def test_unknown_driver_id_raises(self, sampler):
+        with pytest.raises(ValueError):
+            sampler.lineups_to_indices([[100, 101, 102, 103, 104, 999]])
+
+    def test_scores_match_for_lists_and_indices(self, sampler):
+        np.random.seed(5)
+        driver_scores = np.random.gamma(20, 2, size=12)
+        indices = sampler.sample_lineups_with_constraints(100, as_indices=True)
+        lineups = sampler.indices_to_lineups(indices)
+
+        from_indices = sampler.compute_lineup_scores(driver_scores, indices, as_indices=True)
+        from_lists = sampler.compute_lineup_scores(driver_scores, lineups)
+        # Integer driver_id arrays are not mistaken for indices
+        from_id_array = sampler.compute_lineup_scores(driver_scores, np.array(lineups))
+
+        np.testing.assert_allclose(from_indices, from_lists)
+        np.testing.assert_allclose(from_id_array, from_lists)
+        np.testing.assert_allclose(from_indices, driver_scores[indices].sum(axis=1))
@@ -8,24 +8,86 @@ Key features:
 - Redis hash storage per job (job:{job_id})
 - Automatic expiration after JOB_TTL_DAYS (default: 7 days)
 - Support for job status tracking (pending, running, completed, failed)
-- Query methods for running job count (for graceful shutdown monitoring)
-- Connection pooling for efficient Redis access
+- Running-job set for O(1) running counts (graceful shutdown, concurrency control)
+- Non-blocking redis.asyncio client; multi-key updates go out as one pipeline
+- Job update events on pub/sub (job-events:{job_id}) for long-polling
+- Reliable work queue for worker processes (app.worker)
+
+Queue layout:
+- jobs:queue                   pending job IDs (LPUSH to enqueue, FIFO)
+- jobs:processing:{worker_id}  jobs claimed by one worker (BLMOVE from the queue)
+- jobs:running                 IDs of jobs whose status is "running"
+- jobs:workers                 registered worker IDs
+- worker:{worker_id}           worker heartbeat key, expires after JOB_HEARTBEAT_TTL
+
+A claimed job stays in its worker's processing list until the worker
+acknowledges it, so a crashed worker never loses work: once its heartbeat
+key expires, recover_stale_jobs moves its jobs back to the queue (or marks
+them failed when they are out of attempts).
 
 Usage:
-    pool = redis.ConnectionPool(host='localhost', port=6379, db=0)
+    pool = redis.asyncio.ConnectionPool(host='localhost', port=6379, db=0)
     manager = JobStateManager(pool)
-    await manager.create_job(job_id, input_params, correlation_id)
+    await manager.create_job(job_id, input_params, correlation_id, enqueue=True)
     status = await manager.get_job(job_id)
+    status = await manager.wait_for_job_update(job_id, timeout=30, last_status="running")
 """
+import asyncio
 import logging
 import os
 import json
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, List, Set
 from datetime import datetime
 import redis
+import redis.asyncio
 
 logger = logging.getLogger(__name__)
 
+JOB_QUEUE_KEY = "jobs:queue"
+RUNNING_JOBS_KEY = "jobs:running"
+WORKERS_KEY = "jobs:workers"
+JOB_EVENTS_PREFIX = "job-events:"
+
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_HEARTBEAT_TTL = 30
+
+
+def _decode(value: Any) -> Any:
+    """Decode bytes returned by a client without decode_responses."""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def _events_channel(job_id: str) -> str:
+    return f"{JOB_EVENTS_PREFIX}{job_id}"
+
+
+def _processing_key(worker_id: str) -> str:
+    return f"jobs:processing:{worker_id}"
+
+
+def _worker_key(worker_id: str) -> str:
+    return f"worker:{worker_id}"
+
+
+def _parse_positive_int_env(name: str, default: int) -> int:
+    """Read a positive integer from the environment, falling back to default."""
+    value = os.getenv(name, str(default))
+    try:
+        parsed = int(value)
+    except ValueError:
+        parsed = 0
+    if parsed < 1:
+        logger.warning(f"{name}={value} invalid, using default {default}")
+        return default
+    return parsed
+
 
 class JobStateManager:
     """
@@ -44,18 +106,32 @@ class JobStateManager:
         scenario_count: Number of scenarios generated
         slate_id: Slate identifier
         correlation_id: Correlation ID for tracing
+        job_type: Worker handler name (e.g. "optimize")
+        progress: Fraction complete in [0, 1], published by the worker
+        attempts: Number of times a worker has claimed the job
+        max_attempts: Claims allowed before the job is marked failed
+        worker_id: Worker currently (or last) executing the job
+        heartbeat_at: Unix time of the worker's last heartbeat for the job
+
+    Every status or progress change is also published on the job's
+    job-events:{job_id} channel. One pattern subscription per manager fans
+    those events out to wait_for_job_update callers, so any number of
+    long-polling clients share a single Redis connection.
 
     Attributes:
-        redis: Redis client instance with connection pool
+        redis: redis.asyncio client instance with connection pool
         ttl: Time-to-live in seconds for job records
+        max_attempts: Default max_attempts for new jobs (JOB_MAX_ATTEMPTS)
+        heartbeat_ttl: Seconds without a heartbeat before a worker is
+            considered dead (JOB_HEARTBEAT_TTL)
     """
 
-    def __init__(self, redis_pool: redis.ConnectionPool):
+    def __init__(self, redis_pool: redis.asyncio.ConnectionPool):
         """
         Initialize JobStateManager with Redis connection pool.
 
         Args:
-            redis_pool: Redis connection pool configured with health checks
+            redis_pool: redis.asyncio connection pool configured with health checks
 
         Raises:
             ValueError: If redis_pool is None
@@ -63,8 +139,14 @@ class JobStateManager:
         if redis_pool is None:
             raise ValueError("redis_pool cannot be None")
 
-        self.redis = redis.Redis(connection_pool=redis_pool)
+        self.redis = redis.asyncio.Redis(connection_pool=redis_pool)
         self.ttl = self._parse_ttl()
+        self.max_attempts = _parse_positive_int_env("JOB_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+        self.heartbeat_ttl = _parse_positive_int_env("JOB_HEARTBEAT_TTL", DEFAULT_HEARTBEAT_TTL)
+
+        self._waiters: Dict[str, Set[asyncio.Event]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._listener_lock = asyncio.Lock()
 
         logger.info(f"JobStateManager initialized with TTL={self.ttl}s ({self.ttl//86400} days)")
 
@@ -94,22 +176,39 @@ class JobStateManager:
 
         return ttl_days * 86400
 
+    def _queue_status_update(self, pipe, job_id: str, status: str, fields: Dict[str, str]) -> None:
+        """Add a status change (hash, running set, event) to a pipeline."""
+        pipe.hset(_job_key(job_id), mapping={"status": status, **fields})
+        if status == "running":
+            pipe.sadd(RUNNING_JOBS_KEY, job_id)
+        else:
+            pipe.srem(RUNNING_JOBS_KEY, job_id)
+        pipe.publish(_events_channel(job_id), json.dumps({"status": status}))
+
     async def create_job(
         self,
         job_id: str,
         input_params: Dict[str, Any],
-        correlation_id: Optional[str] = None
+        correlation_id: Optional[str] = None,
+        job_type: str = "optimize",
+        max_attempts: Optional[int] = None,
+        enqueue: bool = False
     ) -> None:
         """
         Create a new job record in Redis.
 
         Initializes job with status="pending", empty result and error_message,
-        and current timestamp. Sets TTL for automatic expiration.
+        and current timestamp. Sets TTL for automatic expiration. The job is
+        executed by a worker once enqueued (here with enqueue=True, or later
+        with enqueue_job); all writes go out in one transaction.
 
         Args:
             job_id: Unique job identifier (UUID)
             input_params: Optimization request parameters (will be JSON serialized)
             correlation_id: Optional correlation ID for distributed tracing
+            job_type: Worker handler that executes the job
+            max_attempts: Claims allowed before failing (default: self.max_attempts)
+            enqueue: Also add the job to the work queue
 
         Raises:
             redis.RedisError: If Redis operation fails
@@ -125,14 +224,24 @@ class JobStateManager:
             "updated_at": now,
             "scenario_count": "0",
             "slate_id": input_params.get("slate_id", ""),
-            "correlation_id": correlation_id or job_id
+            "correlation_id": correlation_id or job_id,
+            "job_type": job_type,
+            "progress": "0",
+            "attempts": "0",
+            "max_attempts": str(max_attempts or self.max_attempts),
+            "worker_id": "",
+            "heartbeat_at": ""
         }
 
-        key = f"job:{job_id}"
-        self.redis.hset(key, mapping=job_data)
-        self.redis.expire(key, self.ttl)
+        key = _job_key(job_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=job_data)
+            pipe.expire(key, self.ttl)
+            if enqueue:
+                pipe.lpush(JOB_QUEUE_KEY, job_id)
+            await pipe.execute()
 
-        logger.info(f"Created job {job_id} with TTL {self.ttl}s")
+        logger.info(f"Created job {job_id} with TTL {self.ttl}s" + (" (enqueued)" if enqueue else ""))
 
     async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -147,17 +256,15 @@ class JobStateManager:
         Raises:
             redis.RedisError: If Redis operation fails
         """
-        key = f"job:{job_id}"
-        job_data = self.redis.hgetall(key)
+        key = _job_key(job_id)
+        job_data = await self.redis.hgetall(key)
 
         if not job_data:
             logger.debug(f"Job {job_id} not found")
             return None
 
         # Redis returns bytes, decode to strings
-        decoded_job = {k.decode() if isinstance(k, bytes) else k:
-                       v.decode() if isinstance(v, bytes) else v
-                       for k, v in job_data.items()}
+        decoded_job = {_decode(k): _decode(v) for k, v in job_data.items()}
 
         logger.debug(f"Retrieved job {job_id}, status={decoded_job.get('status')}")
 
@@ -175,6 +282,8 @@ class JobStateManager:
 
         Updates the status field and always updates updated_at timestamp.
         Optionally sets result (on completion) or error_message (on failure).
+        The hash update, running-set membership and update event are sent as
+        one transaction.
 
         Args:
             job_id: Job identifier to update
@@ -186,16 +295,13 @@ class JobStateManager:
             redis.RedisError: If Redis operation fails
             ValueError: If job_id not found
         """
-        key = f"job:{job_id}"
+        key = _job_key(job_id)
 
         # Check if job exists
-        if not self.redis.exists(key):
+        if not await self.redis.exists(key):
             raise ValueError(f"Job {job_id} not found")
 
-        updates = {
-            "status": status,
-            "updated_at": datetime.utcnow().isoformat()
-        }
+        updates = {"updated_at": datetime.utcnow().isoformat()}
 
         if result is not None:
             updates["result"] = json.dumps(result)
@@ -203,7 +309,9 @@ class JobStateManager:
         if error is not None:
             updates["error_message"] = json.dumps(error)
 
-        self.redis.hset(key, mapping=updates)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            self._queue_status_update(pipe, job_id, status, updates)
+            await pipe.execute()
 
         logger.info(f"Updated job {job_id} to status={status}")
 
@@ -212,7 +320,8 @@ class JobStateManager:
         Count jobs with status="running" across all jobs.
 
         Useful for graceful shutdown monitoring and concurrency control.
-        Uses SCAN for efficient iteration without blocking Redis.
+        Reads the running-job set maintained by status updates (SCARD), so the
+        cost does not grow with the number of stored jobs.
 
         Returns:
             Number of jobs currently in "running" status
@@ -220,22 +329,373 @@ class JobStateManager:
         Raises:
             redis.RedisError: If Redis operation fails
         """
-        running_count = 0
-
-        # Scan for all job keys
-        for key in self.redis.scan_iter("job:*"):
-            # Get status field only
-            status_bytes = self.redis.hget(key, "status")
-
-            if status_bytes:
-                status = status_bytes.decode() if isinstance(status_bytes, bytes) else status_bytes
-                if status == "running":
-                    running_count += 1
+        running_count = await self.redis.scard(RUNNING_JOBS_KEY)
 
         logger.debug(f"Running job count: {running_count}")
 
         return running_count
 
+    async def enqueue_job(self, job_id: str) -> None:
+        """
+        Add a created job to the work queue.
+
+        Args:
+            job_id: Job identifier (must have been created with create_job)
+
+        Raises:
+            redis.RedisError: If Redis operation fails
+            ValueError: If job_id not found
+        """
+        if not await self.redis.exists(_job_key(job_id)):
+            raise ValueError(f"Job {job_id} not found")
+
+        await self.redis.lpush(JOB_QUEUE_KEY, job_id)
+
+        logger.info(f"Enqueued job {job_id}")
+
+    async def get_queue_length(self) -> int:
+        """Number of jobs waiting in the queue."""
+        return await self.redis.llen(JOB_QUEUE_KEY)
+
+    async def register_worker(self, worker_id: str) -> None:
+        """
+        Register a worker and start its heartbeat.
+
+        Args:
+            worker_id: Unique worker identifier
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.sadd(WORKERS_KEY, worker_id)
+            pipe.set(_worker_key(worker_id), str(time.time()), ex=self.heartbeat_ttl)
+            await pipe.execute()
+
+        logger.info(f"Registered worker {worker_id}")
+
+    async def deregister_worker(self, worker_id: str) -> None:
+        """
+        Remove a worker, returning any jobs it still holds to the queue.
+
+        Args:
+            worker_id: Worker identifier passed to register_worker
+        """
+        await self._recover_worker_jobs(worker_id, reason=f"Worker {worker_id} stopped")
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.srem(WORKERS_KEY, worker_id)
+            pipe.delete(_worker_key(worker_id))
+            await pipe.execute()
+
+        logger.info(f"Deregistered worker {worker_id}")
+
+    async def heartbeat(self, worker_id: str, job_id: Optional[str] = None) -> None:
+        """
+        Refresh a worker's heartbeat (and its current job's heartbeat_at).
+
+        Must be called more often than heartbeat_ttl, or the worker's jobs are
+        recovered by recover_stale_jobs.
+
+        Args:
+            worker_id: Worker identifier
+            job_id: Job the worker is executing, if any
+        """
+        now = time.time()
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(_worker_key(worker_id), str(now), ex=self.heartbeat_ttl)
+            if job_id is not None:
+                pipe.hset(_job_key(job_id), "heartbeat_at", str(now))
+            await pipe.execute()
+
+    async def claim_job(self, worker_id: str, timeout: float = 5.0) -> Optional[str]:
+        """
+        Claim the next queued job for a worker.
+
+        Waits up to timeout seconds without blocking the event loop. The job
+        moves atomically from the queue to the worker's processing list, then
+        is marked running and its attempts counter incremented.
+
+        Args:
+            worker_id: Worker identifier
+            timeout: Seconds to wait for a job (0 waits forever)
+
+        Returns:
+            Claimed job ID, or None if the queue stayed empty (or the
+            claimed job's record had expired)
+
+        Raises:
+            redis.RedisError: If Redis operation fails
+        """
+        job_id = await self.redis.blmove(
+            JOB_QUEUE_KEY, _processing_key(worker_id), timeout, "RIGHT", "LEFT"
+        )
+        if job_id is None:
+            return None
+
+        job_id = _decode(job_id)
+        if not await self.redis.exists(_job_key(job_id)):
+            # Job record expired while queued; drop it
+            logger.warning(f"Dropping queued job {job_id}: record not found")
+            await self.ack_job(worker_id, job_id)
+            return None
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            self._queue_status_update(pipe, job_id, "running", {
+                "worker_id": worker_id,
+                "heartbeat_at": str(time.time()),
+                "updated_at": datetime.utcnow().isoformat()
+            })
+            pipe.hincrby(_job_key(job_id), "attempts", 1)
+            await pipe.execute()
+
+        logger.info(f"Worker {worker_id} claimed job {job_id}")
+
+        return job_id
+
+    async def update_job_progress(self, job_id: str, progress: float) -> None:
+        """
+        Publish job progress to the job hash and its update channel.
+
+        Args:
+            job_id: Job identifier
+            progress: Fraction complete, clipped to [0, 1]
+        """
+        progress = min(max(float(progress), 0.0), 1.0)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(_job_key(job_id), mapping={
+                "progress": str(progress),
+                "updated_at": datetime.utcnow().isoformat()
+            })
+            pipe.publish(_events_channel(job_id), json.dumps({"progress": progress}))
+            await pipe.execute()
+
+    async def ack_job(self, worker_id: str, job_id: str) -> None:
+        """
+        Remove a finished job from the worker's processing list.
+
+        Call after the job's final status has been written.
+
+        Args:
+            worker_id: Worker that claimed the job
+            job_id: Job identifier
+        """
+        await self.redis.lrem(_processing_key(worker_id), 1, job_id)
+
+    async def retry_or_fail_job(
+        self,
+        worker_id: str,
+        job_id: str,
+        error: Any,
+        retryable: bool = True
+    ) -> Optional[bool]:
+        """
+        Requeue a job after a failed attempt, or fail it.
+
+        The job is failed when it is out of attempts or the error is not
+        retryable (e.g. invalid input that would fail the same way again).
+        The error is recorded on the job either way.
+
+        The status update, removal from the worker's processing list and
+        requeue run in one WATCH/MULTI transaction that only goes ahead while
+        the job is still in that list. When several callers handle the same
+        job at once (e.g. two workers recovering one dead worker), exactly
+        one of them moves it; the others return None.
+
+        Args:
+            worker_id: Worker that claimed the job
+            job_id: Job identifier
+            error: Error details (will be JSON serialized)
+            retryable: Whether another attempt could succeed
+
+        Returns:
+            True if the job was requeued, False if it was marked failed, None
+            if it was no longer in the worker's processing list
+        """
+        processing_key = _processing_key(worker_id)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(processing_key)
+                    if await pipe.lpos(processing_key, job_id) is None:
+                        await pipe.unwatch()
+                        return None
+
+                    attempts, max_attempts = await pipe.hmget(
+                        _job_key(job_id), ["attempts", "max_attempts"]
+                    )
+                    attempts = int(_decode(attempts) or 0)
+                    max_attempts = int(_decode(max_attempts) or self.max_attempts)
+                    retry = retryable and attempts < max_attempts
+
+                    pipe.multi()
+                    self._queue_status_update(pipe, job_id, "pending" if retry else "failed", {
+                        "error_message": json.dumps(error),
+                        "updated_at": datetime.utcnow().isoformat()
+                    })
+                    pipe.lrem(processing_key, 1, job_id)
+                    if retry:
+                        pipe.lpush(JOB_QUEUE_KEY, job_id)
+                    await pipe.execute()
+                    break
+                except redis.WatchError:
+                    continue  # Processing list changed; check again
+
+        if retry:
+            logger.warning(f"Job {job_id} attempt {attempts}/{max_attempts} failed, requeued: {error}")
+        elif not retryable:
+            logger.error(f"Job {job_id} failed (not retryable): {error}")
+        else:
+            logger.error(f"Job {job_id} failed after {attempts} attempts: {error}")
+
+        return retry
+
+    async def _recover_worker_jobs(self, worker_id: str, reason: str) -> List[str]:
+        """
+        Requeue (or fail) every job in a worker's processing list.
+
+        Returns:
+            IDs of the jobs this call moved; jobs another caller recovered
+            first are skipped
+        """
+        job_ids = [_decode(j) for j in await self.redis.lrange(_processing_key(worker_id), 0, -1)]
+        recovered = []
+        for job_id in job_ids:
+            if await self.redis.exists(_job_key(job_id)):
+                if await self.retry_or_fail_job(worker_id, job_id, reason) is not None:
+                    recovered.append(job_id)
+            else:
+                # Job record expired; nothing left to run
+                await self.ack_job(worker_id, job_id)
+        return recovered
+
+    async def recover_stale_jobs(self) -> int:
+        """
+        Recover jobs held by workers whose heartbeat has expired.
+
+        Safe to call from every worker periodically: a worker is only reaped
+        once its heartbeat key is gone, and each of its jobs is moved by
+        exactly one caller (see retry_or_fail_job).
+
+        Returns:
+            Number of jobs returned to the queue or marked failed
+        """
+        worker_ids = [_decode(w) for w in await self.redis.smembers(WORKERS_KEY)]
+        if not worker_ids:
+            return 0
+
+        # One round trip for every worker's heartbeat
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for worker_id in worker_ids:
+                pipe.exists(_worker_key(worker_id))
+            alive = await pipe.execute()
+
+        recovered = 0
+        for worker_id, is_alive in zip(worker_ids, alive):
+            if is_alive:
+                continue
+
+            job_ids = await self._recover_worker_jobs(
+                worker_id, reason=f"Worker {worker_id} lost heartbeat"
+            )
+            await self.redis.srem(WORKERS_KEY, worker_id)
+            recovered += len(job_ids)
+
+            logger.warning(f"Reaped dead worker {worker_id}, recovered {len(job_ids)} jobs")
+
+        return recovered
+
+    async def _ensure_listener(self) -> None:
+        """Start the shared job-events subscription if it is not running."""
+        async with self._listener_lock:
+            if self._listener is not None and not self._listener.done():
+                return
+
+            pubsub = self.redis.pubsub()
+            await pubsub.psubscribe(f"{JOB_EVENTS_PREFIX}*")
+            # Wait for the subscription to be confirmed so no event is missed
+            await pubsub.get_message(timeout=1.0)
+            self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub) -> None:
+        """Wake wait_for_job_update callers when their job publishes an event."""
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+                job_id = _decode(message["channel"])[len(JOB_EVENTS_PREFIX):]
+                for event in self._waiters.get(job_id, ()):
+                    event.set()
+        except redis.RedisError as e:
+            # Waiters fall back to their timeout; the next wait restarts the listener
+            logger.warning(f"Job events subscription lost: {e}")
+        finally:
+            await pubsub.aclose()
+
+    async def wait_for_job_update(
+        self,
+        job_id: str,
+        timeout: float,
+        last_status: Optional[str] = None,
+        last_progress: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Long-poll a job: return once it differs from what the caller last saw.
+
+        Returns immediately if the job is finished or its status/progress
+        already differs from last_status/last_progress; otherwise waits for
+        the job's next update event, or timeout seconds.
+
+        Args:
+            job_id: Job identifier
+            timeout: Maximum seconds to wait
+            last_status: Status the caller already has (None: any status is new)
+            last_progress: Progress the caller already has (None: ignore progress)
+
+        Returns:
+            Current job data dictionary, or None if not found
+
+        Raises:
+            redis.RedisError: If Redis operation fails
+        """
+        event = asyncio.Event()
+        self._waiters.setdefault(job_id, set()).add(event)
+        try:
+            await self._ensure_listener()
+
+            job = await self.get_job(job_id)
+            if job is None or job["status"] in TERMINAL_STATUSES:
+                return job
+
+            changed = last_status is None or job["status"] != last_status or (
+                last_progress is not None and float(job.get("progress") or 0.0) != last_progress
+            )
+            if changed:
+                return job
+
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+            return await self.get_job(job_id)
+        finally:
+            waiters = self._waiters.get(job_id)
+            if waiters is not None:
+                waiters.discard(event)
+                if not waiters:
+                    del self._waiters[job_id]
+
+    async def close(self) -> None:
+        """Stop the job-events subscription (the connection pool is left open)."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+
     def __repr__(self) -> str:
         """Return string representation of JobStateManager."""
         return f"JobStateManager(redis_pool=..., ttl={self.ttl}s)"
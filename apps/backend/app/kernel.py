@@ -6,6 +6,8 @@ from dataclasses import dataclass, field
 import logging
 import threading
 
+import numpy as np
+
 # Initialize logger for module
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,8 @@ try:
         validate_fastest_laps_conservation,
         validate_position_swaps,
         calculate_max_position_swaps,
+        batch_max_position_swaps,
+        batch_conservation_masks,
         ConservationResult
     )
 except ImportError:
@@ -26,6 +30,8 @@ except ImportError:
             validate_fastest_laps_conservation,
             validate_position_swaps,
             calculate_max_position_swaps,
+            batch_max_position_swaps,
+            batch_conservation_masks,
             ConservationResult
         )
     except ImportError:
@@ -64,11 +70,11 @@ except ImportError:
                 return True, ""
             return False, f"Fastest laps conservation violated: total ({int(total)}) exceeds green flag laps ({green_flag_laps})"
 
+        def batch_max_position_swaps(field_size, green_flag_laps):
+            return np.maximum(np.minimum(field_size * 2, np.asarray(green_flag_laps) // 10), field_size)
+
         def calculate_max_position_swaps(field_size, green_flag_laps):
-            swaps_per_driver_limit = field_size * 2
-            track_opportunity_limit = green_flag_laps // 10
-            max_swaps = min(swaps_per_driver_limit, track_opportunity_limit)
-            return max(max_swaps, field_size)
+            return int(batch_max_position_swaps(field_size, green_flag_laps))
 
         def validate_position_swaps(start_positions, finish_positions, max_swaps):
             position_changes = np.abs(finish_positions - start_positions)
@@ -77,6 +83,15 @@ except ImportError:
                 return True, ""
             return False, f"Position swaps violated: total ({int(total_swaps)}) exceeds max allowed ({max_swaps})"
 
+        def batch_conservation_masks(laps_led, fastest_laps, start_positions, finish_positions,
+                                     race_length, green_flag_laps, field_size):
+            green_flag_laps = np.asarray(green_flag_laps)
+            laps_led_ok = np.sum(laps_led, axis=1) <= race_length
+            fastest_laps_ok = np.sum(fastest_laps, axis=1) <= green_flag_laps
+            max_swaps = batch_max_position_swaps(field_size, green_flag_laps)
+            total_swaps = np.abs(np.asarray(finish_positions) - np.asarray(start_positions)).sum(axis=1)
+            return laps_led_ok, fastest_laps_ok, total_swaps <= max_swaps
+
 
 # Module-level rejection statistics with thread-safe access
 _rejection_stats_lock = threading.Lock()
@@ -120,6 +135,40 @@ def get_rejection_stats() -> Dict[str, Any]:
     }
 
 
+def _record_batch_rejection_stats(
+    n_validated: int,
+    n_rejected: int,
+    veto_reason_counts: Dict[str, int]
+) -> None:
+    """Add a whole batch to the rejection statistics under one lock acquisition."""
+    with _rejection_stats_lock:
+        _rejection_stats["total_validated"] += n_validated
+        _rejection_stats["total_rejected"] += n_rejected
+        reasons = _rejection_stats["veto_reasons"]
+        for veto_reason, count in veto_reason_counts.items():
+            reasons[veto_reason] = reasons.get(veto_reason, 0) + count
+
+
+def _count_veto_messages(template: str, failed_values: np.ndarray) -> Dict[str, int]:
+    """
+    Count veto messages for failed scenarios, grouped by distinct values.
+
+    Args:
+        template: Veto message format string with positional fields
+        failed_values: Format arguments per failed scenario (shape: [n_failed, n_fields])
+
+    Returns:
+        Dict mapping formatted veto message to count
+    """
+    if len(failed_values) == 0:
+        return {}
+    unique_values, counts = np.unique(failed_values, axis=0, return_counts=True)
+    return {
+        template.format(*(int(v) for v in values)): int(count)
+        for values, count in zip(unique_values, counts)
+    }
+
+
 def reset_rejection_stats() -> None:
     """
     Reset rejection statistics to zero.
@@ -140,6 +189,40 @@ def reset_rejection_stats() -> None:
     logger.info("Rejection statistics reset")
 
 
+def _stack_scenario_dicts(
+    scenarios: List[Dict[str, Any]]
+) -> Optional[Tuple[np.ndarray, ...]]:
+    """
+    Stack scenario dicts into (n_scenarios, n_drivers) arrays.
+
+    Returns None when the batch cannot be stacked (ragged driver counts,
+    dict-valued fields or non-numeric data), so callers can fall back to
+    per-scenario validation.
+    """
+    if not scenarios:
+        return None
+
+    fields = ('laps_led', 'fastest_laps', 'start_positions', 'finish_positions')
+    columns = {name: [] for name in fields}
+    for scenario in scenarios:
+        for name in fields:
+            value = scenario.get(name, [])
+            if isinstance(value, dict):
+                return None
+            columns[name].append(value)
+
+    try:
+        arrays = [np.array(columns[name], dtype=np.int32) for name in fields]
+        if any(a.ndim != 2 for a in arrays) or arrays[2].shape != arrays[3].shape:
+            return None
+        race_length = np.array([s.get('race_length', 0) for s in scenarios], dtype=np.int64)
+        green_flag_laps = np.array([s.get('green_flag_laps', 0) for s in scenarios], dtype=np.int64)
+    except (ValueError, TypeError):
+        return None
+
+    return (*arrays, race_length, green_flag_laps)
+
+
 class KernelLogic:
     """
     Core logic class enforcing race constraints.
@@ -468,6 +551,115 @@ class KernelLogic:
 
         return validate_position_swaps(start_array, finish_array, max_swaps)
 
+    def validate_conservation_arrays(
+        self,
+        laps_led: np.ndarray,
+        fastest_laps: np.ndarray,
+        start_positions: np.ndarray,
+        finish_positions: np.ndarray,
+        race_length: Any,
+        green_flag_laps: Any
+    ) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        Validate dominator conservation for stacked scenarios in one pass.
+
+        Array-in counterpart of validate_dominator_conservation: the laps
+        led, fastest laps and position swap rules are row-wise reductions
+        from batch_conservation_masks, rejection statistics are updated once
+        for the whole batch, and nothing is logged per scenario.
+
+        Args:
+            laps_led: Laps led (shape: [n_scenarios, n_drivers])
+            fastest_laps: Fastest laps (shape: [n_scenarios, n_drivers])
+            start_positions: Start positions (shape: [n_drivers] or [n_scenarios, n_drivers])
+            finish_positions: Finish positions (shape: [n_scenarios, n_drivers])
+            race_length: Race length (scalar or shape [n_scenarios])
+            green_flag_laps: Green flag laps (scalar or shape [n_scenarios])
+
+        Returns:
+            Tuple of:
+                - Boolean mask (shape: [n_scenarios]), True where all rules pass
+                - Veto counts per rule: {"laps_led", "fastest_laps", "position_swaps"}
+
+        Examples:
+            >>> kernel = KernelLogic(field_size=40)
+            >>> valid, veto_counts = kernel.validate_conservation_arrays(
+            ...     laps_led, fastest_laps, list(range(1, 41)), finish_positions,
+            ...     race_length=200, green_flag_laps=180
+            ... )
+            >>> veto_counts["laps_led"]
+            0
+        """
+        laps_led_ok, fastest_laps_ok, swaps_ok, veto_counts = self._validate_arrays(
+            laps_led, fastest_laps, start_positions, finish_positions,
+            race_length, green_flag_laps
+        )
+        return laps_led_ok & fastest_laps_ok & swaps_ok, veto_counts
+
+    def _validate_arrays(
+        self,
+        laps_led: np.ndarray,
+        fastest_laps: np.ndarray,
+        start_positions: np.ndarray,
+        finish_positions: np.ndarray,
+        race_length: Any,
+        green_flag_laps: Any
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, int]]:
+        """Per-rule masks and veto counts for validate_conservation_arrays."""
+        laps_led = np.asarray(laps_led)
+        fastest_laps = np.asarray(fastest_laps)
+        start_positions = np.asarray(start_positions)
+        finish_positions = np.asarray(finish_positions)
+        n_scenarios = len(laps_led)
+        race_length = np.broadcast_to(np.asarray(race_length), (n_scenarios,))
+        green_flag_laps = np.broadcast_to(np.asarray(green_flag_laps), (n_scenarios,))
+
+        laps_led_ok, fastest_laps_ok, swaps_ok = batch_conservation_masks(
+            laps_led, fastest_laps, start_positions, finish_positions,
+            race_length, green_flag_laps, self.field_size
+        )
+        valid = laps_led_ok & fastest_laps_ok & swaps_ok
+
+        veto_counts = {
+            "laps_led": int(np.count_nonzero(~laps_led_ok)),
+            "fastest_laps": int(np.count_nonzero(~fastest_laps_ok)),
+            "position_swaps": int(np.count_nonzero(~swaps_ok)),
+        }
+        n_rejected = n_scenarios - int(np.count_nonzero(valid))
+
+        # Global stats keep the per-message counts of the scalar path; messages
+        # are formatted once per distinct (total, limit) pair, not per scenario.
+        veto_messages: Dict[str, int] = {}
+        if n_rejected:
+            failed = ~laps_led_ok
+            veto_messages.update(_count_veto_messages(
+                "Laps led conservation violated: total ({}) exceeds race length ({})",
+                np.column_stack([laps_led[failed].sum(axis=1), race_length[failed]])
+            ))
+            failed = ~fastest_laps_ok
+            veto_messages.update(_count_veto_messages(
+                "Fastest laps conservation violated: total ({}) exceeds green flag laps ({})",
+                np.column_stack([fastest_laps[failed].sum(axis=1), green_flag_laps[failed]])
+            ))
+            failed = ~swaps_ok
+            max_swaps = batch_max_position_swaps(self.field_size, green_flag_laps[failed])
+            total_swaps = np.abs(
+                finish_positions[failed] - np.broadcast_to(start_positions, finish_positions.shape)[failed]
+            ).sum(axis=1)
+            veto_messages.update(_count_veto_messages(
+                "Position swaps violated: total ({}) exceeds max allowed ({})",
+                np.column_stack([total_swaps, max_swaps])
+            ))
+
+        _record_batch_rejection_stats(n_scenarios, n_rejected, veto_messages)
+
+        logger.info(
+            f"Array validation: {n_scenarios - n_rejected}/{n_scenarios} valid, "
+            f"veto_counts={veto_counts}"
+        )
+
+        return laps_led_ok, fastest_laps_ok, swaps_ok, veto_counts
+
     def batch_validate_scenarios(
         self,
         scenarios: List[Dict[str, any]]
@@ -475,9 +667,12 @@ class KernelLogic:
         """
         Validate conservation constraints across a batch of scenarios.
 
-        This method processes multiple scenarios efficiently, using JAX
-        vectorization when available for parallel validation. Returns
-        both validation results and batch-level statistics.
+        Scenarios with equal driver counts are stacked and validated in one
+        pass with validate_conservation_arrays(); ConservationResult objects
+        are then built from the masks, with veto reasons formatted only for
+        failing scenarios. Ragged batches fall back to per-scenario
+        validate_dominator_conservation(). Returns both validation results
+        and batch-level statistics.
 
         Args:
             scenarios: List of scenario dictionaries, each containing:
@@ -513,32 +708,24 @@ class KernelLogic:
             >>> summary['rejection_rate']
             0.5
         """
-        logger = logging.getLogger(__name__)
-
-        # Capture stats before batch
-        stats_before = get_rejection_stats()
-
         logger.info(f"Starting batch validation of {len(scenarios)} scenarios")
 
-        results = []
-        for scenario in scenarios:
-            result = self.validate_dominator_conservation(scenario)
-            results.append(result)
-
-        # Capture stats after batch
-        stats_after = get_rejection_stats()
+        stacked = _stack_scenario_dicts(scenarios)
+        if stacked is None:
+            results = [self.validate_dominator_conservation(s) for s in scenarios]
+        else:
+            results = self._results_from_arrays(*stacked)
 
-        # Compute batch-level statistics
-        batch_validated = stats_after["total_validated"] - stats_before["total_validated"]
-        batch_rejected = stats_after["total_rejected"] - stats_before["total_rejected"]
-        batch_rejection_rate = batch_rejected / batch_validated if batch_validated > 0 else 0.0
+        batch_valid = sum(1 for r in results if r.is_valid)
+        batch_rejected = len(results) - batch_valid
+        batch_rejection_rate = batch_rejected / len(results) if results else 0.0
 
         batch_summary = {
             "batch_size": len(scenarios),
-            "batch_validated": batch_validated,
+            "batch_validated": len(results),
             "batch_rejected": batch_rejected,
             "batch_rejection_rate": batch_rejection_rate,
-            "batch_valid": sum(1 for r in results if r.is_valid),
+            "batch_valid": batch_valid,
         }
 
         logger.info(
@@ -548,6 +735,47 @@ class KernelLogic:
 
         return results, batch_summary
 
+    def _results_from_arrays(
+        self,
+        laps_led: np.ndarray,
+        fastest_laps: np.ndarray,
+        start_positions: np.ndarray,
+        finish_positions: np.ndarray,
+        race_length: np.ndarray,
+        green_flag_laps: np.ndarray
+    ) -> List[ConservationResult]:
+        """Build per-scenario ConservationResults from one array validation pass."""
+        laps_led_ok, fastest_laps_ok, swaps_ok, _ = self._validate_arrays(
+            laps_led, fastest_laps, start_positions, finish_positions,
+            race_length, green_flag_laps
+        )
+
+        results = []
+        for i in range(len(laps_led)):
+            result = ConservationResult(
+                laps_led_valid=bool(laps_led_ok[i]),
+                fastest_laps_valid=bool(fastest_laps_ok[i]),
+                position_swaps_valid=bool(swaps_ok[i])
+            )
+            if not result.is_valid:
+                # Reuse the scalar validators so reasons match validate_dominator_conservation
+                gfl = int(green_flag_laps[i])
+                if not laps_led_ok[i]:
+                    result.add_veto_reason(
+                        validate_laps_led_conservation(laps_led[i], int(race_length[i]))[1]
+                    )
+                if not fastest_laps_ok[i]:
+                    result.add_veto_reason(
+                        validate_fastest_laps_conservation(fastest_laps[i], gfl)[1]
+                    )
+                if not swaps_ok[i]:
+                    result.add_veto_reason(validate_position_swaps(
+                        start_positions[i], finish_positions[i],
+                        calculate_max_position_swaps(self.field_size, gfl)
+                    )[1])
+            results.append(result)
+        return results
+
     @classmethod
     def get_rejection_summary(cls) -> Dict[str, Any]:
         """
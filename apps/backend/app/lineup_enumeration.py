@@ -0,0 +1,470 @@
+"""
+Exact enumeration of DraftKings NASCAR lineups for small slates.
+
+A Classic lineup is 6 of roughly 36-40 drivers (C(40,6) ~ 3.8M combinations),
+small enough to enumerate every salary-feasible lineup once per slate instead
+of calling a MILP solver per lineup. This module builds that table with
+bounded pruning and answers lineup queries as vectorized array operations:
+
+- LineupTable.top_n: best N lineups by projection or any per-lineup score
+- LineupTable.select_portfolio: greedy exposure-capped portfolio using the
+  same exposure rules as portfolio_generator (get_overexposed_drivers) and
+  a max_overlap cut between lineups
+- LineupTable.score_scenarios / scenario_cvar: scenario-based scoring
+
+Enumeration follows add_dk_compliance_constraints: exactly n_drivers, total
+salary <= salary_cap, and for every team with at least min_stack drivers on
+the slate, a lineup holds either none or min_stack..max_stack of them.
+
+Lineups are stored as driver pool indices (positions in driver_data, which
+is also the scenario column order) in the smallest unsigned dtype that fits.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.constraints.exposure import get_overexposed_drivers
+
+logger = logging.getLogger(__name__)
+
+# Rows processed per block when scoring or scanning the table
+DEFAULT_CHUNK_SIZE = 262_144
+
+# Refuse to enumerate slates whose raw combination count exceeds this
+MAX_COMBINATIONS = 50_000_000
+
+
+def _min_completion_salary(sorted_salaries: np.ndarray, n_remaining: int) -> np.ndarray:
+    """
+    Cheapest salary of picking driver j plus n_remaining drivers after it.
+
+    With salaries sorted ascending this is non-decreasing in j, so the
+    feasible children of a partial lineup form a contiguous index range.
+    """
+    n = len(sorted_salaries)
+    prefix = np.concatenate([[0], np.cumsum(sorted_salaries, dtype=np.int64)])
+    j = np.arange(n - n_remaining)
+    return sorted_salaries[j] + prefix[j + 1 + n_remaining] - prefix[j + 1]
+
+
+@dataclass
+class LineupTable:
+    """
+    Every salary- and stack-feasible lineup for one slate.
+
+    Attributes:
+        driver_data: Driver dicts the table was built from
+        lineups: Driver pool indices (n_lineups, n_drivers), sorted per row
+        salaries: Total salary per lineup (int32)
+        projections: Sum of projected_points per lineup (float32)
+        max_team_count: Largest same-team count per lineup (uint8)
+        n_teams: Number of distinct teams per lineup (uint8)
+        build_seconds: Time spent enumerating
+
+    Example:
+        >>> table = enumerate_lineups(driver_data, salary_cap=50000)
+        >>> best = table.top_n(150)
+        >>> portfolio = table.select_portfolio(20, max_driver_exposure=0.5)
+        >>> lineups = table.to_lineups(portfolio)
+    """
+    driver_data: List[Dict[str, Any]]
+    lineups: np.ndarray
+    salaries: np.ndarray
+    projections: np.ndarray
+    max_team_count: np.ndarray
+    n_teams: np.ndarray
+    build_seconds: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.lineups)
+
+    @property
+    def n_drivers(self) -> int:
+        """Drivers per lineup."""
+        return self.lineups.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the table arrays."""
+        return sum(
+            arr.nbytes for arr in (
+                self.lineups, self.salaries, self.projections,
+                self.max_team_count, self.n_teams
+            )
+        )
+
+    def driver_scores(self, driver_points: np.ndarray) -> np.ndarray:
+        """
+        Score every lineup from one per-driver points vector.
+
+        Args:
+            driver_points: Points per driver (n_pool_drivers,)
+
+        Returns:
+            float32 array (n_lineups,) of lineup points
+        """
+        driver_points = np.asarray(driver_points, dtype=np.float32)
+        if driver_points.shape != (len(self.driver_data),):
+            raise ValueError(
+                f"driver_points must have shape ({len(self.driver_data)},), "
+                f"got {driver_points.shape}"
+            )
+        return driver_points[self.lineups].sum(axis=1)
+
+    def top_n(self, n: int, scores: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Rows of the n highest-scoring lineups, best first.
+
+        Args:
+            n: Number of lineups
+            scores: Per-lineup scores (default: projections)
+
+        Returns:
+            int64 array of table rows
+        """
+        scores = self.projections if scores is None else np.asarray(scores)
+        n = min(n, len(scores))
+        if n <= 0:
+            return np.empty(0, dtype=np.int64)
+
+        top = np.argpartition(-scores, n - 1)[:n]
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    def select_portfolio(
+        self,
+        n_lineups: int,
+        scores: Optional[np.ndarray] = None,
+        max_driver_exposure: float = 0.5,
+        max_team_exposure: float = 0.7,
+        max_overlap: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> np.ndarray:
+        """
+        Greedily pick the best lineup allowed by exposure and overlap rules.
+
+        Before each pick, drivers over their exposure cap are excluded exactly
+        as in generate_portfolio; the pick is the highest-scoring remaining
+        lineup sharing at most max_overlap drivers with every earlier pick.
+
+        Args:
+            n_lineups: Number of lineups to select
+            scores: Per-lineup scores (default: projections)
+            max_driver_exposure: Max fraction of lineups containing a driver
+            max_team_exposure: Max fraction of lineups from the same team
+            max_overlap: Max drivers shared with any earlier lineup
+                (default n_drivers - 1, i.e. no duplicates)
+            chunk_size: Rows scanned per block
+
+        Returns:
+            int64 array of table rows in pick order (shorter than n_lineups
+            if the rules leave no lineup)
+        """
+        scores = self.projections if scores is None else np.asarray(scores)
+        if scores.shape != (len(self),):
+            raise ValueError(f"scores must have shape ({len(self)},), got {scores.shape}")
+
+        max_overlap = self.n_drivers - 1 if max_overlap is None else max_overlap
+        order = np.argsort(-scores, kind="stable")
+        driver_ids = np.array([d["driver_id"] for d in self.driver_data])
+        id_to_index = {driver_id: i for i, driver_id in enumerate(driver_ids)}
+
+        picked: List[int] = []
+        # (n_picked, n_pool_drivers) membership of each picked lineup
+        picked_members = np.zeros((0, len(driver_ids)), dtype=np.int8)
+        exposure_book: Dict[int, int] = {}
+
+        for lineup_idx in range(n_lineups):
+            allowed = np.ones(len(driver_ids), dtype=bool)
+            excluded = get_overexposed_drivers(
+                exposure_book, lineup_idx,
+                max_driver_exposure=max_driver_exposure,
+                max_team_exposure=max_team_exposure,
+                driver_data=self.driver_data,
+            )
+            allowed[[id_to_index[d] for d in excluded]] = False
+
+            row = self._first_allowed(order, allowed, picked_members, max_overlap, chunk_size)
+            if row is None:
+                logger.warning(f"No lineup satisfies exposure rules for lineup {lineup_idx + 1}, stopping")
+                break
+
+            picked.append(row)
+            members = np.zeros((1, len(driver_ids)), dtype=np.int8)
+            members[0, self.lineups[row]] = 1
+            picked_members = np.vstack([picked_members, members])
+            for driver_id in driver_ids[self.lineups[row]]:
+                exposure_book[int(driver_id)] = exposure_book.get(int(driver_id), 0) + 1
+
+        return np.array(picked, dtype=np.int64)
+
+    def _first_allowed(
+        self,
+        order: np.ndarray,
+        allowed: np.ndarray,
+        picked_members: np.ndarray,
+        max_overlap: int,
+        chunk_size: int,
+    ) -> Optional[int]:
+        """First row in order using only allowed drivers and within overlap."""
+        # The best allowed row is usually near the front, so scan blocks
+        # that start small and double up to chunk_size
+        start, block = 0, min(4096, chunk_size)
+        while start < len(order):
+            rows = order[start:start + block]
+            rows = rows[allowed[self.lineups[rows]].all(axis=1)]
+            if len(rows) and len(picked_members):
+                # overlap[p, r] = drivers lineup r shares with picked lineup p
+                overlap = picked_members[:, self.lineups[rows]].sum(axis=2)
+                rows = rows[(overlap <= max_overlap).all(axis=0)]
+            if len(rows):
+                return int(rows[0])
+            start += block
+            block = min(block * 2, chunk_size)
+        return None
+
+    def score_scenarios(
+        self,
+        scenarios: np.ndarray,
+        rows: Optional[np.ndarray] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> np.ndarray:
+        """
+        Lineup points in every scenario.
+
+        Args:
+            scenarios: Driver points (n_scenarios, n_pool_drivers)
+            rows: Table rows to score (default: all lineups; the result is
+                n_rows x n_scenarios, so subset large tables first)
+            chunk_size: Maximum gathered elements per block, in rows of
+                one scenario
+
+        Returns:
+            float32 array (n_rows, n_scenarios)
+        """
+        scenarios = self._check_scenarios(scenarios)
+        lineups = self.lineups if rows is None else self.lineups[rows]
+        out = np.empty((len(lineups), len(scenarios)), dtype=np.float32)
+
+        block = max(1, chunk_size // max(1, len(scenarios)))
+        scenarios_t = np.ascontiguousarray(scenarios.T)
+        for start in range(0, len(lineups), block):
+            idx = lineups[start:start + block]
+            out[start:start + len(idx)] = scenarios_t[idx].sum(axis=1)
+        return out
+
+    def scenario_cvar(
+        self,
+        scenarios: np.ndarray,
+        alpha: float = 0.99,
+        rows: Optional[np.ndarray] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> np.ndarray:
+        """
+        Upper-tail CVaR of every lineup, matching tail_objectives.compute_cvar.
+
+        Args:
+            scenarios: Driver points (n_scenarios, n_pool_drivers)
+            alpha: Tail quantile (0.99 = mean of the top 1% of scenarios)
+            rows: Table rows to score (default: all lineups)
+            chunk_size: Maximum gathered elements per block, in rows of
+                one scenario
+
+        Returns:
+            float32 array (n_rows,)
+        """
+        if not (0 < alpha < 1):
+            raise ValueError(f"alpha must be in (0, 1), got {alpha}")
+
+        scenarios = self._check_scenarios(scenarios)
+        lineups = self.lineups if rows is None else self.lineups[rows]
+        k = max(1, int(np.ceil((1 - alpha) * len(scenarios))))
+        out = np.empty(len(lineups), dtype=np.float32)
+
+        block = max(1, chunk_size // max(1, len(scenarios)))
+        scenarios_t = np.ascontiguousarray(scenarios.T)
+        for start in range(0, len(lineups), block):
+            points = scenarios_t[lineups[start:start + block]].sum(axis=1)
+            out[start:start + len(points)] = np.partition(points, -k, axis=1)[:, -k:].mean(axis=1)
+        return out
+
+    def _check_scenarios(self, scenarios: np.ndarray) -> np.ndarray:
+        scenarios = np.asarray(scenarios, dtype=np.float32)
+        if scenarios.ndim != 2 or scenarios.shape[1] != len(self.driver_data):
+            raise ValueError(
+                f"scenarios must have shape (n_scenarios, {len(self.driver_data)}), "
+                f"got {scenarios.shape}"
+            )
+        return scenarios
+
+    def to_lineups(self, rows: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Convert table rows to lineup dicts.
+
+        Returns:
+            List of dicts with drivers (driver_ids), total_salary and
+            total_projected_points
+        """
+        return [
+            {
+                "drivers": [self.driver_data[i]["driver_id"] for i in self.lineups[row]],
+                "total_salary": int(self.salaries[row]),
+                "total_projected_points": float(self.projections[row]),
+            }
+            for row in rows
+        ]
+
+
+def enumerate_lineups(
+    driver_data: List[Dict[str, Any]],
+    salary_cap: int = 50000,
+    n_drivers: int = 6,
+    min_stack: int = 2,
+    max_stack: int = 3,
+    projections: Optional[np.ndarray] = None,
+) -> LineupTable:
+    """
+    Enumerate every DK-compliant lineup for a slate.
+
+    Drivers are sorted by salary so each partial lineup's feasible next
+    drivers form a contiguous range bounded by the cheapest completion;
+    partial lineups that would break max_stack are pruned as they grow and
+    min_stack is checked on the complete lineups.
+
+    Args:
+        driver_data: Driver dicts with driver_id and salary keys, plus team
+            (drivers without a team are never stacked) and optionally
+            projected_points
+        salary_cap: Maximum total salary
+        n_drivers: Drivers per lineup
+        min_stack: Minimum drivers from a team that is used at all (teams
+            with fewer drivers on the slate are exempt)
+        max_stack: Maximum drivers from the same team
+        projections: Optional per-driver projections overriding
+            projected_points
+
+    Returns:
+        LineupTable with one row per valid lineup
+
+    Raises:
+        ValueError: If the slate is smaller than n_drivers or too large
+            to enumerate
+
+    Example:
+        >>> table = enumerate_lineups(driver_data)
+        >>> print(f"{len(table)} lineups, {table.nbytes / 1e6:.1f} MB")
+    """
+    start = time.perf_counter()
+    n_pool = len(driver_data)
+
+    if n_pool < n_drivers:
+        raise ValueError(f"Not enough drivers: {n_pool} < {n_drivers}")
+
+    n_combinations = int(np.prod([n_pool - i for i in range(n_drivers)]) // np.prod(range(1, n_drivers + 1)))
+    if n_combinations > MAX_COMBINATIONS:
+        raise ValueError(
+            f"Slate too large to enumerate: {n_combinations:,} combinations "
+            f"> {MAX_COMBINATIONS:,}"
+        )
+
+    if projections is None:
+        projections = np.array([d.get("projected_points", 0.0) for d in driver_data], dtype=np.float32)
+    else:
+        projections = np.asarray(projections, dtype=np.float32)
+        if projections.shape != (n_pool,):
+            raise ValueError(f"projections must have shape ({n_pool},), got {projections.shape}")
+
+    # Team codes; drivers without a team get a unique code so never stack
+    team_codes: Dict[Any, int] = {}
+    team_of = np.empty(n_pool, dtype=np.int16)
+    for i, driver in enumerate(driver_data):
+        team = driver.get("team")
+        key = ("__no_team__", i) if team is None else team
+        team_of[i] = team_codes.setdefault(key, len(team_codes))
+    team_sizes = np.bincount(team_of)
+    has_stacks = bool((team_sizes >= min_stack).any())
+
+    # Enumerate in ascending-salary order
+    order = np.argsort([d["salary"] for d in driver_data], kind="stable")
+    sorted_salaries = np.array([driver_data[i]["salary"] for i in order], dtype=np.int64)
+    sorted_teams = team_of[order]
+
+    partial = np.arange(n_pool, dtype=np.int64)[:, None]
+    partial_salary = sorted_salaries.copy()
+    # Each root needs room for n_drivers - 1 cheaper completions after it
+    bound = _min_completion_salary(sorted_salaries, n_drivers - 1)
+    keep = np.flatnonzero(bound <= salary_cap)
+    partial, partial_salary = partial[keep], partial_salary[keep]
+
+    for depth in range(1, n_drivers):
+        n_remaining = n_drivers - depth - 1
+        completion = _min_completion_salary(sorted_salaries, n_remaining)
+
+        # Children of each parent: last + 1 .. hi (inclusive), contiguous
+        # because completion is non-decreasing
+        last = partial[:, -1]
+        hi = np.searchsorted(completion, salary_cap - partial_salary, side="right") - 1
+        counts = np.maximum(hi - last, 0)
+
+        parent = np.repeat(np.arange(len(partial)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        child = last[parent] + 1 + offsets
+
+        # Prune partial lineups already over max_stack
+        same_team = (sorted_teams[partial[parent]] == sorted_teams[child][:, None]).sum(axis=1)
+        keep = same_team < max_stack
+        parent, child = parent[keep], child[keep]
+
+        partial = np.hstack([partial[parent], child[:, None]])
+        partial_salary = partial_salary[parent] + sorted_salaries[child]
+
+        # Prune partial lineups whose open stacks need more drivers than
+        # the remaining slots: a stackable team with c < min_stack picks
+        # still needs min_stack - c, spread as (min_stack - c) / c per slot
+        if not has_stacks:
+            continue
+        teams = sorted_teams[partial]
+        counts = (teams[:, :, None] == teams[:, None, :]).sum(axis=2)
+        short = (counts < min_stack) & (team_sizes[teams] >= min_stack)
+        needed = np.where(short, (min_stack - counts) / counts, 0.0).sum(axis=1)
+        keep = np.flatnonzero(needed <= n_remaining + 1e-9)
+        partial, partial_salary = partial[keep], partial_salary[keep]
+
+    lineups = np.sort(order[partial], axis=1)
+    del partial
+
+    # Team count of each slot's team within its lineup
+    teams = team_of[lineups]
+    slot_counts = np.empty(teams.shape, dtype=np.uint8)
+    block = max(1, DEFAULT_CHUNK_SIZE // n_drivers)
+    for s in range(0, len(teams), block):
+        t = teams[s:s + block]
+        slot_counts[s:s + block] = (t[:, :, None] == t[:, None, :]).sum(axis=2)
+
+    stack_ok = (slot_counts >= min_stack) | (team_sizes[teams] < min_stack)
+    valid = stack_ok.all(axis=1)
+
+    lineups = lineups[valid]
+    slot_counts = slot_counts[valid]
+    dtype = np.min_scalar_type(n_pool - 1)
+
+    table = LineupTable(
+        driver_data=driver_data,
+        lineups=lineups.astype(dtype),
+        salaries=partial_salary[valid].astype(np.int32),
+        projections=projections[lineups].sum(axis=1, dtype=np.float32),
+        max_team_count=slot_counts.max(axis=1).astype(np.uint8),
+        n_teams=(1.0 / slot_counts).sum(axis=1).round().astype(np.uint8),
+        build_seconds=time.perf_counter() - start,
+    )
+
+    logger.info(
+        f"Enumerated {len(table):,} lineups from {n_pool} drivers "
+        f"({n_combinations:,} combinations) in {table.build_seconds:.2f}s, "
+        f"{table.nbytes / 1e6:.1f} MB"
+    )
+
+    return table
@@ -36,6 +36,8 @@ DraftKings NASCAR Scoring:
 """
 
 import logging
+import time
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 import numpy as np
@@ -50,10 +52,12 @@ from pulp import (
     LpBinary,
     LpStatus,
     value,
-    PULP_CBC_CMD,
 )
 
+from app.solver_backend import SolverBackend, get_solver_backend
+
 # Database imports
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 from app.models import (
     Driver,
@@ -120,6 +124,48 @@ FINISH_POINTS = {
 }
 
 
+@dataclass
+class RaceProjections:
+    """
+    Per-driver projection columns for one race, indexed by driver_id.
+
+    Built once from NASCAROptimizer.drivers and reused by every objective,
+    lineup metric and export, so no per-call driver scans or belief parsing.
+
+    Attributes:
+        drivers: The driver list the columns were built from
+        driver_ids: Driver ids in self.drivers order
+        salary: DraftKings salaries
+        expected_points: Expected DFS points (calculate_expected_points)
+        epistemic_variance: Mean epistemic variance of each driver's beliefs
+        index: driver_id -> row in the columns
+    """
+
+    drivers: List[Dict[str, Any]]
+    driver_ids: np.ndarray
+    salary: np.ndarray
+    expected_points: np.ndarray
+    epistemic_variance: np.ndarray
+    index: Dict[int, int]
+
+    def row(self, driver_id: int) -> int:
+        """Column row for driver_id; raises ValueError if unknown."""
+        try:
+            return self.index[driver_id]
+        except KeyError:
+            raise ValueError(f"Driver with id {driver_id} not found")
+
+    @property
+    def value_score(self) -> np.ndarray:
+        """Expected points per $1,000 of salary (0 for non-positive salaries)."""
+        return np.divide(
+            self.expected_points * 1000,
+            self.salary,
+            out=np.zeros_like(self.expected_points),
+            where=self.salary > 0,
+        )
+
+
 class NASCAROptimizer:
     """
     Optimizer for selecting optimal DraftKings NASCAR DFS lineups using PuLP.
@@ -140,6 +186,7 @@ class NASCAROptimizer:
         drivers: List of driver dictionaries with beliefs
         problem: Current PuLP optimization problem
         driver_vars: Dictionary of PuLP variables for driver selection
+        solver_backend: MILP backend used for every solve (records timings)
     """
 
     def __init__(
@@ -149,6 +196,7 @@ class NASCAROptimizer:
         n_drivers: int = 6,
         min_stack: int = 2,
         max_stack: int = 3,
+        solver_backend: Optional[str] = None,
     ) -> None:
         """
         Initialize NASCAROptimizer with constraints.
@@ -159,6 +207,8 @@ class NASCAROptimizer:
             n_drivers: Number of drivers to select (default 6)
             min_stack: Minimum drivers from same team (default 2)
             max_stack: Maximum drivers from same team (default 3)
+            solver_backend: "highs", "cbc" or "auto" (default: SOLVER_BACKEND
+                env var, then "cbc")
         """
         self.db_session = db_session
         self.salary_cap = salary_cap
@@ -167,8 +217,12 @@ class NASCAROptimizer:
         self.max_stack = max_stack
 
         self.drivers: List[Dict[str, Any]] = []
+        self._projections: Optional[RaceProjections] = None
         self.problem: Optional[LpProblem] = None
         self.driver_vars: Optional[Dict[str, LpVariable]] = None
+        self.solver_backend: SolverBackend = get_solver_backend(
+            solver_backend, time_limit=30
+        )
 
         logger.info(
             f"NASCAROptimizer initialized: salary_cap=${salary_cap}, "
@@ -180,7 +234,9 @@ class NASCAROptimizer:
         Load driver data from database with beliefs.
 
         This method retrieves all drivers for a race and their associated beliefs
-        from the epistemic database. Each driver dictionary includes:
+        from the epistemic database in one joined query, then computes the
+        race's projection columns (see RaceProjections). Each driver dictionary
+        includes:
         - driver_id: Driver identifier
         - name: Driver name
         - team: Driver team
@@ -200,60 +256,59 @@ class NASCAROptimizer:
         if not race:
             raise ValueError(f"Race with id {race_id} not found")
 
-        # Get all drivers
-        drivers = self.db_session.query(Driver).all()
-        if not drivers:
+        # Drivers, this race's propositions and their beliefs in one joined
+        # query; drivers without propositions/beliefs come back with NULLs
+        rows = (
+            self.db_session.query(Driver, Proposition, Belief)
+            .outerjoin(
+                Proposition,
+                and_(Proposition.driver_id == Driver.id, Proposition.race_id == race_id),
+            )
+            .outerjoin(Belief, Belief.prop_id == Proposition.id)
+            .order_by(Driver.id, Proposition.id, Belief.id)
+            .all()
+        )
+        if not rows:
             raise ValueError("No drivers found in database")
 
-        # Load beliefs for each driver
         self.drivers = []
-        for driver in drivers:
-            # Get propositions for this driver and race
-            propositions = (
-                self.db_session.query(Proposition)
-                .filter(
-                    Proposition.driver_id == driver.id,
-                    Proposition.race_id == race_id,
-                )
-                .all()
+        drivers_by_id: Dict[int, Dict[str, Any]] = {}
+        seen_propositions = set()
+        for driver, prop, belief in rows:
+            driver_dict = drivers_by_id.get(driver.id)
+            if driver_dict is None:
+                driver_dict = {
+                    "driver_id": driver.id,
+                    "name": driver.name,
+                    "team": driver.team,
+                    "car_number": driver.car_number,
+                    "salary": float(driver.salary),
+                    "avg_finish": driver.avg_finish,
+                    "wins": driver.wins,
+                    "top5": driver.top5,
+                    "top10": driver.top10,
+                    "beliefs": [],
+                }
+                drivers_by_id[driver.id] = driver_dict
+                self.drivers.append(driver_dict)
+
+            # One belief per proposition (the first by id)
+            if belief is None or prop.id in seen_propositions:
+                continue
+            seen_propositions.add(prop.id)
+            driver_dict["beliefs"].append(
+                {
+                    "belief_id": belief.id,
+                    "proposition_id": prop.id,
+                    "content": prop.content,
+                    "confidence": belief.confidence,
+                    "epistemic_var": belief.epistemic_var,
+                    "source": belief.source,
+                    "timestamp": belief.timestamp,
+                }
             )
 
-            # Get beliefs for these propositions
-            beliefs = []
-            for prop in propositions:
-                belief = (
-                    self.db_session.query(Belief)
-                    .filter(Belief.prop_id == prop.id)
-                    .first()
-                )
-                if belief:
-                    beliefs.append(
-                        {
-                            "belief_id": belief.id,
-                            "proposition_id": prop.id,
-                            "content": prop.content,
-                            "confidence": belief.confidence,
-                            "epistemic_var": belief.epistemic_var,
-                            "source": belief.source,
-                            "timestamp": belief.timestamp,
-                        }
-                    )
-
-            # Create driver dictionary
-            driver_dict = {
-                "driver_id": driver.id,
-                "name": driver.name,
-                "team": driver.team,
-                "car_number": driver.car_number,
-                "salary": float(driver.salary),
-                "avg_finish": driver.avg_finish,
-                "wins": driver.wins,
-                "top5": driver.top5,
-                "top10": driver.top10,
-                "beliefs": beliefs,
-            }
-
-            self.drivers.append(driver_dict)
+        self._projections = self._build_projections()
 
         logger.info(f"Loaded {len(self.drivers)} drivers for race {race_id}")
 
@@ -269,6 +324,8 @@ class NASCAROptimizer:
 
         Expected points = Σ (finish_probability * finish_points) + expected_laps_led * 0.25 + expected_fastest_lap * 1
 
+        Values are computed once per race (see get_projections) and looked up here.
+
         Args:
             driver_id: Driver identifier
 
@@ -278,12 +335,41 @@ class NASCAROptimizer:
         Raises:
             ValueError: If driver_id is invalid
         """
-        # Find driver
-        driver = next(
-            (d for d in self.drivers if d["driver_id"] == driver_id), None
+        projections = self.get_projections()
+        return float(projections.expected_points[projections.row(driver_id)])
+
+    def get_projections(self) -> RaceProjections:
+        """
+        Return the projection columns for the loaded drivers.
+
+        Computed once per load_driver_data() call and rebuilt only if
+        self.drivers is replaced.
+
+        Returns:
+            RaceProjections for self.drivers
+        """
+        if self._projections is None or self._projections.drivers is not self.drivers:
+            self._projections = self._build_projections()
+        return self._projections
+
+    def _build_projections(self) -> RaceProjections:
+        """Compute expected points and variances for every loaded driver."""
+        return RaceProjections(
+            drivers=self.drivers,
+            driver_ids=np.array([d["driver_id"] for d in self.drivers]),
+            salary=np.array([d["salary"] for d in self.drivers], dtype=float),
+            expected_points=np.array(
+                [self._compute_expected_points(d) for d in self.drivers], dtype=float
+            ),
+            epistemic_variance=np.array(
+                [self._get_driver_epistemic_variance(d) for d in self.drivers], dtype=float
+            ),
+            index={d["driver_id"]: i for i, d in enumerate(self.drivers)},
         )
-        if not driver:
-            raise ValueError(f"Driver with id {driver_id} not found")
+
+    def _compute_expected_points(self, driver: Dict[str, Any]) -> float:
+        """Expected DFS points for one driver dictionary (see calculate_expected_points)."""
+        driver_id = driver["driver_id"]
 
         # If no beliefs, use average finish as proxy
         if not driver["beliefs"]:
@@ -456,21 +542,8 @@ class NASCAROptimizer:
         Returns:
             Value score (expected_points / salary * 1000)
         """
-        driver = next(
-            (d for d in self.drivers if d["driver_id"] == driver_id), None
-        )
-        if not driver:
-            raise ValueError(f"Driver with id {driver_id} not found")
-
-        expected_points = self.calculate_expected_points(driver_id)
-        salary = driver["salary"]
-
-        if salary <= 0:
-            return 0.0
-
-        value_score = (expected_points / salary) * 1000
-
-        return value_score
+        projections = self.get_projections()
+        return float(projections.value_score[projections.row(driver_id)])
 
     def calculate_finish_distribution(self, driver_id: int) -> Dict[int, float]:
         """
@@ -485,11 +558,7 @@ class NASCAROptimizer:
         Returns:
             Dictionary mapping finish positions (1-43) to probabilities
         """
-        driver = next(
-            (d for d in self.drivers if d["driver_id"] == driver_id), None
-        )
-        if not driver:
-            raise ValueError(f"Driver with id {driver_id} not found")
+        driver = self.drivers[self.get_projections().row(driver_id)]
 
         # Initialize uniform distribution
         distribution = {pos: 1.0 / 43 for pos in range(1, 44)}
@@ -582,6 +651,8 @@ class NASCAROptimizer:
         excluded_drivers = set()
 
         for lineup_idx in range(n_lineups):
+            build_start = time.perf_counter()
+
             # Create optimization problem
             self.problem = LpProblem(
                 f"NASCAR_DFS_Optimization_{lineup_idx}", LpMaximize
@@ -622,8 +693,9 @@ class NASCAROptimizer:
             self.apply_stacking_constraints(available_drivers)
 
             # Solve the problem
-            solver = PULP_CBC_CMD(msg=0, timeLimit=30)
-            self.problem.solve(solver)
+            self.solver_backend.solve(
+                self.problem, build_seconds=time.perf_counter() - build_start
+            )
 
             # Check solution status
             if LpStatus[self.problem.status] != "Optimal":
@@ -658,31 +730,36 @@ class NASCAROptimizer:
 
     def _set_maximize_points_objective(self, drivers: List[Dict[str, Any]]) -> None:
         """Set objective to maximize expected points."""
-        self.problem += lpSum(
-            self.calculate_expected_points(driver["driver_id"])
-            * self.driver_vars[driver["driver_id"]]
-            for driver in drivers
-        ), "Maximize_Expected_Points"
+        self._set_column_objective(
+            drivers, self.get_projections().expected_points, "Maximize_Expected_Points"
+        )
 
     def _set_maximize_value_objective(self, drivers: List[Dict[str, Any]]) -> None:
         """Set objective to maximize value score."""
-        self.problem += lpSum(
-            self.calculate_value_score(driver["driver_id"])
-            * self.driver_vars[driver["driver_id"]]
-            for driver in drivers
-        ), "Maximize_Value_Score"
+        self._set_column_objective(
+            drivers, self.get_projections().value_score, "Maximize_Value_Score"
+        )
 
     def _set_minimize_risk_objective(self, drivers: List[Dict[str, Any]]) -> None:
         """Set objective to minimize epistemic variance (risk)."""
         # Calculate risk-adjusted score = expected_points / (1 + epistemic_variance)
+        projections = self.get_projections()
+        self._set_column_objective(
+            drivers,
+            projections.expected_points / (1.0 + projections.epistemic_variance),
+            "Minimize_Risk",
+        )
+
+    def _set_column_objective(
+        self, drivers: List[Dict[str, Any]], coefficients: np.ndarray, name: str
+    ) -> None:
+        """Set the objective from a per-driver projection column."""
+        index = self.get_projections().index
         self.problem += lpSum(
-            (
-                self.calculate_expected_points(driver["driver_id"])
-                / (1.0 + self._get_driver_epistemic_variance(driver))
-            )
+            float(coefficients[index[driver["driver_id"]]])
             * self.driver_vars[driver["driver_id"]]
             for driver in drivers
-        ), "Minimize_Risk"
+        ), name
 
     def _get_driver_epistemic_variance(self, driver: Dict[str, Any]) -> float:
         """Get average epistemic variance for driver beliefs."""
@@ -987,11 +1064,7 @@ class NASCAROptimizer:
         Raises:
             ValueError: If driver_id is invalid
         """
-        driver = next(
-            (d for d in self.drivers if d["driver_id"] == driver_id), None
-        )
-        if not driver:
-            raise ValueError(f"Driver with id {driver_id} not found")
+        driver = self.drivers[self.get_projections().row(driver_id)]
 
         return driver["salary"]
 
@@ -1008,11 +1081,7 @@ class NASCAROptimizer:
         Raises:
             ValueError: If driver_id is invalid
         """
-        driver = next(
-            (d for d in self.drivers if d["driver_id"] == driver_id), None
-        )
-        if not driver:
-            raise ValueError(f"Driver with id {driver_id} not found")
+        driver = self.drivers[self.get_projections().row(driver_id)]
 
         return driver["team"]
 
@@ -1106,6 +1175,7 @@ class LineupOptimizer:
         drivers: List[Dict[str, Any]],
         salary_cap: int = 50000,
         lineup_size: int = 6,
+        solver_backend: Optional[str] = None,
     ) -> None:
         """
         Initialize LineupOptimizer with driver data and constraints.
@@ -1119,12 +1189,18 @@ class LineupOptimizer:
                      - position: int
             salary_cap: Maximum salary for lineup (default 50,000)
             lineup_size: Number of drivers to select (default 6)
+            solver_backend: "highs", "cbc" or "auto" (default: SOLVER_BACKEND
+                env var, then "cbc")
         """
         self.drivers: List[Dict[str, Any]] = drivers
         self.salary_cap: int = salary_cap
         self.lineup_size: int = lineup_size
         self.problem: Optional[LpProblem] = None
         self.variables: Optional[Dict[str, LpVariable]] = None
+        self.solver_backend_name: Optional[str] = solver_backend
+        self.solver_backend: SolverBackend = get_solver_backend(
+            solver_backend, time_limit=30
+        )
 
     def optimize(self) -> Optional[Dict[str, Any]]:
         """
@@ -1140,6 +1216,8 @@ class LineupOptimizer:
         if len(self.drivers) < self.lineup_size:
             return None
 
+        build_start = time.perf_counter()
+
         # Create the problem
         self.problem = LpProblem("NASCAR_DFS_Optimization", LpMaximize)
 
@@ -1176,15 +1254,10 @@ class LineupOptimizer:
             "Salary_Cap_Constraint",
         )
 
-        # Solve the problem using system CBC if available (fixes ARM Mac issues)
-        try:
-            # Try to use system-installed CBC first
-            from pulp import COIN_CMD
-            solver = COIN_CMD(path='/usr/bin/cbc', msg=0, timeLimit=30)
-        except Exception:
-            # Fallback to default solver
-            solver = None
-        self.problem.solve(solver)
+        # Solve with the configured backend (SOLVER_BACKEND, CBC by default)
+        self.solver_backend.solve(
+            self.problem, build_seconds=time.perf_counter() - build_start
+        )
 
         # Check if solution is optimal
         if LpStatus[self.problem.status] != "Optimal":
@@ -1240,6 +1313,7 @@ class LineupOptimizer:
                 drivers=available_drivers,
                 salary_cap=self.salary_cap,
                 lineup_size=self.lineup_size,
+                solver_backend=self.solver_backend_name,
             )
 
             result = optimizer.optimize()
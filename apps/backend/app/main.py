@@ -11,7 +11,10 @@ Phase 4 endpoints:
 
 Phase 5 infrastructure:
 - Redis-based job state persistence via JobStateManager
+- Background optimization jobs queued in Redis and run by app.worker processes
 - Connection pooling for efficient Redis access
+- CPU-bound pipelines run in a compute pool with per-endpoint admission
+  control (app.compute); saturated endpoints return 429 with Retry-After
 """
 
 import logging
@@ -20,7 +23,7 @@ import time
 import asyncio
 from typing import List, Dict, Any, Optional
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Request, status, BackgroundTasks, Body
+from fastapi import FastAPI, HTTPException, Request, status, Body
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, validator, constr
@@ -28,6 +31,7 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 import redis
+import redis.asyncio
 
 # Import structured logging and middleware
 from app.logging_config import configure_logging, get_logger
@@ -53,11 +57,24 @@ try:
 except ImportError:
     optimize_router = None
 try:
-    from app.api.optimize_portfolio import optimize_endpoint, OptimizeRequest
+    from app.api.optimize_portfolio import optimize_endpoint, optimize_response_arrays, OptimizeRequest
 except ImportError:
     optimize_endpoint = None
     OptimizeRequest = None
 
+# Compute pool for CPU-bound pipelines (keeps them off the event loop)
+from app.compute import ComputeSaturatedError, get_compute_executor, saturation_http_exception
+
+# Binary (.npy) transport for scenario matrices
+from app.api import matrix_transport
+from app.api.matrix_transport import (
+    MATRIX_CONTENT_TYPE,
+    matrix_response,
+    read_request_payload,
+    resolve_scenario_matrix,
+    wants_matrix_response,
+)
+
 # Import Phase 5 infrastructure
 try:
     from app.job_manager import JobStateManager
@@ -76,9 +93,15 @@ try:
         OwnershipResponse,
         OwnershipPrediction,
     )
-    from app.contest.contest_sim import ContestSimulator
-    from app.contest.field_sim import FieldLineupSampler
-    from app.contest.payout_curve import PayoutCurveFitter
+    # Same module paths the contest package uses internally, so that
+    # ContestSimulator's isinstance checks see the same classes
+    from apps.backend.app.contest.contest_sim import ContestSimulator
+    from apps.backend.app.contest.field_sim import FieldLineupSampler
+    from apps.backend.app.contest.field_pool import (
+        DEFAULT_POOL_SIZE,
+        get_field_pool_cache,
+    )
+    from apps.backend.app.contest.payout_curve import PayoutCurveFitter
     from app.optimizer.leverage_aware import LeverageAwareOptimizer
     from app.api.contracts import (
         ContestSimRequest,
@@ -108,39 +131,6 @@ except ImportError as e:
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
-
-async def graceful_shutdown(job_manager, shutdown_event, timeout: int = 90) -> None:
-    """
-    Graceful shutdown function that waits for in-flight jobs to complete.
-
-    Args:
-        job_manager: JobStateManager instance for checking running jobs
-        shutdown_event: asyncio.Event to signal shutdown
-        timeout: Maximum seconds to wait for jobs to complete (default: 90)
-
-    This function:
-    1. Sets shutdown_event to signal job submission to stop
-    2. Polls running job count until 0 or timeout
-    3. Logs warning if timeout exceeded with jobs still running
-    """
-    logger.info("Shutdown initiated", timeout_seconds=timeout)
-    shutdown_event.set()  # Signal job submission to stop
-
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        running = await job_manager.get_running_job_count()
-        if running == 0:
-            logger.info("All jobs complete, shutting down")
-            return
-        logger.info("Waiting for jobs to complete", running=running)
-        await asyncio.sleep(1)
-
-    remaining = await job_manager.get_running_job_count()
-    logger.warning("Shutdown timeout with jobs still running", remaining=remaining)
-
-
-limiter = Limiter(key_func=get_remote_address)
-
 # OpenAPI tags metadata
 tags_metadata = [
     {
@@ -159,6 +149,10 @@ tags_metadata = [
         "name": "contest",
         "description": "Phase 4: Contest simulation with ownership-based field generation",
     },
+    {
+        "name": "scenarios",
+        "description": "Upload and download scenario matrices (.npy) to reference by ID",
+    },
     {
         "name": "leverage",
         "description": "Phase 4: Leverage-aware optimization with ownership constraints",
@@ -174,14 +168,16 @@ async def lifespan(app: FastAPI):
 
     Startup:
     - Set APP_START_TIME environment variable for uptime tracking
-    - Create Redis connection pool with health checks
+    - Create Redis connection pools with health checks (sync for health
+      checks, redis.asyncio for JobStateManager)
     - Initialize JobStateManager for job persistence
     - Initialize Neo4j driver and store in app.state for readiness checks
     - Store in app.state for endpoint access
 
     Shutdown:
+    - Stop JobStateManager's job-events subscription
     - Close Redis client connection
-    - Disconnect connection pool
+    - Disconnect connection pools
     """
     # Startup - Set APP_START_TIME for health endpoint uptime tracking
     import time
@@ -210,9 +206,21 @@ async def lifespan(app: FastAPI):
         redis_client = redis.Redis(connection_pool=redis_pool)
         app.state.redis_client = redis_client
 
+        # Non-blocking pool for job state. No socket_timeout: the job-events
+        # subscription idles on its socket between events.
+        redis_async_pool = redis.asyncio.ConnectionPool(
+            host=redis_host,
+            port=redis_port,
+            db=0,
+            health_check_interval=30,
+            socket_connect_timeout=3,
+            decode_responses=True,
+        )
+        app.state.redis_async_pool = redis_async_pool
+
         # Initialize JobStateManager if available
         if JobStateManager is not None:
-            job_manager = JobStateManager(redis_pool)
+            job_manager = JobStateManager(redis_async_pool)
             app.state.job_manager = job_manager
             logger.info("Redis connected, JobStateManager initialized")
         else:
@@ -227,6 +235,7 @@ async def lifespan(app: FastAPI):
         logger.error("Failed to connect to Redis", error=str(e))
         # Continue without Redis - will be handled in endpoints
         app.state.redis_pool = None
+        app.state.redis_async_pool = None
         app.state.redis_client = None
         app.state.job_manager = None
 
@@ -269,13 +278,16 @@ async def lifespan(app: FastAPI):
     logger.info("Axiomatic NASCAR DFS API shutting down")
     logger.info("Shutting down Redis connection")
 
-    # Graceful shutdown - wait for running jobs to complete
+    # Stop accepting jobs. Queued optimization jobs run in app.worker
+    # processes, so the API does not wait for them.
+    if hasattr(app.state, "shutdown_event"):
+        app.state.shutdown_event.set()
+
+    # Server has drained in-flight requests, so the compute pool is idle
+    get_compute_executor().shutdown(wait=False)
+
     if hasattr(app.state, "job_manager") and app.state.job_manager:
-        await graceful_shutdown(
-            job_manager=app.state.job_manager,
-            shutdown_event=app.state.shutdown_event,
-            timeout=90,
-        )
+        await app.state.job_manager.close()
 
     if hasattr(app.state, "redis_client") and app.state.redis_client:
         try:
@@ -289,6 +301,12 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning("Error disconnecting Redis pool", error=str(e))
 
+    if hasattr(app.state, "redis_async_pool") and app.state.redis_async_pool:
+        try:
+            await app.state.redis_async_pool.disconnect()
+        except Exception as e:
+            logger.warning("Error disconnecting async Redis pool", error=str(e))
+
 
 app = FastAPI(
     title="Axiomatic NASCAR DFS API",
@@ -345,26 +363,59 @@ async def global_exception_handler(request: Request, exc: Exception):
 if optimize_router is not None:
     app.include_router(optimize_router, prefix="/api/v1", tags=["optimization"])
 
+# Scenario matrix upload/download (binary transport)
+app.include_router(matrix_transport.router, tags=["scenarios"])
+
 # Include health router (should be first for reliability)
 if health_router is not None:
     app.include_router(health_router, tags=["health"])
     logger.info("Health check endpoints registered")
 
 
-@app.post("/optimize", tags=["portfolio"])
-async def optimize_portfolio(request: dict = Body(...), export_csv: bool = False):
+def _matrix_request_body(schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """OpenAPI requestBody for endpoints that take JSON or a framed matrix message."""
+    json_schema = schema or {"type": "object"}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": json_schema},
+                MATRIX_CONTENT_TYPE: {
+                    "schema": {"type": "string", "format": "binary"},
+                    "description": "JSON header with the request fields followed by .npy "
+                                   "arrays (scenario_driver_scores); see app.api.matrix_transport",
+                },
+            },
+        }
+    }
+
+
+@app.post(
+    "/optimize",
+    tags=["portfolio"],
+    openapi_extra=_matrix_request_body(
+        OptimizeRequest.model_json_schema() if OptimizeRequest is not None else None
+    ),
+)
+async def optimize_portfolio(http_request: Request, export_csv: bool = False):
     """
     Generate CVaR-optimized portfolio for NASCAR DFS.
 
     Pipeline:
     1. Generate scenarios using Phase 2 CBN with constraint spec
+       (or use the scenario matrix sent with / referenced by the request)
     2. Run portfolio optimization using Phase 3 CVaR objectives
     3. Validate tail objective (optimizer targets tails, not mean)
     4. Compute calibration metrics (optional)
     5. Generate explain artifacts
 
+    The body is JSON, or an application/vnd.nascar.matrix message whose
+    optional scenario_driver_scores array replaces scenario generation.
+    Send Accept: application/vnd.nascar.matrix to get lineups and the
+    calibration matrix back as .npy arrays.
+
     Args:
-        request: Optimization request with constraint spec and parameters
+        http_request: Incoming request (JSON or framed matrix body)
         export_csv: Export lineups to CSV (returns path in response)
 
     Returns:
@@ -375,16 +426,42 @@ async def optimize_portfolio(request: dict = Body(...), export_csv: bool = False
             status_code=501, detail="Portfolio optimization not available"
         )
 
-    from fastapi import BackgroundTasks
+    fields, arrays = await read_request_payload(http_request)
 
-    # Parse request dict into OptimizeRequest model
+    # Parse request fields into OptimizeRequest model
     try:
-        parsed_request = OptimizeRequest(**request)
+        parsed_request = OptimizeRequest(**fields)
     except Exception as e:
         raise HTTPException(status_code=422, detail=f"Invalid request: {str(e)}")
 
-    background_tasks = BackgroundTasks()
-    return await optimize_endpoint(parsed_request, background_tasks, export_csv)
+    scenarios = _resolve_request_scenarios(
+        arrays.get("scenario_driver_scores"), parsed_request.scenario_matrix_id, required=False
+    )
+    if scenarios is not None and scenarios.shape[1] != len(parsed_request.constraint_spec.drivers):
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid request: scenario matrix has {scenarios.shape[1]} columns, "
+                   f"expected one per driver ({len(parsed_request.constraint_spec.drivers)})",
+        )
+
+    response = await optimize_endpoint(parsed_request, export_csv, scenarios)
+
+    if wants_matrix_response(http_request):
+        return matrix_response(*optimize_response_arrays(response))
+    return response
+
+
+def _resolve_request_scenarios(inline, scenario_matrix_id, required=True):
+    """resolve_scenario_matrix with its errors mapped to HTTP status codes."""
+    try:
+        return resolve_scenario_matrix(inline, scenario_matrix_id, required=required)
+    except KeyError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Scenario matrix {scenario_matrix_id} not found (upload it to /scenario-matrices)",
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid request: {str(e)}")
 
 
 # =============================================================================
@@ -418,7 +495,7 @@ async def estimate_ownership(request: Any) -> Any:
         OwnershipResponse with predictions and optional uncertainty bounds
 
     Raises:
-        HTTPException: If ownership estimation fails
+        HTTPException: 429 if the endpoint is saturated, 500 if ownership estimation fails
     """
     if not PHASE_4_AVAILABLE:
         raise HTTPException(
@@ -426,225 +503,279 @@ async def estimate_ownership(request: Any) -> Any:
         )
 
     try:
-        logger.info(
-            f"Ownership estimation request: {len(request.driver_data)} drivers, "
-            f"track={request.race_data.track_archetype}, "
-            f"ensemble={request.ensemble_method}"
+        return await get_compute_executor().run("ownership", _run_ownership_estimation, request)
+    except ComputeSaturatedError as e:
+        raise saturation_http_exception(e)
+    except Exception as e:
+        logger.error(f"Ownership estimation failed: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500, detail=f"Ownership estimation failed: {str(e)}"
         )
 
-        # Create feature matrix from request
-        import pandas as pd
-
-        driver_data_list = [
-            {
-                "driver_id": d.driver_id,
-                "salary": d.salary,
-                "projected_points": d.projected_points or 50.0,
-                "skill": d.skill or 0.5,
-                "recent_avg_finish": d.recent_avg_finish or 20.0,
-                "track_archetype": request.race_data.track_archetype,
-                "race_date": request.race_data.race_date,
-            }
-            for d in request.driver_data
-        ]
-
-        X = pd.DataFrame(driver_data_list)
-
-        # Check cache for pre-trained model
-        cache_key = f"{request.race_data.track_archetype}_{request.ensemble_method}"
-        estimator = _ownership_estimator_cache.get(cache_key)
 
-        if estimator is None:
-            # Initialize new estimator
-            estimator = HybridOwnershipEstimator(
-                track_archetype=request.race_data.track_archetype,
-                n_recent_races=request.n_recent_races,
-                ensemble_method=request.ensemble_method.value,
-                weights=request.custom_weights,
-            )
+def _run_ownership_estimation(request):
+    """Fit/predict pipeline behind /ownership (CPU-bound, runs in a compute worker)."""
+    logger.info(
+        f"Ownership estimation request: {len(request.driver_data)} drivers, "
+        f"track={request.race_data.track_archetype}, "
+        f"ensemble={request.ensemble_method}"
+    )
 
-            # For now, fit on minimal data (in production, load from DB)
-            # Use mock training data
-            y_mock = np.linspace(30, 0, len(X))  # Decreasing ownership
-            estimator.fit(X, y_mock)
+    # Create feature matrix from request
+    import pandas as pd
+
+    driver_data_list = [
+        {
+            "driver_id": d.driver_id,
+            "salary": d.salary,
+            "projected_points": d.projected_points or 50.0,
+            "skill": d.skill or 0.5,
+            "recent_avg_finish": d.recent_avg_finish or 20.0,
+            "track_archetype": request.race_data.track_archetype,
+            "race_date": request.race_data.race_date,
+        }
+        for d in request.driver_data
+    ]
+
+    X = pd.DataFrame(driver_data_list)
+
+    # Check cache for pre-trained model
+    cache_key = f"{request.race_data.track_archetype}_{request.ensemble_method}"
+    estimator = _ownership_estimator_cache.get(cache_key)
+
+    if estimator is None:
+        # Initialize new estimator
+        estimator = HybridOwnershipEstimator(
+            track_archetype=request.race_data.track_archetype,
+            n_recent_races=request.n_recent_races,
+            ensemble_method=request.ensemble_method.value,
+            weights=request.custom_weights,
+        )
 
-            # Cache estimator
-            _ownership_estimator_cache[cache_key] = estimator
-            logger.info(f"Cached ownership estimator: {cache_key}")
+        # For now, fit on minimal data (in production, load from DB)
+        # Use mock training data
+        y_mock = np.linspace(30, 0, len(X))  # Decreasing ownership
+        estimator.fit(X, y_mock)
 
-        # Generate predictions
-        if request.include_uncertainty:
-            # Predict with uncertainty bounds
-            uncertainty_results = estimator.predict_with_uncertainty(
-                X, n_bootstraps=100
-            )
+        # Cache estimator
+        _ownership_estimator_cache[cache_key] = estimator
+        logger.info(f"Cached ownership estimator: {cache_key}")
 
-            predictions = uncertainty_results["mean"]
-        else:
-            # Simple predictions
-            predictions = estimator.predict(X)
-
-        # Build response
-        ownership_predictions = [
-            {
-                "driver_id": int(d.driver_id),
-                "ownership_percent": float(pred),
-                "uncertainty_lower": float(uncertainty_results["lower_5"][i])
-                if getattr(request, 'include_uncertainty', False)
-                else None,
-                "uncertainty_upper": float(uncertainty_results["upper_95"][i])
-                if getattr(request, 'include_uncertainty', False)
-                else None,
-            }
-            for i, (d, pred) in enumerate(zip(request.driver_data, predictions))
-        ]
+    # Generate predictions
+    if request.include_uncertainty:
+        # Predict with uncertainty bounds
+        uncertainty_results = estimator.predict_with_uncertainty(
+            X, n_bootstraps=100
+        )
 
-        response = {
-            "ownership_predictions": ownership_predictions,
-            "ensemble_method": getattr(request, 'ensemble_method', 'voting'),
-            "feature_importance": getattr(estimator, "feature_importance_", None),
-            "n_recent_races": getattr(request, 'n_recent_races', 5),
-            "model_metadata": {
-                "track_archetype": request.race_data.track_archetype,
-                "n_drivers": len(request.driver_data),
-                "cached": cache_key in _ownership_estimator_cache,
-            },
+        predictions = uncertainty_results["mean"]
+    else:
+        # Simple predictions
+        predictions = estimator.predict(X)
+
+    # Build response
+    ownership_predictions = [
+        {
+            "driver_id": int(d.driver_id),
+            "ownership_percent": float(pred),
+            "uncertainty_lower": float(uncertainty_results["lower_5"][i])
+            if getattr(request, 'include_uncertainty', False)
+            else None,
+            "uncertainty_upper": float(uncertainty_results["upper_95"][i])
+            if getattr(request, 'include_uncertainty', False)
+            else None,
         }
+        for i, (d, pred) in enumerate(zip(request.driver_data, predictions))
+    ]
+
+    response = {
+        "ownership_predictions": ownership_predictions,
+        "ensemble_method": getattr(request, 'ensemble_method', 'voting'),
+        "feature_importance": getattr(estimator, "feature_importance_", None),
+        "n_recent_races": getattr(request, 'n_recent_races', 5),
+        "model_metadata": {
+            "track_archetype": request.race_data.track_archetype,
+            "n_drivers": len(request.driver_data),
+            "cached": cache_key in _ownership_estimator_cache,
+        },
+    }
 
-        logger.info(
-            f"Ownership estimation complete: avg_ownership={np.mean(predictions):.1f}%"
-        )
+    logger.info(
+        f"Ownership estimation complete: avg_ownership={np.mean(predictions):.1f}%"
+    )
 
-        return response
+    return response
 
-    except Exception as e:
-        logger.error(f"Ownership estimation failed: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=500, detail=f"Ownership estimation failed: {str(e)}"
-        )
 
 
-@app.post("/contest-sim", tags=["contest"])
-async def simulate_contest(request: ContestSimRequest):
+@app.post(
+    "/contest-sim",
+    tags=["contest"],
+    openapi_extra=_matrix_request_body(
+        ContestSimRequest.model_json_schema() if ContestSimRequest is not None else None
+    ),
+)
+async def simulate_contest(http_request: Request):
     """
     Simulate contest outcomes with ownership-based field generation.
 
     Runs Monte Carlo simulations to estimate ROI, cash%, and win probability
     for DFS lineups against ownership-weighted field lineups.
 
+    The scenario matrix arrives as JSON scenario_driver_scores, as a .npy
+    array in an application/vnd.nascar.matrix body, or as the
+    scenario_matrix_id of a matrix uploaded to /scenario-matrices.
+
     Pipeline:
-    1. Convert scenario_driver_scores to numpy array
+    1. Resolve the scenario matrix to a numpy array
     2. Create FieldLineupSampler (uses ownership from context or defaults)
-    3. Load or fit PayoutCurveFitter for contest_size_tier
-    4. Create ContestSimulator with field sampler and payout curve
-    5. Run simulate_portfolio() with my_lineup_scores and scenarios
-    6. Compute metrics (ROI, cash%, win probability) with confidence intervals
+    3. Get the slate's pre-sampled field pool (cached across requests)
+    4. Load or fit PayoutCurveFitter for contest_size_tier
+    5. Create ContestSimulator with field sampler, field pool and payout curve
+    6. Run simulate_portfolio() with my_lineup_scores and scenarios
+       (all lineups in one shared contest if self_competition is set)
+    7. Compute metrics (ROI, cash%, win probability, portfolio ROI) with confidence intervals
 
     Args:
-        request: Contest simulation request with lineup scores and scenarios
+        http_request: Contest simulation request (ContestSimRequest fields)
 
     Returns:
         ContestSimResponse with ROI, cash%, win probability, and confidence intervals
 
     Raises:
-        HTTPException: If contest simulation fails
+        HTTPException: 404 for an unknown scenario_matrix_id, 422 for an invalid
+            request, 429 if the endpoint is saturated, 500 if contest simulation fails
     """
     if not PHASE_4_AVAILABLE:
         raise HTTPException(
             status_code=501, detail="Phase 4 contest simulation not available"
         )
 
+    fields, arrays = await read_request_payload(http_request)
     try:
-        logger.info(
-            f"Contest sim request: {len(request.my_lineup_scores)} lineups, "
-            f"{len(request.scenario_driver_scores)} scenarios, "
-            f"field_size={request.field_size}"
-        )
+        request = ContestSimRequest(**fields)
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Invalid request: {str(e)}")
 
-        # Convert scenario scores to numpy array
-        scenario_scores = np.array(request.scenario_driver_scores)
-        my_scores = np.array(request.my_lineup_scores)
+    # Resolved here, not in the compute worker: uploaded matrices live in
+    # this process's cache, and an ndarray pickles far smaller than lists
+    inline = arrays.get("scenario_driver_scores", request.scenario_driver_scores)
+    scenario_scores = _resolve_request_scenarios(inline, request.scenario_matrix_id)
+    # The worker gets the matrix once, as scenario_scores
+    request = request.model_copy(update={"scenario_driver_scores": None})
 
-        n_scenarios, n_drivers = scenario_scores.shape
+    try:
+        return await get_compute_executor().run(
+            "contest-sim", _run_contest_simulation, request, scenario_scores
+        )
+    except ComputeSaturatedError as e:
+        raise saturation_http_exception(e)
+    except Exception as e:
+        logger.error(f"Contest simulation failed: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500, detail=f"Contest simulation failed: {str(e)}"
+        )
 
-        # Create driver pool for field sampler (mock data)
-        driver_pool = [
-            {"driver_id": i, "salary": 7500 + (i % 5) * 500, "projected_points": 45.0}
-            for i in range(n_drivers)
-        ]
 
-        # Create default ownership (uniform distribution)
-        ownership = np.full(n_drivers, 100.0 / n_drivers)
+def _run_contest_simulation(request, scenario_scores):
+    """Simulation pipeline behind /contest-sim (CPU-bound, runs in a compute worker)."""
+    logger.info(
+        f"Contest sim request: {len(request.my_lineup_scores)} lineups, "
+        f"{scenario_scores.shape[0]} scenarios, "
+        f"field_size={request.field_size}, "
+        f"self_competition={request.self_competition}"
+    )
 
-        # Create field sampler
-        field_sampler = FieldLineupSampler(
-            ownership=ownership, driver_pool=driver_pool, salary_cap=50000, n_drivers=6
-        )
+    my_scores = np.array(request.my_lineup_scores)
 
-        # Load or create payout curve
-        payout_curve = _payout_curve_cache.get(request.contest_size_tier)
+    n_scenarios, n_drivers = scenario_scores.shape
 
-        if payout_curve is None:
-            # Use default payout structure
-            logger.info(
-                f"Using default payout structure for '{request.contest_size_tier}'"
-            )
-            payout_curve = None  # Simulator will use defaults
-
-        # Create simulator
-        simulator = ContestSimulator(
-            field_sampler=field_sampler,
-            payout_curve=payout_curve,
-            field_size=request.field_size,
-            n_scenarios=n_scenarios,
-            n_contest_sims=request.n_contest_sims,
-            default_payout_structure="standard_gpp",
-        )
+    # Create driver pool for field sampler (mock data)
+    driver_pool = [
+        {"driver_id": i, "salary": 7500 + (i % 5) * 500, "projected_points": 45.0}
+        for i in range(n_drivers)
+    ]
 
-        # Run simulation
-        results = simulator.simulate_portfolio(
-            my_lineup_scores=my_scores,
-            scenario_driver_scores=scenario_scores,
-            buyin=request.contest_buyin,
-        )
+    # Create default ownership (uniform distribution)
+    ownership = np.full(n_drivers, 100.0 / n_drivers)
 
-        # Compute metrics
-        metrics = simulator.compute_contest_metrics(
-            results, buyin=request.contest_buyin
-        )
+    # Create field sampler
+    field_sampler = FieldLineupSampler(
+        ownership=ownership, driver_pool=driver_pool, salary_cap=50000, n_drivers=6
+    )
 
-        # Calculate confidence intervals
-        payouts = results["payouts"]
-        roi_values = (payouts - request.contest_buyin) / request.contest_buyin * 100
-
-        response = ContestSimResponse(
-            roi=float(metrics["roi"]),
-            roi_std=float(roi_values.std()),
-            roi_lower_5=float(np.percentile(roi_values, 5)),
-            roi_upper_95=float(np.percentile(roi_values, 95)),
-            cash_pct=float(metrics["cash_pct"]),
-            cash_se=float(metrics["cash_pct"] * 0.1),  # Approximate SE
-            win_prob=float(metrics["win_prob"]),
-            win_se=float(metrics["win_prob"] * 0.1),  # Approximate SE
-            best_rank=int(results["ranks"].min()),
-            worst_rank=int(results["ranks"].max()),
-            best_payout=float(payouts.max()),
-            n_simulations=int(len(results["ranks"].flatten())),
-        )
+    # Field composition does not depend on the scenario: reuse one pool
+    # per slate and seed across contest sims and requests
+    field_pool = get_field_pool_cache().get_pool(
+        field_sampler,
+        pool_size=max(DEFAULT_POOL_SIZE, 10 * request.field_size),
+        seed=request.seed,
+    )
 
+    # Load or create payout curve
+    payout_curve = _payout_curve_cache.get(request.contest_size_tier)
+
+    if payout_curve is None:
+        # Use default payout structure
         logger.info(
-            f"Contest sim complete: ROI={response.roi:.2f}%, "
-            f"Cash%={response.cash_pct:.1f}%, "
-            f"Win%={response.win_prob:.2f}%"
+            f"Using default payout structure for '{request.contest_size_tier}'"
         )
+        payout_curve = None  # Simulator will use defaults
+
+    # Create simulator
+    simulator = ContestSimulator(
+        field_sampler=field_sampler,
+        payout_curve=payout_curve,
+        field_size=request.field_size,
+        n_scenarios=n_scenarios,
+        n_contest_sims=request.n_contest_sims,
+        default_payout_structure="standard_gpp",
+        field_pool=field_pool,
+    )
 
-        return response
+    # Run simulation
+    results = simulator.simulate_portfolio(
+        my_lineup_scores=my_scores,
+        scenario_driver_scores=scenario_scores,
+        buyin=request.contest_buyin,
+        self_competition=request.self_competition,
+    )
+
+    # Compute metrics
+    metrics = simulator.compute_contest_metrics(
+        results, buyin=request.contest_buyin
+    )
+
+    # Calculate confidence intervals
+    payouts = results["payouts"]
+    roi_values = (payouts - request.contest_buyin) / request.contest_buyin * 100
+
+    response = ContestSimResponse(
+        roi=float(metrics["roi"]),
+        roi_std=float(roi_values.std()),
+        roi_lower_5=float(np.percentile(roi_values, 5)),
+        roi_upper_95=float(np.percentile(roi_values, 95)),
+        cash_pct=float(metrics["cash_pct"]),
+        cash_se=float(metrics["cash_pct"] * 0.1),  # Approximate SE
+        win_prob=float(metrics["win_prob"]),
+        win_se=float(metrics["win_prob"] * 0.1),  # Approximate SE
+        best_rank=int(results["ranks"].min()),
+        worst_rank=int(results["ranks"].max()),
+        best_payout=float(payouts.max()),
+        n_simulations=int(len(results["ranks"].flatten())),
+        portfolio_roi=float(metrics["portfolio_roi"]),
+        portfolio_roi_std=float(metrics["portfolio_roi_std"]),
+        portfolio_cash_pct=float(metrics["portfolio_cash_pct"]),
+    )
+
+    logger.info(
+        f"Contest sim complete: ROI={response.roi:.2f}%, "
+        f"Cash%={response.cash_pct:.1f}%, "
+        f"Win%={response.win_prob:.2f}%"
+    )
+
+    return response
 
-    except Exception as e:
-        logger.error(f"Contest simulation failed: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=500, detail=f"Contest simulation failed: {str(e)}"
-        )
 
 
 @app.post("/optimize-with-leverage", tags=["leverage"])
@@ -671,7 +802,7 @@ async def optimize_with_leverage(request: LeverageOptimizeRequest):
         LeverageOptimizeResponse with lineups and metrics
 
     Raises:
-        HTTPException: If leverage optimization fails
+        HTTPException: 429 if the endpoint is saturated, 500 if leverage optimization fails
     """
     if not PHASE_4_AVAILABLE:
         raise HTTPException(
@@ -679,156 +810,170 @@ async def optimize_with_leverage(request: LeverageOptimizeRequest):
         )
 
     try:
-        logger.info(
-            f"Leverage optimization request: {request.n_lineups} lineups, "
-            f"leverage_penalty={request.leverage_penalty:.2f}, "
-            f"n_scenarios={request.n_scenarios}"
+        response = await get_compute_executor().run("optimize-with-leverage", _run_leverage_optimization, request)
+    except ComputeSaturatedError as e:
+        raise saturation_http_exception(e)
+    except Exception as e:
+        logger.error(f"Leverage optimization failed: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500, detail=f"Leverage optimization failed: {str(e)}"
         )
 
-        # Convert ownership to numpy array
-        ownership = np.array(request.ownership_estimates)
-
-        # Create leverage-aware optimizer
-        leverage_optimizer = LeverageAwareOptimizer(
-            ownership=ownership,
-            leverage_penalty=request.leverage_penalty,
-            max_ownership_per_driver=request.max_ownership_per_driver,
-            min_low_ownership_drivers=request.min_low_ownership_drivers,
-            max_total_ownership=request.max_total_ownership,
+    if response is None:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to generate any leverage-optimized lineups",
         )
+    return response
 
-        # Create driver data (mock for now)
-        n_drivers = len(ownership)
-        driver_data = [
-            {
-                "driver_id": i,
-                "name": f"Driver_{i}",
-                "salary": 7500 + (i % 5) * 500,
-                "team": f"team_{i % 3}",
-            }
-            for i in range(n_drivers)
-        ]
 
-        # Create mock scenarios
-        np.random.seed(42)
-        scenarios = np.random.gamma(20, 2, size=(request.n_scenarios, n_drivers))
+def _run_leverage_optimization(request):
+    """
+    Optimization pipeline behind /optimize-with-leverage (CPU-bound, runs in a compute worker).
 
-        # Generate lineups
-        if request.use_regime_allocation:
-            # Regime-aware allocation
-            # For now, use mock regimes
-            regimes = np.random.choice(
-                ["dominator", "chaos", "fuel_mileage"], size=request.n_scenarios
-            )
+    Returns:
+        LeverageOptimizeResponse, or None if no lineups could be generated
+    """
+    logger.info(
+        f"Leverage optimization request: {request.n_lineups} lineups, "
+        f"leverage_penalty={request.leverage_penalty:.2f}, "
+        f"n_scenarios={request.n_scenarios}"
+    )
 
-            portfolio_by_regime = leverage_optimizer.generate_regime_aware_portfolio(
-                driver_data=driver_data,
-                scenarios=scenarios,
-                regimes=regimes,
-                salary_cap=request.constraint_spec.salary_cap,
-                n_drivers=request.constraint_spec.n_drivers,
-                n_lineups_per_regime=max(1, request.n_lineups // 3),
-            )
+    # Convert ownership to numpy array
+    ownership = np.array(request.ownership_estimates)
 
-            # Flatten regime portfolios
-            all_lineups = []
-            for regime, lineups in portfolio_by_regime.items():
-                all_lineups.extend(lineups)
+    # Create leverage-aware optimizer
+    leverage_optimizer = LeverageAwareOptimizer(
+        ownership=ownership,
+        leverage_penalty=request.leverage_penalty,
+        max_ownership_per_driver=request.max_ownership_per_driver,
+        min_low_ownership_drivers=request.min_low_ownership_drivers,
+        max_total_ownership=request.max_total_ownership,
+    )
 
-        else:
-            # Standard leverage optimization
-            all_lineups = leverage_optimizer.optimize_lineup_with_leverage(
-                driver_data=driver_data,
-                scenarios=scenarios,
-                salary_cap=request.constraint_spec.salary_cap,
-                n_drivers=request.constraint_spec.n_drivers,
-                n_lineups=request.n_lineups,
-            )
+    # Create driver data (mock for now)
+    n_drivers = len(ownership)
+    driver_data = [
+        {
+            "driver_id": i,
+            "name": f"Driver_{i}",
+            "salary": 7500 + (i % 5) * 500,
+            "team": f"team_{i % 3}",
+        }
+        for i in range(n_drivers)
+    ]
+
+    # Create mock scenarios
+    np.random.seed(42)
+    scenarios = np.random.gamma(20, 2, size=(request.n_scenarios, n_drivers))
+
+    # Generate lineups
+    if request.use_regime_allocation:
+        # Regime-aware allocation
+        # For now, use mock regimes
+        regimes = np.random.choice(
+            ["dominator", "chaos", "fuel_mileage"], size=request.n_scenarios
+        )
 
-        if not all_lineups:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to generate any leverage-optimized lineups",
+        portfolio_by_regime = leverage_optimizer.generate_regime_aware_portfolio(
+            driver_data=driver_data,
+            scenarios=scenarios,
+            regimes=regimes,
+            salary_cap=request.constraint_spec.salary_cap,
+            n_drivers=request.constraint_spec.n_drivers,
+            n_lineups_per_regime=max(1, request.n_lineups // 3),
+        )
+
+        # Flatten regime portfolios
+        all_lineups = []
+        for regime, lineups in portfolio_by_regime.items():
+            all_lineups.extend(lineups)
+
+    else:
+        # Standard leverage optimization
+        all_lineups = leverage_optimizer.optimize_lineup_with_leverage(
+            driver_data=driver_data,
+            scenarios=scenarios,
+            salary_cap=request.constraint_spec.salary_cap,
+            n_drivers=request.constraint_spec.n_drivers,
+            n_lineups=request.n_lineups,
+        )
+
+    if not all_lineups:
+        return None
+
+    # Limit to requested number
+    all_lineups = all_lineups[: request.n_lineups]
+
+    # Convert to API response format
+    response_lineups = []
+    for lineup in all_lineups:
+        drivers = [
+            DriverInLineup(
+                driver_id=int(d["driver_id"]),
+                name=driver_data[d["driver_id"]]["name"],
+                salary=driver_data[d["driver_id"]]["salary"],
+                projected_points=float(
+                    lineup.get("total_projected_points", 150) / 6
+                ),
+                ownership=float(ownership[d["driver_id"]]),
             )
+            for d in [{"driver_id": i} for i in lineup["drivers"]]
+        ]
 
-        # Limit to requested number
-        all_lineups = all_lineups[: request.n_lineups]
-
-        # Convert to API response format
-        response_lineups = []
-        for lineup in all_lineups:
-            drivers = [
-                DriverInLineup(
-                    driver_id=int(d["driver_id"]),
-                    name=driver_data[d["driver_id"]]["name"],
-                    salary=driver_data[d["driver_id"]]["salary"],
-                    projected_points=float(
-                        lineup.get("total_projected_points", 150) / 6
-                    ),
-                    ownership=float(ownership[d["driver_id"]]),
-                )
-                for d in [{"driver_id": i} for i in lineup["drivers"]]
-            ]
-
-            response_lineups.append(
-                LineupWithLeverage(
-                    drivers=drivers,
-                    total_projected_points=float(
-                        lineup.get("total_projected_points", 150)
-                    ),
-                    total_salary=int(lineup.get("total_salary", 48000)),
-                    avg_ownership=float(lineup.get("avg_ownership", 15)),
-                    max_ownership=float(lineup.get("max_ownership", 25)),
-                    total_ownership=float(lineup.get("total_ownership", 90)),
-                    leverage_score=float(lineup.get("leverage_score", 50)),
-                    regime=lineup.get("regime"),
-                )
+        response_lineups.append(
+            LineupWithLeverage(
+                drivers=drivers,
+                total_projected_points=float(
+                    lineup.get("total_projected_points", 150)
+                ),
+                total_salary=int(lineup.get("total_salary", 48000)),
+                avg_ownership=float(lineup.get("avg_ownership", 15)),
+                max_ownership=float(lineup.get("max_ownership", 25)),
+                total_ownership=float(lineup.get("total_ownership", 90)),
+                leverage_score=float(lineup.get("leverage_score", 50)),
+                regime=lineup.get("regime"),
             )
+        )
 
-        # Calculate portfolio metrics
-        avg_points = np.mean([l.total_projected_points for l in response_lineups])
-        avg_salary = np.mean([l.total_salary for l in response_lineups])
+    # Calculate portfolio metrics
+    avg_points = np.mean([l.total_projected_points for l in response_lineups])
+    avg_salary = np.mean([l.total_salary for l in response_lineups])
 
-        portfolio_metrics = PortfolioMetrics(
-            avg_projected_points=float(avg_points),
-            avg_salary=int(avg_salary),
-            portfolio_correlation=0.3,  # Mock value
-            diversification_score=0.7,  # Mock value
-        )
+    portfolio_metrics = PortfolioMetrics(
+        avg_projected_points=float(avg_points),
+        avg_salary=int(avg_salary),
+        portfolio_correlation=0.3,  # Mock value
+        diversification_score=0.7,  # Mock value
+    )
 
-        # Calculate ownership metrics
-        avg_lineup_ownership = np.mean([l.avg_ownership for l in response_lineups])
-        min_lineup_ownership = np.min([l.avg_ownership for l in response_lineups])
-        max_lineup_ownership = np.max([l.avg_ownership for l in response_lineups])
-        low_ownership_count = sum(
-            1 for l in response_lineups for d in l.drivers if d.ownership < 10
-        )
+    # Calculate ownership metrics
+    avg_lineup_ownership = np.mean([l.avg_ownership for l in response_lineups])
+    min_lineup_ownership = np.min([l.avg_ownership for l in response_lineups])
+    max_lineup_ownership = np.max([l.avg_ownership for l in response_lineups])
+    low_ownership_count = sum(
+        1 for l in response_lineups for d in l.drivers if d.ownership < 10
+    )
 
-        ownership_metrics = OwnershipMetrics(
-            avg_lineup_ownership=float(avg_lineup_ownership),
-            min_lineup_ownership=float(min_lineup_ownership),
-            max_lineup_ownership=float(max_lineup_ownership),
-            low_ownership_driver_count=low_ownership_count,
-            diversification_score=0.7,  # Mock value
-        )
+    ownership_metrics = OwnershipMetrics(
+        avg_lineup_ownership=float(avg_lineup_ownership),
+        min_lineup_ownership=float(min_lineup_ownership),
+        max_lineup_ownership=float(max_lineup_ownership),
+        low_ownership_driver_count=low_ownership_count,
+        diversification_score=0.7,  # Mock value
+    )
 
-        response = LeverageOptimizeResponse(
-            lineups=response_lineups,
-            portfolio_metrics=portfolio_metrics,
-            ownership_metrics=ownership_metrics,
-        )
+    response = LeverageOptimizeResponse(
+        lineups=response_lineups,
+        portfolio_metrics=portfolio_metrics,
+        ownership_metrics=ownership_metrics,
+    )
 
-        logger.info(
-            f"Leverage optimization complete: {len(response_lineups)} lineups, "
-            f"avg_ownership={avg_lineup_ownership:.1f}%"
-        )
+    logger.info(
+        f"Leverage optimization complete: {len(response_lineups)} lineups, "
+        f"avg_ownership={avg_lineup_ownership:.1f}%"
+    )
 
-        return response
+    return response
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Leverage optimization failed: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=500, detail=f"Leverage optimization failed: {str(e)}"
-        )
@@ -31,8 +31,11 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     Index,
-    create_engine
+    create_engine,
+    inspect,
+    text,
 )
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker, Session
 from fastapi import Depends
@@ -129,6 +132,8 @@ class Proposition(Base):
         cascade="all, delete-orphan",
         lazy="dynamic"
     )
+    driver = relationship("Driver", back_populates="propositions")
+    race = relationship("Race", back_populates="propositions")
 
     # Indexes for common queries
     __table_args__ = (
@@ -201,6 +206,7 @@ class Belief(Base):
         epistemic_var: Epistemic variance/uncertainty
         timestamp: When this belief state was recorded
         source: Source of this belief (prior, mc_sim, qualifying, practice)
+        distribution: JSON finish-state PMF {state: probability} (nullable)
     """
     __tablename__ = "beliefs"
 
@@ -212,6 +218,7 @@ class Belief(Base):
     epistemic_var = Column(Float, nullable=False)  # Epistemic variance
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
     source = Column(String(50), nullable=False, index=True)  # "prior", "mc_sim", "qualifying", "practice"
+    distribution = Column(JSON, nullable=True)  # {finish_state: probability}
 
     # Relationships
     agent = relationship("Agent", back_populates="beliefs")
@@ -492,18 +499,48 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-def create_all_tables() -> None:
+# Nullable columns added to tables that existed before them. create_all never
+# alters an existing table, so create_all_tables adds these where missing.
+ADDED_COLUMNS = [
+    ("beliefs", "distribution"),
+]
+
+
+def _add_missing_columns(bind: Engine) -> None:
+    """ALTER TABLE ... ADD COLUMN for each ADDED_COLUMNS entry a table lacks."""
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table_name, column_name in ADDED_COLUMNS:
+            if not inspector.has_table(table_name):
+                continue
+            existing = {col["name"] for col in inspector.get_columns(table_name)}
+            if column_name in existing:
+                continue
+            column = Base.metadata.tables[table_name].c[column_name]
+            column_type = column.type.compile(dialect=bind.dialect)
+            conn.execute(text(
+                f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"
+            ))
+
+
+def create_all_tables(bind: Optional[Engine] = None) -> None:
     """
     Create all database tables.
     
     This function creates all tables defined in the schema if they
     don't already exist. It's safe to call multiple times as it uses
-    SQLAlchemy's create_all which only creates missing tables.
+    SQLAlchemy's create_all which only creates missing tables, then
+    adds any ADDED_COLUMNS missing from tables created by older schemas.
     
     Note: This should be called during application initialization,
     typically in a startup event or migration script.
+    
+    Args:
+        bind: Engine to create tables on (defaults to the module engine)
     """
-    Base.metadata.create_all(bind=engine)
+    bind = bind if bind is not None else engine
+    Base.metadata.create_all(bind=bind)
+    _add_missing_columns(bind)
 
 
 def get_db() -> Session:
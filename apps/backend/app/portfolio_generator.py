@@ -6,7 +6,8 @@ optimization to produce 20-150 diverse lineups targeting tournament equity (top
 
 Key features:
 - Scenario matrix caching (no re-simulation per lineup)
-- Independent CVaR optimization per lineup (no warm starting for diversity)
+- Persistent lineup model: built once, then per-lineup cuts, exposure bounds
+  and diversity terms with warm-started re-solves
 - Exposure bookkeeping (driver and team limits)
 - Correlation penalty for lineup diversity
 - DraftKings compliance enforcement
@@ -14,35 +15,126 @@ Key features:
 - Regime-aware portfolio allocation across race-flow scenarios
 - Ownership-aware optimization for tournament leverage
 
-Each lineup is an independent CVaR optimization using cached scenario matrices from
-Phase 2 scenario generation. The portfolio is generated iteratively with exposure
-constraints and correlation penalties to ensure diversity.
+Each lineup is a CVaR optimization over cached scenario matrices from Phase 2
+scenario generation. The portfolio is generated iteratively with exposure
+constraints, no-good cuts and correlation penalties to ensure diversity.
 """
 
+import hashlib
+import json
 import logging
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
 from typing import Dict, List, Any, Optional, Callable
 import numpy as np
 import pandas as pd
-from pulp import LpProblem, LpMaximize, LpVariable, PULP_CBC_CMD, LpStatus, lpSum
-
-from app.tail_objectives import build_multi_cvar_objective, build_upper_tail_cvar_objective
+from pulp import (
+    LpProblem,
+    LpMaximize,
+    LpVariable,
+    LpAffineExpression,
+    LpStatus,
+    lpSum,
+)
+
+from app.tail_objectives import (
+    build_multi_cvar_objective,
+    build_compact_multi_cvar_objective,
+    reduce_scenarios,
+    ScenarioReduction,
+)
 from app.tail_metrics import compute_tail_metrics, adaptive_scenario_count
 from app.constraints.dk_rules import add_dk_compliance_constraints, validate_dk_lineup
-from app.constraints.exposure import add_exposure_constraints, update_exposure_book
+from app.constraints.exposure import (
+    add_exposure_constraints,
+    get_overexposed_drivers,
+    update_exposure_book,
+)
 from app.constraints.diversity import add_correlation_penalty, compute_portfolio_correlation
+from app.solver_backend import SolverBackend, get_solver_backend
 
 logger = logging.getLogger(__name__)
 
 
+# Environment overrides for the shared scenario cache
+SCENARIO_CACHE_MAX_BYTES_ENV = "SCENARIO_CACHE_MAX_BYTES"
+SCENARIO_CACHE_DIR_ENV = "SCENARIO_CACHE_DIR"
+SCENARIO_CACHE_MAX_SPILL_BYTES_ENV = "SCENARIO_CACHE_MAX_SPILL_BYTES"
+
+# In-memory budget of the shared scenario cache (1 GiB)
+DEFAULT_SCENARIO_CACHE_MAX_BYTES = 1 << 30
+
+# Spill directory of the shared scenario cache, common to every process on the host
+DEFAULT_SCENARIO_CACHE_DIR = os.path.join(tempfile.gettempdir(), "nascar-scenario-cache")
+
+# On-disk budget of the spill directory (8 GiB)
+DEFAULT_SCENARIO_CACHE_MAX_SPILL_BYTES = 8 << 30
+
+
+def scenario_cache_key(**parts: Any) -> str:
+    """
+    Build a content-hash cache key for a scenario matrix.
+
+    Every keyword (e.g. constraint_spec, track_id, random_seed, n_scenarios)
+    is serialized to canonical JSON and hashed, so two requests share an
+    entry only if everything that determines the simulation matches.
+    Pydantic models are serialized with model_dump(mode="json").
+
+    Args:
+        **parts: Values that determine the scenario matrix
+
+    Returns:
+        Hex digest usable as a cache key and file name
+
+    Example:
+        >>> key = scenario_cache_key(track_id="daytona", random_seed=42, n_scenarios=10000)
+        >>> key == scenario_cache_key(n_scenarios=10000, random_seed=42, track_id="daytona")
+        True
+    """
+    def _canonical(value: Any) -> Any:
+        if hasattr(value, "model_dump"):
+            return value.model_dump(mode="json")
+        return value
+
+    payload = json.dumps(
+        {name: _canonical(value) for name, value in parts.items()},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
 class ScenarioCache:
     """
     Cache scenario matrices to avoid re-simulation.
 
     Scenario generation is expensive (10000+ scenarios via CBN sampling). This cache
-    stores scenario matrices per race_id and n_scenarios combination, enabling
-    100x speedup when generating multiple lineups for the same race.
-
-    Cache key format: "{race_id}_{n_scenarios}"
+    stores scenario matrices under content-hash keys (see scenario_cache_key),
+    enabling 100x speedup when generating multiple lineups for the same race and
+    across repeat optimizations of the same slate.
+
+    Memory use is bounded: entries are kept in LRU order and the least recently
+    used matrices are evicted once their total size exceeds max_bytes. With a
+    spill_dir, evicted matrices are written there as .npy files and later
+    lookups (from this or any other worker process sharing the directory)
+    memory-map them read-only instead of re-simulating. The directory is
+    kept under max_spill_bytes by deleting the least recently used files.
+    With write_through, newly generated matrices are also written to
+    spill_dir right away, so worker processes that share the directory
+    (see app.compute) reuse each other's scenarios instead of each
+    simulating its own copy.
+
+    Concurrent requests for the same key simulate it once: later callers
+    wait on the first caller's in-flight generation. Generation runs
+    outside the cache lock, so other keys are served meanwhile.
+
+    Without an explicit key, get_scenarios keys on race_id and n_scenarios.
+    put/get store and look up matrices directly by key, e.g. client-uploaded
+    matrices referenced by their matrix ID (app.api.matrix_transport).
 
     Example:
         >>> cache = ScenarioCache()
@@ -52,16 +144,50 @@ class ScenarioCache:
         >>> assert scenarios is scenarios2  # Same object reference
     """
 
-    def __init__(self):
-        """Initialize empty scenario cache."""
-        self._cache = {}
-        logger.debug("ScenarioCache initialized")
+    def __init__(
+        self,
+        max_bytes: Optional[int] = DEFAULT_SCENARIO_CACHE_MAX_BYTES,
+        spill_dir: Optional[str] = None,
+        max_spill_bytes: Optional[int] = None,
+        write_through: bool = False
+    ):
+        """
+        Initialize empty scenario cache.
+
+        Args:
+            max_bytes: In-memory size budget in bytes (None = unbounded)
+            spill_dir: Directory for evicted matrices (None = drop on eviction)
+            max_spill_bytes: On-disk size budget of spill_dir in bytes (None = unbounded)
+            write_through: Also write generated matrices to spill_dir immediately
+        """
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        self.write_through = write_through
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._in_flight: Dict[str, Future] = {}
+        self._stats = {
+            "hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0,
+            "spills": 0, "spill_removals": 0,
+        }
+
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+            self._prune_spill_dir()
+
+        logger.debug(
+            f"ScenarioCache initialized (max_bytes={max_bytes}, spill_dir={spill_dir}, "
+            f"max_spill_bytes={max_spill_bytes}, write_through={write_through})"
+        )
 
     def get_scenarios(
         self,
         race_id: str,
         n_scenarios: int,
-        scenario_fn: Callable[[int], np.ndarray]
+        scenario_fn: Callable[[int], np.ndarray],
+        key: Optional[str] = None
     ) -> np.ndarray:
         """
         Get scenarios from cache or generate using scenario_fn.
@@ -71,9 +197,11 @@ class ScenarioCache:
             n_scenarios: Number of scenarios to generate
             scenario_fn: Function that generates scenarios (takes n_scenarios, returns ndarray)
                         Shape: (n_scenarios, n_drivers) with DFS points per scenario
+            key: Cache key from scenario_cache_key (default: hash of race_id and n_scenarios)
 
         Returns:
-            ndarray (n_scenarios, n_drivers) with DFS points per scenario
+            ndarray (n_scenarios, n_drivers) with DFS points per scenario; matrices
+            loaded from spill_dir are read-only memory maps
 
         Example:
             >>> def mock_scenarios(n):
@@ -84,26 +212,193 @@ class ScenarioCache:
             >>> scenarios = cache.get_scenarios("race_1", 1000, mock_scenarios)
             >>> print(f"Generated scenarios: {scenarios.shape}")
         """
-        cache_key = f"{race_id}_{n_scenarios}"
+        if key is None:
+            key = scenario_cache_key(race_id=race_id, n_scenarios=n_scenarios)
+
+        with self._lock:
+            scenarios = self._lookup(key)
+            if scenarios is not None:
+                logger.info(f"Cache HIT for race '{race_id}' ({n_scenarios} scenarios, key {key})")
+                return scenarios
+
+            # Only the first caller for a key generates; the others wait on it
+            in_flight = self._in_flight.get(key)
+            generating = in_flight is None
+            if generating:
+                in_flight = self._in_flight[key] = Future()
+
+        if not generating:
+            logger.info(f"Waiting for in-flight generation of race '{race_id}' (key {key})")
+            return in_flight.result()
+
+        logger.info(f"Cache MISS for race '{race_id}' (key {key}), generating {n_scenarios} scenarios")
+        try:
+            scenarios = scenario_fn(n_scenarios)
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            in_flight.set_exception(e)
+            raise
 
-        if cache_key in self._cache:
-            logger.info(f"Cache HIT for {cache_key} ({n_scenarios} scenarios)")
-            return self._cache[cache_key]
+        if self.write_through:
+            self._spill(key, scenarios)  # Outside the lock; the write can be slow
 
-        logger.info(f"Cache MISS for {cache_key}, generating {n_scenarios} scenarios")
-        scenarios = scenario_fn(n_scenarios)
-        self._cache[cache_key] = scenarios
+        with self._lock:
+            self._store(key, scenarios)
+            del self._in_flight[key]
+        in_flight.set_result(scenarios)
 
         logger.info(
             f"Cached {n_scenarios} scenarios for race '{race_id}' "
-            f"(shape: {scenarios.shape})"
+            f"(shape: {scenarios.shape}, {scenarios.nbytes} bytes)"
         )
 
         return scenarios
 
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up a matrix by cache key without generating it.
+
+        Args:
+            key: Cache key (e.g. a scenario matrix ID)
+
+        Returns:
+            Cached matrix (a read-only memory map if found in spill_dir), or None
+        """
+        with self._lock:
+            return self._lookup(key)
+
+    def put(self, key: str, scenarios: np.ndarray, persist: bool = False) -> None:
+        """
+        Store a matrix under key (e.g. one uploaded by a client).
+
+        Args:
+            key: Cache key
+            scenarios: Matrix to cache
+            persist: Also write it to spill_dir right away, so other worker
+                processes sharing the directory can find it
+        """
+        with self._lock:
+            if key in self._cache:
+                self._bytes -= self._cache.pop(key).nbytes
+            self._store(key, scenarios)
+            if persist:
+                self._spill(key, scenarios)
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        """Memory, then spill_dir lookup that updates LRU order and stats (lock held)."""
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self._stats["hits"] += 1
+            return self._cache[key]
+
+        path = self._spill_path(key)
+        if path is not None and os.path.exists(path):
+            try:
+                scenarios = np.load(path, mmap_mode="r")
+                os.utime(path)  # Most recently used for spill pruning
+            except (FileNotFoundError, ValueError):
+                pass  # Pruned (or still being replaced) by another worker
+            else:
+                self._stats["disk_hits"] += 1
+                logger.debug(f"Mapped spilled scenarios {key} from {path}")
+                self._store(key, scenarios)
+                return scenarios
+
+        self._stats["misses"] += 1
+        return None
+
+    def _spill_path(self, key: str) -> Optional[str]:
+        """Path of the spilled .npy file for key, or None without a spill_dir."""
+        if self.spill_dir is None:
+            return None
+        return os.path.join(self.spill_dir, f"scenarios_{key}.npy")
+
+    def _store(self, key: str, scenarios: np.ndarray) -> None:
+        """Insert an entry as most recently used, then evict down to max_bytes."""
+        self._cache[key] = scenarios
+        self._bytes += scenarios.nbytes
+
+        while self.max_bytes is not None and self._bytes > self.max_bytes and self._cache:
+            evicted_key, evicted = self._cache.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self._stats["evictions"] += 1
+            self._spill(evicted_key, evicted)
+
+    def _spill(self, key: str, scenarios: np.ndarray) -> None:
+        """Write a matrix to spill_dir (no-op if absent or already there)."""
+        path = self._spill_path(key)
+        if path is None or os.path.exists(path):
+            return
+
+        # Write to a temporary name first so other workers never map a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.ascontiguousarray(scenarios))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to spill scenarios {key} to {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        logger.debug(f"Spilled scenarios {key} to {path} ({scenarios.nbytes} bytes)")
+        with self._lock:
+            self._stats["spills"] += 1
+            self._prune_spill_dir()
+
+    def _prune_spill_dir(self) -> None:
+        """Delete the least recently used spill files beyond max_spill_bytes."""
+        if self.spill_dir is None or self.max_spill_bytes is None:
+            return
+
+        files = []
+        for entry in os.scandir(self.spill_dir):
+            if not (entry.name.startswith("scenarios_") and entry.name.endswith(".npy")):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # Removed by another worker
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_spill_bytes:
+                break
+            # Processes that already mapped the file keep their mapping
+            try:
+                os.remove(path)
+                self._stats["spill_removals"] += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return cache statistics.
+
+        Returns:
+            Dict with hits, disk_hits, misses, evictions, spills, spill_removals,
+            entries, bytes (in-memory total), max_bytes and hit_rate
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hits = self._stats["hits"] + self._stats["disk_hits"]
+            return {
+                **self._stats,
+                "entries": len(self._cache),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
     def clear(self):
-        """Clear all cached scenarios."""
-        self._cache.clear()
+        """Clear all in-memory scenarios (spilled files are left for other workers)."""
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
         logger.debug("ScenarioCache cleared")
 
     def size(self) -> int:
@@ -111,6 +406,183 @@ class ScenarioCache:
         return len(self._cache)
 
 
+_shared_scenario_cache: Optional[ScenarioCache] = None
+_shared_scenario_cache_lock = threading.Lock()
+
+
+def get_scenario_cache() -> ScenarioCache:
+    """
+    Return the process-wide scenario cache.
+
+    Created on first use with its budget from SCENARIO_CACHE_MAX_BYTES
+    (default DEFAULT_SCENARIO_CACHE_MAX_BYTES), spill directory from
+    SCENARIO_CACHE_DIR (default DEFAULT_SCENARIO_CACHE_DIR; set it empty to
+    disable spilling) and on-disk budget from SCENARIO_CACHE_MAX_SPILL_BYTES
+    (default DEFAULT_SCENARIO_CACHE_MAX_SPILL_BYTES). Generated matrices are
+    written through to the spill directory, so compute pool worker processes
+    share them.
+
+    Returns:
+        Shared ScenarioCache instance
+    """
+    global _shared_scenario_cache
+    with _shared_scenario_cache_lock:
+        if _shared_scenario_cache is None:
+            _shared_scenario_cache = ScenarioCache(
+                max_bytes=int(os.getenv(
+                    SCENARIO_CACHE_MAX_BYTES_ENV, DEFAULT_SCENARIO_CACHE_MAX_BYTES
+                )),
+                spill_dir=os.getenv(SCENARIO_CACHE_DIR_ENV, DEFAULT_SCENARIO_CACHE_DIR) or None,
+                max_spill_bytes=int(os.getenv(
+                    SCENARIO_CACHE_MAX_SPILL_BYTES_ENV, DEFAULT_SCENARIO_CACHE_MAX_SPILL_BYTES
+                )),
+                write_through=True,
+            )
+        return _shared_scenario_cache
+
+
+def _resolve_scenarios(
+    race_id: str,
+    n_scenarios: int,
+    scenario_fn: Callable[[int], np.ndarray],
+    scenario_cache: Optional[ScenarioCache],
+    scenario_key: Optional[str]
+) -> np.ndarray:
+    """Scenario matrix for a portfolio run, through a cache when one is keyed or given."""
+    if scenario_cache is None and scenario_key is None:
+        return scenario_fn(n_scenarios)
+    cache = scenario_cache if scenario_cache is not None else get_scenario_cache()
+    return cache.get_scenarios(race_id, n_scenarios, scenario_fn, key=scenario_key)
+
+
+def _build_lineup_result(
+    selected_drivers: List[int],
+    scenarios: np.ndarray,
+    driver_data: List[Dict[str, Any]],
+    exposure_book: Dict[int, int],
+    n_lineups_generated: int,
+    cvar_alphas: List[float],
+    salary_cap: int,
+    n_drivers: int,
+    min_stack: int,
+    max_stack: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Validate a solved lineup and attach tail metrics, exposure and salary.
+
+    Returns None if the selection has the wrong size or fails DK validation.
+    """
+    if len(selected_drivers) != n_drivers:
+        logger.error(
+            f"Solver selected {len(selected_drivers)} drivers, expected {n_drivers}"
+        )
+        return None
+
+    # Validate lineup
+    validation = validate_dk_lineup(
+        selected_drivers, driver_data, salary_cap, n_drivers, min_stack, max_stack
+    )
+
+    if not validation["valid"]:
+        logger.error(f"Lineup validation failed: {validation['errors']}")
+        return None
+
+    # Compute tail metrics for this lineup
+    # Get indices of selected drivers
+    driver_indices = [i for i, d in enumerate(driver_data) if d["driver_id"] in selected_drivers]
+    lineup_scenarios = scenarios[:, driver_indices]
+    lineup_points = lineup_scenarios.sum(axis=1)
+
+    # Compute tail metrics
+    metrics = compute_tail_metrics(lineup_points, alpha=cvar_alphas[0])
+
+    # Compute CVaR at second quantile (if provided)
+    cvar_95 = None
+    if len(cvar_alphas) > 1:
+        metrics_95 = compute_tail_metrics(lineup_points, alpha=cvar_alphas[1])
+        cvar_95 = metrics_95.CVaR
+
+    # Calculate exposure for this lineup
+    exposure = {
+        driver_id: (exposure_book.get(driver_id, 0) + 1) / (n_lineups_generated + 1)
+        for driver_id in selected_drivers
+    }
+
+    # Calculate total salary
+    total_salary = sum(
+        d["salary"] for d in driver_data if d["driver_id"] in selected_drivers
+    )
+
+    lineup = {
+        "drivers": selected_drivers,
+        "cvar_99": metrics.CVaR,
+        "cvar_95": cvar_95,
+        "top_1pct": metrics.top_X_pct,
+        "conditional_upside": metrics.conditional_upside,
+        "exposure": exposure,
+        "total_salary": total_salary,
+    }
+
+    logger.info(
+        f"Generated lineup: CVaR(99%)={lineup['cvar_99']:.2f}, "
+        f"Top 1%={lineup['top_1pct']:.2f}, Salary=${total_salary}"
+    )
+
+    return lineup
+
+
+def _build_lineup_objective(
+    prob: LpProblem,
+    x: Dict[int, LpVariable],
+    scenarios: np.ndarray,
+    driver_data: List[Dict[str, Any]],
+    objective_type: str,
+    cvar_alphas: List[float],
+    cvar_weights: List[float],
+    scenario_reduction: Optional[ScenarioReduction] = None
+) -> LpAffineExpression:
+    """
+    Build the mean or bounded Multi-CVaR lineup objective (before diversity penalty).
+
+    CVaR variables and constraints are added to prob.
+    """
+    if objective_type == "mean":
+        # Mean optimization: maximize expected points across scenarios
+        expected_points = {}
+        for i, driver in enumerate(driver_data):
+            driver_id = driver["driver_id"]
+            mean_points = float(scenarios[:, i].mean())
+            expected_points[driver_id] = mean_points
+
+        cvar_objective = lpSum(
+            expected_points[driver_id] * x[driver_id]
+            for driver_id in x.keys()
+        )
+        logger.debug(f"Objective: Mean optimization (expected points)")
+    else:  # objective_type == "cvar" (default after 03-05)
+        # Bounded upper-tail Multi-CVaR (e.g. 70% CVaR(99%) + 30% CVaR(95%)),
+        # built as one compact LP that shares scenario points across quantiles
+        if len(cvar_alphas) > 1:
+            alphas, weights = cvar_alphas[:2], cvar_weights[:2]
+        else:
+            alphas, weights = cvar_alphas[:1], [1.0]
+
+        if scenario_reduction is not None:
+            lp_scenarios = scenario_reduction.scenarios
+            lp_weights = scenario_reduction.weights
+        else:
+            lp_scenarios, lp_weights = scenarios, None
+
+        cvar_objective = build_compact_multi_cvar_objective(
+            prob, lp_scenarios, x, alphas, weights,
+            scenario_weights=lp_weights, var_prefix="cvar"
+        )
+
+        logger.debug(f"Objective: Bounded Upper-Tail CVaR (alpha={cvar_alphas[0]})")
+
+    return cvar_objective
+
+
 def generate_lineup_with_cvar(
     scenarios: np.ndarray,
     driver_data: List[Dict[str, Any]],
@@ -127,7 +599,10 @@ def generate_lineup_with_cvar(
     min_stack: int = 2,
     max_stack: int = 3,
     solver_time_limit: int = 30,
-    objective_type: str = "cvar"
+    objective_type: str = "cvar",
+    scenario_reduction: Optional[ScenarioReduction] = None,
+    solver_backend: Optional[SolverBackend] = None,
+    max_overlap: Optional[int] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Generate single lineup optimized for CVaR.
@@ -152,6 +627,14 @@ def generate_lineup_with_cvar(
         min_stack: Min team stacking (default 2)
         max_stack: Max team stacking (default 3)
         solver_time_limit: Max solve time in seconds (default 30)
+        objective_type: "cvar" for tail optimization, "mean" for expected value
+        scenario_reduction: Optional weighted representatives of scenarios
+            (from reduce_scenarios) used in the CVaR LP instead of the full
+            matrix; tail metrics are still computed on the full scenarios
+        solver_backend: Backend to solve with (default get_solver_backend()
+            with solver_time_limit); its timings record this solve
+        max_overlap: Max drivers shared with any previous lineup
+            (default n_drivers - 1, i.e. no duplicate lineups)
 
     Returns:
         Lineup dict with keys:
@@ -186,6 +669,8 @@ def generate_lineup_with_cvar(
         f"{len(driver_data)} drivers, {len(previous_lineups)} previous lineups"
     )
 
+    build_start = time.perf_counter()
+
     # Create optimization problem
     prob = LpProblem("CVaR_Lineup", LpMaximize)
 
@@ -196,34 +681,10 @@ def generate_lineup_with_cvar(
     }
 
     # Build objective based on objective_type
-    if objective_type == "mean":
-        # Mean optimization: maximize expected points across scenarios
-        expected_points = {}
-        for i, driver in enumerate(driver_data):
-            driver_id = driver["driver_id"]
-            mean_points = float(scenarios[:, i].mean())
-            expected_points[driver_id] = mean_points
-
-        cvar_objective = lpSum(
-            expected_points[driver_id] * x[driver_id]
-            for driver_id in x.keys()
-        )
-        logger.debug(f"Objective: Mean optimization (expected points)")
-    else:  # objective_type == "cvar" (default after 03-05)
-        # Bounded CVaR optimization for upper-tail maximization
-        cvar_objective = build_upper_tail_cvar_objective(
-            prob, scenarios, x, cvar_alphas[0], var_prefix="cvar_99"
-        )
-
-        # Optional: Add CVaR(95%) for stability (Multi-CVaR approach)
-        if len(cvar_alphas) > 1:
-            cvar_95_objective = build_upper_tail_cvar_objective(
-                prob, scenarios, x, cvar_alphas[1], var_prefix="cvar_95"
-            )
-            # Weighted combination: 70% CVaR(99%) + 30% CVaR(95%)
-            cvar_objective = cvar_weights[0] * cvar_objective + cvar_weights[1] * cvar_95_objective
-
-        logger.debug(f"Objective: Bounded Upper-Tail CVaR (alpha={cvar_alphas[0]})")
+    cvar_objective = _build_lineup_objective(
+        prob, x, scenarios, driver_data, objective_type,
+        cvar_alphas, cvar_weights, scenario_reduction
+    )
 
     # Add correlation penalty for diversity
     correlation_penalty = add_correlation_penalty(
@@ -246,14 +707,20 @@ def generate_lineup_with_cvar(
         max_driver_exposure, max_team_exposure, driver_data
     )
 
-    # Solve using system CBC if available (fixes ARM Mac Rosetta issues)
-    try:
-        from pulp import COIN_CMD
-        solver = COIN_CMD(path='/usr/bin/cbc', msg=0, timeLimit=solver_time_limit)
-    except Exception:
-        # Fallback to default PuLP CBC
-        solver = PULP_CBC_CMD(msg=0, timeLimit=solver_time_limit)
-    prob.solve(solver)
+    # No-good cuts against previous lineups (same as IncrementalPortfolioModel)
+    if max_overlap is None:
+        max_overlap = n_drivers - 1
+    for i, lineup in enumerate(previous_lineups):
+        prob += (
+            lpSum(x[driver_id] for driver_id in lineup["drivers"] if driver_id in x)
+            <= max_overlap,
+            f"Lineup_Cut_{i}"
+        )
+
+    # Solve with the configured backend (SOLVER_BACKEND, CBC by default)
+    if solver_backend is None:
+        solver_backend = get_solver_backend(time_limit=solver_time_limit)
+    solver_backend.solve(prob, build_seconds=time.perf_counter() - build_start)
 
     # Check solution status
     status = LpStatus[prob.status]
@@ -269,63 +736,243 @@ def generate_lineup_with_cvar(
         if x[d["driver_id"]].value() == 1
     ]
 
-    if len(selected_drivers) != n_drivers:
-        logger.error(
-            f"Solver selected {len(selected_drivers)} drivers, expected {n_drivers}"
+    return _build_lineup_result(
+        selected_drivers, scenarios, driver_data, exposure_book,
+        n_lineups_generated, cvar_alphas, salary_cap, n_drivers,
+        min_stack, max_stack
+    )
+
+
+class IncrementalPortfolioModel:
+    """
+    Persistent lineup MILP reused across every lineup of a portfolio.
+
+    The CVaR (or mean) objective, its scenario constraints and the DK rules
+    are built once. Each subsequent lineup only:
+    - adds a no-good cut for the previous lineup (overlap <= max_overlap)
+    - resets exposure exclusions as variable bounds (so they can lift again
+      as the portfolio grows, unlike fixed == 0 constraints)
+    - rewrites the diversity penalty coefficients on the selection variables
+
+    Solves are warm-started from the previous incumbent's variable values.
+    With the HiGHS backend the solver model itself stays resident and only
+    receives appended cuts, bounds and objective changes.
+
+    Example:
+        >>> model = IncrementalPortfolioModel(scenarios, driver_data)
+        >>> lineups, book = [], {}
+        >>> for _ in range(150):
+        ...     lineup = model.generate_lineup(book, lineups)
+        ...     if lineup is None:
+        ...         break
+        ...     lineups.append(lineup)
+        ...     book = update_exposure_book(book, lineup["drivers"])
+    """
+
+    def __init__(
+        self,
+        scenarios: np.ndarray,
+        driver_data: List[Dict[str, Any]],
+        cvar_alphas: List[float] = [0.99, 0.95],
+        cvar_weights: List[float] = [0.7, 0.3],
+        correlation_weight: float = 0.1,
+        max_driver_exposure: float = 0.5,
+        max_team_exposure: float = 0.7,
+        salary_cap: int = 50000,
+        n_drivers: int = 6,
+        min_stack: int = 2,
+        max_stack: int = 3,
+        solver_time_limit: int = 30,
+        objective_type: str = "cvar",
+        scenario_reduction: Optional[ScenarioReduction] = None,
+        max_overlap: Optional[int] = None,
+        warm_start: bool = True,
+        solver_backend: Optional[str] = None
+    ):
+        """
+        Build the base model.
+
+        Args:
+            scenarios: ndarray (n_scenarios, n_drivers) with DFS points per scenario
+            driver_data: List of driver dicts with salary, team, driver_id keys
+            cvar_alphas: CVaR quantiles for Multi-CVaR (default [0.99, 0.95])
+            cvar_weights: Weights for Multi-CVaR (default [0.7, 0.3])
+            correlation_weight: Penalty strength for diversity (default 0.1)
+            max_driver_exposure: Max driver exposure fraction (default 0.5)
+            max_team_exposure: Max team exposure fraction (default 0.7)
+            salary_cap: DK salary cap (default $50,000)
+            n_drivers: Roster size (default 6)
+            min_stack: Min team stacking (default 2)
+            max_stack: Max team stacking (default 3)
+            solver_time_limit: Max solve time per lineup in seconds (default 30)
+            objective_type: "cvar" for tail optimization, "mean" for expected value
+            scenario_reduction: Optional weighted representatives used in the LP
+            max_overlap: Max drivers shared with any previous lineup
+                (default n_drivers - 1, i.e. no duplicate lineups)
+            warm_start: Warm-start from the previous incumbent (default True)
+            solver_backend: "highs", "cbc" or "auto" (default: SOLVER_BACKEND
+                env var, then "cbc"); HiGHS keeps the model resident and
+                only receives the per-lineup changes
+
+        Raises:
+            ValueError: If scenarios or driver_data is empty
+        """
+        if scenarios.size == 0:
+            raise ValueError("scenarios array cannot be empty")
+
+        if not driver_data:
+            raise ValueError("driver_data cannot be empty")
+
+        self.scenarios = scenarios
+        self.driver_data = driver_data
+        self.cvar_alphas = cvar_alphas
+        self.correlation_weight = correlation_weight
+        self.max_driver_exposure = max_driver_exposure
+        self.max_team_exposure = max_team_exposure
+        self.salary_cap = salary_cap
+        self.n_drivers = n_drivers
+        self.min_stack = min_stack
+        self.max_stack = max_stack
+        self.objective_type = objective_type
+        self.max_overlap = n_drivers - 1 if max_overlap is None else max_overlap
+        self.solver = get_solver_backend(
+            solver_backend, time_limit=solver_time_limit,
+            warm_start=warm_start, incremental=True
         )
-        return None
+        self.n_cuts = 0
 
-    # Validate lineup
-    validation = validate_dk_lineup(
-        selected_drivers, driver_data, salary_cap, n_drivers, min_stack, max_stack
-    )
+        start = time.perf_counter()
 
-    if not validation["valid"]:
-        logger.error(f"Lineup validation failed: {validation['errors']}")
-        return None
+        self.prob = LpProblem("CVaR_Portfolio", LpMaximize)
+        self.x = {
+            d["driver_id"]: LpVariable(f"select_{d['driver_id']}", cat="Binary")
+            for d in driver_data
+        }
 
-    # Compute tail metrics for this lineup
-    # Get indices of selected drivers
-    driver_indices = [i for i, d in enumerate(driver_data) if d["driver_id"] in selected_drivers]
-    lineup_scenarios = scenarios[:, driver_indices]
-    lineup_points = lineup_scenarios.sum(axis=1)
+        self.base_objective = _build_lineup_objective(
+            self.prob, self.x, scenarios, driver_data, objective_type,
+            cvar_alphas, cvar_weights, scenario_reduction
+        )
+        self.objective = LpAffineExpression(self.base_objective)
+        self.prob.setObjective(self.objective)
 
-    # Compute tail metrics
-    metrics = compute_tail_metrics(lineup_points, alpha=cvar_alphas[0])
+        add_dk_compliance_constraints(
+            self.prob, self.x, driver_data, salary_cap, n_drivers, min_stack, max_stack
+        )
 
-    # Compute CVaR at second quantile (if provided)
-    cvar_95 = None
-    if len(cvar_alphas) > 1:
-        metrics_95 = compute_tail_metrics(lineup_points, alpha=cvar_alphas[1])
-        cvar_95 = metrics_95.CVaR
+        self.build_seconds = time.perf_counter() - start
+        self.solve_seconds: List[float] = []
 
-    # Calculate exposure for this lineup
-    exposure = {
-        driver_id: (exposure_book.get(driver_id, 0) + 1) / (n_lineups_generated + 1)
-        for driver_id in selected_drivers
-    }
+        logger.info(
+            f"Built incremental portfolio model in {self.build_seconds:.2f}s: "
+            f"{len(self.prob.variables())} variables, {len(self.prob.constraints)} constraints"
+        )
 
-    # Calculate total salary
-    total_salary = sum(
-        d["salary"] for d in driver_data if d["driver_id"] in selected_drivers
-    )
+    def _update_objective(
+        self,
+        previous_lineups: List[Dict],
+        perturbation: Optional[Dict[int, float]] = None
+    ):
+        """
+        Rewrite diversity penalty coefficients (same penalty as add_correlation_penalty).
 
-    lineup = {
-        "drivers": selected_drivers,
-        "cvar_99": metrics.CVaR,
-        "cvar_95": cvar_95,
-        "top_1pct": metrics.top_X_pct,
-        "conditional_upside": metrics.conditional_upside,
-        "exposure": exposure,
-        "total_salary": total_salary,
-    }
+        An optional per-driver perturbation is added on top, e.g. to make
+        concurrent solves from the same portfolio state diverge.
+        """
+        usage = Counter(
+            driver_id
+            for lineup in previous_lineups
+            for driver_id in lineup.get("drivers", [])
+        )
+        perturbation = perturbation or {}
+        for driver_id, var in self.x.items():
+            self.objective[var] = (
+                self.base_objective.get(var, 0.0)
+                - self.correlation_weight * usage.get(driver_id, 0)
+                + perturbation.get(driver_id, 0.0)
+            )
+        self.prob.setObjective(self.objective)
 
-    logger.info(
-        f"Generated lineup: CVaR(99%)={lineup['cvar_99']:.2f}, "
-        f"Top 1%={lineup['top_1pct']:.2f}, Salary=${total_salary}"
-    )
+    def _update_exposure_bounds(self, exposure_book: Dict[int, int], n_lineups_generated: int):
+        """Exclude overexposed drivers and teams via upper bounds."""
+        excluded = get_overexposed_drivers(
+            exposure_book, n_lineups_generated,
+            self.max_driver_exposure, self.max_team_exposure, self.driver_data
+        )
+        for driver_id, var in self.x.items():
+            var.upBound = 0 if driver_id in excluded else 1
+
+        if excluded:
+            logger.debug(f"Excluded {len(excluded)} overexposed drivers via bounds")
+
+    def add_lineup_cut(self, drivers: List[int]):
+        """Forbid overlapping more than max_overlap drivers with a lineup."""
+        self.prob.addConstraint(
+            lpSum(self.x[driver_id] for driver_id in drivers if driver_id in self.x)
+            <= self.max_overlap,
+            f"Lineup_Cut_{self.n_cuts}"
+        )
+        self.n_cuts += 1
 
-    return lineup
+    def sync_lineup_cuts(self, lineups: List[Dict]):
+        """Add cuts for any lineups beyond the ones already cut (append-only list)."""
+        for lineup in lineups[self.n_cuts:]:
+            self.add_lineup_cut(lineup["drivers"])
+
+    def generate_lineup(
+        self,
+        exposure_book: Dict[int, int],
+        previous_lineups: List[Dict],
+        perturbation: Optional[Dict[int, float]] = None,
+        add_cut: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Solve for the next lineup and add its cut to the model.
+
+        Args:
+            exposure_book: Current exposure counts (driver_id -> usage count)
+            previous_lineups: Lineups generated so far
+            perturbation: Optional driver_id -> objective coefficient offset
+            add_cut: Add the new lineup's cut immediately (default True); pass
+                False when lineups are accepted elsewhere and synced with
+                sync_lineup_cuts()
+
+        Returns:
+            Lineup dict (same keys as generate_lineup_with_cvar), or None if
+            infeasible or the solver fails
+        """
+        n_lineups_generated = len(previous_lineups)
+
+        self._update_objective(previous_lineups, perturbation)
+        self._update_exposure_bounds(exposure_book, n_lineups_generated)
+
+        start = time.perf_counter()
+        # Charge the one-off model build to the first solve
+        self.solver.solve(
+            self.prob, build_seconds=0.0 if self.solve_seconds else self.build_seconds
+        )
+        self.solve_seconds.append(time.perf_counter() - start)
+
+        status = LpStatus[self.prob.status]
+        if status != "Optimal":
+            logger.warning(f"Solver status: {status} (not Optimal)")
+            return None
+
+        selected_drivers = [
+            d["driver_id"] for d in self.driver_data
+            if self.x[d["driver_id"]].value() == 1
+        ]
+
+        lineup = _build_lineup_result(
+            selected_drivers, self.scenarios, self.driver_data, exposure_book,
+            n_lineups_generated, self.cvar_alphas, self.salary_cap, self.n_drivers,
+            self.min_stack, self.max_stack
+        )
+
+        if lineup is not None and add_cut:
+            self.add_lineup_cut(lineup["drivers"])
+
+        return lineup
 
 
 def generate_portfolio(
@@ -345,14 +992,20 @@ def generate_portfolio(
     max_stack: int = 3,
     solver_time_limit: int = 30,
     random_seed: int = 42,
-    objective_type: str = "cvar"
+    objective_type: str = "cvar",
+    n_representative_scenarios: Optional[int] = None,
+    incremental: bool = True,
+    solver_backend: Optional[str] = None,
+    scenario_cache: Optional[ScenarioCache] = None,
+    scenario_key: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     Generate portfolio of lineups optimized for CVaR or mean.
 
     Iteratively generates multiple lineups using CVaR or mean optimization with exposure
-    bookkeeping and correlation penalties to ensure diversity. Each lineup is an
-    independent optimization (no warm starting) using cached scenario matrices.
+    bookkeeping and correlation penalties to ensure diversity. By default the lineup
+    model is built once (IncrementalPortfolioModel) and each lineup adds a no-good
+    cut, exposure bounds and updated penalty terms before a warm-started re-solve.
 
     Args:
         race_id: Race identifier (e.g., "daytona_500")
@@ -372,6 +1025,17 @@ def generate_portfolio(
         solver_time_limit: Max solve time (default 30)
         random_seed: Random seed for scenario generation (default 42)
         objective_type: Optimization type - "cvar" for tail optimization, "mean" for expected value (default "cvar")
+        n_representative_scenarios: If set, cluster scenarios into this many
+            weighted representatives once and solve every lineup's CVaR LP on
+            them (default None = full scenario matrix)
+        incremental: Reuse one persistent model across lineups (default True);
+            False rebuilds an independent model per lineup
+        solver_backend: "highs", "cbc" or "auto" (default: SOLVER_BACKEND env
+            var, then "cbc")
+        scenario_cache: Cache to read scenarios through (default: the shared
+            get_scenario_cache() when scenario_key is given)
+        scenario_key: Content-hash key from scenario_cache_key; without a key
+            or cache, scenario_fn is called directly
 
     Returns:
         List of lineup dicts
@@ -410,9 +1074,9 @@ def generate_portfolio(
             f"for CVaR({cvar_alphas[0]}). Tail estimates may be unstable."
         )
 
-    # Cache scenarios
-    cache = ScenarioCache()
-    scenarios = cache.get_scenarios(race_id, n_scenarios, scenario_fn)
+    scenarios = _resolve_scenarios(
+        race_id, n_scenarios, scenario_fn, scenario_cache, scenario_key
+    )
     logger.info(f"Using {len(scenarios)} scenarios for optimization")
 
     # Validate scenarios shape
@@ -422,19 +1086,22 @@ def generate_portfolio(
             f"but driver_data has {len(driver_data)} drivers"
         )
 
-    # Generate lineups iteratively
-    lineups = []
-    exposure_book = {}
-
-    for lineup_idx in range(n_lineups):
-        logger.info(f"Generating lineup {lineup_idx + 1}/{n_lineups}...")
+    # Optional scenario reduction, shared by every lineup's LP
+    scenario_reduction = None
+    if n_representative_scenarios is not None and objective_type == "cvar":
+        scenario_reduction = reduce_scenarios(
+            scenarios, n_representative_scenarios, n_drivers=n_drivers
+        )
+        logger.info(
+            f"CVaR LP uses {scenario_reduction.n_representatives} representative "
+            f"scenarios (error bound {scenario_reduction.error_bound:.2f} points)"
+        )
 
-        lineup = generate_lineup_with_cvar(
+    model = None
+    if incremental:
+        model = IncrementalPortfolioModel(
             scenarios=scenarios,
             driver_data=driver_data,
-            exposure_book=exposure_book,
-            n_lineups_generated=len(lineups),
-            previous_lineups=lineups,
             cvar_alphas=cvar_alphas,
             cvar_weights=cvar_weights,
             correlation_weight=correlation_weight,
@@ -445,8 +1112,44 @@ def generate_portfolio(
             min_stack=min_stack,
             max_stack=max_stack,
             solver_time_limit=solver_time_limit,
-            objective_type=objective_type
+            objective_type=objective_type,
+            scenario_reduction=scenario_reduction,
+            solver_backend=solver_backend
         )
+        backend = model.solver
+    else:
+        backend = get_solver_backend(solver_backend, time_limit=solver_time_limit)
+
+    # Generate lineups iteratively
+    lineups = []
+    exposure_book = {}
+
+    for lineup_idx in range(n_lineups):
+        logger.info(f"Generating lineup {lineup_idx + 1}/{n_lineups}...")
+
+        if model is not None:
+            lineup = model.generate_lineup(exposure_book, lineups)
+        else:
+            lineup = generate_lineup_with_cvar(
+                scenarios=scenarios,
+                driver_data=driver_data,
+                exposure_book=exposure_book,
+                n_lineups_generated=len(lineups),
+                previous_lineups=lineups,
+                cvar_alphas=cvar_alphas,
+                cvar_weights=cvar_weights,
+                correlation_weight=correlation_weight,
+                max_driver_exposure=max_driver_exposure,
+                max_team_exposure=max_team_exposure,
+                salary_cap=salary_cap,
+                n_drivers=n_drivers,
+                min_stack=min_stack,
+                max_stack=max_stack,
+                solver_time_limit=solver_time_limit,
+                objective_type=objective_type,
+                scenario_reduction=scenario_reduction,
+                solver_backend=backend
+            )
 
         if lineup is None:
             logger.warning(f"Failed to generate lineup {lineup_idx + 1}, stopping")
@@ -469,6 +1172,14 @@ def generate_portfolio(
             f"min={correlation['min_similarity']:.3f}"
         )
 
+    solver_summary = backend.summary()
+    logger.info(
+        f"Solver ({solver_summary['backend']}): {solver_summary['n_solves']} solves, "
+        f"build={solver_summary['build_seconds']:.2f}s, "
+        f"solve={solver_summary['solve_seconds']:.2f}s, "
+        f"extract={solver_summary['extract_seconds']:.2f}s"
+    )
+
     logger.info(f"Portfolio generation complete: {len(lineups)} lineups generated")
 
     return lineups
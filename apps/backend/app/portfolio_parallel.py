@@ -0,0 +1,375 @@
+"""
+Parallel portfolio generation for NASCAR DFS CVaR optimization.
+
+Solves batches of lineups concurrently in a process pool. Each worker attaches
+to the scenario matrix through shared memory (no per-task pickling of the
+matrix) and keeps its own IncrementalPortfolioModel for the life of the pool,
+so the CVaR model is built once per worker rather than once per lineup.
+
+Batching scheme:
+- Every task in a batch starts from the same accepted portfolio state
+  (exposure book, previous lineups, no-good cuts)
+- Tasks after the first get a small random objective perturbation so
+  concurrent solves diverge instead of returning the same lineup
+- The parent accepts batch results in order, re-checking each against the
+  exposure rules in app/constraints/exposure.py and the overlap limit given
+  everything accepted so far; rejected lineups are simply re-solved in the
+  next batch from the updated state
+
+Accepted lineups therefore satisfy exactly the rules the sequential path
+enforces: every lineup respects max_driver_exposure/max_team_exposure as
+evaluated on the lineups accepted before it.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.constraints.diversity import compute_portfolio_correlation
+from app.constraints.exposure import get_overexposed_drivers, update_exposure_book
+from app.portfolio_generator import (
+    IncrementalPortfolioModel,
+    ScenarioCache,
+    _resolve_scenarios,
+    generate_portfolio,
+)
+from app.tail_metrics import adaptive_scenario_count
+from app.tail_objectives import reduce_scenarios
+
+logger = logging.getLogger(__name__)
+
+# Default objective perturbation, as a fraction of each driver's mean points
+DEFAULT_PERTURBATION = 0.05
+
+# Per-process worker state (set by _init_worker)
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    shm_name: str,
+    shape: Tuple[int, int],
+    dtype: str,
+    driver_data: List[Dict[str, Any]],
+    model_kwargs: Dict[str, Any]
+):
+    """Attach to shared scenarios and build this worker's persistent model."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    scenarios = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+    # Keep the SharedMemory handle alive for as long as the array is used
+    _worker_state["shm"] = shm
+    _worker_state["driver_data"] = driver_data
+    _worker_state["mean_points"] = scenarios.mean(axis=0)
+    _worker_state["model"] = IncrementalPortfolioModel(
+        scenarios, driver_data, **model_kwargs
+    )
+
+
+def _solve_lineup_task(
+    accepted_lineups: List[Dict],
+    exposure_book: Dict[int, int],
+    seed: Optional[int],
+    perturbation: float
+) -> Tuple[Optional[Dict[str, Any]], float]:
+    """
+    Solve one lineup from the given portfolio state in a worker process.
+
+    Returns:
+        Tuple of (lineup dict or None, solve seconds)
+    """
+    model: IncrementalPortfolioModel = _worker_state["model"]
+    model.sync_lineup_cuts(accepted_lineups)
+
+    offsets = None
+    if seed is not None and perturbation > 0:
+        rng = np.random.default_rng(seed)
+        noise = rng.normal(0.0, perturbation, size=len(_worker_state["driver_data"]))
+        offsets = {
+            d["driver_id"]: float(noise[i] * abs(_worker_state["mean_points"][i]))
+            for i, d in enumerate(_worker_state["driver_data"])
+        }
+
+    start = time.perf_counter()
+    lineup = model.generate_lineup(
+        exposure_book, accepted_lineups, perturbation=offsets, add_cut=False
+    )
+    return lineup, time.perf_counter() - start
+
+
+def _accept_lineup(
+    lineup: Dict[str, Any],
+    accepted: List[Dict[str, Any]],
+    exposure_book: Dict[int, int],
+    driver_data: List[Dict[str, Any]],
+    max_driver_exposure: float,
+    max_team_exposure: float,
+    max_overlap: int
+) -> bool:
+    """Check a batch result against exposure and overlap rules for the current portfolio."""
+    drivers = set(lineup["drivers"])
+
+    excluded = get_overexposed_drivers(
+        exposure_book, len(accepted), max_driver_exposure, max_team_exposure, driver_data
+    )
+    if drivers & excluded:
+        return False
+
+    return all(len(drivers & set(prev["drivers"])) <= max_overlap for prev in accepted)
+
+
+def generate_portfolio_parallel(
+    race_id: str,
+    driver_data: List[Dict[str, Any]],
+    scenario_fn: Callable[[int], np.ndarray],
+    n_lineups: int = 20,
+    n_scenarios: int = 10000,
+    n_workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    perturbation: float = DEFAULT_PERTURBATION,
+    cvar_alphas: List[float] = [0.99, 0.95],
+    cvar_weights: List[float] = [0.7, 0.3],
+    correlation_weight: float = 0.1,
+    max_driver_exposure: float = 0.5,
+    max_team_exposure: float = 0.7,
+    salary_cap: int = 50000,
+    n_drivers: int = 6,
+    min_stack: int = 2,
+    max_stack: int = 3,
+    solver_time_limit: int = 30,
+    random_seed: int = 42,
+    objective_type: str = "cvar",
+    n_representative_scenarios: Optional[int] = None,
+    compare_sequential: bool = False,
+    solver_backend: Optional[str] = None,
+    scenario_cache: Optional[ScenarioCache] = None,
+    scenario_key: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+    """
+    Generate a portfolio by solving batches of lineups in a process pool.
+
+    Takes the same arguments as generate_portfolio() plus the pool settings.
+
+    Args:
+        race_id: Race identifier (e.g., "daytona_500")
+        driver_data: List of driver dicts with salary, team, driver_id keys
+        scenario_fn: Function to generate scenarios (n_scenarios) -> ndarray
+        n_lineups: Number of lineups to generate (default 20)
+        n_scenarios: Number of scenarios for CVaR optimization (default 10000)
+        n_workers: Worker processes (default os.cpu_count())
+        batch_size: Lineups solved concurrently per batch (default n_workers)
+        perturbation: Std of the objective perturbation for batch tasks after
+            the first, as a fraction of each driver's mean points (default 0.05)
+        cvar_alphas: CVaR quantiles (default [0.99, 0.95])
+        cvar_weights: CVaR weights (default [0.7, 0.3])
+        correlation_weight: Diversity penalty weight (default 0.1)
+        max_driver_exposure: Max driver exposure (default 0.5)
+        max_team_exposure: Max team exposure (default 0.7)
+        salary_cap: DK salary cap (default $50,000)
+        n_drivers: Roster size (default 6)
+        min_stack: Min team stacking (default 2)
+        max_stack: Max team stacking (default 3)
+        solver_time_limit: Max solve time per lineup (default 30)
+        random_seed: Random seed for scenarios and perturbations (default 42)
+        objective_type: "cvar" for tail optimization, "mean" for expected value
+        n_representative_scenarios: Optional scenario reduction target
+        compare_sequential: Also run generate_portfolio() on the same inputs
+            and report the measured speedup (default False)
+        solver_backend: "highs", "cbc" or "auto" for every worker (default:
+            SOLVER_BACKEND env var, then "cbc")
+        scenario_cache: Cache to read scenarios through (see generate_portfolio)
+        scenario_key: Content-hash key from scenario_cache_key (see generate_portfolio)
+
+    Returns:
+        Tuple of (lineups, stats) where stats has keys:
+            - wall_seconds: Parallel wall time
+            - solve_seconds: Summed worker solve time
+            - parallel_efficiency: solve_seconds / wall_seconds (the speedup
+              over running the same solves back to back)
+            - n_batches, n_solved, n_rejected
+            - sequential_seconds, speedup: Only with compare_sequential=True
+
+    Example:
+        >>> lineups, stats = generate_portfolio_parallel(
+        ...     race_id='daytona_500',
+        ...     driver_data=drivers,
+        ...     scenario_fn=scenario_fn,
+        ...     n_lineups=150,
+        ...     n_workers=32
+        ... )
+        >>> print(f"{len(lineups)} lineups, {stats['parallel_efficiency']:.1f}x")
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    batch_size = batch_size or n_workers
+
+    if n_workers <= 0 or batch_size <= 0:
+        raise ValueError(
+            f"n_workers and batch_size must be positive, got {n_workers}, {batch_size}"
+        )
+
+    logger.info(
+        f"Generating portfolio in parallel: {n_lineups} lineups, {n_scenarios} scenarios, "
+        f"{n_workers} workers, batch size {batch_size}, race '{race_id}'"
+    )
+
+    if random_seed is not None:
+        np.random.seed(random_seed)
+
+    min_scenarios = adaptive_scenario_count(cvar_alphas[0])
+    if n_scenarios < min_scenarios:
+        logger.warning(
+            f"Requested {n_scenarios} scenarios < recommended {min_scenarios} "
+            f"for CVaR({cvar_alphas[0]}). Tail estimates may be unstable."
+        )
+
+    scenarios = _resolve_scenarios(
+        race_id, n_scenarios, scenario_fn, scenario_cache, scenario_key
+    )
+
+    if scenarios.shape[1] != len(driver_data):
+        raise ValueError(
+            f"Scenario shape mismatch: scenarios have {scenarios.shape[1]} drivers, "
+            f"but driver_data has {len(driver_data)} drivers"
+        )
+
+    scenario_reduction = None
+    if n_representative_scenarios is not None and objective_type == "cvar":
+        scenario_reduction = reduce_scenarios(
+            scenarios, n_representative_scenarios, n_drivers=n_drivers
+        )
+
+    max_overlap = n_drivers - 1
+    model_kwargs = dict(
+        cvar_alphas=cvar_alphas,
+        cvar_weights=cvar_weights,
+        correlation_weight=correlation_weight,
+        max_driver_exposure=max_driver_exposure,
+        max_team_exposure=max_team_exposure,
+        salary_cap=salary_cap,
+        n_drivers=n_drivers,
+        min_stack=min_stack,
+        max_stack=max_stack,
+        solver_time_limit=solver_time_limit,
+        objective_type=objective_type,
+        scenario_reduction=scenario_reduction,
+        max_overlap=max_overlap,
+        solver_backend=solver_backend,
+    )
+
+    scenarios = np.ascontiguousarray(scenarios)
+    shm = shared_memory.SharedMemory(create=True, size=max(scenarios.nbytes, 1))
+    shared = np.ndarray(scenarios.shape, dtype=scenarios.dtype, buffer=shm.buf)
+    shared[:] = scenarios
+
+    seed_rng = np.random.default_rng(random_seed)
+    lineups: List[Dict[str, Any]] = []
+    exposure_book: Dict[int, int] = {}
+    stats = {"n_batches": 0, "n_solved": 0, "n_rejected": 0, "solve_seconds": 0.0}
+
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(shm.name, scenarios.shape, scenarios.dtype.str, driver_data, model_kwargs)
+        ) as pool:
+            while len(lineups) < n_lineups:
+                n_tasks = min(batch_size, n_lineups - len(lineups))
+                # First task of each batch is unperturbed (the sequential solve)
+                seeds = [None] + [
+                    int(seed) for seed in seed_rng.integers(0, 2**31 - 1, size=n_tasks - 1)
+                ]
+                futures = [
+                    pool.submit(_solve_lineup_task, lineups, exposure_book, seed, perturbation)
+                    for seed in seeds
+                ]
+                results = [future.result() for future in futures]
+                stats["n_batches"] += 1
+
+                n_accepted = 0
+                for lineup, solve_seconds in results:
+                    stats["solve_seconds"] += solve_seconds
+                    if lineup is None:
+                        continue
+                    stats["n_solved"] += 1
+
+                    if len(lineups) >= n_lineups or not _accept_lineup(
+                        lineup, lineups, exposure_book, driver_data,
+                        max_driver_exposure, max_team_exposure, max_overlap
+                    ):
+                        stats["n_rejected"] += 1
+                        continue
+
+                    # Exposure as of acceptance, not as of the batch start
+                    lineup["exposure"] = {
+                        driver_id: (exposure_book.get(driver_id, 0) + 1) / (len(lineups) + 1)
+                        for driver_id in lineup["drivers"]
+                    }
+                    lineups.append(lineup)
+                    exposure_book = update_exposure_book(exposure_book, lineup["drivers"])
+                    n_accepted += 1
+
+                # The unperturbed task failing means the sequential path would stop too
+                if results[0][0] is None:
+                    logger.warning(
+                        f"Failed to generate lineup {len(lineups) + 1}, stopping"
+                    )
+                    break
+
+                logger.info(
+                    f"Batch {stats['n_batches']}: accepted {n_accepted}/{n_tasks}, "
+                    f"portfolio {len(lineups)}/{n_lineups}"
+                )
+    finally:
+        shm.close()
+        shm.unlink()
+
+    stats["wall_seconds"] = time.perf_counter() - start
+    stats["parallel_efficiency"] = stats["solve_seconds"] / max(stats["wall_seconds"], 1e-9)
+
+    if compare_sequential:
+        seq_start = time.perf_counter()
+        generate_portfolio(
+            race_id=race_id,
+            driver_data=driver_data,
+            scenario_fn=lambda n: scenarios,
+            n_lineups=n_lineups,
+            n_scenarios=n_scenarios,
+            cvar_alphas=cvar_alphas,
+            cvar_weights=cvar_weights,
+            correlation_weight=correlation_weight,
+            max_driver_exposure=max_driver_exposure,
+            max_team_exposure=max_team_exposure,
+            salary_cap=salary_cap,
+            n_drivers=n_drivers,
+            min_stack=min_stack,
+            max_stack=max_stack,
+            solver_time_limit=solver_time_limit,
+            random_seed=random_seed,
+            objective_type=objective_type,
+            n_representative_scenarios=n_representative_scenarios,
+            solver_backend=solver_backend,
+        )
+        stats["sequential_seconds"] = time.perf_counter() - seq_start
+        stats["speedup"] = stats["sequential_seconds"] / max(stats["wall_seconds"], 1e-9)
+
+    if len(lineups) >= 2:
+        correlation = compute_portfolio_correlation(lineups)
+        logger.info(
+            f"Portfolio correlation: avg={correlation['avg_similarity']:.3f}, "
+            f"max={correlation['max_similarity']:.3f}"
+        )
+
+    logger.info(
+        f"Parallel portfolio complete: {len(lineups)} lineups in "
+        f"{stats['wall_seconds']:.1f}s ({stats['n_batches']} batches, "
+        f"{stats['n_rejected']} rejected, efficiency {stats['parallel_efficiency']:.1f}x"
+        + (f", speedup vs sequential {stats['speedup']:.1f}x" if compare_sequential else "")
+        + ")"
+    )
+
+    return lineups, stats
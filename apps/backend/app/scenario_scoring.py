@@ -0,0 +1,195 @@
+"""
+DraftKings points scoring for simulated race scenarios.
+
+Turns scenario outcomes (finish position, start position, laps led, fastest
+laps per driver) into the float32 (n_scenarios, n_drivers) points matrix the
+portfolio optimizer consumes. Scoring is pure array arithmetic: finish points
+come from a lookup array built from the FINISH_POINTS table, so no per-driver
+Python runs for columnar ScenarioBatch input.
+
+DraftKings NASCAR Classic scoring used here:
+- Finish position: FINISH_POINTS table (positions past the table use its last entry)
+- Place differential: +1 per position gained, -1 per position lost
+- Laps led: 0.25 points per lap
+- Fastest laps: 0.45 points per lap
+
+score_scenario_stream fills a preallocated matrix chunk by chunk, so large
+runs never hold every scenario object (or every chunk) in memory at once.
+"""
+
+import logging
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.lineup_optimizer import FINISH_POINTS
+
+logger = logging.getLogger(__name__)
+
+# Per-unit DraftKings scoring rates
+PLACE_DIFFERENTIAL_POINTS = 1.0
+LAPS_LED_POINTS = 0.25
+FASTEST_LAP_POINTS = 0.45
+
+
+def _build_finish_points_lookup() -> np.ndarray:
+    """Finish points indexed by finish position (index 0 is unused)."""
+    max_position = max(FINISH_POINTS)
+    lookup = np.zeros(max_position + 1, dtype=np.float32)
+    for position, points in FINISH_POINTS.items():
+        lookup[position] = points
+    return lookup
+
+
+FINISH_POINTS_LOOKUP = _build_finish_points_lookup()
+
+
+def score_outcome_arrays(
+    finish_positions: np.ndarray,
+    start_positions: np.ndarray,
+    laps_led: np.ndarray,
+    fastest_laps: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Score stacked driver outcomes as DraftKings points.
+
+    Args:
+        finish_positions: Finish positions (shape: [n_scenarios, n_drivers])
+        start_positions: Start positions (shape: [n_drivers] or [n_scenarios, n_drivers])
+        laps_led: Laps led (shape: [n_scenarios, n_drivers])
+        fastest_laps: Fastest laps (shape: [n_scenarios, n_drivers])
+        out: Optional float32 array to write the points into
+
+    Returns:
+        float32 points matrix (shape: [n_scenarios, n_drivers])
+    """
+    finish_positions = np.asarray(finish_positions)
+    positions = np.clip(finish_positions, 1, len(FINISH_POINTS_LOOKUP) - 1)
+
+    if out is None:
+        out = np.empty(finish_positions.shape, dtype=np.float32)
+
+    np.take(FINISH_POINTS_LOOKUP, positions, out=out)
+    out += PLACE_DIFFERENTIAL_POINTS * (np.asarray(start_positions) - finish_positions)
+    out += LAPS_LED_POINTS * np.asarray(laps_led)
+    out += FASTEST_LAP_POINTS * np.asarray(fastest_laps)
+    return out
+
+
+def _column_order(batch_driver_ids: Sequence[str], driver_ids: Optional[Sequence[str]]):
+    """Column indices mapping batch driver order to driver_ids, or None if identical."""
+    if driver_ids is None or list(driver_ids) == list(batch_driver_ids):
+        return None
+    index = {driver_id: j for j, driver_id in enumerate(batch_driver_ids)}
+    missing = [driver_id for driver_id in driver_ids if driver_id not in index]
+    if missing:
+        raise ValueError(f"Drivers missing from scenarios: {missing}")
+    return np.array([index[driver_id] for driver_id in driver_ids])
+
+
+def score_scenario_batch(
+    batch,
+    driver_ids: Optional[Sequence[str]] = None,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Score a ScenarioBatch without materializing its scenarios.
+
+    Args:
+        batch: axiomatic_sim ScenarioBatch
+        driver_ids: Optional column order for the result (defaults to batch.driver_ids)
+        out: Optional float32 array to write the points into
+
+    Returns:
+        float32 points matrix (shape: [len(batch), n_drivers])
+
+    Raises:
+        ValueError: If driver_ids names drivers the batch does not have
+    """
+    columns = _column_order(batch.driver_ids, driver_ids)
+    finish_positions = batch.finish_positions
+    start_positions = batch.start_positions
+    laps_led = batch.laps_led
+    fastest_laps = batch.fastest_laps
+
+    if columns is not None:
+        finish_positions = finish_positions[:, columns]
+        start_positions = start_positions[columns]
+        laps_led = laps_led[:, columns]
+        fastest_laps = fastest_laps[:, columns]
+
+    return score_outcome_arrays(finish_positions, start_positions, laps_led, fastest_laps, out=out)
+
+
+def score_scenarios(scenarios: Sequence, driver_ids: Sequence[str]) -> np.ndarray:
+    """
+    Score a list of ScenarioComponents.
+
+    Outcome fields are gathered into arrays once, then scored with
+    score_outcome_arrays. Prefer score_scenario_batch for batched output.
+
+    Args:
+        scenarios: ScenarioComponents objects
+        driver_ids: Column order of the result
+
+    Returns:
+        float32 points matrix (shape: [len(scenarios), len(driver_ids)])
+    """
+    shape = (len(scenarios), len(driver_ids))
+    finish_positions = np.empty(shape, dtype=np.int32)
+    start_positions = np.empty(shape, dtype=np.int32)
+    laps_led = np.empty(shape, dtype=np.int32)
+    fastest_laps = np.empty(shape, dtype=np.int32)
+
+    for i, scenario in enumerate(scenarios):
+        outcomes = scenario.driver_outcomes
+        for j, driver_id in enumerate(driver_ids):
+            outcome = outcomes[driver_id]
+            finish_positions[i, j] = outcome.finish_position
+            start_positions[i, j] = outcome.finish_position - outcome.place_differential
+            laps_led[i, j] = outcome.laps_led
+            fastest_laps[i, j] = outcome.fastest_laps
+
+    return score_outcome_arrays(finish_positions, start_positions, laps_led, fastest_laps)
+
+
+def score_scenario_stream(
+    batches: Iterable,
+    n_scenarios: int,
+    driver_ids: List[str],
+) -> np.ndarray:
+    """
+    Score scenario batches into one preallocated points matrix.
+
+    Each batch is scored straight into its slice of the result and can be
+    released before the next one is generated.
+
+    Args:
+        batches: Iterable of ScenarioBatch chunks (e.g. a generator)
+        n_scenarios: Number of rows to fill
+        driver_ids: Column order of the result
+
+    Returns:
+        float32 points matrix (shape: [n_filled, len(driver_ids)]); n_filled is
+        less than n_scenarios only if the batches ran out early
+    """
+    points = np.empty((n_scenarios, len(driver_ids)), dtype=np.float32)
+    filled = 0
+
+    for batch in batches:
+        n = min(len(batch), n_scenarios - filled)
+        if n <= 0:
+            break
+        if n < len(batch):
+            # Only the final chunk can overshoot; score it whole and keep n rows
+            points[filled:filled + n] = score_scenario_batch(batch, driver_ids)[:n]
+        else:
+            score_scenario_batch(batch, driver_ids, out=points[filled:filled + n])
+        filled += n
+        logger.debug(f"Scored {filled}/{n_scenarios} scenarios")
+
+    if filled < n_scenarios:
+        logger.warning(f"Scenario stream ended early: scored {filled}/{n_scenarios} scenarios")
+        return points[:filled]
+    return points
@@ -0,0 +1,473 @@
+"""
+Pluggable MILP solver backends for PuLP models.
+
+Every optimizer in this package models lineups with PuLP. Solving through
+PuLP's CBC interface writes an MPS file, spawns a CBC process and parses the
+solution file back; for 6-of-40 selection problems that overhead exceeds the
+solve itself. This module keeps PuLP as the modelling layer and lets the solve
+go to:
+
+- HighsBackend: HiGHS in-process via highspy (optional dependency). The PuLP
+  model is exported straight into HiGHS arrays; with incremental=True a
+  persistent model only ships appended rows, bounds and objective changes
+  between solves.
+- CbcBackend: CBC through PuLP (system /usr/bin/cbc when present, otherwise
+  PuLP's bundled binary). Always available; used as the fallback.
+
+Both backends write the solution back into the PuLP variables and set
+prob.status, so callers keep checking LpStatus[prob.status] and var.value()
+as before. Each solve's build, solve and extract timings are added to running
+totals (the most recent solve is kept in full), so a long-lived backend uses
+constant memory.
+
+Backend selection: get_solver_backend("auto" | "highs" | "cbc"), defaulting
+to the SOLVER_BACKEND environment variable, then DEFAULT_SOLVER_BACKEND. The
+default stays "cbc": CVaR objectives are often tied across many lineups and
+HiGHS breaks those ties differently, so set SOLVER_BACKEND=auto to opt in.
+"""
+
+import logging
+import os
+import time
+import weakref
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pulp import (
+    LpProblem,
+    LpMaximize,
+    LpInteger,
+    LpStatusOptimal,
+    LpStatusNotSolved,
+    LpStatusInfeasible,
+    LpStatusUnbounded,
+    LpSolutionOptimal,
+    LpSolutionIntegerFeasible,
+    LpSolutionNoSolutionFound,
+    LpSolutionInfeasible,
+    LpSolutionUnbounded,
+    LpConstraintEQ,
+    LpConstraintLE,
+    COIN_CMD,
+    PULP_CBC_CMD,
+)
+
+try:
+    import highspy
+except ImportError:
+    highspy = None
+
+logger = logging.getLogger(__name__)
+
+# System CBC binary (fixes ARM Mac Rosetta issues with PuLP's bundled build)
+SYSTEM_CBC_PATH = "/usr/bin/cbc"
+
+# Environment variable selecting the default backend
+SOLVER_BACKEND_ENV = "SOLVER_BACKEND"
+
+# Backend used when neither the caller nor SOLVER_BACKEND picks one
+DEFAULT_SOLVER_BACKEND = "cbc"
+
+
+@dataclass
+class SolveTimings:
+    """
+    Timing breakdown for one solve.
+
+    Attributes:
+        backend: Backend name ("highs" or "cbc")
+        build_seconds: Model construction reported by the caller plus the
+            backend's export of the PuLP model into the solver
+        solve_seconds: Solver run time (for CBC this includes MPS write,
+            process spawn and solution parsing, which PuLP does together)
+        extract_seconds: Copying the solution back into PuLP variables
+        status: PuLP status code after the solve
+        n_variables: Number of model columns
+        n_constraints: Number of model rows
+    """
+    backend: str
+    build_seconds: float
+    solve_seconds: float
+    extract_seconds: float
+    status: int
+    n_variables: int
+    n_constraints: int
+
+    @property
+    def total_seconds(self) -> float:
+        """Build + solve + extract time."""
+        return self.build_seconds + self.solve_seconds + self.extract_seconds
+
+
+class SolverBackend:
+    """
+    Base class for MILP solver backends.
+
+    Subclasses implement _solve(), which solves prob in place and returns the
+    (build, solve, extract) seconds it spent.
+
+    Example:
+        >>> backend = get_solver_backend()
+        >>> status = backend.solve(prob)
+        >>> if LpStatus[status] == "Optimal":
+        ...     selected = [d for d, var in x.items() if var.value() > 0.5]
+        >>> print(backend.summary())
+    """
+
+    name = "base"
+
+    def __init__(self, time_limit: Optional[float] = 30, warm_start: bool = False):
+        """
+        Initialize backend.
+
+        Args:
+            time_limit: Max solve time per call in seconds (None = no limit)
+            warm_start: Seed each solve with the PuLP variables' current values
+        """
+        self.time_limit = time_limit
+        self.warm_start = warm_start
+        self.n_solves = 0
+        self.last: Optional[SolveTimings] = None
+        self._phase_totals = {"build": 0.0, "solve": 0.0, "extract": 0.0}
+
+    def solve(self, prob: LpProblem, build_seconds: float = 0.0) -> int:
+        """
+        Solve prob in place and record timings.
+
+        Args:
+            prob: PuLP problem
+            build_seconds: Caller's model construction time, added to the
+                recorded build time
+
+        Returns:
+            PuLP status code (also stored on prob.status)
+        """
+        export_seconds, solve_seconds, extract_seconds = self._solve(prob)
+
+        timings = SolveTimings(
+            backend=self.name,
+            build_seconds=build_seconds + export_seconds,
+            solve_seconds=solve_seconds,
+            extract_seconds=extract_seconds,
+            status=prob.status,
+            n_variables=prob.numVariables(),
+            n_constraints=prob.numConstraints(),
+        )
+        self.n_solves += 1
+        self.last = timings
+        for phase in self._phase_totals:
+            self._phase_totals[phase] += getattr(timings, f"{phase}_seconds")
+
+        logger.debug(
+            f"{self.name} solve: build={timings.build_seconds * 1000:.1f}ms, "
+            f"solve={timings.solve_seconds * 1000:.1f}ms, "
+            f"extract={timings.extract_seconds * 1000:.1f}ms, "
+            f"{timings.n_variables} vars, {timings.n_constraints} rows"
+        )
+
+        return prob.status
+
+    def _solve(self, prob: LpProblem):
+        raise NotImplementedError
+
+    def summary(self) -> Dict[str, Any]:
+        """Return solve count and total/mean build, solve and extract seconds."""
+        n_solves = self.n_solves
+        summary: Dict[str, Any] = {"backend": self.name, "n_solves": n_solves}
+        for phase, total in self._phase_totals.items():
+            summary[f"{phase}_seconds"] = total
+            summary[f"mean_{phase}_seconds"] = total / n_solves if n_solves else 0.0
+        return summary
+
+    def last_timings(self) -> Optional[Dict[str, Any]]:
+        """Return the most recent solve's timings as a dict."""
+        return asdict(self.last) if self.last is not None else None
+
+
+class CbcBackend(SolverBackend):
+    """CBC through PuLP's command-line interface."""
+
+    name = "cbc"
+
+    def __init__(
+        self,
+        time_limit: Optional[float] = 30,
+        warm_start: bool = False,
+        path: str = SYSTEM_CBC_PATH
+    ):
+        super().__init__(time_limit, warm_start)
+        if os.path.exists(path):
+            self.solver = COIN_CMD(
+                path=path, msg=0, timeLimit=time_limit, warmStart=warm_start
+            )
+        else:
+            self.solver = PULP_CBC_CMD(msg=0, timeLimit=time_limit, warmStart=warm_start)
+
+    def _solve(self, prob: LpProblem):
+        start = time.perf_counter()
+        prob.solve(self.solver)
+        return 0.0, time.perf_counter() - start, 0.0
+
+
+class HighsBackend(SolverBackend):
+    """
+    HiGHS in-process via highspy.
+
+    With incremental=True the backend keeps the HiGHS model of the last
+    problem it solved. Re-solving the same LpProblem only sends rows
+    appended since the last solve plus current column bounds and objective
+    coefficients, so existing rows must not be edited in place between
+    solves (IncrementalPortfolioModel only appends cuts). If rows were
+    removed, renamed or reordered the model is rebuilt instead.
+    """
+
+    name = "highs"
+
+    def __init__(
+        self,
+        time_limit: Optional[float] = 30,
+        warm_start: bool = False,
+        incremental: bool = False,
+        mip_rel_gap: Optional[float] = None
+    ):
+        if highspy is None:
+            raise ImportError("highspy is not installed; pip install highspy")
+
+        super().__init__(time_limit, warm_start)
+        self.incremental = incremental
+        self.mip_rel_gap = mip_rel_gap
+        self._highs = None
+        self._prob_ref: Optional[weakref.ref] = None
+        self._columns: List = []
+        self._row_names: List[str] = []
+
+    def _new_highs(self):
+        h = highspy.Highs()
+        h.setOptionValue("output_flag", False)
+        if self.time_limit is not None:
+            h.setOptionValue("time_limit", float(self.time_limit))
+        if self.mip_rel_gap is not None:
+            h.setOptionValue("mip_rel_gap", float(self.mip_rel_gap))
+        return h
+
+    @staticmethod
+    def _row_arrays(constraints, column_index):
+        """CSR arrays and row bounds for a list of PuLP constraints."""
+        starts = np.empty(len(constraints), dtype=np.int32)
+        lower = np.empty(len(constraints))
+        upper = np.empty(len(constraints))
+        indices: List[int] = []
+        values: List[float] = []
+
+        for row, constraint in enumerate(constraints):
+            starts[row] = len(indices)
+            for var, coef in constraint.items():
+                indices.append(column_index[var])
+                values.append(coef)
+
+            rhs = -constraint.constant
+            if constraint.sense == LpConstraintEQ:
+                lower[row], upper[row] = rhs, rhs
+            elif constraint.sense == LpConstraintLE:
+                lower[row], upper[row] = -highspy.kHighsInf, rhs
+            else:
+                lower[row], upper[row] = rhs, highspy.kHighsInf
+
+        return (
+            starts,
+            np.asarray(indices, dtype=np.int32),
+            np.asarray(values, dtype=np.float64),
+            lower,
+            upper,
+        )
+
+    def _column_arrays(self, prob: LpProblem):
+        """Column bounds and objective coefficients in column order."""
+        inf = highspy.kHighsInf
+        lower = np.array([
+            -inf if var.lowBound is None else var.lowBound for var in self._columns
+        ], dtype=np.float64)
+        upper = np.array([
+            inf if var.upBound is None else var.upBound for var in self._columns
+        ], dtype=np.float64)
+
+        cost = np.zeros(len(self._columns))
+        for var, coef in prob.objective.items():
+            cost[self._column_index[var]] = coef
+
+        return lower, upper, cost
+
+    def _load(self, prob: LpProblem):
+        """Export the full PuLP model into a fresh HiGHS instance."""
+        self._highs = self._new_highs()
+        self._prob_ref = weakref.ref(prob)
+        self._columns = prob.variables()
+        self._column_index = {var: i for i, var in enumerate(self._columns)}
+
+        constraints = list(prob.constraints.values())
+        self._row_names = list(prob.constraints)
+        starts, indices, values, row_lower, row_upper = self._row_arrays(
+            constraints, self._column_index
+        )
+        col_lower, col_upper, cost = self._column_arrays(prob)
+
+        lp = highspy.HighsLp()
+        lp.num_col_ = len(self._columns)
+        lp.num_row_ = len(constraints)
+        lp.col_cost_ = cost
+        lp.col_lower_ = col_lower
+        lp.col_upper_ = col_upper
+        lp.row_lower_ = row_lower
+        lp.row_upper_ = row_upper
+        lp.offset_ = float(prob.objective.constant)
+        lp.sense_ = (
+            highspy.ObjSense.kMaximize if prob.sense == LpMaximize else highspy.ObjSense.kMinimize
+        )
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+        lp.a_matrix_.start_ = np.append(starts, len(indices)).astype(np.int32)
+        lp.a_matrix_.index_ = indices
+        lp.a_matrix_.value_ = values
+        lp.integrality_ = [
+            highspy.HighsVarType.kInteger if var.cat == LpInteger else highspy.HighsVarType.kContinuous
+            for var in self._columns
+        ]
+        self._highs.passModel(lp)
+
+    def _update(self, prob: LpProblem):
+        """Ship appended rows, bounds and objective to the cached model."""
+        names = list(prob.constraints)
+        n_rows = len(self._row_names)
+        if names[:n_rows] != self._row_names:
+            # Rows were removed, renamed or reordered since the last solve
+            self._load(prob)
+            return
+
+        new_rows = [prob.constraints[name] for name in names[n_rows:]]
+        if new_rows:
+            starts, indices, values, row_lower, row_upper = self._row_arrays(
+                new_rows, self._column_index
+            )
+            self._highs.addRows(
+                len(new_rows), row_lower, row_upper, len(indices), starts, indices, values
+            )
+            self._row_names = names
+
+        col_lower, col_upper, cost = self._column_arrays(prob)
+        columns = np.arange(len(self._columns), dtype=np.int32)
+        self._highs.changeColsBounds(len(columns), columns, col_lower, col_upper)
+        self._highs.changeColsCost(len(columns), columns, cost)
+
+    def _solve(self, prob: LpProblem):
+        start = time.perf_counter()
+
+        if (
+            self.incremental
+            and self._highs is not None
+            and self._prob_ref is not None
+            and self._prob_ref() is prob
+        ):
+            try:
+                self._update(prob)
+            except KeyError:
+                # A new variable appeared in the rows or objective
+                self._load(prob)
+        else:
+            self._load(prob)
+
+        if self.warm_start and all(var.varValue is not None for var in self._columns):
+            self._highs.setSolution(
+                len(self._columns),
+                np.arange(len(self._columns), dtype=np.int32),
+                np.array([var.varValue for var in self._columns], dtype=np.float64),
+            )
+
+        export_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self._highs.run()
+        solve_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self._extract(prob)
+        extract_seconds = time.perf_counter() - start
+
+        if not self.incremental:
+            self._highs = None
+
+        return export_seconds, solve_seconds, extract_seconds
+
+    def _extract(self, prob: LpProblem):
+        """Map HiGHS status to PuLP and copy column values into the variables."""
+        model_status = self._highs.getModelStatus()
+        has_solution = (
+            self._highs.getInfo().primal_solution_status == highspy.kSolutionStatusFeasible
+        )
+        status_enum = highspy.HighsModelStatus
+
+        if model_status == status_enum.kOptimal:
+            prob.status, prob.sol_status = LpStatusOptimal, LpSolutionOptimal
+        elif model_status == status_enum.kInfeasible:
+            prob.status, prob.sol_status = LpStatusInfeasible, LpSolutionInfeasible
+        elif model_status in (status_enum.kUnbounded, status_enum.kUnboundedOrInfeasible):
+            prob.status, prob.sol_status = LpStatusUnbounded, LpSolutionUnbounded
+        elif has_solution:
+            # Stopped on a limit with an incumbent, as PuLP reports for CBC
+            prob.status, prob.sol_status = LpStatusOptimal, LpSolutionIntegerFeasible
+        else:
+            prob.status, prob.sol_status = LpStatusNotSolved, LpSolutionNoSolutionFound
+
+        if not has_solution:
+            return
+
+        col_value = self._highs.getSolution().col_value
+        for var, val in zip(self._columns, col_value):
+            # Snap integer columns so callers can compare x.value() == 1
+            var.varValue = float(round(val)) if var.cat == LpInteger else val
+
+
+def highs_available() -> bool:
+    """Return True if the HiGHS backend can be used."""
+    return highspy is not None
+
+
+def get_solver_backend(
+    name: Optional[str] = None,
+    time_limit: Optional[float] = 30,
+    warm_start: bool = False,
+    incremental: bool = False
+) -> SolverBackend:
+    """
+    Create a solver backend.
+
+    Args:
+        name: "highs", "cbc" or "auto" (default: SOLVER_BACKEND env var, then
+            DEFAULT_SOLVER_BACKEND). "auto" picks HiGHS when highspy is
+            installed, else CBC.
+        time_limit: Max solve time per call in seconds
+        warm_start: Seed solves with the variables' current values
+        incremental: Keep the solver model between solves of the same
+            problem (HiGHS only; ignored by CBC)
+
+    Returns:
+        SolverBackend instance
+
+    Raises:
+        ValueError: If name is not a known backend
+
+    Example:
+        >>> backend = get_solver_backend("auto", time_limit=30)
+        >>> backend.solve(prob)
+        >>> print(backend.last_timings())
+    """
+    name = (name or os.getenv(SOLVER_BACKEND_ENV, DEFAULT_SOLVER_BACKEND)).lower()
+
+    if name not in ("auto", "highs", "cbc"):
+        raise ValueError(f"Unknown solver backend: {name}")
+
+    if name == "highs" or (name == "auto" and highs_available()):
+        if highs_available():
+            return HighsBackend(time_limit, warm_start, incremental=incremental)
+        logger.warning("highspy not installed, falling back to CBC backend")
+
+    return CbcBackend(time_limit, warm_start)
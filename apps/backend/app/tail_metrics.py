@@ -12,18 +12,29 @@ Key design principles:
 1. Use np.partition() for O(n) tail selection (NOT np.sort which is O(n log n))
 2. Standard Rockafellar-Uryasev CVaR formulation (zeta + tail_slack mean)
 3. Adaptive scenario counts prevent instability from insufficient samples
-4. Bootstrap stability validation detects unreliable tail estimates
+4. Bootstrap stability validation detects unreliable tail estimates; all
+   resamples are drawn as one index matrix and their CVaRs come from a
+   single batched partition, and a fixed lineup set is scored across
+   resamples by matrix product instead of re-optimizing
 
 Reference: Rockafellar & Uryasev (2000) "Optimization of Conditional Value-at-Risk"
 """
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Optional, Callable
+from typing import Dict, List, Optional, Callable, Sequence
 
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Max elements of resampled data materialized at once during bootstrap
+BOOTSTRAP_CHUNK_ELEMENTS = 1 << 23
+
+# Stability thresholds for bootstrap validation
+STABLE_CVAR_CV = 0.2
+STABLE_LINEUP_CONSISTENCY = 0.7
+
 
 @dataclass
 class TailMetrics:
@@ -105,6 +116,54 @@ def compute_cvar(
     return cvar
 
 
+def compute_cvar_batch(
+    scenario_points: np.ndarray,
+    alpha: float = 0.99,
+    axis: int = -1,
+) -> np.ndarray:
+    """
+    Compute CVaR for many scenario vectors at once.
+
+    Same tail definition as compute_cvar (mean of the top
+    max(1, int((1 - alpha) * n)) values), using one np.partition over
+    the whole array instead of one call per vector.
+
+    Args:
+        scenario_points: Array whose `axis` holds the scenarios, e.g.
+            (n_bootstrap, n_scenarios) or (n_bootstrap, n_scenarios, n_lineups)
+        alpha: Tail quantile (e.g., 0.99 for top 1%)
+        axis: Scenario axis (default: last)
+
+    Returns:
+        CVaR array with `axis` removed
+
+    Raises:
+        ValueError: If the scenario axis is empty or alpha is not in [0, 1]
+
+    Examples:
+        >>> compute_cvar_batch(np.array([[1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
+        ...                              [10, 9, 8, 7, 6, 5, 4, 3, 2, 1]]), alpha=0.80)
+        array([9.5, 9.5])
+    """
+    scenario_points = np.asarray(scenario_points)
+    n_scenarios = scenario_points.shape[axis]
+    if n_scenarios == 0:
+        raise ValueError("scenario_points cannot be empty")
+
+    if not 0 <= alpha <= 1:
+        raise ValueError(f"alpha must be in [0, 1], got {alpha}")
+
+    if alpha == 1.0:
+        return np.max(scenario_points, axis=axis).astype(float)
+    if alpha == 0.0:
+        return np.min(scenario_points, axis=axis).astype(float)
+
+    k = max(1, int((1 - alpha) * n_scenarios))
+    top_k = np.partition(scenario_points, n_scenarios - k, axis=axis)
+    top_k = np.take(top_k, np.arange(n_scenarios - k, n_scenarios), axis=axis)
+    return np.mean(top_k, axis=axis, dtype=float)
+
+
 def compute_tail_metrics(
     scenario_points: np.ndarray,
     alpha: float = 0.99,
@@ -298,11 +357,126 @@ def adaptive_scenario_count(
         return max(required_scenarios, 500)
 
 
+def bootstrap_indices(
+    n_scenarios: int,
+    n_bootstrap: int,
+    random_state: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Draw every bootstrap resample as one index matrix.
+
+    Args:
+        n_scenarios: Number of scenarios to resample from (and per resample)
+        n_bootstrap: Number of resamples
+        random_state: Seed (None = derived from the global NumPy seed, so
+            np.random.seed still makes results reproducible)
+
+    Returns:
+        int array (n_bootstrap, n_scenarios) of scenario indices
+    """
+    if random_state is None:
+        random_state = np.random.randint(2**31)
+    rng = np.random.default_rng(random_state)
+    dtype = np.int32 if n_scenarios < 2**31 else np.int64
+    return rng.integers(0, n_scenarios, size=(n_bootstrap, n_scenarios), dtype=dtype)
+
+
+def _bootstrap_chunks(n_bootstrap: int, elements_per_resample: int):
+    """Resample row ranges keeping each chunk under BOOTSTRAP_CHUNK_ELEMENTS."""
+    chunk = max(1, BOOTSTRAP_CHUNK_ELEMENTS // max(1, elements_per_resample))
+    for start in range(0, n_bootstrap, chunk):
+        yield slice(start, min(start + chunk, n_bootstrap))
+
+
+def bootstrap_cvar(
+    scenario_points: np.ndarray,
+    indices: np.ndarray,
+    alpha: float = 0.99,
+) -> np.ndarray:
+    """
+    CVaR of every bootstrap resample without materializing the resamples.
+
+    A resample's CVaR only depends on how many times each scenario was
+    drawn. Each column's top m scenarios (m a little over twice the tail
+    size) are found once; per resample, the draw counts of those scenarios
+    are accumulated down the sorted order until k draws are covered, which
+    gives the exact top-k mean. Resamples with fewer than k draws among the
+    top m (vanishingly rare) fall back to a full partition.
+
+    Args:
+        scenario_points: Points per scenario, shape (n_scenarios,) or
+            (n_scenarios, n_columns) (e.g. one column per lineup)
+        indices: Bootstrap index matrix from bootstrap_indices,
+            shape (n_bootstrap, n_scenarios)
+        alpha: Tail quantile (e.g., 0.99 for top 1%)
+
+    Returns:
+        CVaR per resample, shape (n_bootstrap,) or (n_bootstrap, n_columns);
+        equal to compute_cvar(scenario_points[indices[b]], alpha) per column
+    """
+    points = np.asarray(scenario_points)
+    squeeze = points.ndim == 1
+    if squeeze:
+        points = points[:, None]
+    n_scenarios, n_columns = points.shape
+    n_bootstrap = len(indices)
+
+    if not 0 <= alpha <= 1:
+        raise ValueError(f"alpha must be in [0, 1], got {alpha}")
+
+    k = max(1, int((1 - alpha) * n_scenarios))
+    m = min(n_scenarios, 2 * k + 64)
+    if alpha == 0.0 or m == n_scenarios:
+        # Whole-sample statistics: materialize in chunks
+        result = np.empty((n_bootstrap, n_columns))
+        for rows in _bootstrap_chunks(n_bootstrap, n_scenarios * n_columns):
+            result[rows] = compute_cvar_batch(points[indices[rows]], alpha=alpha, axis=1)
+        return result[:, 0] if squeeze else result
+
+    # Top m scenarios of every column, best first: (m, n_columns)
+    top = np.argpartition(points, n_scenarios - m, axis=0)[n_scenarios - m:]
+    top_values = np.take_along_axis(points, top, axis=0)
+    order = np.argsort(-top_values, axis=0, kind='stable')
+    top = np.take_along_axis(top, order, axis=0)
+    top_values = np.take_along_axis(top_values, order, axis=0).astype(float)
+
+    result = np.empty((n_bootstrap, n_columns))
+    for rows in _bootstrap_chunks(n_bootstrap, max(n_scenarios, m * n_columns)):
+        chunk = indices[rows]
+        n_chunk = len(chunk)
+        # Draw counts per resample and scenario
+        offsets = (np.arange(n_chunk, dtype=np.int64) * n_scenarios)[:, None]
+        counts = np.bincount((chunk + offsets).ravel(), minlength=n_chunk * n_scenarios)
+        counts = counts.reshape(n_chunk, n_scenarios)
+
+        top_counts = counts[:, top]  # (n_chunk, m, n_columns)
+        drawn_before = np.cumsum(top_counts, axis=1) - top_counts
+        in_tail = np.clip(k - drawn_before, 0, top_counts)
+        result[rows] = np.einsum('bmc,mc->bc', in_tail, top_values) / k
+
+        short = np.argwhere(in_tail.sum(axis=1) < k)
+        for b, c in short:
+            result[rows.start + b, c] = compute_cvar(points[chunk[b], c], alpha=alpha)
+
+    return result[:, 0] if squeeze else result
+
+
+def _coefficient_of_variation(values: np.ndarray, axis: int = 0):
+    """CV = std (ddof=1) / |mean|, inf where the mean is zero."""
+    mean = np.mean(values, axis=axis)
+    std = np.std(values, axis=axis, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cv = np.where(mean != 0, std / np.abs(mean), np.inf)
+    return mean, std, cv
+
+
 def validate_tail_stability(
     scenarios: np.ndarray,
     optimize_fn: Callable[[np.ndarray], list],
     alpha: float = 0.99,
     n_bootstrap: int = 10,
+    n_workers: Optional[int] = None,
+    random_state: Optional[int] = None,
 ) -> Dict[str, any]:
     """
     Validate tail metric stability using bootstrap resampling.
@@ -311,11 +485,19 @@ def validate_tail_stability(
     of CVaR estimates. High coefficient of variation (CV) or low
     lineup consistency indicates unstable tail estimates.
 
+    All resamples are drawn at once (bootstrap_indices) and their CVaRs
+    computed with one batched partition. optimize_fn still runs once per
+    resample; pass n_workers to run those re-optimizations in a process
+    pool (optimize_fn must then be picklable). To score a fixed set of
+    lineups without re-optimizing, use validate_portfolio_tail_stability.
+
     Args:
         scenarios: Array of scenario outcomes, shape (n_scenarios,)
         optimize_fn: Function that takes scenarios and returns lineup scores
         alpha: Tail quantile for CVaR calculation (default: 0.99)
         n_bootstrap: Number of bootstrap iterations (default: 10)
+        n_workers: Process pool size for optimize_fn (default: None = in-process)
+        random_state: Seed for resampling (default: derived from np.random)
 
     Returns:
         Dict with:
@@ -340,48 +522,164 @@ def validate_tail_stability(
     if n_bootstrap < 2:
         raise ValueError(f"n_bootstrap must be >= 2, got {n_bootstrap}")
 
+    scenarios = np.asarray(scenarios)
     n_scenarios = len(scenarios)
-    cvar_values = []
-    lineup_rankings = []
-
-    # Perform bootstrap resampling
-    for i in range(n_bootstrap):
-        # Resample scenarios with replacement
-        bootstrap_sample = np.random.choice(scenarios, size=n_scenarios, replace=True)
+    indices = bootstrap_indices(n_scenarios, n_bootstrap, random_state)
 
-        # Compute CVaR for this bootstrap sample
-        bootstrap_cvar = compute_cvar(bootstrap_sample, alpha=alpha)
-        cvar_values.append(bootstrap_cvar)
+    # CVaR of every resample, from draw counts (no per-resample partition)
+    cvar_values = bootstrap_cvar(scenarios, indices, alpha=alpha)
 
-        # Get lineup ranking from optimize function
-        ranking = optimize_fn(bootstrap_sample)
-        lineup_rankings.append(tuple(ranking))
+    # Get lineup ranking from optimize function for every resample
+    samples = (scenarios[row] for row in indices)
+    if n_workers is not None and n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            lineup_rankings = [tuple(r) for r in pool.map(optimize_fn, samples)]
+    else:
+        lineup_rankings = [tuple(optimize_fn(sample)) for sample in samples]
 
     # Calculate coefficient of variation (CV = std / mean)
-    cvar_values = np.array(cvar_values)
-    cvar_mean = float(np.mean(cvar_values))
-    cvar_std = float(np.std(cvar_values, ddof=1))
-
-    # Avoid division by zero
-    if cvar_mean != 0:
-        cvar_cv = cvar_std / abs(cvar_mean)
-    else:
-        cvar_cv = float('inf')
+    cvar_mean, cvar_std, cvar_cv = _coefficient_of_variation(cvar_values)
+    cvar_mean, cvar_std, cvar_cv = float(cvar_mean), float(cvar_std), float(cvar_cv)
 
     # Calculate lineup consistency
     # Fraction of bootstrap samples that produce the same top lineup
     most_common_ranking = max(set(lineup_rankings), key=lineup_rankings.count)
     lineup_consistency = lineup_rankings.count(most_common_ranking) / n_bootstrap
 
+    return _stability_result(alpha, cvar_values, cvar_mean, cvar_std, cvar_cv, lineup_consistency)
+
+
+def validate_portfolio_tail_stability(
+    scenarios: np.ndarray,
+    lineups: Sequence[Sequence[int]],
+    alpha: float = 0.99,
+    n_bootstrap: int = 200,
+    random_state: Optional[int] = None,
+) -> Dict[str, any]:
+    """
+    Bootstrap tail stability of a fixed set of candidate lineups.
+
+    Instead of re-optimizing per resample, every candidate lineup is scored
+    once by matrix product (scenarios @ lineup_matrix.T) and the CVaR of
+    every lineup in every resample comes from one batched partition. Cheap
+    enough to run on every production portfolio.
+
+    The portfolio is stable when every lineup's CVaR estimate is: the
+    largest per-lineup CVaR CV must be below STABLE_CVAR_CV. Lineup
+    consistency (the fraction of resamples whose best-CVaR lineup is the
+    most frequent winner) is reported but not gated on, since in a
+    diversified portfolio of near-equal lineups it is low by design.
+
+    Args:
+        scenarios: DFS points matrix, shape (n_scenarios, n_drivers)
+        lineups: Candidate lineups as lists of driver column indices
+        alpha: Tail quantile for CVaR calculation (default: 0.99)
+        n_bootstrap: Number of bootstrap resamples (default: 200)
+        random_state: Seed for resampling (default: derived from np.random)
+
+    Returns:
+        Dict with the validate_tail_stability keys (cvar_* for the best
+        lineup on the full scenario set), plus:
+        - max_cvar_cv: Largest per-lineup CVaR coefficient of variation
+        - lineup_cvar_values: (n_bootstrap, n_lineups) CVaR per resample and lineup
+        - lineup_cvar_cv: (n_lineups,) CVaR coefficient of variation per lineup
+        - best_lineup_counts: (n_lineups,) resamples in which each lineup has the best CVaR
+
+    Raises:
+        ValueError: If scenarios or lineups are empty or n_bootstrap < 2
+
+    Examples:
+        >>> np.random.seed(42)
+        >>> scenarios = np.random.randn(10000, 12) * 10 + 50
+        >>> stability = validate_portfolio_tail_stability(
+        ...     scenarios, [[0, 1, 2, 3, 4, 5], [6, 7, 8, 9, 10, 11]], alpha=0.95
+        ... )
+        >>> stability['lineup_cvar_values'].shape
+        (200, 2)
+    """
+    scenarios = np.asarray(scenarios)
+    if scenarios.ndim != 2 or len(scenarios) == 0:
+        raise ValueError("scenarios cannot be empty and must be (n_scenarios, n_drivers)")
+
+    if len(lineups) == 0:
+        raise ValueError("lineups cannot be empty")
+
+    if n_bootstrap < 2:
+        raise ValueError(f"n_bootstrap must be >= 2, got {n_bootstrap}")
+
+    n_scenarios, n_drivers = scenarios.shape
+    lineup_matrix = np.zeros((len(lineups), n_drivers), dtype=scenarios.dtype)
+    for i, lineup in enumerate(lineups):
+        lineup_matrix[i, list(lineup)] = 1
+
+    # Points of every lineup in every scenario: (n_scenarios, n_lineups)
+    lineup_points = scenarios @ lineup_matrix.T
+    n_lineups = lineup_points.shape[1]
+
+    indices = bootstrap_indices(n_scenarios, n_bootstrap, random_state)
+    lineup_cvar_values = bootstrap_cvar(lineup_points, indices, alpha=alpha)
+
+    best_per_resample = np.argmax(lineup_cvar_values, axis=1)
+    best_lineup_counts = np.bincount(best_per_resample, minlength=n_lineups)
+    lineup_consistency = float(best_lineup_counts.max() / n_bootstrap)
+
+    _, _, lineup_cvar_cv = _coefficient_of_variation(lineup_cvar_values)
+
+    # Headline CVaR statistics for the best lineup on the full scenario set
+    best = int(np.argmax(compute_cvar_batch(lineup_points, alpha=alpha, axis=0)))
+    cvar_values = lineup_cvar_values[:, best]
+    cvar_mean, cvar_std, cvar_cv = (float(v) for v in _coefficient_of_variation(cvar_values))
+
+    max_cvar_cv = float(np.max(lineup_cvar_cv))
+    stable = bool(max_cvar_cv < STABLE_CVAR_CV)
+
+    if not stable:
+        message = (
+            f"Unstable portfolio tail estimates detected: "
+            f"max lineup CVaR CV={max_cvar_cv:.3f} (threshold: {STABLE_CVAR_CV})."
+        )
+        recommended = adaptive_scenario_count(alpha)
+        if n_scenarios < recommended:
+            message += f" Recommend increasing scenario count to {recommended}."
+        logger.warning(message)
+
+    logger.info(
+        f"Portfolio tail stability (alpha={alpha:.2f}): "
+        f"max CV={max_cvar_cv:.3f}, Consistency={lineup_consistency:.3f}, Stable={stable}"
+    )
+
+    return {
+        'cvar_cv': cvar_cv,
+        'max_cvar_cv': max_cvar_cv,
+        'lineup_consistency': lineup_consistency,
+        'stable': stable,
+        'cvar_values': cvar_values,
+        'cvar_mean': cvar_mean,
+        'cvar_std': cvar_std,
+        'lineup_cvar_values': lineup_cvar_values,
+        'lineup_cvar_cv': lineup_cvar_cv,
+        'best_lineup_counts': best_lineup_counts,
+    }
+
+
+def _stability_result(
+    alpha: float,
+    cvar_values: np.ndarray,
+    cvar_mean: float,
+    cvar_std: float,
+    cvar_cv: float,
+    lineup_consistency: float,
+) -> Dict[str, any]:
+    """Apply the stability thresholds, log, and build the result dict."""
     # Determine stability
-    stable = (cvar_cv < 0.2) and (lineup_consistency > 0.7)
+    stable = bool((cvar_cv < STABLE_CVAR_CV) and (lineup_consistency > STABLE_LINEUP_CONSISTENCY))
 
     # Log warnings if unstable
     if not stable:
         logger.warning(
             f"Unstable tail estimates detected: "
-            f"CVaR CV={cvar_cv:.3f} (threshold: 0.2), "
-            f"Lineup consistency={lineup_consistency:.3f} (threshold: 0.7). "
+            f"CVaR CV={cvar_cv:.3f} (threshold: {STABLE_CVAR_CV}), "
+            f"Lineup consistency={lineup_consistency:.3f} (threshold: {STABLE_LINEUP_CONSISTENCY}). "
             f"Recommend increasing scenario count to {adaptive_scenario_count(alpha)}."
         )
 
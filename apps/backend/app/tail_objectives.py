@@ -25,11 +25,19 @@ References:
 """
 
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 import numpy as np
-from pulp import LpProblem, LpVariable, lpSum, LpAffineExpression
+from pulp import (
+    LpProblem,
+    LpVariable,
+    lpSum,
+    LpAffineExpression,
+    LpConstraint,
+    LpConstraintEQ,
+    LpConstraintGE,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -531,6 +539,357 @@ def build_upper_tail_cvar_objective(
     return cvar_objective
 
 
+@dataclass
+class ScenarioReduction:
+    """
+    Weighted representative scenarios produced by reduce_scenarios().
+
+    Attributes:
+        scenarios: ndarray (n_representatives, n_drivers) of representative
+            driver points
+        weights: ndarray (n_representatives,) of probabilities summing to 1
+        assignment: ndarray (n_original,) mapping each original scenario to
+            its representative row
+        error_bound: Upper bound on |CVaR_reduced - CVaR_full| for any lineup
+            of n_drivers drivers and any alpha
+    """
+    scenarios: np.ndarray
+    weights: np.ndarray
+    assignment: np.ndarray
+    error_bound: float
+
+    @property
+    def n_representatives(self) -> int:
+        """Number of representative scenarios."""
+        return len(self.weights)
+
+
+def compute_weighted_cvar(
+    scenario_points: np.ndarray,
+    scenario_weights: np.ndarray,
+    alpha: float = 0.99
+) -> float:
+    """
+    Compute upper-tail CVaR of a weighted discrete distribution.
+
+    Takes the probability-weighted mean of the top (1-alpha) mass, splitting
+    the boundary scenario fractionally. With uniform weights this is the
+    exact Rockafellar-Uryasev optimum.
+
+    Args:
+        scenario_points: ndarray (n_scenarios,) with portfolio points
+        scenario_weights: ndarray (n_scenarios,) of probabilities
+        alpha: Tail quantile (e.g., 0.99 for top 1%)
+
+    Returns:
+        CVaR value (float)
+    """
+    if scenario_points.size == 0:
+        raise ValueError("scenario_points array cannot be empty")
+
+    if not (0 < alpha < 1):
+        raise ValueError(f"alpha must be in (0, 1), got {alpha}")
+
+    order = np.argsort(-scenario_points, kind="stable")
+    points = scenario_points[order]
+    weights = scenario_weights[order] / scenario_weights.sum()
+
+    tail_mass = 1 - alpha
+    mass_before = np.concatenate([[0.0], np.cumsum(weights)[:-1]])
+    mass_in_tail = np.clip(tail_mass - mass_before, 0.0, weights)
+
+    return float((points * mass_in_tail).sum() / tail_mass)
+
+
+def _assign_to_centroids(
+    scenarios: np.ndarray,
+    centroids: np.ndarray,
+    chunk_size: int = 4096
+) -> np.ndarray:
+    """Assign each scenario to its nearest centroid (squared Euclidean)."""
+    centroid_norms = (centroids ** 2).sum(axis=1)
+    assignment = np.empty(len(scenarios), dtype=np.int64)
+
+    for start in range(0, len(scenarios), chunk_size):
+        block = scenarios[start:start + chunk_size]
+        # ||a - c||^2 = ||a||^2 - 2 a.c + ||c||^2; ||a||^2 is constant per row
+        distances = centroid_norms[None, :] - 2.0 * block @ centroids.T
+        assignment[start:start + chunk_size] = distances.argmin(axis=1)
+
+    return assignment
+
+
+def reduce_scenarios(
+    scenarios: np.ndarray,
+    n_representatives: int,
+    n_drivers: int = 6,
+    tail_fraction: float = 0.05,
+    n_iter: int = 10
+) -> ScenarioReduction:
+    """
+    Cluster scenarios into weighted representatives for the CVaR LP.
+
+    Scenarios whose best possible lineup (sum of the top n_drivers driver
+    points) ranks in the top tail_fraction are kept exactly, since they are
+    the ones upper-tail CVaR is built from. The remaining scenarios are
+    grouped by k-means (Lloyd iterations seeded from potential-sorted
+    slices) and replaced by their centroids, weighted by cluster mass.
+
+    Every original scenario maps to one representative with its probability
+    mass, so if each lineup's points move by at most delta under that map,
+    its CVaR moves by at most delta at every alpha. error_bound is that
+    delta: the largest sum of the n_drivers biggest per-driver deviations
+    between a scenario and its representative.
+
+    Args:
+        scenarios: ndarray (n_scenarios, n_drivers_total) with DFS points
+        n_representatives: Target number of representative scenarios
+        n_drivers: Lineup size used for the error bound (default 6)
+        tail_fraction: Fraction of highest-potential scenarios kept exact
+        n_iter: Maximum Lloyd iterations for the bulk clusters
+
+    Returns:
+        ScenarioReduction with representatives, weights, assignment and
+        error bound
+
+    Raises:
+        ValueError: If scenarios is empty or n_representatives is not positive
+
+    Example:
+        >>> reduction = reduce_scenarios(scenarios, n_representatives=1000)
+        >>> obj = build_compact_multi_cvar_objective(
+        ...     prob, reduction.scenarios, x,
+        ...     scenario_weights=reduction.weights
+        ... )
+        >>> print(f"CVaR error <= {reduction.error_bound:.2f} points")
+    """
+    if scenarios.size == 0:
+        raise ValueError("scenarios array cannot be empty")
+
+    if n_representatives <= 0:
+        raise ValueError(f"n_representatives must be positive, got {n_representatives}")
+
+    if not (0 <= tail_fraction <= 1):
+        raise ValueError(f"tail_fraction must be in [0, 1], got {tail_fraction}")
+
+    scenarios = np.asarray(scenarios, dtype=np.float64)
+    n_scenarios, n_drivers_total = scenarios.shape
+    lineup_size = min(n_drivers, n_drivers_total)
+
+    if n_representatives >= n_scenarios:
+        return ScenarioReduction(
+            scenarios=scenarios,
+            weights=np.full(n_scenarios, 1.0 / n_scenarios),
+            assignment=np.arange(n_scenarios),
+            error_bound=0.0
+        )
+
+    # Best lineup points achievable in each scenario (ignoring constraints)
+    potential = np.partition(scenarios, -lineup_size, axis=1)[:, -lineup_size:].sum(axis=1)
+    order = np.argsort(-potential, kind="stable")
+
+    n_exact = min(int(np.ceil(tail_fraction * n_scenarios)), n_representatives - 1)
+    exact_idx = order[:n_exact]
+    bulk_idx = order[n_exact:]
+    n_clusters = n_representatives - n_exact
+
+    # Seed centroids from contiguous slices of the potential ordering
+    bulk = scenarios[bulk_idx]
+    seed_labels = np.arange(len(bulk_idx)) * n_clusters // len(bulk_idx)
+    labels = seed_labels
+
+    for _ in range(n_iter):
+        counts = np.bincount(labels, minlength=n_clusters)
+        occupied = counts > 0
+        sums = np.zeros((n_clusters, n_drivers_total))
+        np.add.at(sums, labels, bulk)
+        centroids = sums[occupied] / counts[occupied, None]
+
+        new_labels = _assign_to_centroids(bulk, centroids)
+        n_clusters = len(centroids)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+    counts = np.bincount(labels, minlength=n_clusters)
+    occupied = counts > 0
+    remap = np.cumsum(occupied) - 1
+    labels = remap[labels]
+    sums = np.zeros((int(occupied.sum()), n_drivers_total))
+    np.add.at(sums, labels, bulk)
+    centroids = sums / counts[occupied, None]
+
+    representatives = np.vstack([scenarios[exact_idx], centroids])
+    weights = np.concatenate([
+        np.ones(n_exact),
+        counts[occupied].astype(np.float64)
+    ]) / n_scenarios
+
+    assignment = np.empty(n_scenarios, dtype=np.int64)
+    assignment[exact_idx] = np.arange(n_exact)
+    assignment[bulk_idx] = n_exact + labels
+
+    deviation = np.abs(scenarios - representatives[assignment])
+    error_bound = float(
+        np.partition(deviation, -lineup_size, axis=1)[:, -lineup_size:].sum(axis=1).max()
+    )
+
+    logger.info(
+        f"Reduced {n_scenarios} scenarios to {len(weights)} representatives "
+        f"({n_exact} exact tail scenarios), CVaR error bound {error_bound:.2f}"
+    )
+
+    return ScenarioReduction(
+        scenarios=representatives,
+        weights=weights,
+        assignment=assignment,
+        error_bound=error_bound
+    )
+
+
+def build_compact_multi_cvar_objective(
+    prob: LpProblem,
+    scenarios: np.ndarray,
+    x: Dict[int, LpVariable],
+    alphas: List[float] = [0.99, 0.95],
+    weights: List[float] = [0.7, 0.3],
+    scenario_weights: Optional[np.ndarray] = None,
+    var_prefix: str = "cvar"
+) -> LpAffineExpression:
+    """
+    Build a weighted upper-tail Multi-CVaR objective with a compact LP.
+
+    Equivalent to summing build_upper_tail_cvar_objective() per quantile,
+    but emits each constraint row straight from the NumPy scenario matrix
+    (one coefficient list per row, no per-term lpSum arithmetic) and shares
+    the scenario portfolio points across quantiles:
+
+        points_k = sum_i scenarios[k, i] * x_i            (one dense row per k)
+        u_{a,k} >= points_k - zeta_a                      (three terms per a, k)
+
+    With two quantiles this halves the dense rows the model carries. With a
+    single quantile the points variables are skipped and the dense rows
+    bound u_k directly.
+
+    Scenario weights (e.g. from reduce_scenarios()) turn the CVaR sum into
+    zeta + (1/(1-alpha)) * sum_k w_k u_k; the default is uniform 1/S.
+
+    Args:
+        prob: PuLP problem instance
+        scenarios: (n_scenarios, n_drivers) matrix of driver points per scenario
+        x: Dict mapping driver_id to binary selection variables, in the
+            column order of scenarios
+        alphas: Tail quantiles (e.g., [0.99, 0.95])
+        weights: Objective weight per quantile
+        scenario_weights: Optional (n_scenarios,) probabilities summing to 1
+        var_prefix: Prefix for variable and constraint names
+
+    Returns:
+        LpAffineExpression for the weighted Multi-CVaR objective (maximize)
+
+    Raises:
+        ValueError: If scenarios is empty, alphas/weights lengths differ,
+            any alpha is outside (0, 1) or scenario_weights is malformed
+
+    Example:
+        >>> prob = LpProblem("Compact_CVaR", LpMaximize)
+        >>> scenarios = np.random.randn(10000, 40) * 10 + 50
+        >>> x = {i: LpVariable(f"d{i}", cat="Binary") for i in range(40)}
+        >>> prob += build_compact_multi_cvar_objective(prob, scenarios, x)
+    """
+    if scenarios.size == 0:
+        raise ValueError("scenarios array cannot be empty")
+
+    if len(alphas) != len(weights):
+        raise ValueError(
+            f"len(alphas)={len(alphas)} must equal len(weights)={len(weights)}"
+        )
+
+    for alpha in alphas:
+        if not (0 < alpha < 1):
+            raise ValueError(f"alpha must be in (0, 1), got {alpha}")
+
+    n_scenarios, n_drivers = scenarios.shape
+
+    if scenario_weights is None:
+        scenario_weights = np.full(n_scenarios, 1.0 / n_scenarios)
+    else:
+        scenario_weights = np.asarray(scenario_weights, dtype=np.float64)
+        if scenario_weights.shape != (n_scenarios,):
+            raise ValueError(
+                f"scenario_weights shape {scenario_weights.shape} does not match "
+                f"{n_scenarios} scenarios"
+            )
+        if np.any(scenario_weights < 0) or not np.isclose(scenario_weights.sum(), 1.0):
+            raise ValueError("scenario_weights must be non-negative and sum to 1.0")
+
+    logger.info(
+        f"Building compact Multi-CVaR objective: {n_scenarios} scenarios, "
+        f"{n_drivers} drivers, alphas={alphas}"
+    )
+
+    # Same bounds as build_upper_tail_cvar_objective()
+    max_lineup_points = float(scenarios.max()) * n_drivers
+    min_lineup_points = float(scenarios.min())
+    max_excess = max_lineup_points - min_lineup_points
+
+    x_vars = list(x.values())
+    rows = np.asarray(scenarios, dtype=np.float64).tolist()
+    shared_points = len(alphas) > 1
+
+    if shared_points:
+        points = [
+            LpVariable(f"{var_prefix}_points_{k}", cat="Continuous")
+            for k in range(n_scenarios)
+        ]
+        # points_k - sum_i s_ki x_i = 0
+        for k, row in enumerate(rows):
+            terms = list(zip(x_vars, (-c for c in row)))
+            terms.append((points[k], 1.0))
+            prob.addConstraint(
+                LpConstraint(LpAffineExpression(terms), LpConstraintEQ, rhs=0.0),
+                f"{var_prefix}_points_def_{k}"
+            )
+
+    objective_terms = []
+    for alpha, weight in zip(alphas, weights):
+        prefix = f"{var_prefix}_{int(round(alpha * 100))}"
+        zeta = LpVariable(
+            f"{prefix}_zeta",
+            lowBound=min_lineup_points,
+            upBound=max_lineup_points,
+            cat="Continuous"
+        )
+        u = [
+            LpVariable(f"{prefix}_u_{k}", lowBound=0, upBound=max_excess, cat="Continuous")
+            for k in range(n_scenarios)
+        ]
+
+        # u_k + zeta - points_k >= 0
+        for k in range(n_scenarios):
+            if shared_points:
+                terms = [(u[k], 1.0), (zeta, 1.0), (points[k], -1.0)]
+            else:
+                terms = list(zip(x_vars, (-c for c in rows[k])))
+                terms.extend(((u[k], 1.0), (zeta, 1.0)))
+            prob.addConstraint(
+                LpConstraint(LpAffineExpression(terms), LpConstraintGE, rhs=0.0),
+                f"{prefix}_tail_slack_{k}"
+            )
+
+        # weight * (zeta + (1/(1-alpha)) sum_k w_k u_k)
+        tail_coefs = (weight / (1 - alpha)) * scenario_weights
+        objective_terms.append((zeta, weight))
+        objective_terms.extend(zip(u, tail_coefs.tolist()))
+
+    logger.debug(
+        f"Compact Multi-CVaR objective created: {len(prob.constraints)} constraints, "
+        f"shared_points={shared_points}"
+    )
+
+    return LpAffineExpression(objective_terms)
+
+
 if __name__ == "__main__":
     # Example usage
     logging.basicConfig(level=logging.INFO)
@@ -17,6 +17,10 @@ from tail_metrics import (
     compute_top_X_metrics,
     adaptive_scenario_count,
     validate_tail_stability,
+    validate_portfolio_tail_stability,
+    bootstrap_indices,
+    bootstrap_cvar,
+    compute_cvar_batch,
     TailMetrics,
 )
 
@@ -388,3 +392,92 @@ class TestValidateTailStability:
         assert stability1['stable'] == stability2['stable']
         # CV should be similar
         assert abs(stability1['cvar_cv'] - stability2['cvar_cv']) < 0.01
+
+    def test_stability_reoptimizes_once_per_resample(self):
+        """optimize_fn should see each bootstrap resample exactly once."""
+        scenarios = np.arange(1000, dtype=float)
+        seen = []
+
+        def optimize_fn(sample):
+            seen.append(sample)
+            return [int(sample.max() > 990)]
+
+        stability = validate_tail_stability(scenarios, optimize_fn, n_bootstrap=4, random_state=0)
+
+        indices = bootstrap_indices(1000, 4, random_state=0)
+        assert len(seen) == 4
+        for sample, row in zip(seen, indices):
+            np.testing.assert_array_equal(sample, scenarios[row])
+        expected = [compute_cvar(scenarios[row], alpha=0.99) for row in indices]
+        np.testing.assert_allclose(stability['cvar_values'], expected)
+
+
+class TestBatchedBootstrap:
+    """Test batched CVaR and fixed-portfolio bootstrap stability."""
+
+    def test_cvar_batch_matches_per_row(self):
+        """Batched CVaR should equal compute_cvar row by row."""
+        np.random.seed(0)
+        points = np.random.randn(20, 500)
+
+        for alpha in (0.0, 0.9, 0.99, 1.0):
+            expected = [compute_cvar(row, alpha=alpha) for row in points]
+            np.testing.assert_allclose(compute_cvar_batch(points, alpha=alpha), expected)
+
+    @pytest.mark.parametrize("alpha", [0.5, 0.95, 0.99, 0.999])
+    def test_bootstrap_cvar_matches_materialized_resamples(self, alpha):
+        """Count-based bootstrap CVaR should be exact, including ties."""
+        np.random.seed(1)
+        points = np.round(np.random.randn(2000, 3) * 5)  # many ties
+        indices = bootstrap_indices(2000, 25, random_state=3)
+
+        result = bootstrap_cvar(points, indices, alpha=alpha)
+
+        expected = np.array([
+            [compute_cvar(points[row, c], alpha=alpha) for c in range(3)]
+            for row in indices
+        ])
+        np.testing.assert_allclose(result, expected)
+
+    def test_portfolio_stability_scores_fixed_lineups(self):
+        """A dominant lineup should win every resample."""
+        np.random.seed(2)
+        scenarios = np.random.randn(5000, 12) * 5 + 30
+        scenarios[:, :6] += 20  # First six drivers dominate
+
+        stability = validate_portfolio_tail_stability(
+            scenarios, [[0, 1, 2, 3, 4, 5], [6, 7, 8, 9, 10, 11]],
+            alpha=0.95, n_bootstrap=50, random_state=0
+        )
+
+        assert stability['lineup_cvar_values'].shape == (50, 2)
+        np.testing.assert_array_equal(stability['best_lineup_counts'], [50, 0])
+        assert stability['lineup_consistency'] == 1.0
+        assert stability['stable']
+        np.testing.assert_array_equal(
+            stability['cvar_values'], stability['lineup_cvar_values'][:, 0]
+        )
+
+    def test_portfolio_stability_ignores_best_lineup_churn(self):
+        """Near-equal lineups trade the best CVaR but are each estimated stably."""
+        np.random.seed(3)
+        scenarios = np.random.randn(10000, 12) * 5 + 30
+        lineups = [[i, (i + 1) % 12, (i + 2) % 12, (i + 3) % 12, (i + 4) % 12, (i + 5) % 12]
+                   for i in range(12)]
+
+        stability = validate_portfolio_tail_stability(
+            scenarios, lineups, alpha=0.99, n_bootstrap=100, random_state=0
+        )
+
+        assert stability['lineup_consistency'] < 0.7
+        assert stability['max_cvar_cv'] == pytest.approx(stability['lineup_cvar_cv'].max())
+        assert stability['max_cvar_cv'] < 0.2
+        assert stability['stable']
+
+    def test_portfolio_stability_validates_inputs(self):
+        """Empty lineups or too few resamples should raise ValueError."""
+        scenarios = np.ones((100, 6))
+        with pytest.raises(ValueError, match="lineups cannot be empty"):
+            validate_portfolio_tail_stability(scenarios, [])
+        with pytest.raises(ValueError, match="n_bootstrap must be >= 2"):
+            validate_portfolio_tail_stability(scenarios, [[0, 1]], n_bootstrap=1)
@@ -0,0 +1,254 @@
+"""
+Queue worker for background optimization jobs.
+
+Workers run as separate processes (or machines) from the API: the API only
+creates and enqueues jobs through JobStateManager, and any number of workers
+pull them from Redis. Scaling optimization capacity means starting more
+workers, independently of API replicas.
+
+Each worker:
+- Registers itself and keeps a heartbeat key alive (every heartbeat_ttl / 3)
+- Claims one job at a time with BLMOVE (the job stays in the worker's
+  processing list until it is acknowledged)
+- Runs the job's handler in a thread, so heartbeats continue during long jobs
+- Publishes handler progress to the job hash
+- Writes the result; after a transient error (TRANSIENT_ERRORS) requeues
+  the job until max_attempts is reached, after any other error fails it
+- Periodically recovers jobs from workers whose heartbeat expired
+
+Handlers are looked up by the job's job_type and called as
+handler(job_id, input_params, report_progress) -> JSON-serializable result,
+where report_progress(fraction) may be called from the handler's thread.
+
+Run:
+    python -m app.worker
+
+Configuration (environment):
+- REDIS_HOST / REDIS_PORT: Redis connection (same as the API)
+- WORKER_ID: Worker identifier (default: hostname-pid)
+- WORKER_POLL_TIMEOUT: Seconds to block waiting for a job (default 5)
+- WORKER_RECOVER_INTERVAL: Seconds between stale-job recovery passes (default 30)
+- JOB_MAX_ATTEMPTS / JOB_HEARTBEAT_TTL: see app.job_manager
+"""
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+import redis
+import redis.asyncio
+
+from app.job_manager import JobStateManager
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[str, Dict[str, Any], Callable[[float], None]], Any]
+
+# Handler errors worth another attempt (lost connections, timeouts). Anything
+# else, e.g. a ValueError for an infeasible slate, would fail the same way again.
+TRANSIENT_ERRORS = (ConnectionError, TimeoutError, redis.ConnectionError, redis.TimeoutError)
+
+
+def default_handlers() -> Dict[str, JobHandler]:
+    """Job handlers by job_type (imported lazily; the pipelines are heavy)."""
+    from app.api.optimize import run_optimization_job
+
+    return {"optimize": run_optimization_job}
+
+
+class JobWorker:
+    """
+    Pulls jobs from the Redis queue and executes them.
+
+    Attributes:
+        job_manager: JobStateManager for queue and job state access
+        worker_id: Unique worker identifier
+        handlers: Job handlers by job_type
+        poll_timeout: Seconds to block waiting for a job
+        recover_interval: Seconds between stale-job recovery passes
+    """
+
+    def __init__(
+        self,
+        job_manager: JobStateManager,
+        worker_id: Optional[str] = None,
+        handlers: Optional[Dict[str, JobHandler]] = None,
+        poll_timeout: float = 5.0,
+        recover_interval: float = 30.0,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            job_manager: JobStateManager for queue and job state access
+            worker_id: Unique worker identifier (default: hostname-pid)
+            handlers: Job handlers by job_type (default: default_handlers())
+            poll_timeout: Seconds to block waiting for a job
+            recover_interval: Seconds between stale-job recovery passes
+        """
+        self.job_manager = job_manager
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.handlers = handlers if handlers is not None else default_handlers()
+        self.poll_timeout = poll_timeout
+        self.recover_interval = recover_interval
+        self.heartbeat_interval = max(job_manager.heartbeat_ttl / 3, 0.1)
+
+        self._current_job: Optional[str] = None
+        self._last_recovery = 0.0
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            try:
+                await self.job_manager.heartbeat(self.worker_id, self._current_job)
+            except redis.RedisError as e:
+                logger.warning(f"Worker {self.worker_id} heartbeat failed: {e}")
+            await asyncio.sleep(self.heartbeat_interval)
+
+    def _progress_reporter(
+        self, job_id: str, loop: asyncio.AbstractEventLoop, pending: List[Future]
+    ) -> Callable[[float], None]:
+        """Thread-safe progress callback that publishes without blocking the handler."""
+        def report_progress(progress: float) -> None:
+            pending.append(asyncio.run_coroutine_threadsafe(
+                self.job_manager.update_job_progress(job_id, progress), loop
+            ))
+        return report_progress
+
+    async def process_job(self, job_id: str) -> None:
+        """
+        Execute one claimed job and record its outcome.
+
+        Args:
+            job_id: Job claimed by this worker
+        """
+        job = await self.job_manager.get_job(job_id)
+        if job is None:
+            logger.warning(f"Job {job_id} disappeared before execution")
+            await self.job_manager.ack_job(self.worker_id, job_id)
+            return
+
+        job_type = job.get("job_type") or "optimize"
+        handler = self.handlers.get(job_type)
+        if handler is None:
+            # No worker can run it; retrying would not help
+            await self.job_manager.update_job_status(
+                job_id, "failed", error=f"Unknown job type '{job_type}'"
+            )
+            await self.job_manager.ack_job(self.worker_id, job_id)
+            return
+
+        self._current_job = job_id
+        started = time.perf_counter()
+        pending_progress: List[Future] = []
+        try:
+            report_progress = self._progress_reporter(
+                job_id, asyncio.get_running_loop(), pending_progress
+            )
+            try:
+                result = await asyncio.to_thread(
+                    handler, job_id, json.loads(job["input_params"]), report_progress
+                )
+            finally:
+                # Let progress writes land before the final status
+                await asyncio.gather(
+                    *(asyncio.wrap_future(f) for f in pending_progress), return_exceptions=True
+                )
+        except Exception as e:
+            logger.error(f"Job {job_id} raised: {e}", exc_info=True)
+            await self.job_manager.retry_or_fail_job(
+                self.worker_id, job_id, str(e), retryable=isinstance(e, TRANSIENT_ERRORS)
+            )
+            return
+        finally:
+            self._current_job = None
+
+        await self.job_manager.update_job_progress(job_id, 1.0)
+        await self.job_manager.update_job_status(job_id, "completed", result=result)
+        await self.job_manager.ack_job(self.worker_id, job_id)
+
+        logger.info(f"Job {job_id} completed in {time.perf_counter() - started:.1f}s")
+
+    async def run_once(self) -> bool:
+        """
+        Recover stale jobs if due, then claim and process at most one job.
+
+        Returns:
+            True if a job was processed, False if the queue was empty
+        """
+        if time.monotonic() - self._last_recovery >= self.recover_interval:
+            self._last_recovery = time.monotonic()
+            await self.job_manager.recover_stale_jobs()
+
+        job_id = await self.job_manager.claim_job(self.worker_id, timeout=self.poll_timeout)
+        if job_id is None:
+            return False
+
+        await self.process_job(job_id)
+        return True
+
+    async def run(self, stop_event: Optional[asyncio.Event] = None) -> None:
+        """
+        Process jobs until stop_event is set.
+
+        The current job is finished before stopping; jobs still held when the
+        worker exits are returned to the queue by deregistration.
+
+        Args:
+            stop_event: Event that stops the loop (default: run forever)
+        """
+        stop_event = stop_event or asyncio.Event()
+
+        await self.job_manager.register_worker(self.worker_id)
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        logger.info(f"Worker {self.worker_id} started, handlers={sorted(self.handlers)}")
+
+        try:
+            while not stop_event.is_set():
+                try:
+                    await self.run_once()
+                except redis.ConnectionError as e:
+                    logger.error(f"Worker {self.worker_id} lost Redis: {e}; retrying")
+                    await asyncio.sleep(self.poll_timeout)
+        finally:
+            heartbeat.cancel()
+            await self.job_manager.deregister_worker(self.worker_id)
+            logger.info(f"Worker {self.worker_id} stopped")
+
+
+async def _main() -> None:
+    # No socket_timeout: claim_job blocks on BLMOVE for up to poll_timeout
+    redis_pool = redis.asyncio.ConnectionPool(
+        host=os.getenv("REDIS_HOST", "redis"),
+        port=int(os.getenv("REDIS_PORT", "6379")),
+        db=0,
+        health_check_interval=30,
+        socket_connect_timeout=3,
+        decode_responses=True,
+    )
+    poll_timeout = float(os.getenv("WORKER_POLL_TIMEOUT", "5"))
+    job_manager = JobStateManager(redis_pool)
+    worker = JobWorker(
+        job_manager,
+        worker_id=os.getenv("WORKER_ID"),
+        poll_timeout=poll_timeout,
+        recover_interval=float(os.getenv("WORKER_RECOVER_INTERVAL", "30")),
+    )
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await worker.run(stop_event)
+    await job_manager.close()
+    await redis_pool.disconnect()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(_main())
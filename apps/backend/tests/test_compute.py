@@ -0,0 +1,152 @@
+"""
+Tests for the off-event-loop compute executor.
+
+Covers admission control (per-endpoint in-flight limits, 429 mapping),
+slot release, per-endpoint modes, process-mode execution, and that a
+running job does not block the event loop.
+"""
+import asyncio
+import math
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api.optimize_portfolio as optimize_portfolio
+import app.main as main
+from app.compute import (
+    ComputeExecutor,
+    ComputeSaturatedError,
+    saturation_http_exception,
+)
+
+
+def _wait(event: threading.Event) -> str:
+    event.wait(timeout=10)
+    return "done"
+
+
+def test_admission_limit_rejects_and_releases():
+    executor = ComputeExecutor(n_workers=2, mode="thread", default_limit=1, limits={"contest-sim": 2})
+    release = threading.Event()
+
+    first = executor.submit("optimize", _wait, release)
+    with pytest.raises(ComputeSaturatedError) as excinfo:
+        executor.submit("optimize", _wait, release)
+    assert excinfo.value.limit == 1
+    assert excinfo.value.retry_after >= 1
+
+    # Limits are per endpoint
+    other = executor.submit("contest-sim", _wait, release)
+
+    release.set()
+    assert first.result(timeout=5) == "done"
+    assert other.result(timeout=5) == "done"
+    assert executor.submit("optimize", math.factorial, 5).result(timeout=5) == 120
+
+    stats = executor.stats()["endpoints"]
+    assert stats["optimize"] == {
+        "in_flight": 0, "limit": 1, "completed": 2, "rejected": 1,
+        "avg_seconds": stats["optimize"]["avg_seconds"],
+    }
+    assert stats["contest-sim"]["limit"] == 2
+    executor.shutdown()
+
+
+def test_limits_from_env(monkeypatch):
+    monkeypatch.setenv("COMPUTE_MODE", "thread")
+    monkeypatch.setenv("COMPUTE_WORKERS", "3")
+    monkeypatch.setenv("COMPUTE_MAX_IN_FLIGHT", "4")
+    monkeypatch.setenv("COMPUTE_LIMIT_CONTEST_SIM", "7")
+
+    executor = ComputeExecutor.from_env()
+
+    assert executor.n_workers == 3
+    assert executor.limit("optimize") == 4
+    assert executor.limit("contest-sim") == 7
+    with pytest.raises(ValueError):
+        ComputeExecutor(mode="gpu")
+
+
+def test_endpoint_modes(monkeypatch):
+    monkeypatch.setenv("COMPUTE_MODE", "process")
+    monkeypatch.setenv("COMPUTE_MODE_OWNERSHIP", "process")
+
+    executor = ComputeExecutor.from_env()
+
+    # Cache-heavy endpoints default to threads, env overrides win
+    assert executor.mode_for("optimize") == "process"
+    assert executor.mode_for("contest-sim") == "thread"
+    assert executor.mode_for("ownership") == "process"
+    assert executor.stats()["endpoint_modes"] == {"CONTEST_SIM": "thread", "OWNERSHIP": "process"}
+    with pytest.raises(ValueError):
+        ComputeExecutor(modes={"optimize": "gpu"})
+
+
+def test_thread_mode_endpoint_shares_process_state():
+    executor = ComputeExecutor(n_workers=1, mode="process", modes={"contest-sim": "thread"})
+
+    result = asyncio.run(executor.run("contest-sim", threading.current_thread))
+
+    assert result.name.startswith("compute")
+    executor.shutdown()
+
+
+def test_run_does_not_block_event_loop():
+    executor = ComputeExecutor(n_workers=1, mode="thread")
+    release = threading.Event()
+
+    async def scenario():
+        job = asyncio.ensure_future(executor.run("optimize", _wait, release))
+        # The loop keeps serving other coroutines while the job runs
+        await asyncio.sleep(0.01)
+        assert not job.done()
+        release.set()
+        return await job
+
+    assert asyncio.run(scenario()) == "done"
+    executor.shutdown()
+
+
+def test_rejected_run_does_not_touch_pool(monkeypatch):
+    executor = ComputeExecutor(n_workers=1, mode="thread", default_limit=1)
+    release = threading.Event()
+    first = executor.submit("optimize", _wait, release)
+
+    def fail(mode):
+        raise AssertionError("pool requested before admission")
+
+    monkeypatch.setattr(executor, "_get_pool", fail)
+    with pytest.raises(ComputeSaturatedError):
+        asyncio.run(executor.run("optimize", _wait, release))
+
+    release.set()
+    assert first.result(timeout=5) == "done"
+    executor.shutdown()
+
+
+def test_process_mode_runs_in_worker():
+    executor = ComputeExecutor(n_workers=1, mode="process")
+
+    result = asyncio.run(executor.run("optimize", math.factorial, 10))
+
+    assert result == math.factorial(10)
+    executor.shutdown()
+
+
+def test_saturated_endpoint_returns_429(monkeypatch, optimize_request):
+    executor = ComputeExecutor(n_workers=1, mode="thread", default_limit=1)
+    release = threading.Event()
+    executor.submit("optimize", _wait, release)
+    monkeypatch.setattr(optimize_portfolio, "get_compute_executor", lambda: executor)
+
+    response = TestClient(main.app).post("/optimize", json=optimize_request())
+
+    release.set()
+    executor.shutdown()
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    error = saturation_http_exception(ComputeSaturatedError("optimize", 2, 30))
+    assert error.status_code == 429
+    assert error.headers == {"Retry-After": "30"}
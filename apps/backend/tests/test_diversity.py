@@ -0,0 +1,122 @@
+"""
+Tests for incidence-matrix portfolio diversity metrics.
+
+Checks the matrix-based similarity, correlation and greedy selection against
+pairwise set-based Jaccard references.
+"""
+import numpy as np
+import pytest
+
+from app.constraints.diversity import (
+    compute_pairwise_similarity,
+    compute_portfolio_correlation,
+    compute_similarity_matrix,
+    find_most_diverse_subset,
+    lineup_incidence_matrix,
+)
+
+
+def _random_lineups(n_lineups, n_drivers=40, size=6, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {"drivers": [int(d) for d in rng.choice(n_drivers, size=size, replace=False)]}
+        for _ in range(n_lineups)
+    ]
+
+
+def _reference_matrix(lineups):
+    n = len(lineups)
+    matrix = np.eye(n)
+    for i in range(n):
+        for j in range(i + 1, n):
+            matrix[i, j] = matrix[j, i] = compute_pairwise_similarity(
+                lineups[i]["drivers"], lineups[j]["drivers"]
+            )
+    return matrix
+
+
+def test_incidence_matrix_encodes_lineups():
+    incidence, driver_ids = lineup_incidence_matrix(
+        [{"drivers": ["c", "a"]}, {"drivers": ["a", "b", "a"]}]
+    )
+
+    assert driver_ids == ["c", "a", "b"]
+    np.testing.assert_array_equal(incidence, [[1, 1, 0], [0, 1, 1]])
+
+    incidence, _ = lineup_incidence_matrix([{"drivers": ["a", "z"]}], driver_ids=["a", "b"])
+    np.testing.assert_array_equal(incidence, [[1, 0]])
+
+
+def test_similarity_matrix_matches_pairwise_jaccard():
+    lineups = _random_lineups(30) + [{"drivers": []}, {"drivers": []}]
+
+    matrix = compute_similarity_matrix(lineups)
+
+    assert matrix.dtype == np.float64
+    np.testing.assert_array_equal(matrix, _reference_matrix(lineups))
+
+
+def test_portfolio_correlation_matches_pairwise_reference(monkeypatch):
+    import app.constraints.diversity as diversity
+
+    # Small blocks so several row blocks are combined
+    monkeypatch.setattr(diversity, "SIMILARITY_BLOCK_ELEMENTS", 100)
+    lineups = _random_lineups(50, n_drivers=12, seed=1)
+    reference = _reference_matrix(lineups)
+    upper = reference[np.triu_indices(len(lineups), k=1)]
+
+    corr = compute_portfolio_correlation(lineups)
+
+    assert corr["n_pairs"] == len(upper)
+    # Similarities are float64, so extremes match the set-based reference exactly
+    assert corr["avg_similarity"] == pytest.approx(upper.mean(), rel=1e-12)
+    assert corr["max_similarity"] == upper.max()
+    assert corr["min_similarity"] == upper.min()
+    i, j = corr["most_similar_pair"]
+    assert i < j and reference[i, j] == upper.max()
+    i, j = corr["least_similar_pair"]
+    assert i < j and reference[i, j] == upper.min()
+
+
+def test_portfolio_correlation_small_portfolio():
+    assert compute_portfolio_correlation([{"drivers": [0, 1]}])["n_pairs"] == 0
+
+    corr = compute_portfolio_correlation([
+        {"drivers": [0, 1, 2, 3, 4, 5]},
+        {"drivers": [0, 1, 2, 6, 7, 8]},
+        {"drivers": [3, 4, 5, 6, 7, 8]},
+    ])
+    assert corr["avg_similarity"] == pytest.approx(1 / 3)
+    assert corr["most_similar_pair"] == (0, 1)
+    assert corr["least_similar_pair"] == (0, 1)
+
+
+def test_most_diverse_subset_matches_greedy_reference():
+    lineups = _random_lineups(80, seed=2)
+    reference = _reference_matrix(lineups)
+
+    selected = find_most_diverse_subset(lineups, n_select=10, start_index=0)
+
+    expected = [0]
+    while len(expected) < 10:
+        avg = reference[:, expected].mean(axis=1)
+        avg[expected] = np.inf
+        expected.append(int(np.argmin(avg)))
+    assert selected == expected
+    assert len(set(selected)) == 10
+
+
+def test_most_diverse_subset_edge_cases():
+    lineups = _random_lineups(5)
+
+    assert find_most_diverse_subset(lineups, n_select=5) == [0, 1, 2, 3, 4]
+    assert find_most_diverse_subset(lineups, n_select=0) == []
+    assert len(find_most_diverse_subset(lineups, n_select=1)) == 1
+
+
+def test_most_diverse_subset_scales_to_large_pools():
+    lineups = _random_lineups(50_000, seed=3)
+
+    selected = find_most_diverse_subset(lineups, n_select=150, start_index=0)
+
+    assert len(set(selected)) == 150
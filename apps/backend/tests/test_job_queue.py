@@ -0,0 +1,278 @@
+"""
+Tests for the Redis-backed job queue, job state and queue worker.
+
+Runs against fakeredis: enqueue/claim/complete, progress publication,
+retries of transient errors up to max_attempts (other errors fail at
+once), recovery of jobs held by dead workers (each job moved once even
+with concurrent recoverers), the running-job set, long-polling on job
+update events, and that POST /api/v1/optimize enqueues instead of running
+in the API process.
+"""
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.job_manager import JOB_QUEUE_KEY, RUNNING_JOBS_KEY, JobStateManager
+from app.worker import JobWorker
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def store(server):
+    """Synchronous view of the same fake Redis, for assertions."""
+    return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+
+@pytest.fixture
+def manager(server, monkeypatch):
+    monkeypatch.setenv("JOB_MAX_ATTEMPTS", "2")
+    monkeypatch.setenv("JOB_HEARTBEAT_TTL", "30")
+    client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    return JobStateManager(client.connection_pool)
+
+
+def _worker(manager, handler, worker_id="w1"):
+    return JobWorker(manager, worker_id=worker_id, handlers={"optimize": handler}, poll_timeout=0.1)
+
+
+def _job(store, job_id):
+    return store.hgetall(f"job:{job_id}")
+
+
+def test_worker_completes_job_and_publishes_progress(manager, store):
+    calls = []
+
+    def handler(job_id, params, report_progress):
+        calls.append((job_id, params))
+        report_progress(0.5)
+        return {"lineup": ["d1", "d2"]}
+
+    async def scenario():
+        await manager.create_job("job-1", {"slate_id": "s1"}, enqueue=True)
+        await manager.create_job("job-2", {"slate_id": "s1"}, enqueue=True)
+        worker = _worker(manager, handler)
+        return [await worker.run_once() for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [True, True, False]
+
+    # FIFO order, input params round-trip through Redis
+    assert calls == [("job-1", {"slate_id": "s1"}), ("job-2", {"slate_id": "s1"})]
+    job = _job(store, "job-1")
+    assert job["status"] == "completed"
+    assert json.loads(job["result"]) == {"lineup": ["d1", "d2"]}
+    assert float(job["progress"]) == 1.0
+    assert job["attempts"] == "1"
+    assert job["worker_id"] == "w1"
+    assert store.llen("jobs:processing:w1") == 0
+    assert store.scard(RUNNING_JOBS_KEY) == 0
+
+
+def test_failed_job_is_retried_then_marked_failed(manager, store):
+    attempts = []
+
+    def handler(job_id, params, report_progress):
+        attempts.append(job_id)
+        raise TimeoutError("solver timed out")
+
+    async def scenario():
+        await manager.create_job("job-1", {}, enqueue=True)
+        worker = _worker(manager, handler)
+
+        await worker.run_once()
+        assert (await manager.get_job("job-1"))["status"] == "pending"
+        assert await manager.get_queue_length() == 1
+
+        await worker.run_once()
+
+    asyncio.run(scenario())
+
+    job = _job(store, "job-1")
+    assert attempts == ["job-1", "job-1"]
+    assert job["status"] == "failed"
+    assert json.loads(job["error_message"]) == "solver timed out"
+    assert store.llen(JOB_QUEUE_KEY) == 0
+    assert store.llen("jobs:processing:w1") == 0
+
+
+def test_deterministic_error_fails_without_retry(manager, store):
+    def handler(job_id, params, report_progress):
+        raise ValueError("No valid lineup found")
+
+    async def scenario():
+        await manager.create_job("job-1", {}, enqueue=True)
+        await _worker(manager, handler).run_once()
+
+    asyncio.run(scenario())
+
+    job = _job(store, "job-1")
+    assert job["status"] == "failed"
+    assert job["attempts"] == "1"
+    assert json.loads(job["error_message"]) == "No valid lineup found"
+    assert store.llen(JOB_QUEUE_KEY) == 0
+    assert store.llen("jobs:processing:w1") == 0
+
+
+def test_unknown_job_type_fails_without_retry(manager, store):
+    async def scenario():
+        await manager.create_job("job-1", {}, job_type="backtest", enqueue=True)
+        await _worker(manager, lambda *args: None).run_once()
+
+    asyncio.run(scenario())
+
+    job = _job(store, "job-1")
+    assert job["status"] == "failed"
+    assert job["attempts"] == "1"
+    assert store.llen(JOB_QUEUE_KEY) == 0
+
+
+def test_jobs_of_dead_worker_are_recovered(manager, store):
+    async def scenario():
+        await manager.create_job("job-1", {}, enqueue=True)
+        await manager.register_worker("dead")
+        assert await manager.claim_job("dead", timeout=0.1) == "job-1"
+        assert await manager.get_running_job_count() == 1
+
+        # Recovery leaves live workers alone
+        assert await manager.recover_stale_jobs() == 0
+        # Heartbeat key expires when the worker stops beating
+        store.delete("worker:dead")
+        assert await manager.recover_stale_jobs() == 1
+        assert await manager.get_running_job_count() == 0
+        assert not store.sismember("jobs:workers", "dead")
+
+        await _worker(manager, lambda *args: "ok", worker_id="alive").run_once()
+
+    asyncio.run(scenario())
+
+    job = _job(store, "job-1")
+    assert job["status"] == "completed"
+    assert job["attempts"] == "2"
+    assert json.loads(job["error_message"]) == "Worker dead lost heartbeat"
+
+
+def test_concurrent_recovery_requeues_once(server, manager, store):
+    other = JobStateManager(
+        fakeredis.FakeAsyncRedis(server=server, decode_responses=True).connection_pool
+    )
+
+    def slow_lrange(client):
+        lrange = client.lrange
+
+        async def delayed(*args):
+            result = await lrange(*args)
+            await asyncio.sleep(0.05)  # Both recoverers read the list before either moves
+            return result
+        return delayed
+
+    manager.redis.lrange = slow_lrange(manager.redis)
+    other.redis.lrange = slow_lrange(other.redis)
+
+    async def scenario():
+        await manager.create_job("job-1", {}, enqueue=True)
+        await manager.register_worker("dead")
+        assert await manager.claim_job("dead", timeout=0.1) == "job-1"
+        store.delete("worker:dead")
+
+        return await asyncio.gather(manager.recover_stale_jobs(), other.recover_stale_jobs())
+
+    assert sorted(asyncio.run(scenario())) == [0, 1]
+    assert store.lrange(JOB_QUEUE_KEY, 0, -1) == ["job-1"]
+    assert store.llen("jobs:processing:dead") == 0
+    assert _job(store, "job-1")["status"] == "pending"
+
+
+def test_worker_run_stops_and_deregisters(manager, store):
+    async def scenario():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def handler(job_id, params, report_progress):
+            loop.call_soon_threadsafe(stop.set)
+            return "ok"
+
+        await manager.create_job("job-1", {}, enqueue=True)
+        await _worker(manager, handler).run(stop)
+
+    asyncio.run(scenario())
+
+    assert _job(store, "job-1")["status"] == "completed"
+    assert store.smembers("jobs:workers") == set()
+    assert not store.exists("worker:w1")
+
+
+def test_wait_for_job_update_wakes_on_progress(manager):
+    async def scenario():
+        await manager.create_job("job-1", {}, enqueue=True)
+        await manager.claim_job("w1", timeout=0.1)
+
+        # Caller has already seen "running" at progress 0: nothing new yet
+        waiter = asyncio.ensure_future(
+            manager.wait_for_job_update("job-1", timeout=5, last_status="running", last_progress=0.0)
+        )
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+
+        await manager.update_job_progress("job-1", 0.25)
+        job = await asyncio.wait_for(waiter, timeout=2)
+
+        # A stale view returns at once; an unchanged one times out
+        stale = await manager.wait_for_job_update("job-1", timeout=5, last_status="pending")
+        unchanged = await manager.wait_for_job_update(
+            "job-1", timeout=0.05, last_status="running", last_progress=0.25
+        )
+        missing = await manager.wait_for_job_update("nope", timeout=5)
+
+        await manager.close()
+        return job, stale, unchanged, missing
+
+    job, stale, unchanged, missing = asyncio.run(scenario())
+
+    assert float(job["progress"]) == 0.25
+    assert stale["status"] == "running"
+    assert float(unchanged["progress"]) == 0.25
+    assert missing is None
+
+
+def test_submit_optimization_enqueues_job(manager, store):
+    from app.main import app
+
+    request_data = {
+        "slate_id": "test_slate",
+        "drivers": [
+            {
+                "driver_id": f"d{i}",
+                "skill": 0.5,
+                "aggression": 0.5,
+                "shadow_risk": 0.5,
+                "min_laps_led": 0,
+                "max_laps_led": 100,
+            }
+            for i in range(1, 7)
+        ],
+        "scenario_config": {"track_id": "daytona", "n_scenarios": 100},
+        "salary_cap": 50000,
+        "random_seed": 42,
+    }
+
+    with TestClient(app) as client:
+        app.state.job_manager = manager
+        response = client.post("/api/v1/optimize", json=request_data)
+        run_id = response.json()["run_id"]
+        status = client.get(
+            f"/api/v1/optimize/{run_id}/status",
+            params={"wait": 0.05, "last_status": "pending", "last_progress": 0.0},
+        )
+
+    assert response.status_code == 200
+    assert status.status_code == 200
+    assert status.json()["status"] == "pending"
+    assert store.lrange(JOB_QUEUE_KEY, 0, -1) == [run_id]
+    assert json.loads(_job(store, run_id)["input_params"])["slate_id"] == "test_slate"
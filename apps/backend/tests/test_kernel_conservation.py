@@ -20,7 +20,7 @@ import os
 # Add app directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app.kernel import KernelLogic
+from app.kernel import KernelLogic, get_rejection_stats, reset_rejection_stats
 
 
 # Test strategies
@@ -389,6 +389,72 @@ class TestBatchValidation:
         assert not results[1].is_valid
         assert not results[2].is_valid
 
+    def test_batch_validation_matches_per_scenario_reasons(self):
+        """Test stacked batch validation reports the same veto reasons as the scalar path."""
+        kernel = KernelLogic(field_size=40)
+
+        scenarios = [
+            {
+                'laps_led': [150, 70] + [0] * 38,
+                'fastest_laps': [100, 90] + [0] * 38,
+                'start_positions': list(range(1, 41)),
+                'finish_positions': list(range(40, 0, -1)),
+                'race_length': 200,
+                'green_flag_laps': 180
+            },
+            {
+                'laps_led': [100, 50] + [0] * 38,
+                'fastest_laps': [10, 8] + [0] * 38,
+                'race_length': 200,
+                'green_flag_laps': 180
+            },
+        ]
+
+        results, _ = kernel.batch_validate_scenarios(scenarios)
+
+        for result, scenario in zip(results, scenarios):
+            expected = kernel.validate_dominator_conservation(scenario)
+            assert result.is_valid == expected.is_valid
+            assert result.veto_reasons == expected.veto_reasons
+        assert len(results[0].veto_reasons) == 3
+
+    def test_validate_conservation_arrays_counts_per_reason(self):
+        """Test array validation returns a mask and per-rule veto counts."""
+        import numpy as np
+
+        reset_rejection_stats()
+        kernel = KernelLogic(field_size=4)
+        n = 1000
+
+        laps_led = np.tile([100, 50, 30, 20], (n, 1))
+        laps_led[::2, 0] = 150  # Every other scenario leads 250 laps
+        fastest_laps = np.tile([10, 8, 5, 3], (n, 1))
+        fastest_laps[::5, 0] = 200  # Every fifth scenario exceeds green flag laps
+        finish_positions = np.tile([1, 2, 3, 4], (n, 1))
+        finish_positions[:10] = [4, 3, 2, 1]  # 8 swaps > max(min(8, 30 // 10), 4)
+
+        valid, veto_counts = kernel.validate_conservation_arrays(
+            laps_led, fastest_laps, [1, 2, 3, 4], finish_positions,
+            race_length=200, green_flag_laps=30
+        )
+
+        assert valid.shape == (n,)
+        assert veto_counts == {
+            "laps_led": 500,
+            "fastest_laps": 200,
+            "position_swaps": 10,
+        }
+        expected_valid = ~((np.arange(n) % 2 == 0) | (np.arange(n) % 5 == 0) | (np.arange(n) < 10))
+        np.testing.assert_array_equal(valid, expected_valid)
+
+        stats = get_rejection_stats()
+        assert stats['total_validated'] == n
+        assert stats['total_rejected'] == int(np.count_nonzero(~expected_valid))
+        assert stats['veto_reasons'][
+            "Laps led conservation violated: total (250) exceeds race length (200)"
+        ] == 500
+        reset_rejection_stats()
+
 
 class TestConvenienceMethods:
     """Test convenience wrapper methods."""
@@ -0,0 +1,171 @@
+"""
+Tests for exact lineup enumeration.
+
+Validates the enumerated table against brute force over all combinations
+and the MILP optimizer, and checks portfolio selection and scenario scoring.
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from app.constraints.dk_rules import validate_dk_lineup
+from app.lineup_enumeration import enumerate_lineups
+from app.lineup_optimizer import LineupOptimizer
+from app.tail_objectives import compute_cvar
+
+
+@pytest.fixture
+def driver_data():
+    """16 drivers over 7 teams (one single-driver team), varied salaries."""
+    rng = np.random.default_rng(11)
+    drivers = [
+        {
+            'driver_id': 100 + i,
+            'name': f'Driver {i}',
+            'salary': int(rng.integers(45, 110)) * 100,
+            'team': f'Team {i % 6}',
+            'projected_points': float(rng.gamma(5, 6)),
+        }
+        for i in range(15)
+    ]
+    drivers.append({
+        'driver_id': 115, 'name': 'Driver 15', 'salary': 5200,
+        'team': 'Solo', 'projected_points': 30.0,
+    })
+    return drivers
+
+
+def _brute_force(driver_data, salary_cap=50000, min_stack=2, max_stack=3):
+    team_sizes = {}
+    for d in driver_data:
+        team_sizes[d['team']] = team_sizes.get(d['team'], 0) + 1
+
+    valid = set()
+    for combo in itertools.combinations(range(len(driver_data)), 6):
+        if sum(driver_data[i]['salary'] for i in combo) > salary_cap:
+            continue
+        counts = {}
+        for i in combo:
+            counts[driver_data[i]['team']] = counts.get(driver_data[i]['team'], 0) + 1
+        if all(
+            (count >= min_stack or team_sizes[team] < min_stack) and count <= max_stack
+            for team, count in counts.items()
+        ):
+            valid.add(combo)
+    return valid
+
+
+class TestEnumerateLineups:
+    """Tests for table construction."""
+
+    def test_matches_brute_force(self, driver_data):
+        table = enumerate_lineups(driver_data)
+
+        assert {tuple(row) for row in table.lineups.tolist()} == _brute_force(driver_data)
+        assert table.lineups.dtype == np.uint8
+
+    def test_precomputed_columns(self, driver_data):
+        table = enumerate_lineups(driver_data)
+        salaries = np.array([d['salary'] for d in driver_data])
+        projections = np.array([d['projected_points'] for d in driver_data])
+        teams = np.array([d['team'] for d in driver_data])
+
+        np.testing.assert_array_equal(table.salaries, salaries[table.lineups].sum(axis=1))
+        np.testing.assert_allclose(table.projections, projections[table.lineups].sum(axis=1), rtol=1e-5)
+        assert table.salaries.max() <= 50000
+        for row in range(0, len(table), 97):
+            _, counts = np.unique(teams[table.lineups[row]], return_counts=True)
+            assert table.max_team_count[row] == counts.max()
+            assert table.n_teams[row] == len(counts)
+
+    def test_lineups_pass_dk_validation(self, driver_data):
+        table = enumerate_lineups(driver_data)
+        # The single-driver team is exempt from min_stack in the MILP;
+        # validate the rest of the table against the DK validator
+        solo = next(i for i, d in enumerate(driver_data) if d['team'] == 'Solo')
+        rows = np.flatnonzero(~(table.lineups == solo).any(axis=1))
+
+        for lineup in table.to_lineups(rows[:50]):
+            assert validate_dk_lineup(lineup['drivers'], driver_data)['valid']
+
+    def test_no_team_drivers_never_stack(self):
+        drivers = [{'driver_id': i, 'salary': 5000, 'projected_points': 10.0} for i in range(8)]
+
+        table = enumerate_lineups(drivers)
+
+        assert len(table) == 28  # C(8, 6)
+
+    def test_too_small_slate_raises(self, driver_data):
+        with pytest.raises(ValueError, match='Not enough drivers'):
+            enumerate_lineups(driver_data[:5])
+
+    def test_too_large_slate_raises(self, monkeypatch, driver_data):
+        monkeypatch.setattr('app.lineup_enumeration.MAX_COMBINATIONS', 100)
+        with pytest.raises(ValueError, match='too large'):
+            enumerate_lineups(driver_data)
+
+
+class TestLineupQueries:
+    """Tests for vectorized queries over the table."""
+
+    def test_top_lineup_matches_milp(self, driver_data):
+        no_team = [{k: v for k, v in d.items() if k != 'team'} for d in driver_data]
+        table = enumerate_lineups(no_team)
+
+        best = table.to_lineups(table.top_n(1))[0]
+        milp = LineupOptimizer(no_team).optimize()
+
+        assert best['total_projected_points'] == pytest.approx(milp['total_projected_points'], rel=1e-5)
+
+    def test_top_n_sorted(self, driver_data):
+        table = enumerate_lineups(driver_data)
+
+        top = table.top_n(25)
+
+        assert len(top) == 25
+        assert np.all(np.diff(table.projections[top]) <= 0)
+        assert table.projections[top[-1]] >= np.sort(table.projections)[-25]
+
+    def test_select_portfolio_respects_exposure_and_overlap(self, driver_data):
+        table = enumerate_lineups(driver_data)
+
+        rows = table.select_portfolio(8, max_driver_exposure=1.1, max_team_exposure=10.0, max_overlap=4)
+
+        assert len(rows) == 8
+        members = np.zeros((len(rows), len(driver_data)), dtype=int)
+        for i, row in enumerate(rows):
+            members[i, table.lineups[row]] = 1
+        overlap = members @ members.T
+        np.fill_diagonal(overlap, 0)
+        assert overlap.max() <= 4
+        # First pick is the unconstrained best lineup
+        assert rows[0] == table.top_n(1)[0]
+
+    def test_scenario_scores_and_cvar(self, driver_data):
+        table = enumerate_lineups(driver_data)
+        scenarios = np.random.default_rng(0).gamma(3, 10, size=(400, len(driver_data)))
+        rows = table.top_n(20)
+
+        points = table.score_scenarios(scenarios, rows=rows, chunk_size=1000)
+        cvar = table.scenario_cvar(scenarios, alpha=0.95, rows=rows, chunk_size=1000)
+
+        expected = scenarios[:, table.lineups[rows]].sum(axis=2).T
+        np.testing.assert_allclose(points, expected, rtol=1e-5)
+        for i in range(len(rows)):
+            assert cvar[i] == pytest.approx(compute_cvar(expected[i], alpha=0.95), rel=1e-5)
+
+    def test_driver_scores_shape_checked(self, driver_data):
+        table = enumerate_lineups(driver_data)
+        with pytest.raises(ValueError, match='driver_points must have shape'):
+            table.driver_scores(np.ones(3))
+
+    def test_select_portfolio_stops_when_exposure_blocks(self, driver_data):
+        table = enumerate_lineups(driver_data)
+
+        # After one lineup every used driver is at 100% exposure
+        rows = table.select_portfolio(3, max_driver_exposure=0.5, max_team_exposure=10.0)
+
+        assert 1 <= len(rows) <= 3
+        if len(rows) > 1:
+            assert not set(table.lineups[rows[0]]) & set(table.lineups[rows[1]])
@@ -54,72 +54,7 @@ def test_ready_endpoint(client) -> None:
 # =============================================================================
 
 
-def _create_constraint_spec(n_drivers: int = 8) -> dict:
-    """
-    Create a valid ConstraintSpec dict for testing.
-    
-    This matches the OptimizeRequest.constraint_spec schema.
-    """
-    from datetime import datetime
-    
-    drivers = {}
-    for i in range(n_drivers):
-        driver_id = f"driver_{i}"
-        drivers[driver_id] = {
-            "driver_id": driver_id,
-            "skill": 0.5 + (i % 5) * 0.1,
-            "aggression": 0.3 + (i % 3) * 0.2,
-            "shadow_risk": 0.1 + (i % 4) * 0.05,
-            "min_laps_led": 0,
-            "max_laps_led": 50 + i * 5,
-            "veto_rules": []
-        }
-    
-    tracks = {
-        "daytona": {
-            "track_id": "daytona",
-            "difficulty": 0.7,
-            "aggression_factor": 0.6,
-            "caution_rate": 0.15,
-            "pit_window_laps": [35, 70, 105, 140, 175]
-        }
-    }
-    
-    return {
-        "slate_id": "test_slate_001",
-        "compiled_at": datetime.utcnow().isoformat(),
-        "drivers": drivers,
-        "tracks": tracks,
-        "version": "1.0.0",
-        "hash": ""
-    }
-
-
-def _create_optimize_request(n_drivers: int = 8, n_lineups: int = 5) -> dict:
-    """
-    Create a valid OptimizeRequest dict for testing.
-    """
-    return {
-        "constraint_spec": _create_constraint_spec(n_drivers),
-        "track_id": "daytona",
-        "n_lineups": n_lineups,
-        "n_scenarios": 1000,  # Lower for test speed
-        "cvar_alphas": [0.99, 0.95],
-        "cvar_weights": [0.7, 0.3],
-        "correlation_weight": 0.1,
-        "max_driver_exposure": 0.5,
-        "max_team_exposure": 0.7,
-        "salary_cap": 50000,
-        "n_drivers": 6,
-        "min_stack": 2,
-        "max_stack": 3,
-        "random_seed": 42,
-        "include_calibration": False,  # Faster tests
-        "validate_tail_objective": False  # Faster tests
-    }
-
-
-def test_optimize_endpoint_returns_response(client) -> None:
+def test_optimize_endpoint_returns_response(client, optimize_request) -> None:
     """
     Test the /optimize endpoint returns a valid response structure.
     
@@ -127,7 +62,7 @@ def test_optimize_endpoint_returns_response(client) -> None:
     the expected response structure. We don't validate business logic here,
     just API contract compliance.
     """
-    request_data = _create_optimize_request()
+    request_data = optimize_request()
     
     response = client.post("/optimize", json=request_data)
     
@@ -162,11 +97,11 @@ def test_optimize_endpoint_validation(client) -> None:
     assert response.status_code == 422
 
 
-def test_optimize_endpoint_empty_drivers(client) -> None:
+def test_optimize_endpoint_empty_drivers(client, optimize_request) -> None:
     """
     Test the /optimize endpoint with empty drivers.
     """
-    request_data = _create_optimize_request(n_drivers=0)
+    request_data = optimize_request(n_drivers=0)
     
     response = client.post("/optimize", json=request_data)
     
@@ -175,11 +110,11 @@ def test_optimize_endpoint_empty_drivers(client) -> None:
     assert response.status_code in [200, 422, 500, 501]
 
 
-def test_optimize_endpoint_illegal_cvar_alphas(client) -> None:
+def test_optimize_endpoint_illegal_cvar_alphas(client, optimize_request) -> None:
     """
     Test the /optimize endpoint rejects invalid CVaR alphas.
     """
-    request_data = _create_optimize_request()
+    request_data = optimize_request()
     request_data["cvar_alphas"] = [1.5, -0.5]  # Invalid: must be 0-1
     
     response = client.post("/optimize", json=request_data)
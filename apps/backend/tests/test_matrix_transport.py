@@ -0,0 +1,233 @@
+"""
+Tests for the binary scenario-matrix transport.
+
+Covers .npy framing round trips and malformed messages, content-hash
+matrix IDs, matrix upload/download, resolving inline vs uploaded matrices,
+the binary /optimize request and response paths, what /contest-sim hands
+to the compute pool, and ScenarioCache put/get.
+"""
+import io
+import json
+import struct
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.api.matrix_transport import (
+    MATRIX_CONTENT_TYPE,
+    NPY_CONTENT_TYPE,
+    decode_matrix_message,
+    decode_npy,
+    encode_matrix_message,
+    encode_npy,
+    matrix_id,
+    resolve_scenario_matrix,
+)
+from app.api.optimize_portfolio import (
+    LINEUP_METRIC_COLUMNS,
+    CalibrationMetrics,
+    ExplainArtifacts,
+    LineupResponse,
+    OptimizeResponse,
+    optimize_response_arrays,
+)
+from app.portfolio_generator import ScenarioCache
+import app.portfolio_generator as portfolio_generator
+
+
+@pytest.fixture
+def scenario_cache(monkeypatch):
+    """Fresh process-wide scenario cache for each test."""
+    cache = ScenarioCache()
+    monkeypatch.setattr(portfolio_generator, "_shared_scenario_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+def _scenarios(n_scenarios: int = 50, n_drivers: int = 8) -> np.ndarray:
+    return np.random.default_rng(0).normal(40.0, 10.0, size=(n_scenarios, n_drivers))
+
+
+def test_matrix_message_round_trip():
+    scores = _scenarios()
+    ids = np.arange(6, dtype=np.int32)
+
+    body = encode_matrix_message({"field_size": 100, "seed": 7}, {"scores": scores, "ids": ids})
+    fields, arrays = decode_matrix_message(body)
+
+    assert fields == {"field_size": 100, "seed": 7}
+    assert list(arrays) == ["scores", "ids"]
+    np.testing.assert_array_equal(arrays["scores"], scores)
+    assert arrays["ids"].dtype == np.int32
+
+    # Readable with plain struct/json/np.load, as documented for clients
+    n = struct.unpack("<I", body[:4])[0]
+    header = json.loads(body[4:4 + n])
+    stream = io.BytesIO(body[4 + n:])
+    np.testing.assert_array_equal(np.load(stream), scores)
+    assert header["arrays"] == ["scores", "ids"]
+
+    np.testing.assert_array_equal(decode_npy(encode_npy(scores)), scores)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"\x01",
+        struct.pack("<I", 100) + b"{}",
+        struct.pack("<I", 2) + b"[]",
+        encode_matrix_message({}, {"scores": np.ones(3)})[:-8],
+    ],
+)
+def test_malformed_matrix_message_is_rejected(body):
+    with pytest.raises(ValueError):
+        decode_matrix_message(body)
+
+
+def test_object_arrays_are_rejected():
+    buffer = io.BytesIO()
+    np.save(buffer, np.array([{"a": 1}], dtype=object), allow_pickle=True)
+
+    with pytest.raises(ValueError):
+        decode_npy(buffer.getvalue())
+
+
+def test_matrix_id_is_a_content_hash():
+    scores = _scenarios()
+
+    assert matrix_id(scores) == matrix_id(scores.copy())
+    assert matrix_id(scores) != matrix_id(scores.astype(np.float32))
+    assert matrix_id(scores) != matrix_id(scores.reshape(100, 4))
+
+
+def test_upload_and_download_scenario_matrix(client, scenario_cache):
+    scores = _scenarios()
+
+    uploaded = client.post(
+        "/scenario-matrices", content=encode_npy(scores), headers={"Content-Type": NPY_CONTENT_TYPE}
+    )
+    again = client.post("/scenario-matrices", json=scores.tolist())
+
+    assert uploaded.status_code == 201
+    assert uploaded.json() == {"matrix_id": matrix_id(scores), "shape": [50, 8], "dtype": "float64"}
+    assert again.json()["matrix_id"] == uploaded.json()["matrix_id"]
+
+    downloaded = client.get(f"/scenario-matrices/{uploaded.json()['matrix_id']}")
+    assert downloaded.headers["content-type"] == NPY_CONTENT_TYPE
+    np.testing.assert_array_equal(decode_npy(downloaded.content), scores)
+
+    assert client.get("/scenario-matrices/unknown").status_code == 404
+    assert client.post("/scenario-matrices", json=[1.0, 2.0]).status_code == 422
+    assert client.post("/scenario-matrices", json=[[1.0, float("nan")]]).status_code == 422
+    assert client.post(
+        "/scenario-matrices", content=b"1,2", headers={"Content-Type": "text/csv"}
+    ).status_code == 415
+
+
+def test_upload_persists_to_spill_dir(tmp_path, monkeypatch):
+    cache = ScenarioCache(spill_dir=str(tmp_path))
+    monkeypatch.setattr(portfolio_generator, "_shared_scenario_cache", cache)
+    scores = _scenarios()
+
+    key = TestClient(main.app).post("/scenario-matrices", json=scores.tolist()).json()["matrix_id"]
+
+    # Another process sharing the directory finds it without an upload
+    other = ScenarioCache(spill_dir=str(tmp_path))
+    np.testing.assert_array_equal(other.get(key), scores)
+    assert other.get("missing") is None
+
+
+def test_resolve_scenario_matrix(scenario_cache):
+    scores = _scenarios()
+    scenario_cache.put("m1", scores)
+
+    np.testing.assert_array_equal(resolve_scenario_matrix(None, "m1"), scores)
+    assert resolve_scenario_matrix(scores.tolist(), None).dtype == np.float64
+    assert resolve_scenario_matrix(None, None, required=False) is None
+
+    with pytest.raises(ValueError):
+        resolve_scenario_matrix(scores, "m1")
+    with pytest.raises(ValueError):
+        resolve_scenario_matrix(None, None)
+    with pytest.raises(KeyError):
+        resolve_scenario_matrix(None, "m2")
+
+
+def test_optimize_rejects_bad_matrix_requests(client, scenario_cache, optimize_request):
+    request_data = optimize_request(n_drivers=8)
+
+    wrong_width = client.post(
+        "/optimize",
+        content=encode_matrix_message(request_data, {"scenario_driver_scores": _scenarios(n_drivers=5)}),
+        headers={"Content-Type": MATRIX_CONTENT_TYPE},
+    )
+    unknown_id = client.post("/optimize", json={**request_data, "scenario_matrix_id": "nope"})
+    garbled = client.post(
+        "/optimize", content=b"\x00\x00", headers={"Content-Type": MATRIX_CONTENT_TYPE}
+    )
+
+    if wrong_width.status_code == 501:
+        pytest.skip("Portfolio optimization module not available")
+    assert wrong_width.status_code == 422
+    assert "columns" in wrong_width.json()["detail"]
+    assert unknown_id.status_code == 404
+    assert garbled.status_code == 422
+
+
+def test_contest_sim_submits_matrix_once(client, scenario_cache, monkeypatch):
+    submitted = []
+
+    class RecordingExecutor:
+        async def run(self, endpoint, fn, *args):
+            submitted.append((endpoint, args))
+            return {"roi": 0.0}
+
+    monkeypatch.setattr(main, "get_compute_executor", lambda: RecordingExecutor())
+    scores = _scenarios(n_scenarios=20)
+
+    client.post("/contest-sim", json={"my_lineup_scores": [200.0], "scenario_driver_scores": scores.tolist()})
+
+    if not main.PHASE_4_AVAILABLE:
+        pytest.skip("Phase 4 contest simulation not available")
+    (endpoint, (request, scenario_scores)), = submitted
+    assert endpoint == "contest-sim"
+    assert request.scenario_driver_scores is None
+    np.testing.assert_array_equal(scenario_scores, scores)
+
+
+def test_optimize_response_arrays():
+    lineups = [
+        LineupResponse(
+            drivers=[1, 2, 3, 4, 5, 6], cvar_99=180.0 + i, cvar_95=150.0, top_1pct=190.0,
+            conditional_upside=30.0, exposure={1: 0.5}, total_salary=49500,
+            team_distribution={"Hendrick": 2},
+        )
+        for i in range(3)
+    ]
+    response = OptimizeResponse(
+        lineups=lineups,
+        portfolio_correlation={"mean": 0.2},
+        calibration_metrics=CalibrationMetrics(
+            observed_finish_positions=[[1.0, 2.0], [2.0, 1.0]],
+            n_scenarios=2, n_drivers=2, mean_finish=1.5, std_finish=0.5,
+        ),
+        explain=ExplainArtifacts(why_high_tail="", constraint_binding={}, tail_vs_mean={}),
+    )
+
+    fields, arrays = decode_matrix_message(encode_matrix_message(*optimize_response_arrays(response)))
+
+    assert arrays["lineup_drivers"].shape == (3, 6)
+    assert arrays["lineup_drivers"].dtype == np.int32
+    assert fields["lineup_metric_columns"] == LINEUP_METRIC_COLUMNS
+    np.testing.assert_array_equal(arrays["lineup_metrics"][:, 0], [180.0, 181.0, 182.0])
+    np.testing.assert_array_equal(arrays["observed_finish_positions"], [[1.0, 2.0], [2.0, 1.0]])
+    assert fields["lineups"][0] == {"exposure": {"1": 0.5}, "team_distribution": {"Hendrick": 2}}
+    assert fields["calibration_metrics"]["mean_finish"] == 1.5
+    assert "observed_finish_positions" not in fields["calibration_metrics"]
+    assert fields["portfolio_correlation"] == {"mean": 0.2}
@@ -486,3 +486,90 @@ def test_get_multiple_lineups() -> None:
         assert len(lineup["drivers"]) == 6
         assert lineup["total_salary"] <= 50000
         assert lineup["total_projected_points"] > 0
+
+
+def _seed_race_db(n_drivers: int = 12):
+    """In-memory database with one race, drivers and per-driver beliefs."""
+    from datetime import datetime
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models import Agent, Base, Belief, Driver, Proposition, Race
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    agent = Agent(name="projector", type="projector")
+    race = Race(name="Test 500", track="Test", date=datetime(2025, 2, 16), laps=200, status="scheduled")
+    other_race = Race(name="Other 400", track="Other", date=datetime(2025, 3, 1), laps=200, status="scheduled")
+    session.add_all([agent, race, other_race])
+    session.flush()
+
+    for i in range(n_drivers):
+        driver = Driver(
+            name=f"Driver {i}", team=f"Team {i % 4}", car_number=i + 1,
+            salary=5000 + 400 * i, avg_finish=10.0 + i, wins=i % 3, top5=i % 5, top10=i % 7,
+        )
+        session.add(driver)
+        session.flush()
+        if i % 4 == 3:
+            continue  # No beliefs: falls back to avg_finish
+        for content, prop_race in ((f"Driver {i} top-5 finish", race), (f"Driver {i} win", race),
+                                   (f"Driver {i} top-3 finish", other_race)):
+            prop = Proposition(content=content, driver_id=driver.id, race_id=prop_race.id,
+                               session_type="race")
+            session.add(prop)
+            session.flush()
+            session.add(Belief(agent_id=agent.id, prop_id=prop.id, confidence=0.1 + 0.05 * i,
+                               epistemic_var=0.01 * (i + 1), source="prior"))
+    session.commit()
+    return engine, session, race.id
+
+
+def test_nascar_optimizer_bulk_load_uses_constant_queries() -> None:
+    """
+    Test load_driver_data fetches drivers, propositions and beliefs without N+1 queries.
+    """
+    from sqlalchemy import event
+
+    from app.lineup_optimizer import NASCAROptimizer
+
+    engine, session, race_id = _seed_race_db()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    optimizer = NASCAROptimizer(db_session=session)
+    optimizer.load_driver_data(race_id)
+
+    assert len(statements) == 2  # race lookup + one joined query
+    assert len(optimizer.drivers) == 12
+    by_id = {d["driver_id"]: d for d in optimizer.drivers}
+    assert len(by_id[1]["beliefs"]) == 2  # other race's proposition excluded
+    assert by_id[4]["beliefs"] == []
+
+
+def test_nascar_optimizer_projections_computed_once() -> None:
+    """
+    Test expected points are computed once per race and reused by objectives.
+    """
+    from app.lineup_optimizer import NASCAROptimizer
+
+    _, session, race_id = _seed_race_db()
+    optimizer = NASCAROptimizer(db_session=session)
+    optimizer.load_driver_data(race_id)
+
+    projections = optimizer.get_projections()
+    for i, driver in enumerate(optimizer.drivers):
+        assert projections.expected_points[i] == optimizer._compute_expected_points(driver)
+        assert optimizer.calculate_expected_points(driver["driver_id"]) == projections.expected_points[i]
+
+    calls = []
+    original = optimizer._compute_expected_points
+    optimizer._compute_expected_points = lambda driver: calls.append(driver) or original(driver)
+
+    lineups = optimizer.optimize_lineup(race_id, n_lineups=2, objective="maximize_value")
+
+    assert len(lineups) == 2
+    assert len(calls) == len(optimizer.drivers)  # once per driver for the race
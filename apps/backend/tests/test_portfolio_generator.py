@@ -12,11 +12,23 @@ import numpy as np
 import pandas as pd
 import tempfile
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import app.portfolio_generator as portfolio_generator
 from app.portfolio_generator import (
     generate_portfolio,
+    get_scenario_cache,
     generate_lineup_with_cvar,
     export_lineups_dk_format,
-    ScenarioCache
+    IncrementalPortfolioModel,
+    ScenarioCache,
+    scenario_cache_key,
+)
+from app.constraints.exposure import (
+    add_exposure_constraints,
+    get_overexposed_drivers,
+    update_exposure_book,
 )
 
 
@@ -173,6 +185,177 @@ class TestScenarioCache:
         cache.clear()
         assert cache.size() == 0
 
+    def test_content_hash_key_distinguishes_seed_and_spec(self):
+        """Test that keys depend on every part and not on keyword order."""
+        key = scenario_cache_key(constraint_spec={'slate_id': 's1'}, track_id='daytona',
+                                 random_seed=42, n_scenarios=1000)
+
+        assert key == scenario_cache_key(n_scenarios=1000, random_seed=42, track_id='daytona',
+                                         constraint_spec={'slate_id': 's1'})
+        assert key != scenario_cache_key(constraint_spec={'slate_id': 's1'}, track_id='daytona',
+                                         random_seed=43, n_scenarios=1000)
+        assert key != scenario_cache_key(constraint_spec={'slate_id': 's2'}, track_id='daytona',
+                                         random_seed=42, n_scenarios=1000)
+
+    def test_lru_eviction_by_bytes(self):
+        """Test that the least recently used matrix is evicted past max_bytes."""
+        matrix_bytes = np.zeros((100, 10)).nbytes
+        cache = ScenarioCache(max_bytes=2 * matrix_bytes)
+        calls = []
+
+        def mock_generate(n):
+            calls.append(n)
+            return np.zeros((n, 10))
+
+        cache.get_scenarios("race_1", 100, mock_generate)
+        cache.get_scenarios("race_2", 100, mock_generate)
+        cache.get_scenarios("race_1", 100, mock_generate)  # race_1 now most recent
+        cache.get_scenarios("race_3", 100, mock_generate)  # evicts race_2
+
+        stats = cache.stats()
+        assert cache.size() == 2
+        assert stats['bytes'] == 2 * matrix_bytes
+        assert stats['evictions'] == 1
+        assert stats['hits'] == 1
+        assert stats['misses'] == 3
+
+        cache.get_scenarios("race_1", 100, mock_generate)
+        assert len(calls) == 3  # race_1 survived eviction
+
+    def test_evicted_matrix_spills_to_shared_directory(self, tmp_path):
+        """Test that evicted matrices are memory-mapped back instead of regenerated."""
+        matrix = np.random.randn(100, 10)
+        cache = ScenarioCache(max_bytes=matrix.nbytes, spill_dir=str(tmp_path))
+        cache.get_scenarios("race_1", 100, lambda n: matrix)
+        cache.get_scenarios("race_2", 100, lambda n: np.zeros((n, 10)))
+
+        assert cache.stats()['spills'] == 1
+        assert len(list(tmp_path.glob("*.npy"))) == 1
+
+        # Another worker sharing the directory maps the spilled file
+        other = ScenarioCache(spill_dir=str(tmp_path))
+
+        def fail_generate(n):
+            raise AssertionError("spilled scenarios should not be re-simulated")
+
+        scenarios = other.get_scenarios("race_1", 100, fail_generate)
+
+        assert isinstance(scenarios, np.memmap)
+        np.testing.assert_array_equal(scenarios, matrix)
+        assert other.stats()['disk_hits'] == 1
+        assert other.stats()['hit_rate'] == 1.0
+
+    def test_write_through_shares_generated_matrices(self, tmp_path):
+        """Test that write-through caches persist new matrices for other workers."""
+        matrix = np.random.randn(100, 10)
+        cache = ScenarioCache(spill_dir=str(tmp_path), write_through=True)
+        cache.get_scenarios("race_1", 100, lambda n: matrix)
+
+        assert cache.stats()['spills'] == 1
+        assert cache.stats()['evictions'] == 0
+
+        def fail_generate(n):
+            raise AssertionError("written-through scenarios should not be re-simulated")
+
+        other = ScenarioCache(spill_dir=str(tmp_path))
+        np.testing.assert_array_equal(other.get_scenarios("race_1", 100, fail_generate), matrix)
+
+    def test_generation_does_not_block_other_keys(self):
+        """Test that a slow simulation dedupes its key without holding up others."""
+        cache = ScenarioCache()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_generate(n):
+            calls.append(n)
+            started.set()
+            release.wait(timeout=10)
+            return np.ones((n, 10))
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(cache.get_scenarios, "race_1", 100, slow_generate)
+            started.wait(timeout=10)
+            second = pool.submit(cache.get_scenarios, "race_1", 100, slow_generate)
+
+            # Another slate is served while race_1 is still simulating
+            other = cache.get_scenarios("race_2", 100, lambda n: np.zeros((n, 10)))
+            assert not first.done()
+
+            release.set()
+            assert first.result(timeout=10) is second.result(timeout=10)
+
+        assert other.shape == (100, 10)
+        assert calls == [100]
+
+    def test_failed_generation_is_not_cached(self):
+        """Test that a failing simulation is retried by the next caller."""
+        cache = ScenarioCache()
+
+        def fail_generate(n):
+            raise RuntimeError("simulation failed")
+
+        with pytest.raises(RuntimeError):
+            cache.get_scenarios("race_1", 100, fail_generate)
+
+        scenarios = cache.get_scenarios("race_1", 100, lambda n: np.zeros((n, 10)))
+        assert scenarios.shape == (100, 10)
+
+    def test_spill_directory_is_bounded(self, tmp_path):
+        """Test that the oldest spill files are removed past max_spill_bytes."""
+        matrix = np.zeros((100, 10))
+        file_bytes = matrix.nbytes + 128  # .npy header
+        cache = ScenarioCache(max_bytes=0, spill_dir=str(tmp_path), max_spill_bytes=2 * file_bytes)
+
+        for race in ("race_1", "race_2", "race_3"):
+            cache.get_scenarios(race, 100, lambda n: np.zeros((n, 10)))
+            time.sleep(0.01)  # Distinct modification times
+
+        stats = cache.stats()
+        assert stats['spills'] == 3
+        assert stats['spill_removals'] == 1
+        assert len(list(tmp_path.glob("*.npy"))) == 2
+
+        # The oldest matrix was removed and is simulated again
+        calls = []
+        cache.get_scenarios("race_1", 100, lambda n: calls.append(n) or np.zeros((n, 10)))
+        assert calls == [100]
+
+    def test_shared_cache_spills_by_default(self, monkeypatch, tmp_path):
+        """Test that the process-wide cache spills unless explicitly disabled."""
+        monkeypatch.delenv("SCENARIO_CACHE_DIR", raising=False)
+        monkeypatch.setattr(portfolio_generator, "_shared_scenario_cache", None)
+        assert get_scenario_cache().spill_dir == portfolio_generator.DEFAULT_SCENARIO_CACHE_DIR
+        assert get_scenario_cache().write_through
+
+        monkeypatch.setenv("SCENARIO_CACHE_DIR", "")
+        monkeypatch.setattr(portfolio_generator, "_shared_scenario_cache", None)
+        assert get_scenario_cache().spill_dir is None
+
+    def test_generate_portfolio_reuses_keyed_scenarios(self, sample_driver_data, sample_scenarios):
+        """Test that repeat portfolio runs with the same key never re-simulate."""
+        cache = ScenarioCache()
+        calls = []
+
+        def counting_fn(n):
+            calls.append(n)
+            return sample_scenarios
+
+        key = scenario_cache_key(track_id='test_track', random_seed=42, n_scenarios=1000)
+        for _ in range(2):
+            generate_portfolio(
+                race_id='test_race',
+                driver_data=sample_driver_data,
+                scenario_fn=counting_fn,
+                n_lineups=1,
+                n_scenarios=1000,
+                scenario_cache=cache,
+                scenario_key=key,
+            )
+
+        assert calls == [1000]
+        assert cache.stats()['hits'] == 1
+
 
 class TestGenerateLineupWithCVaR:
     """Test single lineup generation with CVaR optimization."""
@@ -264,6 +447,33 @@ class TestGenerateLineupWithCVaR:
         assert lineup is not None
         assert len(lineup['drivers']) == 6
 
+    def test_previous_lineups_are_cut(self, sample_scenarios, sample_driver_data):
+        """Test that lineups overlap previous ones by at most max_overlap drivers."""
+        first = generate_lineup_with_cvar(
+            scenarios=sample_scenarios,
+            driver_data=sample_driver_data,
+            exposure_book={},
+            n_lineups_generated=0,
+            previous_lineups=[],
+            objective_type="mean"
+        )
+        # No diversity penalty, so only the cut keeps the optimum from repeating
+        second = generate_lineup_with_cvar(
+            scenarios=sample_scenarios,
+            driver_data=sample_driver_data,
+            exposure_book={},
+            n_lineups_generated=1,
+            previous_lineups=[first],
+            correlation_weight=0.0,
+            max_driver_exposure=1.0,
+            max_team_exposure=1.0,
+            objective_type="mean",
+            max_overlap=3
+        )
+
+        assert second is not None
+        assert len(set(first['drivers']) & set(second['drivers'])) <= 3
+
 
 class TestGeneratePortfolio:
     """Test portfolio generation with CVaR optimization."""
@@ -703,3 +913,101 @@ class TestMeanOptimization:
         # Should have CVaR metrics
         assert "cvar_99" in lineups[0]
         assert "cvar_95" in lineups[0]
+
+
+class TestIncrementalPortfolioModel:
+    """Test the persistent lineup model reused across a portfolio."""
+
+    def test_model_is_built_once(self, sample_scenarios, sample_driver_data):
+        model = IncrementalPortfolioModel(
+            sample_scenarios, sample_driver_data,
+            max_driver_exposure=1.1, max_team_exposure=10.0
+        )
+        n_base_constraints = len(model.prob.constraints)
+
+        lineups, book = [], {}
+        for _ in range(3):
+            lineup = model.generate_lineup(book, lineups)
+            assert lineup is not None
+            lineups.append(lineup)
+            book = update_exposure_book(book, lineup["drivers"])
+
+        # Only the per-lineup cuts were added
+        assert len(model.prob.constraints) == n_base_constraints + 3
+        assert len(model.solve_seconds) == 3
+
+    def test_no_duplicate_lineups(self, sample_scenarios, sample_driver_data):
+        model = IncrementalPortfolioModel(
+            sample_scenarios, sample_driver_data,
+            correlation_weight=0.0, max_driver_exposure=1.1, max_team_exposure=10.0
+        )
+
+        lineups, book = [], {}
+        for _ in range(4):
+            lineup = model.generate_lineup(book, lineups)
+            lineups.append(lineup)
+            book = update_exposure_book(book, lineup["drivers"])
+
+        assert len({tuple(sorted(l["drivers"])) for l in lineups}) == 4
+
+    def test_exposure_bounds_are_lifted(self, sample_scenarios, sample_driver_data):
+        model = IncrementalPortfolioModel(sample_scenarios, sample_driver_data)
+
+        model._update_exposure_bounds({0: 2}, n_lineups_generated=2)
+        assert model.x[0].upBound == 0
+
+        model._update_exposure_bounds({0: 2}, n_lineups_generated=10)
+        assert model.x[0].upBound == 1
+
+    def test_penalty_matches_correlation_penalty(self, sample_scenarios, sample_driver_data):
+        model = IncrementalPortfolioModel(
+            sample_scenarios, sample_driver_data, correlation_weight=0.5
+        )
+        previous = [{"drivers": [0, 1, 2, 3, 4, 5]}, {"drivers": [0, 1, 6, 7, 8, 9]}]
+
+        model._update_objective(previous)
+
+        assert model.objective[model.x[0]] == pytest.approx(-1.0)
+        assert model.objective[model.x[6]] == pytest.approx(-0.5)
+        assert model.objective[model.x[11]] == pytest.approx(0.0)
+
+    def test_incremental_portfolio_matches_constraints(self, sample_driver_data, scenario_fn):
+        lineups = generate_portfolio(
+            race_id="test_incremental",
+            driver_data=sample_driver_data,
+            scenario_fn=scenario_fn,
+            n_lineups=3,
+            n_scenarios=2000,
+            incremental=True
+        )
+
+        assert len(lineups) >= 1
+        for lineup in lineups:
+            assert len(lineup["drivers"]) == 6
+            assert lineup["total_salary"] <= 50000
+
+
+def test_get_overexposed_drivers(sample_driver_data):
+    # Driver rule: 5/10 >= 0.5
+    assert get_overexposed_drivers({0: 5, 1: 3}, 10) == {0}
+
+    # Team rule: Team 1 usage (0 and 1) = 8/10 >= 0.7
+    excluded = get_overexposed_drivers(
+        {0: 4, 1: 4}, 10, max_driver_exposure=0.5, driver_data=sample_driver_data
+    )
+    assert excluded == {0, 1}
+
+    assert get_overexposed_drivers({0: 5}, 0) == set()
+
+
+def test_exposure_constraints_exclude_overexposed_drivers(sample_driver_data):
+    from pulp import LpMaximize, LpProblem, LpVariable
+
+    prob = LpProblem("Exposure", LpMaximize)
+    x = {d["driver_id"]: LpVariable(f"x_{d['driver_id']}", cat="Binary") for d in sample_driver_data}
+    exposure_book = {0: 4, 1: 4, 2: 6}
+
+    add_exposure_constraints(prob, x, exposure_book, 10, driver_data=sample_driver_data)
+
+    excluded = get_overexposed_drivers(exposure_book, 10, driver_data=sample_driver_data)
+    assert {f"Exclude_Overexposed_Driver_{d}" for d in excluded} == set(prob.constraints)
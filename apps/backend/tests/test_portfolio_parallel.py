@@ -0,0 +1,93 @@
+"""
+Tests for parallel portfolio generation.
+
+Validates that batched process-pool generation produces complete portfolios
+that respect the same exposure and overlap rules as the sequential path.
+"""
+import numpy as np
+import pytest
+
+from app.constraints.exposure import get_overexposed_drivers, update_exposure_book
+from app.portfolio_parallel import _accept_lineup, generate_portfolio_parallel
+
+
+@pytest.fixture
+def driver_data():
+    """18 drivers across 6 teams, cheap enough that any 6 fit the cap."""
+    return [
+        {'driver_id': i, 'name': f'Driver {i}', 'salary': 6000 + i * 100, 'team': f'Team {i // 3}'}
+        for i in range(18)
+    ]
+
+
+@pytest.fixture
+def scenarios(driver_data):
+    rng = np.random.default_rng(7)
+    return rng.gamma(3, 10, size=(500, len(driver_data)))
+
+
+class TestGeneratePortfolioParallel:
+    """End-to-end tests with a small process pool."""
+
+    def test_generates_requested_lineups(self, driver_data, scenarios):
+        lineups, stats = generate_portfolio_parallel(
+            race_id='test_parallel',
+            driver_data=driver_data,
+            scenario_fn=lambda n: scenarios,
+            n_lineups=6,
+            n_scenarios=500,
+            n_workers=2,
+            max_driver_exposure=0.7,
+            max_team_exposure=10.0,
+        )
+
+        assert len(lineups) == 6
+        assert stats['n_batches'] >= 3
+        assert stats['wall_seconds'] > 0
+        assert all(len(lineup['drivers']) == 6 for lineup in lineups)
+
+    def test_respects_exposure_and_overlap(self, driver_data, scenarios):
+        lineups, _ = generate_portfolio_parallel(
+            race_id='test_parallel_exposure',
+            driver_data=driver_data,
+            scenario_fn=lambda n: scenarios,
+            n_lineups=6,
+            n_scenarios=500,
+            n_workers=2,
+            batch_size=3,
+            max_driver_exposure=0.5,
+            max_team_exposure=10.0,
+        )
+
+        book = {}
+        for idx, lineup in enumerate(lineups):
+            excluded = get_overexposed_drivers(book, idx, 0.5, 10.0, driver_data)
+            assert not set(lineup['drivers']) & excluded
+            for prev in lineups[:idx]:
+                assert len(set(lineup['drivers']) & set(prev['drivers'])) <= 5
+            book = update_exposure_book(book, lineup['drivers'])
+
+    def test_invalid_pool_settings(self, driver_data, scenarios):
+        with pytest.raises(ValueError, match="must be positive"):
+            generate_portfolio_parallel(
+                race_id='test_parallel_invalid',
+                driver_data=driver_data,
+                scenario_fn=lambda n: scenarios,
+                n_workers=2,
+                batch_size=-1,
+            )
+
+
+def test_accept_lineup_rejects_duplicates_and_overexposure(driver_data):
+    accepted = [{'drivers': [0, 1, 3, 4, 6, 7]}]
+    book = update_exposure_book({}, accepted[0]['drivers'])
+
+    duplicate = {'drivers': [0, 1, 3, 4, 6, 7]}
+    assert not _accept_lineup(duplicate, accepted, book, driver_data, 1.1, 10.0, 5)
+
+    # Driver 0 at 1/1 exposure exceeds 0.5
+    overexposed = {'drivers': [0, 9, 10, 12, 13, 15]}
+    assert not _accept_lineup(overexposed, accepted, book, driver_data, 0.5, 10.0, 5)
+
+    fresh = {'drivers': [9, 10, 12, 13, 15, 16]}
+    assert _accept_lineup(fresh, accepted, book, driver_data, 0.5, 10.0, 5)
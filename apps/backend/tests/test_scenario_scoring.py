@@ -0,0 +1,116 @@
+"""
+Tests for scenario-to-DFS-points scoring.
+
+Checks the vectorized scorer against a per-driver reference built from
+FINISH_POINTS, column reordering, and chunked streaming into one matrix.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.lineup_optimizer import FINISH_POINTS
+from app.scenario_scoring import (
+    FASTEST_LAP_POINTS,
+    LAPS_LED_POINTS,
+    score_outcome_arrays,
+    score_scenario_batch,
+    score_scenario_stream,
+    score_scenarios,
+)
+
+
+class _Batch(SimpleNamespace):
+    """Namespace with the arrays a ScenarioBatch exposes."""
+
+    def __len__(self):
+        return len(self.finish_positions)
+
+
+def _make_batch(n_scenarios, driver_ids, seed):
+    rng = np.random.default_rng(seed)
+    n_drivers = len(driver_ids)
+    return _Batch(
+        driver_ids=list(driver_ids),
+        start_positions=np.arange(1, n_drivers + 1),
+        finish_positions=np.argsort(rng.random((n_scenarios, n_drivers)), axis=1) + 1,
+        laps_led=rng.integers(0, 50, size=(n_scenarios, n_drivers)),
+        fastest_laps=rng.integers(0, 20, size=(n_scenarios, n_drivers)),
+    )
+
+
+def _reference_points(finish, start, laps_led, fastest_laps):
+    return FINISH_POINTS[finish] + (start - finish) + LAPS_LED_POINTS * laps_led + FASTEST_LAP_POINTS * fastest_laps
+
+
+def test_score_outcome_arrays_matches_reference():
+    batch = _make_batch(50, [f'd{i}' for i in range(40)], seed=0)
+
+    points = score_outcome_arrays(
+        batch.finish_positions, batch.start_positions, batch.laps_led, batch.fastest_laps
+    )
+
+    assert points.dtype == np.float32
+    assert points.shape == (50, 40)
+    for i in (0, 17, 49):
+        for j in (0, 5, 39):
+            expected = _reference_points(
+                int(batch.finish_positions[i, j]), j + 1,
+                int(batch.laps_led[i, j]), int(batch.fastest_laps[i, j]),
+            )
+            assert points[i, j] == pytest.approx(expected, rel=1e-6)
+
+
+def test_winner_from_pole_with_dominator_stats():
+    points = score_outcome_arrays(
+        np.array([[1, 2]]), np.array([1, 10]), np.array([[100, 0]]), np.array([[20, 0]])
+    )
+
+    assert points[0, 0] == pytest.approx(46 + 25 + 9)
+    assert points[0, 1] == pytest.approx(40 + 8)
+
+
+def test_score_scenario_batch_reorders_columns():
+    batch = _make_batch(10, ['a', 'b', 'c'], seed=1)
+
+    natural = score_scenario_batch(batch)
+    reordered = score_scenario_batch(batch, driver_ids=['c', 'a', 'b'])
+
+    np.testing.assert_array_equal(reordered, natural[:, [2, 0, 1]])
+    with pytest.raises(ValueError, match="missing"):
+        score_scenario_batch(batch, driver_ids=['a', 'z'])
+
+
+def test_score_scenarios_matches_batch_scoring():
+    batch = _make_batch(5, ['a', 'b', 'c'], seed=2)
+    scenarios = [
+        SimpleNamespace(driver_outcomes={
+            driver_id: SimpleNamespace(
+                finish_position=int(batch.finish_positions[i, j]),
+                place_differential=int(batch.finish_positions[i, j]) - (j + 1),
+                laps_led=int(batch.laps_led[i, j]),
+                fastest_laps=int(batch.fastest_laps[i, j]),
+            )
+            for j, driver_id in enumerate(batch.driver_ids)
+        })
+        for i in range(5)
+    ]
+
+    np.testing.assert_allclose(
+        score_scenarios(scenarios, batch.driver_ids), score_scenario_batch(batch)
+    )
+
+
+def test_score_scenario_stream_fills_chunks_in_order():
+    driver_ids = [f'd{i}' for i in range(8)]
+    chunks = [_make_batch(n, driver_ids, seed) for seed, n in enumerate([4, 4, 3])]
+
+    points = score_scenario_stream(iter(chunks), n_scenarios=10, driver_ids=driver_ids)
+
+    assert points.shape == (10, 8)
+    np.testing.assert_array_equal(points[:4], score_scenario_batch(chunks[0]))
+    np.testing.assert_array_equal(points[4:8], score_scenario_batch(chunks[1]))
+    np.testing.assert_array_equal(points[8:], score_scenario_batch(chunks[2])[:2])
+
+    short = score_scenario_stream(iter(chunks[:1]), n_scenarios=10, driver_ids=driver_ids)
+    assert short.shape == (4, 8)
@@ -0,0 +1,168 @@
+"""
+Tests for pluggable MILP solver backends.
+
+Validates that HiGHS and CBC agree on small selection problems, that the
+incremental HiGHS model picks up appended rows and bound changes, and that
+per-solve timings are recorded.
+"""
+import pytest
+from pulp import LpMaximize, LpProblem, LpStatus, LpVariable, lpSum
+
+from app.solver_backend import (
+    CbcBackend,
+    HighsBackend,
+    SolverBackend,
+    get_solver_backend,
+    highs_available,
+)
+
+VALUES = [10, 13, 7, 8, 12, 9, 11, 6]
+WEIGHTS = [5, 6, 3, 4, 6, 4, 5, 2]
+
+
+def _knapsack(capacity: int = 15):
+    prob = LpProblem("knapsack", LpMaximize)
+    x = [LpVariable(f"x_{i}", cat="Binary") for i in range(len(VALUES))]
+    prob += lpSum(v * xi for v, xi in zip(VALUES, x))
+    prob += lpSum(w * xi for w, xi in zip(WEIGHTS, x)) <= capacity, "Capacity"
+    return prob, x
+
+
+def _selected(x):
+    return sorted(i for i, xi in enumerate(x) if xi.value() > 0.5)
+
+
+requires_highs = pytest.mark.skipif(not highs_available(), reason="highspy not installed")
+
+
+class TestGetSolverBackend:
+    """Tests for backend selection."""
+
+    def test_cbc_backend(self):
+        assert isinstance(get_solver_backend("cbc"), CbcBackend)
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError, match="Unknown solver backend"):
+            get_solver_backend("gurobi")
+
+    def test_env_var_selects_backend(self, monkeypatch):
+        monkeypatch.setenv("SOLVER_BACKEND", "cbc")
+        assert isinstance(get_solver_backend(), CbcBackend)
+
+    @requires_highs
+    def test_auto_prefers_highs(self):
+        assert isinstance(get_solver_backend("auto"), HighsBackend)
+
+
+class TestSolverBackends:
+    """Tests that both backends solve and report timings."""
+
+    @pytest.mark.parametrize("name", ["cbc", pytest.param("highs", marks=requires_highs)])
+    def test_solves_knapsack(self, name):
+        backend = get_solver_backend(name)
+        prob, x = _knapsack()
+
+        status = backend.solve(prob, build_seconds=0.01)
+
+        assert LpStatus[status] == "Optimal"
+        assert sum(VALUES[i] for i in _selected(x)) == 35
+
+        timings = backend.last_timings()
+        assert timings["backend"] == name
+        assert timings["build_seconds"] >= 0.01
+        assert timings["solve_seconds"] > 0
+        assert timings["n_variables"] == len(VALUES)
+        assert backend.summary()["n_solves"] == 1
+
+    def test_summary_keeps_running_totals(self):
+        backend = get_solver_backend("cbc")
+        solve_seconds = []
+        for _ in range(3):
+            prob, _ = _knapsack()
+            backend.solve(prob, build_seconds=0.01)
+            solve_seconds.append(backend.last_timings()["solve_seconds"])
+
+        summary = backend.summary()
+
+        assert summary["n_solves"] == 3
+        assert summary["build_seconds"] >= 0.03
+        assert summary["solve_seconds"] == pytest.approx(sum(solve_seconds))
+        assert summary["mean_solve_seconds"] == pytest.approx(sum(solve_seconds) / 3)
+
+    @requires_highs
+    def test_highs_matches_cbc(self):
+        results = {}
+        for name in ("cbc", "highs"):
+            prob, x = _knapsack(capacity=12)
+            get_solver_backend(name).solve(prob)
+            results[name] = (_selected(x), prob.objective.value())
+
+        assert results["highs"][1] == pytest.approx(results["cbc"][1])
+
+    @requires_highs
+    def test_highs_reports_infeasible(self):
+        prob, x = _knapsack()
+        prob += lpSum(x) >= len(x), "All_Items"
+
+        status = HighsBackend().solve(prob)
+
+        assert LpStatus[status] == "Infeasible"
+
+
+@requires_highs
+class TestIncrementalHighs:
+    """Tests for the resident HiGHS model."""
+
+    def test_appended_rows_and_bounds(self):
+        backend = HighsBackend(incremental=True)
+        prob, x = _knapsack()
+
+        backend.solve(prob)
+        first = _selected(x)
+
+        # Cut off the first solution and fix one item out via its bound
+        prob += lpSum(x[i] for i in first) <= len(first) - 1, "Cut_0"
+        x[first[0]].upBound = 0
+        backend.solve(prob)
+        second = _selected(x)
+
+        assert second != first
+        assert first[0] not in second
+        assert backend.summary()["n_solves"] == 2
+
+        # The resident model agrees with a fresh CBC solve of the same problem
+        prob_fresh, x_fresh = _knapsack()
+        prob_fresh += lpSum(x_fresh[i] for i in first) <= len(first) - 1, "Cut_0"
+        x_fresh[first[0]].upBound = 0
+        CbcBackend().solve(prob_fresh)
+        assert prob.objective.value() == pytest.approx(prob_fresh.objective.value())
+
+    def test_new_problem_reloads(self):
+        backend = HighsBackend(incremental=True)
+        for capacity in (15, 8):
+            prob, x = _knapsack(capacity)
+            backend.solve(prob)
+            assert sum(WEIGHTS[i] for i in _selected(x)) <= capacity
+
+    def test_removed_row_reloads(self):
+        backend = HighsBackend(incremental=True)
+        prob, x = _knapsack()
+        prob += x[0] + x[1] <= 0, "Cut_0"
+        backend.solve(prob)
+
+        # Same row count, different rows: the resident model must be rebuilt
+        del prob.constraints["Cut_0"]
+        prob += x[2] + x[3] <= 0, "Cut_1"
+        backend.solve(prob)
+
+        prob_fresh, x_fresh = _knapsack()
+        prob_fresh += x_fresh[2] + x_fresh[3] <= 0, "Cut_1"
+        CbcBackend().solve(prob_fresh)
+        assert _selected(x) == _selected(x_fresh)
+        assert prob.objective.value() == pytest.approx(prob_fresh.objective.value())
+
+
+def test_base_backend_is_abstract():
+    prob, _ = _knapsack()
+    with pytest.raises(NotImplementedError):
+        SolverBackend().solve(prob)
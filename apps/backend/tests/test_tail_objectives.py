@@ -16,7 +16,11 @@ from app.tail_objectives import (
     add_cvar_constraints,
     compute_scenario_points,
     compute_cvar,
+    compute_weighted_cvar,
     CVaRVariables,
+    build_upper_tail_cvar_objective,
+    build_compact_multi_cvar_objective,
+    reduce_scenarios,
 )
 
 
@@ -503,3 +507,141 @@ class TestComputeCVaR:
         # CVaR optimization should complete without error
         # (Actual improvement depends on scenario distribution)
         assert cvar_cvar > 0, f"CVaR should be positive"
+
+
+class TestCompactMultiCVaR:
+    """Tests for the compact Multi-CVaR builder and scenario reduction."""
+
+    @staticmethod
+    def _solve_lineup(scenarios, build):
+        prob = LpProblem("Compact_CVaR", LpMaximize)
+        x = {i: LpVariable(f"d{i}", cat="Binary") for i in range(scenarios.shape[1])}
+        prob += build(prob, x)
+        prob += lpSum(x.values()) == 3, "Roster_Size"
+        prob.solve(PULP_CBC_CMD(msg=0))
+        assert LpStatus[prob.status] == "Optimal"
+        selected = sorted(i for i, var in x.items() if var.value() > 0.5)
+        return prob.objective.value(), selected
+
+    def test_matches_per_quantile_builders(self):
+        """Compact model has the same optimum as summed upper-tail builders."""
+        rng = np.random.default_rng(0)
+        scenarios = rng.gamma(3, 10, size=(300, 8))
+
+        def reference(prob, x):
+            cvar_99 = build_upper_tail_cvar_objective(prob, scenarios, x, 0.99, "cvar_99")
+            cvar_95 = build_upper_tail_cvar_objective(prob, scenarios, x, 0.95, "cvar_95")
+            return 0.7 * cvar_99 + 0.3 * cvar_95
+
+        def compact(prob, x):
+            return build_compact_multi_cvar_objective(prob, scenarios, x)
+
+        ref_value, ref_selected = self._solve_lineup(scenarios, reference)
+        value, selected = self._solve_lineup(scenarios, compact)
+
+        assert value == pytest.approx(ref_value, rel=1e-6)
+        assert selected == ref_selected
+
+    def test_shared_points_rows(self):
+        """Two quantiles share one dense points row per scenario."""
+        prob = LpProblem("Compact_Rows", LpMaximize)
+        scenarios = np.random.default_rng(1).normal(50, 10, size=(20, 5))
+        x = {i: LpVariable(f"d{i}", cat="Binary") for i in range(5)}
+
+        build_compact_multi_cvar_objective(prob, scenarios, x)
+
+        dense_rows = [c for c in prob.constraints.values() if len(c) > 3]
+        assert len(dense_rows) == 20
+        assert len(prob.constraints) == 20 * 3
+
+    def test_single_quantile_skips_points_variables(self):
+        prob = LpProblem("Compact_Single", LpMaximize)
+        scenarios = np.random.default_rng(2).normal(50, 10, size=(20, 5))
+        x = {i: LpVariable(f"d{i}", cat="Binary") for i in range(5)}
+
+        build_compact_multi_cvar_objective(prob, scenarios, x, alphas=[0.99], weights=[1.0])
+
+        assert len(prob.constraints) == 20
+        assert not any("points" in v.name for v in prob.variables())
+
+    def test_invalid_scenario_weights(self):
+        prob = LpProblem("Compact_Invalid", LpMaximize)
+        scenarios = np.ones((10, 3))
+        x = {i: LpVariable(f"d{i}", cat="Binary") for i in range(3)}
+
+        with pytest.raises(ValueError, match="scenario_weights shape"):
+            build_compact_multi_cvar_objective(
+                prob, scenarios, x, scenario_weights=np.ones(5) / 5
+            )
+
+        with pytest.raises(ValueError, match="sum to 1.0"):
+            build_compact_multi_cvar_objective(
+                prob, scenarios, x, scenario_weights=np.ones(10)
+            )
+
+    def test_weighted_cvar_uniform_is_top_tail_mean(self):
+        points = np.random.default_rng(3).normal(100, 15, size=1000)
+
+        assert compute_weighted_cvar(points, np.ones(1000), 0.99) == pytest.approx(
+            np.sort(points)[-10:].mean()
+        )
+
+    def test_weighted_cvar_respects_weights(self):
+        points = np.array([10.0, 20.0, 30.0])
+        weights = np.array([0.5, 0.45, 0.05])
+
+        # Top 10% mass: 0.05 at 30 and 0.05 at 20
+        assert compute_weighted_cvar(points, weights, 0.90) == pytest.approx(25.0)
+
+    def test_reduce_scenarios_preserves_mass_and_bound(self):
+        """Reduced CVaR stays within the reported bound for sampled lineups."""
+        rng = np.random.default_rng(4)
+        scenarios = rng.gamma(3, 10, size=(2000, 12))
+
+        reduction = reduce_scenarios(scenarios, n_representatives=200, n_drivers=6)
+
+        assert reduction.n_representatives <= 200
+        assert reduction.weights.sum() == pytest.approx(1.0)
+        assert reduction.assignment.shape == (2000,)
+
+        uniform = np.full(2000, 1 / 2000)
+        for _ in range(25):
+            selected = rng.choice(12, size=6, replace=False)
+            for alpha in (0.99, 0.95):
+                full = compute_weighted_cvar(scenarios[:, selected].sum(axis=1), uniform, alpha)
+                reduced = compute_weighted_cvar(
+                    reduction.scenarios[:, selected].sum(axis=1), reduction.weights, alpha
+                )
+                assert abs(full - reduced) <= reduction.error_bound + 1e-9
+
+    def test_reduce_scenarios_no_op_when_target_exceeds_count(self):
+        scenarios = np.random.default_rng(5).normal(size=(50, 4))
+
+        reduction = reduce_scenarios(scenarios, n_representatives=100)
+
+        np.testing.assert_array_equal(reduction.scenarios, scenarios)
+        assert reduction.error_bound == 0.0
+
+    def test_portfolio_with_scenario_reduction(self):
+        from app.portfolio_generator import generate_portfolio
+
+        np.random.seed(42)
+        driver_data = [
+            {'driver_id': i, 'name': f'Driver {i}', 'salary': 7500 + i*100, 'team': f'Team {i//3}'}
+            for i in range(15)
+        ]
+        scenarios = np.random.randn(2000, 15) * 15 + 120
+
+        lineups = generate_portfolio(
+            race_id='test_reduced_race',
+            driver_data=driver_data,
+            scenario_fn=lambda n: scenarios,
+            n_lineups=2,
+            n_scenarios=2000,
+            n_representative_scenarios=200,
+            max_driver_exposure=1.1,
+            max_team_exposure=10.0,
+        )
+
+        assert len(lineups) == 2
+        assert all(len(lineup['drivers']) == 6 for lineup in lineups)
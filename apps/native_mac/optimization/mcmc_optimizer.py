@@ -1,17 +1,165 @@
 """MCMC lineup optimizer using JAX for local Apple Silicon computation."""
 
+import heapq
 import logging
-from typing import Dict, List, Optional, Any, Callable
+from functools import partial
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple
 from dataclasses import dataclass
 import numpy as np
 
 # JAX imports for Apple Silicon optimization
 import jax
 import jax.numpy as jnp
-from jax import random, jit, vmap
+from jax import lax, random, jit, vmap
 
 logger = logging.getLogger(__name__)
 
+# Candidate lineups proposed per jitted sampler call
+DEFAULT_PROPOSAL_BATCH = 4096
+
+# Weight of value_score in the lineup score
+VALUE_SCORE_WEIGHT = 0.1
+
+
+@partial(jit, static_argnames=("batch_size", "lineup_size", "n_teams"))
+def _propose_lineups(
+    key: jnp.ndarray,
+    salaries: jnp.ndarray,
+    logits: jnp.ndarray,
+    driver_scores: jnp.ndarray,
+    team_indices: jnp.ndarray,
+    available_mask: jnp.ndarray,
+    salary_cap: float,
+    min_stack: int,
+    max_stack: int,
+    *,
+    batch_size: int,
+    lineup_size: int,
+    n_teams: int,
+) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+    """Propose a batch of lineups by greedy randomized construction.
+
+    At each of the lineup_size picks, every lineup in the batch draws one
+    available, affordable driver whose team is still below max_stack, with
+    probability proportional to exp(points / temperature) (Gumbel-max over
+    the masked logits). Drawing from the allowed drivers directly is the same
+    distribution as drawing from all affordable drivers and discarding
+    over-stacked picks until one is accepted.
+
+    Args:
+        key: JAX random key
+        salaries: Driver salaries
+        logits: Driver sampling logits (projected_points / temperature)
+        driver_scores: Per-driver lineup score contribution
+        team_indices: Team index of each driver
+        available_mask: Drivers that may be selected
+        salary_cap: Salary cap
+        min_stack: Minimum drivers from one team
+        max_stack: Maximum drivers from one team
+        batch_size: Number of lineups to propose
+        lineup_size: Drivers per lineup
+        n_teams: Number of distinct teams
+
+    Returns:
+        Tuple of (lineups [batch_size, lineup_size] int32, valid [batch_size] bool,
+        scores [batch_size])
+    """
+    n_drivers = salaries.shape[0]
+    rows = jnp.arange(batch_size)
+    gumbel = random.gumbel(key, (lineup_size, batch_size, n_drivers))
+
+    available = jnp.broadcast_to(available_mask, (batch_size, n_drivers))
+    remaining_cap = jnp.full(batch_size, salary_cap, dtype=salaries.dtype)
+    team_counts = jnp.zeros((batch_size, n_teams), dtype=jnp.int32)
+    valid = jnp.ones(batch_size, dtype=jnp.bool_)
+
+    picks = []
+    for step in range(lineup_size):
+        allowed = (
+            available
+            & (salaries[None, :] <= remaining_cap[:, None])
+            & (team_counts[:, team_indices] < max_stack)
+        )
+        pick = jnp.argmax(jnp.where(allowed, logits[None, :] + gumbel[step], -jnp.inf), axis=1)
+        valid = valid & allowed.any(axis=1)
+
+        picks.append(pick)
+        remaining_cap = remaining_cap - salaries[pick]
+        team_counts = team_counts.at[rows, team_indices[pick]].add(1)
+        available = available.at[rows, pick].set(False)
+
+    lineups = jnp.stack(picks, axis=1).astype(jnp.int32)
+    valid = valid & (team_counts.max(axis=1) >= min_stack)
+    scores = driver_scores[lineups].sum(axis=1)
+
+    return lineups, valid, scores
+
+
+@partial(jit, static_argnames=("n_steps", "n_teams"))
+def _swap_chains(
+    key: jnp.ndarray,
+    lineups: jnp.ndarray,
+    salaries: jnp.ndarray,
+    driver_scores: jnp.ndarray,
+    team_indices: jnp.ndarray,
+    available_mask: jnp.ndarray,
+    salary_cap: float,
+    min_stack: int,
+    max_stack: int,
+    temperature: float,
+    *,
+    n_steps: int,
+    n_teams: int,
+) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """Refine lineups with parallel Metropolis swap-move chains.
+
+    Each chain starts from one lineup. A step swaps a random slot for a random
+    unselected driver; feasible moves are accepted with probability
+    min(1, exp(delta_score / temperature)).
+
+    Returns:
+        Tuple of (best lineup per chain, best score per chain)
+    """
+    n_drivers = salaries.shape[0]
+
+    def chain(key, lineup):
+        def step(carry, key):
+            lineup, score, best, best_score = carry
+            k_slot, k_driver, k_accept = random.split(key, 3)
+
+            selected = jnp.zeros(n_drivers, dtype=jnp.bool_).at[lineup].set(True)
+            candidates = available_mask & ~selected
+            slot = random.randint(k_slot, (), 0, lineup.shape[0])
+            driver = random.categorical(k_driver, jnp.where(candidates, 0.0, -jnp.inf))
+            proposal = lineup.at[slot].set(driver.astype(lineup.dtype))
+
+            counts = jnp.zeros(n_teams, dtype=jnp.int32).at[team_indices[proposal]].add(1)
+            feasible = (
+                candidates.any()
+                & (salaries[proposal].sum() <= salary_cap)
+                & (counts.max() <= max_stack)
+                & (counts.max() >= min_stack)
+            )
+            new_score = driver_scores[proposal].sum()
+            accept = feasible & (
+                jnp.log(random.uniform(k_accept)) < (new_score - score) / temperature
+            )
+
+            lineup = jnp.where(accept, proposal, lineup)
+            score = jnp.where(accept, new_score, score)
+            improved = score > best_score
+            best = jnp.where(improved, lineup, best)
+            best_score = jnp.where(improved, score, best_score)
+            return (lineup, score, best, best_score), None
+
+        score = driver_scores[lineup].sum()
+        (_, _, best, best_score), _ = lax.scan(
+            step, (lineup, score, lineup, score), random.split(key, n_steps)
+        )
+        return best, best_score
+
+    return vmap(chain)(random.split(key, lineups.shape[0]), lineups)
+
 
 @dataclass
 class OptimizationResult:
@@ -25,6 +173,101 @@ class OptimizationResult:
     lineup_score: float
 
 
+class TopKLineupPool:
+    """The K highest-scoring distinct lineups seen so far.
+
+    A min-heap of (score, lineup_key) keeps the worst kept lineup at the root,
+    and a set of lineup keys rejects duplicates. A lineup key is the tuple of
+    its sorted driver indices, so the same drivers picked in a different
+    order count as one lineup.
+
+    Attributes:
+        k: Maximum number of lineups kept
+    """
+
+    def __init__(self, k: int):
+        """Initialize an empty pool.
+
+        Args:
+            k: Maximum number of lineups kept
+        """
+        self.k = k
+        self._heap: List[Tuple[float, Tuple[int, ...]]] = []
+        self._keys: Set[Tuple[int, ...]] = set()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def min_score(self) -> float:
+        """Score a new lineup must beat once the pool is full (-inf until then)."""
+        if len(self._heap) < self.k:
+            return float("-inf")
+        return self._heap[0][0]
+
+    def offer(self, lineup, score: float) -> bool:
+        """Add a lineup if it is new and scores high enough.
+
+        Args:
+            lineup: Driver indices
+            score: Lineup score
+
+        Returns:
+            True if the lineup was added
+        """
+        key = tuple(sorted(int(i) for i in lineup))
+        if key in self._keys or score <= self.min_score:
+            return False
+
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, (score, key))
+        else:
+            _, evicted = heapq.heapreplace(self._heap, (score, key))
+            self._keys.discard(evicted)
+        self._keys.add(key)
+        return True
+
+    def offer_batch(self, lineups: np.ndarray, scores: np.ndarray) -> int:
+        """Offer a batch of lineups, best first.
+
+        Candidates that cannot beat min_score are dropped with one array
+        comparison, duplicates within the batch with one np.unique, so only
+        plausible new lineups reach the heap.
+
+        Args:
+            lineups: Driver index rows (shape: [n, lineup_size])
+            scores: Lineup scores (shape: [n])
+
+        Returns:
+            Number of lineups added
+        """
+        keep = scores > self.min_score
+        if not keep.any():
+            return 0
+
+        lineups, first = np.unique(np.sort(lineups[keep], axis=1), axis=0, return_index=True)
+        scores = scores[keep][first]
+
+        added = 0
+        for i in np.argsort(-scores, kind="stable"):
+            score = float(scores[i])
+            if score <= self.min_score:
+                break
+            added += self.offer(lineups[i], score)
+        return added
+
+    def lineups(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Kept lineups and scores, best first.
+
+        Returns:
+            Tuple of (lineups [n, lineup_size] int32, scores [n] float32)
+        """
+        ranked = sorted(self._heap, reverse=True)
+        lineups = np.array([key for _, key in ranked], dtype=np.int32)
+        scores = np.array([score for score, _ in ranked], dtype=np.float32)
+        return lineups, scores
+
+
 class MCMCLineupOptimizer:
     """MCMC-based lineup optimizer using JAX for local computation on Apple Silicon.
 
@@ -33,7 +276,11 @@ class MCMCLineupOptimizer:
 
     Key features:
     - JAX-based computation for Apple Silicon performance
-    - Configurable MCMC iterations (default 1000, max 5000)
+    - Batched proposals: thousands of candidate lineups per jitted call,
+      kept as index arrays and scored with one gather
+    - Optional jitted Metropolis swap-move refinement of the final lineups
+    - Results are the top-K distinct lineups (TopKLineupPool)
+    - Configurable MCMC iterations (default 1000, max 100,000)
     - Temperature-based sampling for exploration/exploitation tradeoff
     - Salary cap constraint enforcement ($50,000 for DraftKings)
     - 6-driver lineup size constraint
@@ -46,30 +293,39 @@ class MCMCLineupOptimizer:
         temperature: MCMC temperature parameter
         salary_cap: DraftKings salary cap
         lineup_size: Number of drivers per lineup
+        proposal_batch_size: Candidate lineups proposed per sampler call
+        swap_steps: Metropolis swap steps per final lineup (0 disables)
     """
 
     def __init__(
         self,
         default_iterations: int = 1000,
-        max_iterations: int = 5000,
+        max_iterations: int = 100000,
         temperature: float = 1.0,
         salary_cap: int = 50000,
         lineup_size: int = 6,
+        proposal_batch_size: int = DEFAULT_PROPOSAL_BATCH,
+        swap_steps: int = 0,
     ):
         """Initialize MCMC lineup optimizer.
 
         Args:
             default_iterations: Default MCMC iterations (default 1000)
-            max_iterations: Maximum iterations allowed (default 5000)
+            max_iterations: Maximum iterations allowed (default 100000)
             temperature: MCMC temperature for sampling (default 1.0)
             salary_cap: Salary cap constraint (default 50000)
             lineup_size: Number of drivers per lineup (default 6)
+            proposal_batch_size: Candidate lineups per sampler call (default 4096)
+            swap_steps: Metropolis swap steps run from each final lineup
+                (default 0 = no refinement)
         """
         self.default_iterations = default_iterations
         self.max_iterations = max_iterations
         self.temperature = temperature
         self.salary_cap = salary_cap
         self.lineup_size = lineup_size
+        self.proposal_batch_size = proposal_batch_size
+        self.swap_steps = swap_steps
 
         # JAX configuration for Apple Silicon
         # Use CPU backend (Metal GPU support is experimental)
@@ -195,10 +451,9 @@ class MCMCLineupOptimizer:
 
         # Handle excluded drivers
         exclude_drivers = constraints.get("exclude_drivers", [])
-        available_mask = jnp.ones(n_drivers, dtype=jnp.bool_)
-        for i, driver in enumerate(drivers):
-            if driver.get("driver_id") in exclude_drivers:
-                available_mask = available_mask.at[i].set(False)
+        available_mask = jnp.array(
+            [d.get("driver_id") not in exclude_drivers for d in drivers], dtype=jnp.bool_
+        )
 
         return {
             "n_drivers": n_drivers,
@@ -235,191 +490,113 @@ class MCMCLineupOptimizer:
         Returns:
             List of optimized lineups
         """
-        n_drivers = driver_data["n_drivers"]
+        if num_lineups <= 0:
+            return []
 
         # Initialize random key for reproducibility
         key = random.PRNGKey(42)
 
-        # Track best lineups found
-        best_lineups = []
-        best_scores = []
-
         # MCMC parameters
         min_stack = constraints.get("min_stack", 0)
         max_stack = constraints.get("max_stack", 6)
 
-        # Progress tracking
-        progress_interval = max(1, iterations // 100)  # Update every 1%
+        # Per-driver arrays: lineup scores are one gather + sum over these
+        driver_scores = self._driver_scores(driver_data)
+        logits = driver_data["projected_points"] / self.temperature
+        sampler_args = (
+            driver_data["salaries"],
+            logits,
+            driver_scores,
+            driver_data["team_indices"],
+            driver_data["available_mask"],
+            salary_cap,
+            min_stack,
+            max_stack,
+        )
+
+        # Top-K distinct valid lineups; dicts are built only at the end
+        pool = TopKLineupPool(num_lineups)
         best_score_so_far = 0.0
 
-        for iteration in range(iterations):
+        # Every call proposes a full batch (one compiled shape); the final
+        # batch is truncated to the remaining iterations
+        completed = 0
+        while completed < iterations:
             # Check for cancellation
             if cancellation_check and cancellation_check():
                 raise CancellationError("Optimization cancelled by user")
 
-            # Generate candidate lineup
             key, subkey = random.split(key)
-            candidate = self._generate_candidate_lineup(
-                key=subkey,
-                driver_data=driver_data,
-                salary_cap=salary_cap,
-                min_stack=min_stack,
-                max_stack=max_stack,
+            lineups, valid, scores = _propose_lineups(
+                subkey,
+                *sampler_args,
+                batch_size=self.proposal_batch_size,
+                lineup_size=self.lineup_size,
+                n_teams=driver_data["n_teams"],
             )
 
-            if candidate is None:
-                continue
-
-            # Calculate lineup score
-            score = self._calculate_lineup_score(candidate, driver_data)
-
-            # Update best score tracking
-            if score > best_score_so_far:
-                best_score_so_far = score
-
-            # MCMC acceptance criterion (Metropolis-Hastings)
-            # Accept if better, or with probability based on temperature
-            if len(best_lineups) < num_lineups:
-                # Fill initial population
-                lineup_dict = self._create_lineup_dict(candidate, driver_data, score)
-                best_lineups.append(lineup_dict)
-                best_scores.append(score)
-            else:
-                # Replace worst if better
-                min_idx = int(jnp.argmin(jnp.array(best_scores)))
-                if score > best_scores[min_idx]:
-                    lineup_dict = self._create_lineup_dict(
-                        candidate, driver_data, score
-                    )
-                    best_lineups[min_idx] = lineup_dict
-                    best_scores[min_idx] = score
+            n = min(self.proposal_batch_size, iterations - completed)
+            keep = np.asarray(valid)[:n]
+            lineups = np.asarray(lineups)[:n][keep]
+            scores = np.asarray(scores)[:n][keep]
+            completed += n
+
+            if len(scores):
+                best_score_so_far = max(best_score_so_far, float(scores.max()))
+                pool.offer_batch(lineups, scores)
 
             # Progress callback
-            if progress_callback and iteration % progress_interval == 0:
-                progress_callback(iteration, iterations, float(best_score_so_far))
+            if progress_callback and completed < iterations:
+                progress_callback(completed, iterations, float(best_score_so_far))
+
+        if self.swap_steps > 0 and len(pool):
+            # Refined lineups compete with the sampled ones for the K slots
+            key, subkey = random.split(key)
+            refined, refined_scores = _swap_chains(
+                subkey,
+                jnp.asarray(pool.lineups()[0]),
+                driver_data["salaries"],
+                driver_scores,
+                driver_data["team_indices"],
+                driver_data["available_mask"],
+                salary_cap,
+                min_stack,
+                max_stack,
+                self.temperature,
+                n_steps=self.swap_steps,
+                n_teams=driver_data["n_teams"],
+            )
+            refined_scores = np.asarray(refined_scores)
+            pool.offer_batch(np.asarray(refined), refined_scores)
+            best_score_so_far = max(best_score_so_far, float(refined_scores.max()))
 
         # Final progress update
         if progress_callback:
             progress_callback(iterations, iterations, float(best_score_so_far))
 
-        # Sort by score descending
-        sorted_indices = sorted(
-            range(len(best_lineups)), key=lambda i: best_scores[i], reverse=True
-        )
-
-        return [best_lineups[i] for i in sorted_indices]
-
-    def _generate_candidate_lineup(
-        self,
-        key: jnp.ndarray,
-        driver_data: Dict[str, jnp.ndarray],
-        salary_cap: int,
-        min_stack: int,
-        max_stack: int,
-    ) -> Optional[jnp.ndarray]:
-        """Generate a candidate lineup using greedy randomized selection.
-
-        Args:
-            key: JAX random key
-            driver_data: Driver data
-            salary_cap: Salary cap
-            min_stack: Minimum stack size
-            max_stack: Maximum stack size
-
-        Returns:
-            Array of selected driver indices, or None if invalid
-        """
-        n_drivers = driver_data["n_drivers"]
-        salaries = driver_data["salaries"]
-        projected_points = driver_data["projected_points"]
-        team_indices = driver_data["team_indices"]
-        available_mask = driver_data["available_mask"]
-
-        # Greedy randomized construction
-        selected = []
-        remaining_cap = salary_cap
-        available = set(int(i) for i in range(n_drivers) if available_mask[i])
-
-        # Track team counts for stacking
-        team_counts = {}
-
-        max_attempts = 100
-        attempts = 0
-
-        while len(selected) < self.lineup_size and attempts < max_attempts:
-            attempts += 1
-
-            # Find affordable drivers
-            affordable = [i for i in available if int(salaries[i]) <= remaining_cap]
-
-            if not affordable:
-                break
-
-            # Calculate selection probabilities based on projected points
-            points = jnp.array([projected_points[i] for i in affordable])
-
-            # Add some randomness (temperature)
-            probs = jnp.exp(points / self.temperature)
-            probs = probs / jnp.sum(probs)
-
-            # Sample driver
-            key, subkey = random.split(key)
-            idx = int(random.choice(subkey, jnp.array(affordable), p=probs))
-
-            # Check stacking constraints
-            team_idx = int(team_indices[idx])
-            new_team_count = team_counts.get(team_idx, 0) + 1
-
-            if new_team_count > max_stack:
-                # Remove this driver and try again
-                available.discard(idx)
-                continue
-
-            # Accept driver
-            selected.append(idx)
-            remaining_cap -= int(salaries[idx])
-            available.discard(idx)
-            team_counts[team_idx] = new_team_count
-
-        # Validate lineup
-        if len(selected) != self.lineup_size:
-            return None
+        # Sorted by score descending
+        lineups, scores = pool.lineups()
+        if len(lineups) < num_lineups:
+            logger.warning(
+                f"Only {len(lineups)} distinct valid lineups found "
+                f"(requested {num_lineups})"
+            )
 
-        # Check min stacking constraint
-        if min_stack > 0:
-            max_team_count = max(team_counts.values()) if team_counts else 0
-            if max_team_count < min_stack:
-                return None
+        return [
+            self._create_lineup_dict(lineup, driver_data, float(score))
+            for lineup, score in zip(lineups, scores)
+        ]
 
-        return jnp.array(selected, dtype=jnp.int32)
-
-    def _calculate_lineup_score(
-        self,
-        candidate: jnp.ndarray,
-        driver_data: Dict[str, jnp.ndarray],
-    ) -> float:
-        """Calculate score for a candidate lineup.
+    def _driver_scores(self, driver_data: Dict[str, jnp.ndarray]) -> jnp.ndarray:
+        """Per-driver contribution to the lineup score.
 
         Args:
-            candidate: Array of selected driver indices
             driver_data: Driver data
 
         Returns:
-            Lineup score (higher is better)
+            Array of projected_points + VALUE_SCORE_WEIGHT * value_score
         """
-        projected_points = driver_data["projected_points"]
-        value_scores = driver_data["value_scores"]
-
-        # Total projected points
-        total_points = float(jnp.sum(projected_points[candidate]))
-
-        # Total value score
-        total_value = float(jnp.sum(value_scores[candidate]))
-
-        # Combined score with value weighting
-        score = total_points + 0.1 * total_value
-
-        return score
+        return driver_data["projected_points"] + VALUE_SCORE_WEIGHT * driver_data["value_scores"]
 
     def _create_lineup_dict(
         self,
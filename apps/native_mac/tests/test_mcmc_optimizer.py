@@ -0,0 +1,186 @@
+"""
+Tests for the batched MCMC lineup sampler and the top-K lineup pool.
+
+Checks that jitted proposals and swap-move refinement only return feasible
+lineups and that their scores match a per-lineup recomputation, and that
+TopKLineupPool keeps the K best distinct lineups with deterministic ties.
+"""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+jax = pytest.importorskip("jax")
+pytest.importorskip("PySide6")  # optimization package imports the Qt worker
+
+from apps.native_mac.optimization.mcmc_optimizer import (  # noqa: E402
+    VALUE_SCORE_WEIGHT,
+    MCMCLineupOptimizer,
+    TopKLineupPool,
+    _propose_lineups,
+    _swap_chains,
+)
+
+SALARY_CAP = 50000
+MIN_STACK = 2
+MAX_STACK = 3
+EXCLUDED = "d11"
+
+
+def _drivers(n_drivers=16):
+    rng = np.random.default_rng(7)
+    return [
+        {
+            "driver_id": f"d{i}",
+            "name": f"Driver {i}",
+            "team": f"Team {i % 4}",
+            "salary": int(rng.integers(5000, 10000)),
+            "projected_points": float(rng.uniform(20, 60)),
+            "value_score": float(rng.uniform(0, 10)),
+        }
+        for i in range(n_drivers)
+    ]
+
+
+@pytest.fixture
+def setup():
+    optimizer = MCMCLineupOptimizer()
+    drivers = _drivers()
+    data = optimizer._prepare_driver_data(drivers, {"exclude_drivers": [EXCLUDED]})
+    return optimizer, drivers, data
+
+
+def _assert_feasible(lineup, drivers, lineup_size=6):
+    picked = [drivers[int(i)] for i in lineup]
+    assert len({d["driver_id"] for d in picked}) == lineup_size
+    assert EXCLUDED not in {d["driver_id"] for d in picked}
+    assert sum(d["salary"] for d in picked) <= SALARY_CAP
+    team_counts = Counter(d["team"] for d in picked)
+    assert MIN_STACK <= max(team_counts.values()) <= MAX_STACK
+
+
+def _scalar_score(lineup, drivers):
+    return sum(
+        drivers[int(i)]["projected_points"] + VALUE_SCORE_WEIGHT * drivers[int(i)]["value_score"]
+        for i in lineup
+    )
+
+
+def test_proposed_lineups_are_feasible_and_scored(setup):
+    optimizer, drivers, data = setup
+
+    lineups, valid, scores = _propose_lineups(
+        jax.random.PRNGKey(0),
+        data["salaries"],
+        data["projected_points"] / optimizer.temperature,
+        optimizer._driver_scores(data),
+        data["team_indices"],
+        data["available_mask"],
+        SALARY_CAP,
+        MIN_STACK,
+        MAX_STACK,
+        batch_size=256,
+        lineup_size=6,
+        n_teams=data["n_teams"],
+    )
+    lineups, valid, scores = np.asarray(lineups), np.asarray(valid), np.asarray(scores)
+
+    assert lineups.shape == (256, 6)
+    assert valid.sum() > 0
+    for lineup, score in zip(lineups[valid], scores[valid]):
+        _assert_feasible(lineup, drivers)
+        assert score == pytest.approx(_scalar_score(lineup, drivers), rel=1e-5)
+
+
+def test_swap_chains_keep_lineups_feasible(setup):
+    optimizer, drivers, data = setup
+    driver_scores = optimizer._driver_scores(data)
+
+    lineups, valid, scores = _propose_lineups(
+        jax.random.PRNGKey(1),
+        data["salaries"],
+        data["projected_points"] / optimizer.temperature,
+        driver_scores,
+        data["team_indices"],
+        data["available_mask"],
+        SALARY_CAP,
+        MIN_STACK,
+        MAX_STACK,
+        batch_size=64,
+        lineup_size=6,
+        n_teams=data["n_teams"],
+    )
+    start = np.asarray(lineups)[np.asarray(valid)][:16]
+    start_scores = np.asarray(scores)[np.asarray(valid)][:16]
+
+    refined, refined_scores = _swap_chains(
+        jax.random.PRNGKey(2),
+        jax.numpy.asarray(start),
+        data["salaries"],
+        driver_scores,
+        data["team_indices"],
+        data["available_mask"],
+        SALARY_CAP,
+        MIN_STACK,
+        MAX_STACK,
+        optimizer.temperature,
+        n_steps=50,
+        n_teams=data["n_teams"],
+    )
+    refined, refined_scores = np.asarray(refined), np.asarray(refined_scores)
+
+    assert refined.shape == start.shape
+    # Each chain reports its best lineup, never worse than where it started
+    assert np.all(refined_scores >= start_scores - 1e-4)
+    for lineup, score in zip(refined, refined_scores):
+        _assert_feasible(lineup, drivers)
+        assert score == pytest.approx(_scalar_score(lineup, drivers), rel=1e-5)
+
+
+def test_pool_keeps_k_best():
+    pool = TopKLineupPool(k=3)
+    rng = np.random.default_rng(0)
+    lineups = np.array([rng.choice(20, size=6, replace=False) for _ in range(50)])
+    scores = rng.uniform(100, 200, size=50)
+
+    for lineup, score in zip(lineups[:25], scores[:25]):
+        pool.offer(lineup, float(score))
+    pool.offer_batch(lineups[25:], scores[25:])
+
+    kept, kept_scores = pool.lineups()
+    best = np.argsort(-scores)[:3]
+    np.testing.assert_allclose(kept_scores, scores[best].astype(np.float32))
+    np.testing.assert_array_equal(kept, np.sort(lineups[best], axis=1))
+    assert pool.min_score == pytest.approx(scores[best[-1]])
+
+
+def test_pool_rejects_duplicates():
+    pool = TopKLineupPool(k=5)
+
+    assert pool.offer([0, 1, 2, 3, 4, 5], 150.0)
+    assert not pool.offer([5, 4, 3, 2, 1, 0], 160.0)  # Same drivers, other order
+    batch = np.array([[6, 7, 8, 9, 10, 11], [11, 10, 9, 8, 7, 6], [0, 1, 2, 3, 4, 5]])
+    assert pool.offer_batch(batch, np.array([140.0, 145.0, 170.0])) == 1
+
+    assert len(pool) == 2
+
+
+def test_pool_ties_are_deterministic():
+    # A full pool keeps its incumbent when a newcomer only ties the minimum
+    pool = TopKLineupPool(k=1)
+    assert pool.offer([0, 1, 2, 3, 4, 5], 150.0)
+    assert not pool.offer([6, 7, 8, 9, 10, 11], 150.0)
+    np.testing.assert_array_equal(pool.lineups()[0], [[0, 1, 2, 3, 4, 5]])
+
+    # Tied batch rows resolve the same way whatever their order in the batch
+    batch = np.array([[6, 7, 8, 9, 10, 11], [0, 1, 2, 3, 4, 5], [3, 4, 5, 6, 7, 8]])
+    scores = np.full(3, 150.0)
+    results = []
+    for order in ([0, 1, 2], [2, 1, 0], [1, 2, 0]):
+        pool = TopKLineupPool(k=2)
+        pool.offer_batch(batch[order], scores[order])
+        results.append(pool.lineups()[0])
+
+    for kept in results[1:]:
+        np.testing.assert_array_equal(kept, results[0])
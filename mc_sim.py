@@ -13,8 +13,7 @@ track characteristics, driver skill, global race events, and pit strategies.
 
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Tuple, Optional, Any, Set
-from collections import defaultdict
+from typing import Dict, Tuple, Optional, Any, Set
 import json
 from datetime import datetime
 import logging
@@ -27,6 +26,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Transition table variants, indexed by the lap's global event
+GREEN_VARIANT = 0
+CAUTION_VARIANT = 1
+BIG_ONE_VARIANT = 2
+
 # Database models import
 from apps.backend.app.models import (
     Agent, World, Run, Belief, Driver, Race,
@@ -66,6 +70,39 @@ class GlobalRaceScenario:
                 if np.random.random() < big_one_prob:
                     self.big_one_laps.add(lap)
 
+def sample_race_events(
+    n_sims: int,
+    n_laps: int,
+    track_config: Dict[str, Any],
+    rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized GlobalRaceScenario events for many simulations at once.
+
+    Stage breaks are cautions in every simulation; other laps are a caution
+    with caution_probability and a caution is a "Big One" with the
+    incident model's pack_wreck_prob.
+
+    Returns:
+        (variants, stage_breaks): uint8 (n_sims, n_laps) transition variant per
+        lap (GREEN/CAUTION/BIG_ONE_VARIANT) and bool (n_laps,) stage break mask.
+        Column j is lap j + 1.
+    """
+    caution_prob = track_config.get('caution_probability', 0.08)
+    incident_model = track_config.get('incident_model', {})
+    big_one_prob = incident_model.get('pack_wreck_prob', 0.0) if incident_model.get('enabled') else 0.0
+
+    laps = np.arange(1, n_laps + 1)
+    stage_breaks = np.isin(laps, list(track_config.get('stage_breaks', [60, 120])))
+
+    caution = rng.random((n_sims, n_laps)) < caution_prob
+    big_one = caution & (rng.random((n_sims, n_laps)) < big_one_prob) & ~stage_breaks
+
+    variants = np.full((n_sims, n_laps), GREEN_VARIANT, dtype=np.uint8)
+    variants[caution | stage_breaks] = CAUTION_VARIANT
+    variants[big_one] = BIG_ONE_VARIANT
+    return variants, stage_breaks
+
 class MarkovChain:
     """
     Enhanced Markov chain for NASCAR.
@@ -158,10 +195,49 @@ class MarkovChain:
                 # Caution restarts: high variance
                 # Flatten the distribution (anyone can jump on restart)
                 probs[:9] = 0.8 * probs[:9] + 0.2 * (1.0/9.0)
+                probs /= probs.sum()
                 
         # Sample
         return np.random.choice(self.n_states, p=probs)
 
+    def cumulative_transition_tables(self) -> np.ndarray:
+        """
+        Cumulative transition tables for the green, caution and big-one variants.
+
+        Applies get_next_state's event logic to every state at once, so lap
+        transitions can be drawn by inverse-CDF lookup with uniform arrays.
+        Unfitted (all-zero) rows fall back to the default row and the DNF
+        state is absorbing.
+
+        Returns:
+            Array of shape (3, n_states, n_states), indexed by
+            [variant, current_state]; each row ends at exactly 1.0
+        """
+        dnf = self.n_states - 1
+        green = self.transition_matrix.astype(float)
+        for i in np.flatnonzero(green.sum(axis=1) == 0):
+            green[i] = self._get_default_row(i)
+        green /= green.sum(axis=1, keepdims=True)
+
+        # Caution restarts: flatten the running-state distribution
+        caution = green.copy()
+        caution[:, :dnf] = 0.8 * caution[:, :dnf] + 0.2 / dnf
+        caution /= caution.sum(axis=1, keepdims=True)
+
+        # Big One: 30% extra wreck chance for the pack (middle states)
+        big_one = green.copy()
+        pack = slice(2, 8)
+        big_one[pack, dnf] += 0.3
+        big_one[pack, :dnf] *= (1 - big_one[pack, dnf:]) / big_one[pack, :dnf].sum(axis=1, keepdims=True)
+
+        tables = np.stack([green, caution, big_one])
+        tables[:, dnf] = 0.0
+        tables[:, dnf, dnf] = 1.0
+
+        cumulative = np.cumsum(tables, axis=2)
+        cumulative[:, :, -1] = 1.0
+        return cumulative
+
 class NASCARSimulator:
     """
     Enhanced Simulator with Shared Shocks and Strategy.
@@ -202,73 +278,99 @@ class NASCARSimulator:
     def simulate_race(
         self,
         race_id: int,
-        n_simulations: int = 1000, # Reduced default for heavy logic
-        store_in_db: bool = True
-    ) -> Dict[int, List[List[int]]]:
+        n_simulations: int = 1000,
+        store_in_db: bool = True,
+        keep_paths: bool = True,
+        random_state: Optional[int] = None
+    ) -> Dict[int, np.ndarray]:
         """
         Run correlated simulations.
+
+        Returns per-driver views into simulate_paths(): (n_simulations,
+        n_laps + 1) state paths, or (n_simulations,) final states when
+        keep_paths is False.
+        """
+        states = self.simulate_paths(n_simulations, keep_paths, random_state)
+        self.simulations = dict(zip(self.drivers_data, states))
+
+        if store_in_db:
+            self._store_results(race_id)
+
+        return self.simulations
+
+    def simulate_paths(
+        self,
+        n_simulations: int = 1000,
+        keep_paths: bool = True,
+        random_state: Optional[int] = None
+    ) -> np.ndarray:
         """
+        Advance every driver in every simulation lap by lap, all at once.
+
+        Each simulation shares one set of global events (sample_race_events)
+        across drivers. Per lap, stage-break pit strategy is applied and next
+        states are drawn by inverse-CDF lookup in each driver's
+        cumulative_transition_tables().
+
+        Args:
+            n_simulations: Number of simulated races
+            keep_paths: Keep full lap-by-lap paths (False = final states only)
+            random_state: Seed for the simulation RNG (None = derived from the
+                global NumPy seed, so np.random.seed still reproduces runs)
+
+        Returns:
+            uint8 array (n_drivers, n_simulations, n_laps + 1) of states, with the
+            start state in column 0, or (n_drivers, n_simulations) final states.
+            Drivers are in drivers_data order.
+        """
+        if random_state is None:
+            random_state = np.random.randint(2**31)
+        rng = np.random.default_rng(random_state)
+
         n_laps = self.track_data.get('laps', 200)
-        self.simulations = defaultdict(list)
-        
+        driver_ids = list(self.drivers_data)
+        n_drivers = len(driver_ids)
+
         # 1. Generate Global Scenarios (Shared Shocks)
-        scenarios = [
-            GlobalRaceScenario(n_laps, self.track_data) 
-            for _ in range(n_simulations)
-        ]
-        
+        variants, stage_breaks = sample_race_events(n_simulations, n_laps, self.track_data, rng)
+
+        # All drivers' CDF rows, column-major: cdf_columns[j][row] is P(next <= j)
+        tables = np.stack([self.markov_chains[did].cumulative_transition_tables() for did in driver_ids])
+        cdf_columns = np.ascontiguousarray(tables.reshape(-1, self.n_states).T, dtype=np.float32)
+        driver_offset = (np.arange(n_drivers, dtype=np.int32) * 3 * self.n_states)[:, None]
+
         # 2. Simulate Drivers through these scenarios
         initial_positions = self._get_initial_positions()
-        
-        for driver_id in self.drivers_data:
-            start_pos = initial_positions.get(driver_id, 5)
-            mc = self.markov_chains[driver_id]
-            
-            for sim_idx in range(n_simulations):
-                scenario = scenarios[sim_idx]
-                path = self._simulate_single_path(mc, start_pos, scenario)
-                self.simulations[driver_id].append(path)
-                
-        if store_in_db:
-            self._store_results(race_id)
-            
-        return self.simulations
+        state = np.empty((n_drivers, n_simulations), dtype=np.uint8)
+        state[:] = np.array([initial_positions.get(did, 5) for did in driver_ids], dtype=np.uint8)[:, None]
 
-    def _simulate_single_path(
-        self, 
-        mc: MarkovChain, 
-        start_state: int, 
-        scenario: GlobalRaceScenario
-    ) -> List[int]:
-        """Simulate one driver in one global scenario."""
-        path = [start_state]
-        curr = start_state
-        
-        for lap in range(1, scenario.n_laps + 1):
-            # Construct event context
-            events = {
-                'caution': lap in scenario.cautions,
-                'big_one': lap in scenario.big_one_laps
-            }
-            
-            # Stage Strategy Logic
-            if lap in scenario.stage_breaks:
-                # Apply stage strategy: 
-                # Front runners (0-2) might stay out (keep pos)
-                # Mid-pack (3-6) might pit (drop pos for tire advantage later)
-                if curr <= 2:
-                    pass # Stay out for points
-                elif 3 <= curr <= 6:
-                    # Pit strategy: Drop back, but gain "momentum" (simulated by prob boost next laps)
-                    # For simplicity in this state model, we just drop them
-                    if np.random.random() < 0.5:
-                        curr = min(8, curr + 2) 
-            
-            next_state = mc.get_next_state(curr, events)
-            path.append(next_state)
-            curr = next_state
-            
-        return path
+        # Filled lap-major (contiguous per-lap writes), transposed once at the end
+        paths = None
+        if keep_paths:
+            paths = np.empty((n_laps + 1, n_drivers, n_simulations), dtype=np.uint8)
+            paths[0] = state
+
+        for lap in range(n_laps):
+            if stage_breaks[lap]:
+                # Mid-pack (3-6) pits half the time and drops two bins
+                pits = (state >= 3) & (state <= 6) & (rng.random(state.shape) < 0.5)
+                state = np.where(pits, np.minimum(state + 2, self.n_states - 2), state).astype(np.uint8)
+
+            # Inverse CDF: the next state is the number of CDF entries <= u
+            # (the last entry is 1.0 and never counts)
+            rows = driver_offset + variants[:, lap].astype(np.int32) * self.n_states + state
+            u = rng.random(state.shape, dtype=np.float32)
+            next_state = np.zeros(state.shape, dtype=np.uint8)
+            for j in range(self.n_states - 1):
+                next_state += u >= cdf_columns[j].take(rows)
+            state = next_state
+
+            if keep_paths:
+                paths[lap + 1] = state
+
+        if keep_paths:
+            return np.ascontiguousarray(paths.transpose(1, 2, 0))
+        return state
 
     def _get_initial_positions(self) -> Dict[int, int]:
         """Convert qualifying info to state bins."""
@@ -288,17 +390,19 @@ class NASCARSimulator:
     def get_driver_finish_distribution(self, driver_id: int) -> Dict[int, float]:
         if driver_id not in self.simulations: return {}
         
-        counts = defaultdict(int)
-        for path in self.simulations[driver_id]:
-            counts[path[-1]] += 1
-            
-        total = len(self.simulations[driver_id])
-        return {k: v/total for k, v in counts.items()}
+        finals = self._final_states(driver_id)
+        counts = np.bincount(finals, minlength=self.n_states)
+        total = len(finals)
+        return {int(k): counts[k] / total for k in np.flatnonzero(counts)}
 
     def calculate_epistemic_variance(self, driver_id: int) -> float:
         if driver_id not in self.simulations: return 0.0
-        finals = [p[-1] for p in self.simulations[driver_id]]
-        return float(np.var(finals))
+        return float(np.var(self._final_states(driver_id)))
+
+    def _final_states(self, driver_id: int) -> np.ndarray:
+        """Final state per simulation, from full paths or final-state output."""
+        states = np.asarray(self.simulations[driver_id])
+        return states[:, -1] if states.ndim == 2 else states
 
     def _store_results(self, race_id: int):
         # (Simplified DB storage logic similar to original)
@@ -9,10 +9,10 @@ Key features:
 - Structure learning with ontology veto rules
 - Hybrid parameterization (ontology priors + data-driven learning)
 - Exact inference with VariableElimination
-- Conditional outcome sampling
+- Conditional outcome sampling via a compiled, vectorized forward sampler
 """
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Union
 import pandas as pd
 import networkx as nx
 import numpy as np
@@ -76,6 +76,10 @@ class CausalBayesianNetwork:
         self.model = BayesianNetwork(structure.edges())
         self.structure = structure
 
+        # Compiled forward sampler, rebuilt whenever the model's CPDs change
+        self._sampler: Optional["CompiledForwardSampler"] = None
+        self._sampler_cpds: Tuple[Any, ...] = ()
+
         logger.info(f"Initialized CBN with {len(structure.nodes)} nodes, {len(structure.edges)} edges")
 
     def learn_parameters(
@@ -146,21 +150,83 @@ class CausalBayesianNetwork:
 
         return self
 
+    def compile_sampler(self) -> "CompiledForwardSampler":
+        """
+        Return the compiled forward sampler for the current CPDs.
+
+        The sampler is cached and only rebuilt when the set of CPDs attached
+        to the model changes (e.g. after learn_parameters() or add_cpds()).
+
+        Returns:
+            CompiledForwardSampler for this network
+
+        Raises:
+            ValueError: If parameters not learned
+        """
+        cpds = tuple(self.model.get_cpds())
+        if len(cpds) == 0:
+            raise ValueError("CBN parameters not learned. Call learn_parameters() first.")
+
+        cached = self._sampler_cpds
+        if (
+            self._sampler is None
+            or len(cached) != len(cpds)
+            or any(a is not b for a, b in zip(cached, cpds))
+        ):
+            self._sampler = CompiledForwardSampler(self.structure, self.model)
+            self._sampler_cpds = cpds
+
+        return self._sampler
+
+    def sample_outcome_array(
+        self,
+        n_samples: int,
+        evidence: Optional[Dict[str, Any]] = None,
+        random_state: Optional[Union[int, np.random.Generator]] = None
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Sample outcomes as a columnar array of state codes.
+
+        This is the allocation-light counterpart of sample_outcomes(): one
+        int column per variable, in topological order. Decode a column with
+        ``cbn.compile_sampler().decode(var, codes[:, j])``.
+
+        Args:
+            n_samples: Number of samples to generate
+            evidence: Optional dictionary of observed variables
+            random_state: Optional seed or numpy Generator
+
+        Returns:
+            Tuple of (variable names, int array of shape (n_samples, n_vars)).
+            Evidence values that are not CPD states are coded as -1.
+
+        Raises:
+            ValueError: If parameters not learned or evidence invalid
+        """
+        sampler = self.compile_sampler()
+        self._validate_evidence(evidence)
+        codes = sampler.sample_codes(n_samples, evidence, random_state)
+        return list(sampler.variables), codes
+
     def sample_outcomes(
         self,
         n_samples: int,
-        evidence: Optional[Dict[str, Any]] = None
+        evidence: Optional[Dict[str, Any]] = None,
+        random_state: Optional[Union[int, np.random.Generator]] = None
     ) -> pd.DataFrame:
         """
-        Sample outcomes from the CBN using exact inference.
+        Sample outcomes from the CBN by ancestral (forward) sampling.
 
-        Uses VariableElimination for exact probabilistic inference.
-        If evidence is provided (e.g., {"caution": True}), samples are
-        conditioned on that evidence.
+        Variables are drawn in topological order from their CPDs, all
+        n_samples at once per variable, using the compiled sampler from
+        compile_sampler(). If evidence is provided (e.g., {"caution": True}),
+        evidence variables are clamped to the observed value and their
+        descendants are sampled conditioned on it.
 
         Args:
             n_samples: Number of samples to generate
             evidence: Optional dictionary of observed variables
+            random_state: Optional seed or numpy Generator
 
         Returns:
             DataFrame with sampled outcomes, columns depend on CBN variables
@@ -170,19 +236,8 @@ class CausalBayesianNetwork:
         Raises:
             ValueError: If parameters not learned or evidence invalid
         """
-        if len(self.model.get_cpds()) == 0:
-            raise ValueError("CBN parameters not learned. Call learn_parameters() first.")
-
-        # Validate evidence variables exist in CBN
-        if evidence:
-            evidence_vars = set(evidence.keys())
-            model_vars = set(self.structure.nodes())
-            if not evidence_vars.issubset(model_vars):
-                invalid = evidence_vars - model_vars
-                raise ValueError(f"Evidence variables not in CBN: {invalid}")
-
-        # Use VariableElimination for exact inference
-        infer = VariableElimination(self.model)
+        sampler = self.compile_sampler()
+        self._validate_evidence(evidence)
 
         logger.info(
             f"Sampling {n_samples} outcomes from CBN with "
@@ -191,74 +246,15 @@ class CausalBayesianNetwork:
         if evidence:
             logger.info(f"Evidence conditioning: {evidence}")
 
-        # Get topological order for sampling (parents before children)
-        variables_sorted = list(nx.topological_sort(self.structure))
-
-        samples = []
-        rejected = 0
-
-        for sample_idx in range(n_samples):
-            sample = {}
-
-            # Forward sampling: sample variables in topological order
-            for var in variables_sorted:
-                # If variable is in evidence, use evidence value
-                if evidence and var in evidence:
-                    sample[var] = evidence[var]
-                    continue
-
-                # Get CPD for this variable
-                try:
-                    cpd = self.model.get_cpds(var)
-                except Exception as e:
-                    logger.warning(f"No CPD found for {var}, using default value")
-                    # Use default based on variable type
-                    if "skill" in var or "aggression" in var or "shadow_risk" in var or "_risk" in var:
-                        sample[var] = 0.5
-                    elif "laps_led" in var or "fastest_laps" in var:
-                        sample[var] = 0
-                    elif "finish_position" in var:
-                        sample[var] = 20
-                    elif "incident" in var or "caution" in var:
-                        sample[var] = False
-                    else:
-                        sample[var] = 0
-                    continue
-
-                # Build evidence for this variable's parents
-                parent_evidence = {}
-                if hasattr(cpd, 'variables') and cpd.variables:
-                    # Get parent variable names (all variables except the node itself)
-                    parents = [v for v in cpd.variables if v != var]
-                    for parent in parents:
-                        if parent in sample:
-                            parent_evidence[parent] = sample[parent]
-
-                # Sample from conditional distribution
-                if parent_evidence:
-                    # Use VariableElimination to query P(var | parent_evidence)
-                    try:
-                        result = infer.query(
-                            variables=[var],
-                            evidence=parent_evidence,
-                            show_progress=False
-                        )
-                        # Sample from the resulting distribution
-                        sample[var] = _sample_from_distribution(result, var)
-                    except Exception as e:
-                        logger.debug(f"Inference failed for {var}, using prior: {e}")
-                        sample[var] = _sample_from_cpd(cpd, var, parent_evidence)
-                else:
-                    # No parents, sample from prior CPD
-                    sample[var] = _sample_from_cpd(cpd, var, {})
-
-            samples.append(sample)
-
-        df = pd.DataFrame(samples)
+        codes = sampler.sample_codes(n_samples, evidence, random_state)
+        df = pd.DataFrame({
+            var: sampler.decode(var, codes[:, j], evidence)
+            for j, var in enumerate(sampler.variables)
+        })
 
         # Log sampling statistics
-        for var in variables_sorted:
-            if var in df.columns:
+        if logger.isEnabledFor(logging.DEBUG):
+            for var in sampler.variables:
                 if df[var].dtype in [float, int]:
                     logger.debug(
                         f"{var}: mean={df[var].mean():.3f}, std={df[var].std():.3f}"
@@ -267,6 +263,15 @@ class CausalBayesianNetwork:
         logger.info(f"Generated {len(df)} samples from CBN")
         return df
 
+    def _validate_evidence(self, evidence: Optional[Dict[str, Any]]) -> None:
+        """Raise ValueError if evidence names variables outside the CBN."""
+        if evidence:
+            evidence_vars = set(evidence.keys())
+            model_vars = set(self.structure.nodes())
+            if not evidence_vars.issubset(model_vars):
+                invalid = evidence_vars - model_vars
+                raise ValueError(f"Evidence variables not in CBN: {invalid}")
+
     def get_conditional_probability(
         self,
         target: str,
@@ -317,73 +322,184 @@ class CausalBayesianNetwork:
         return float(result.values[0]) if len(result.values) > 0 else 0.0
 
 
-def _sample_from_distribution(inference_result, var: str) -> Any:
+class CompiledForwardSampler:
+    """
+    Vectorized ancestral sampler over a CBN's tabular CPDs.
+
+    Each CPD is compiled once into a cumulative-probability lookup table with
+    one row per joint parent configuration. Sampling then draws all samples
+    of a variable with a single vectorized categorical draw, indexing the
+    table by the (already sampled) parent state codes, so no inference is run
+    per sample.
+
+    Variables without a CPD are treated as constants using the same defaults
+    as the legacy sampler. Parent states unknown to a child's CPD (e.g. an
+    evidence value that is not a CPD state) select a uniform row, matching
+    the legacy uniform fallback.
     """
-    Sample from a pgmpy inference result distribution.
 
-    Args:
-        inference_result: Result from VariableElimination.query()
-        var: Variable name being sampled
+    def __init__(self, structure: nx.DiGraph, model: BayesianNetwork):
+        """
+        Compile the CPDs of a model into lookup tables.
 
-    Returns:
-        Sampled value
-    """
-    values = inference_result.values
-    state_names = inference_result.state_names.get(var, list(range(len(values))))
+        Args:
+            structure: CBN structure as NetworkX DiGraph
+            model: pgmpy BayesianNetwork with CPDs attached
+        """
+        self.variables: List[str] = list(nx.topological_sort(structure))
+        self._index = {var: j for j, var in enumerate(self.variables)}
+
+        cpds = {cpd.variable: cpd for cpd in model.get_cpds()}
+
+        # Decoded state values per variable, indexed by state code
+        self.states: Dict[str, np.ndarray] = {}
+        # var -> (parent column indices, parent code remaps, strides, cumulative table)
+        self._tables: Dict[str, Tuple[List[int], List[np.ndarray], np.ndarray, np.ndarray]] = {}
+
+        for var in self.variables:
+            cpd = cpds.get(var)
+            if cpd is None:
+                logger.warning(f"No CPD found for {var}, using default value")
+                self.states[var] = _state_array([_default_value(var)])
+                continue
+
+            states = list(cpd.state_names.get(var, range(cpd.variable_card)))
+            self.states[var] = _state_array(states)
+
+            parents = [v for v in cpd.variables if v != var]
+            parent_cards = [int(c) for c in cpd.cardinality[1:]]
+
+            # (card, prod(parent_cards)) -> one row per parent configuration
+            probs = np.asarray(cpd.get_values(), dtype=np.float64).T
+            probs = probs / probs.sum(axis=1, keepdims=True)
+            # Trailing uniform row for parent states the CPD does not know
+            uniform = np.full((1, probs.shape[1]), 1.0 / probs.shape[1])
+            cumulative = np.cumsum(np.vstack([probs, uniform]), axis=1)
+
+            strides = np.ones(len(parents), dtype=np.int64)
+            for k in range(len(parents) - 2, -1, -1):
+                strides[k] = strides[k + 1] * parent_cards[k + 1]
+
+            self._tables[var] = (
+                [self._index[p] for p in parents],
+                [self._parent_remap(p, cpd) for p in parents],
+                strides,
+                cumulative,
+            )
 
-    # Sample from the probability distribution
-    idx = np.random.choice(len(values), p=values)
-    return state_names[idx]
+    def _parent_remap(self, parent: str, cpd) -> np.ndarray:
+        """Map the parent's own state codes to the child CPD's codes (-1 if unknown)."""
+        child_states = cpd.state_names.get(parent, list(range(cpd.get_cardinality([parent])[parent])))
+        lookup = {state: code for code, state in enumerate(child_states)}
+        return np.array(
+            [lookup.get(state, -1) for state in self.states[parent]],
+            dtype=np.int64,
+        )
 
+    def sample_codes(
+        self,
+        n_samples: int,
+        evidence: Optional[Dict[str, Any]] = None,
+        random_state: Optional[Union[int, np.random.Generator]] = None
+    ) -> np.ndarray:
+        """
+        Draw n_samples joint samples as state codes.
 
-def _sample_from_cpd(cpd, var: str, parent_evidence: Dict[str, Any]) -> Any:
-    """
-    Sample from a CPD given parent evidence.
+        Args:
+            n_samples: Number of samples to generate
+            evidence: Optional dictionary of clamped variable values
+            random_state: Optional seed or numpy Generator (default: derived
+                from np.random, so np.random.seed still makes results reproducible)
 
-    Args:
-        cpd: pgmpy TabularCPD for the variable
-        var: Variable name
-        parent_evidence: Dictionary of parent variable values
+        Returns:
+            Int array of shape (n_samples, n_vars), columns in self.variables
+            order. Evidence values that are not known states are coded as -1.
+        """
+        if random_state is None:
+            random_state = np.random.randint(2**31)
+        rng = np.random.default_rng(random_state)
+        evidence = evidence or {}
+        codes = np.zeros((n_samples, len(self.variables)), dtype=np.int64)
+
+        for j, var in enumerate(self.variables):
+            if var in evidence:
+                codes[:, j] = self.encode(var, evidence[var])
+                continue
+
+            table = self._tables.get(var)
+            if table is None:
+                continue  # constant default, code 0
+
+            parent_cols, remaps, strides, cumulative = table
+            if parent_cols:
+                row = np.zeros(n_samples, dtype=np.int64)
+                unknown = np.zeros(n_samples, dtype=bool)
+                for col, remap, stride in zip(parent_cols, remaps, strides):
+                    parent_codes = codes[:, col]
+                    child_codes = np.where(parent_codes >= 0, remap[parent_codes], -1)
+                    unknown |= child_codes < 0
+                    row += child_codes * stride
+                row[unknown] = cumulative.shape[0] - 1
+                cdf = cumulative[row]
+            else:
+                cdf = cumulative[:1]
+
+            u = rng.random((n_samples, 1))
+            drawn = (u >= cdf).sum(axis=1)
+            codes[:, j] = np.minimum(drawn, cumulative.shape[1] - 1)
+
+        return codes
+
+    def encode(self, var: str, value: Any) -> int:
+        """Return the state code of value for var, or -1 if it is not a state."""
+        for code, state in enumerate(self.states[var]):
+            if state == value:
+                return code
+        return -1
+
+    def decode(
+        self,
+        var: str,
+        codes: np.ndarray,
+        evidence: Optional[Dict[str, Any]] = None
+    ) -> np.ndarray:
+        """
+        Map a column of state codes back to state values.
 
-    Returns:
-        Sampled value
-    """
-    # Get the variable's cardinality (number of states)
-    if hasattr(cpd, 'state_names') and var in cpd.state_names:
-        states = cpd.state_names[var]
-    else:
-        # Default: assume integer states 0 to cardinality-1
-        cardinality = cpd.variable_card if hasattr(cpd, 'variable_card') else 2
-        states = list(range(cardinal))
-
-    # For discrete variables, get conditional probability
-    if parent_evidence and hasattr(cpd, 'reduce'):
-        # Reduce CPD to the parent evidence state
-        try:
-            reduced_cpd = cpd.reduce(parent_evidence, inplace=False)
-            probs = reduced_cpd.values
-            # Ensure probs is 1D
-            if len(probs.shape) > 1:
-                probs = probs.flatten()
-        except Exception:
-            # Fallback: use uniform distribution
-            probs = np.ones(len(states)) / len(states)
-    else:
-        # No parent evidence, use the CPD's marginal
-        if hasattr(cpd, 'values'):
-            probs = cpd.values
-            if len(probs.shape) > 1:
-                # Use the first row (marginal when no evidence)
-                probs = probs.flatten()
-        else:
-            probs = np.ones(len(states)) / len(states)
-
-    # Normalize probabilities to sum to 1
-    probs = probs / np.sum(probs)
-
-    # Sample from the distribution
-    idx = np.random.choice(len(states), p=probs)
-    return states[idx]
+        Args:
+            var: Variable name
+            codes: State codes sampled for var
+            evidence: Evidence used for sampling (supplies values coded -1)
+
+        Returns:
+            Array of state values
+        """
+        if evidence and var in evidence and self.encode(var, evidence[var]) < 0:
+            return _state_array([evidence[var]] * len(codes))
+        return self.states[var][codes]
+
+
+def _state_array(values: List[Any]) -> np.ndarray:
+    """Build a 1-D array of state values, typed when numpy can infer a dtype."""
+    typed = np.asarray(values)
+    if typed.ndim == 1 and typed.dtype.kind in "biuf":
+        return typed
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
+
+
+def _default_value(var: str) -> Any:
+    """Default value for a variable without a CPD, keyed on its name."""
+    if "skill" in var or "aggression" in var or "shadow_risk" in var or "_risk" in var:
+        return 0.5
+    elif "laps_led" in var or "fastest_laps" in var:
+        return 0
+    elif "finish_position" in var:
+        return 20
+    elif "incident" in var or "caution" in var:
+        return False
+    return 0
 
 
 def learn_structure(
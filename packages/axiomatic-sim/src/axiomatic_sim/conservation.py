@@ -19,6 +19,8 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Optional
 import logging
 
+import numpy as np
+
 # JAX imports for acceleration
 try:
     import jax.numpy as jnp
@@ -195,19 +197,29 @@ def calculate_max_position_swaps(field_size: int, green_flag_laps: int) -> int:
         >>> calculate_max_position_swaps(20, 50)
         10  # min(40, 5) = 5
     """
-    # Conservative bound: 2 swaps per driver max
-    swaps_per_driver_limit = field_size * 2
+    return int(batch_max_position_swaps(field_size, green_flag_laps))
 
-    # Track geometry bound: 1 swap opportunity per 10 green flag laps
-    track_opportunity_limit = green_flag_laps // 10
 
-    # Take the more conservative bound
-    max_swaps = min(swaps_per_driver_limit, track_opportunity_limit)
+def batch_max_position_swaps(field_size: int, green_flag_laps: np.ndarray) -> np.ndarray:
+    """Position swap limit for an array of green flag lap counts.
 
-    # Ensure at least field_size (one swap per driver minimum)
-    max_swaps = max(max_swaps, field_size)
+    Vectorized form of calculate_max_position_swaps:
+    max(min(field_size * 2, green_flag_laps // 10), field_size).
 
-    return max_swaps
+    Args:
+        field_size: Number of drivers in the race
+        green_flag_laps: Green flag laps per scenario (any shape)
+
+    Returns:
+        Integer array of maximum swaps, same shape as green_flag_laps
+
+    Examples:
+        >>> batch_max_position_swaps(20, np.array([50, 500]))
+        array([20, 40])
+    """
+    return np.maximum(
+        np.minimum(field_size * 2, np.asarray(green_flag_laps) // 10), field_size
+    )
 
 
 def validate_position_swaps(
@@ -258,33 +270,6 @@ def validate_position_swaps(
         return False, veto_reason
 
 
-@jit
-def _validate_single_scenario(
-    scenario: jnp.ndarray,
-    race_length: int,
-    green_flag_laps: int,
-    max_swaps: int
-) -> bool:
-    """Validate a single scenario's conservation constraints.
-
-    Args:
-        scenario: Array with [laps_led, fastest_laps] per driver (shape: [n_drivers, 2])
-        race_length: Total race laps
-        green_flag_laps: Total green flag laps
-        max_swaps: Maximum position swaps
-
-    Returns:
-        True if all conservation constraints satisfied
-    """
-    laps_led = scenario[:, 0]
-    fastest_laps = scenario[:, 1]
-
-    laps_led_ok = jnp.sum(laps_led) <= race_length
-    fastest_laps_ok = jnp.sum(fastest_laps) <= green_flag_laps
-
-    return jnp.logical_and(laps_led_ok, fastest_laps_ok)
-
-
 @jit
 def batch_validate_conservation(
     scenarios: jnp.ndarray,
@@ -294,16 +279,17 @@ def batch_validate_conservation(
 ) -> jnp.ndarray:
     """Validate conservation constraints across a batch of scenarios.
 
-    This function is JIT-compiled for performance. Uses vmap to vectorize
-    validation across all scenarios in parallel.
+    This function is JIT-compiled for performance. Both constraints are
+    row-wise reductions over the whole batch, so the NumPy fallback is a
+    single vectorized pass as well.
 
     Args:
         scenarios: Batch of scenarios with laps_led and fastest_laps
                    (shape: [n_scenarios, n_drivers, 2])
                    scenarios[i, :, 0] = laps_led for scenario i
                    scenarios[i, :, 1] = fastest_laps for scenario i
-        race_length: Total race laps
-        green_flag_laps: Total green flag laps
+        race_length: Total race laps (scalar or shape [n_scenarios])
+        green_flag_laps: Total green flag laps (scalar or shape [n_scenarios])
         max_swaps: Maximum position swaps (not used in vectorized laps validation)
 
     Returns:
@@ -313,31 +299,69 @@ def batch_validate_conservation(
     Examples:
         >>> scenarios = jnp.array([
         ...     [[100, 10], [50, 8], [30, 5], [20, 3]],  # Sum: 200, 26
-        ...     [[150, 15], [60, 12], [40, 8]],           # Sum: 250, 35
+        ...     [[150, 15], [60, 12], [40, 8], [0, 0]],  # Sum: 250, 35
         ... ])
         >>> batch_validate_conservation(scenarios, 200, 30, 40)
         Array([True, False], dtype=bool)
     """
-    if JAX_AVAILABLE:
-        # Use JAX vmap for vectorized validation
-        validate_fn = lambda s: _validate_single_scenario(
-            s, race_length, green_flag_laps, max_swaps
-        )
-        vectorized_validate = vmap(validate_fn)
-        return vectorized_validate(scenarios)
-    else:
-        # Fallback to loop-based validation
-        results = []
-        for i in range(scenarios.shape[0]):
-            scenario = scenarios[i]
-            laps_led = scenario[:, 0]
-            fastest_laps = scenario[:, 1]
+    laps_led_ok = jnp.sum(scenarios[:, :, 0], axis=1) <= race_length
+    fastest_laps_ok = jnp.sum(scenarios[:, :, 1], axis=1) <= green_flag_laps
+
+    return jnp.logical_and(laps_led_ok, fastest_laps_ok)
+
+
+def batch_conservation_masks(
+    laps_led: np.ndarray,
+    fastest_laps: np.ndarray,
+    start_positions: np.ndarray,
+    finish_positions: np.ndarray,
+    race_length: int,
+    green_flag_laps: np.ndarray,
+    field_size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Check all three conservation rules for stacked scenarios at once.
+
+    Applies the same rules as validate_laps_led_conservation,
+    validate_fastest_laps_conservation and validate_position_swaps (with
+    calculate_max_position_swaps), as row-wise NumPy reductions.
+
+    Args:
+        laps_led: Laps led per driver (shape: [n_scenarios, n_drivers])
+        fastest_laps: Fastest laps per driver (shape: [n_scenarios, n_drivers])
+        start_positions: Starting positions (shape: [n_drivers] or
+                         [n_scenarios, n_drivers])
+        finish_positions: Finishing positions (shape: [n_scenarios, n_drivers])
+        race_length: Total race laps
+        green_flag_laps: Green flag laps per scenario (shape: [n_scenarios])
+        field_size: Number of drivers used for the position swap bound
+
+    Returns:
+        Tuple of boolean arrays (laps_led_ok, fastest_laps_ok, position_swaps_ok),
+        each of shape [n_scenarios]
+
+    Examples:
+        >>> laps_ok, fl_ok, swaps_ok = batch_conservation_masks(
+        ...     np.array([[100, 100], [150, 100]]),
+        ...     np.array([[10, 5], [10, 5]]),
+        ...     np.array([1, 2]),
+        ...     np.array([[1, 2], [2, 1]]),
+        ...     200, np.array([180, 180]), 2
+        ... )
+        >>> laps_ok
+        array([ True, False])
+    """
+    green_flag_laps = np.asarray(green_flag_laps)
+
+    laps_led_ok = np.sum(laps_led, axis=1) <= race_length
+    fastest_laps_ok = np.sum(fastest_laps, axis=1) <= green_flag_laps
 
-            laps_led_ok = jnp.sum(laps_led) <= race_length
-            fastest_laps_ok = jnp.sum(fastest_laps) <= green_flag_laps
-            results.append(jnp.logical_and(laps_led_ok, fastest_laps_ok))
+    max_swaps = batch_max_position_swaps(field_size, green_flag_laps)
+    total_swaps = np.abs(
+        np.asarray(finish_positions) - np.asarray(start_positions)
+    ).sum(axis=1)
+    position_swaps_ok = total_swaps <= max_swaps
 
-        return jnp.array(results)
+    return laps_led_ok, fastest_laps_ok, position_swaps_ok
 
 
 def validate_race_state_conservation(
@@ -411,8 +435,10 @@ __all__ = [
     "validate_laps_led_conservation",
     "validate_fastest_laps_conservation",
     "calculate_max_position_swaps",
+    "batch_max_position_swaps",
     "validate_position_swaps",
     "batch_validate_conservation",
+    "batch_conservation_masks",
     "validate_race_state_conservation",
     "JAX_AVAILABLE",
 ]
@@ -11,9 +11,12 @@ provides the data contracts for scenario generation and serialization.
 import json
 import logging
 import uuid
+from collections.abc import Sequence
 from dataclasses import dataclass, asdict, field
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
+
+import numpy as np
 
 # PyArrow and pandas for serialization
 try:
@@ -257,6 +260,210 @@ class ScenarioComponents:
                 )
 
 
+# Index order used by ScenarioBatch.pit_strategy codes
+PIT_STRATEGY_ORDER = [PitStrategy.AGGRESSIVE, PitStrategy.STANDARD, PitStrategy.CONSERVATIVE]
+
+
+@dataclass(frozen=True, eq=False)
+class ScenarioBatch(Sequence):
+    """
+    Columnar batch of race scenarios stored as stacked arrays.
+
+    Batched generation produces one array per scenario field instead of one
+    ScenarioComponents object per scenario. Indexing the batch materializes
+    a ScenarioComponents on demand, so code that iterates over a list of
+    scenarios keeps working, while array consumers (scoring, optimization)
+    read the columns directly.
+
+    Attributes:
+        driver_ids: Driver identifiers, in column order
+        track_id: Track identifier
+        race_length: Total laps in the race
+        field_size: Field size used for the position swap bound
+        scenario_numbers: Per-scenario sequence number, used in scenario IDs (shape: [n])
+        n_cautions: Caution count per scenario (shape: [n])
+        pit_strategy: Index into PIT_STRATEGY_ORDER per scenario (shape: [n])
+        fuel_window_risk: Fuel window risk per scenario (shape: [n])
+        late_race_chaos: Late race chaos per scenario (shape: [n])
+        green_flag_laps: Green flag laps per scenario (shape: [n])
+        start_positions: Starting position per driver (shape: [n_drivers])
+        laps_led: Laps led (shape: [n, n_drivers])
+        fastest_laps: Fastest laps (shape: [n, n_drivers])
+        finish_positions: Finishing positions (shape: [n, n_drivers])
+        incident: Incident flags (shape: [n, n_drivers])
+        dnf_lap: DNF lap, 0 when the driver finished (shape: [n, n_drivers])
+        validation_passed: Conservation check result per scenario (shape: [n])
+        id_prefix: Prefix for materialized scenario IDs
+
+    Example:
+        >>> batch = generator.generate_scenario_batch(10000)
+        >>> batch.laps_led.shape
+        (10000, 40)
+        >>> scenario = batch[0]  # ScenarioComponents, built on access
+    """
+    driver_ids: List[str]
+    track_id: str
+    race_length: int
+    field_size: int
+    scenario_numbers: np.ndarray
+    n_cautions: np.ndarray
+    pit_strategy: np.ndarray
+    fuel_window_risk: np.ndarray
+    late_race_chaos: np.ndarray
+    green_flag_laps: np.ndarray
+    start_positions: np.ndarray
+    laps_led: np.ndarray
+    fastest_laps: np.ndarray
+    finish_positions: np.ndarray
+    incident: np.ndarray
+    dnf_lap: np.ndarray
+    validation_passed: np.ndarray
+    id_prefix: str = "scenario"
+
+    _ROW_FIELDS = (
+        "scenario_numbers", "n_cautions", "pit_strategy", "fuel_window_risk",
+        "late_race_chaos", "green_flag_laps", "laps_led", "fastest_laps",
+        "finish_positions", "incident", "dnf_lap", "validation_passed",
+    )
+
+    def __len__(self) -> int:
+        return len(self.n_cautions)
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[ScenarioComponents, "ScenarioBatch"]:
+        if isinstance(index, slice):
+            return self.take(np.arange(len(self))[index])
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError(f"Scenario index {index} out of range for batch of {n}")
+        return self.scenario(index)
+
+    def take(self, indices: np.ndarray) -> "ScenarioBatch":
+        """
+        Return a new batch holding the selected scenarios.
+
+        Args:
+            indices: Integer indices or boolean mask over scenarios
+
+        Returns:
+            ScenarioBatch with the selected rows
+        """
+        rows = {name: getattr(self, name)[indices] for name in self._ROW_FIELDS}
+        return ScenarioBatch(
+            driver_ids=self.driver_ids,
+            track_id=self.track_id,
+            race_length=self.race_length,
+            field_size=self.field_size,
+            start_positions=self.start_positions,
+            id_prefix=self.id_prefix,
+            **rows,
+        )
+
+    @classmethod
+    def concatenate(cls, batches: List["ScenarioBatch"]) -> "ScenarioBatch":
+        """
+        Stack batches with the same drivers and track into one batch.
+
+        Args:
+            batches: Non-empty list of ScenarioBatch
+
+        Returns:
+            ScenarioBatch with all rows in order
+        """
+        first = batches[0]
+        rows = {
+            name: np.concatenate([getattr(b, name) for b in batches])
+            for name in cls._ROW_FIELDS
+        }
+        return cls(
+            driver_ids=first.driver_ids,
+            track_id=first.track_id,
+            race_length=first.race_length,
+            field_size=first.field_size,
+            start_positions=first.start_positions,
+            id_prefix=first.id_prefix,
+            **rows,
+        )
+
+    def veto_reasons(self, index: int) -> List[str]:
+        """Veto reasons for a failed scenario, in the kernel's wording."""
+        if self.validation_passed[index]:
+            return []
+
+        # Imported here to keep narrative importable without conservation deps
+        from axiomatic_sim.conservation import (
+            validate_laps_led_conservation,
+            validate_fastest_laps_conservation,
+            validate_position_swaps,
+            calculate_max_position_swaps,
+        )
+
+        green_flag_laps = int(self.green_flag_laps[index])
+        max_swaps = calculate_max_position_swaps(self.field_size, green_flag_laps)
+        checks = [
+            validate_laps_led_conservation(self.laps_led[index], self.race_length),
+            validate_fastest_laps_conservation(self.fastest_laps[index], green_flag_laps),
+            validate_position_swaps(
+                self.start_positions, self.finish_positions[index], max_swaps
+            ),
+        ]
+        return [reason for ok, reason in checks if not ok]
+
+    def scenario(self, index: int) -> ScenarioComponents:
+        """
+        Materialize one scenario as ScenarioComponents.
+
+        Args:
+            index: Row index in the batch
+
+        Returns:
+            ScenarioComponents for that row
+        """
+        regime = RaceFlowRegime(
+            n_cautions=int(self.n_cautions[index]),
+            pit_strategy=PIT_STRATEGY_ORDER[int(self.pit_strategy[index])],
+            fuel_window_risk=float(self.fuel_window_risk[index]),
+            late_race_chaos=float(self.late_race_chaos[index]),
+        )
+
+        laps_led = self.laps_led[index].tolist()
+        fastest_laps = self.fastest_laps[index].tolist()
+        finish_positions = self.finish_positions[index].tolist()
+        incident = self.incident[index].tolist()
+        dnf_lap = self.dnf_lap[index].tolist()
+        start_positions = self.start_positions.tolist()
+
+        driver_outcomes = {}
+        for j, driver_id in enumerate(self.driver_ids):
+            driver_outcomes[driver_id] = DriverOutcome(
+                driver_id=driver_id,
+                laps_led=laps_led[j],
+                fastest_laps=fastest_laps[j],
+                finish_position=finish_positions[j],
+                place_differential=finish_positions[j] - start_positions[j],
+                incident=bool(incident[j]),
+                dnf_lap=dnf_lap[j] or None,
+            )
+
+        conservation_metadata = ConservationMetadata(
+            total_laps_led=sum(laps_led),
+            total_fastest_laps=sum(fastest_laps),
+            green_flag_laps=int(self.green_flag_laps[index]),
+            validation_passed=bool(self.validation_passed[index]),
+            veto_reasons=self.veto_reasons(index),
+        )
+
+        return ScenarioComponents(
+            scenario_id=f"{self.id_prefix}_{int(self.scenario_numbers[index])}",
+            regime=regime,
+            driver_outcomes=driver_outcomes,
+            conservation_metadata=conservation_metadata,
+        )
+
+
 def serialize_scenario(scenario: ScenarioComponents) -> dict:
     """
     Convert ScenarioComponents to JSON-serializable dictionary.
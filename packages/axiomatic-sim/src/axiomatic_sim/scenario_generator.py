@@ -12,10 +12,13 @@ The Skeleton Narrative concept treats races as mostly quiet (coarse granularity)
 until something happens (incident/caution triggers fine granularity).
 """
 import logging
+import math
 import uuid
 from dataclasses import replace
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 import networkx as nx
+import numpy as np
+import pandas as pd
 
 # Try to import JAX for performance
 try:
@@ -39,7 +42,8 @@ except ImportError:
 
 # Import from prior plans
 from axiomatic_sim.cbn import CausalBayesianNetwork, create_cbn_variables
-from axiomatic_sim.ontology_constraints import OntologyConstraints
+from axiomatic_sim.conservation import batch_conservation_masks
+from axiomatic_sim.ontology_constraints import OntologyConstraints, get_driver_priors
 from axiomatic_sim.state_space import RaceState, RaceSegment, DriverState
 from axiomatic_sim.transitions import (
     green_flag_transition,
@@ -53,7 +57,8 @@ from axiomatic_sim.narrative import (
     ScenarioComponents,
     DriverOutcome,
     ConservationMetadata,
-    PitStrategy,
+    ScenarioBatch,
+    PIT_STRATEGY_ORDER,
 )
 
 # Import kernel for post-validation
@@ -308,6 +313,29 @@ class SkeletonNarrative:
         logger.info(f"Extracted {len(driver_ids)} driver IDs from CBN structure")
         return list(driver_ids)
 
+    def _caution_lambda(self) -> float:
+        """Expected caution count for the Poisson caution model."""
+        # Use constraint_spec caution_rate if available
+        if self.constraint_spec is not None and self.track_id in self.constraint_spec.tracks:
+            track_constraints = self.constraint_spec.tracks[self.track_id]
+            # Use caution_rate from constraint spec (expected cautions per lap)
+            # Convert to lambda for Poisson: lambda = caution_rate * race_length
+            return track_constraints.caution_rate * self.race_length
+        # Fallback to track_difficulty-based lambda
+        return 3.0 * self.track_difficulty
+
+    def _pit_strategy_probs(self) -> List[float]:
+        """Pit strategy probabilities in PIT_STRATEGY_ORDER."""
+        # Track difficulty influences strategy distribution
+        if self.track_difficulty > 0.7:
+            # High difficulty tracks favor conservative strategy
+            return [0.2, 0.5, 0.3]  # [AGGRESSIVE, STANDARD, CONSERVATIVE]
+        elif self.track_difficulty < 0.3:
+            # Easy tracks allow aggressive strategy
+            return [0.4, 0.4, 0.2]
+        # Intermediate tracks have balanced strategy
+        return [0.3, 0.5, 0.2]
+
     def sample_race_flow_regime(self) -> RaceFlowRegime:
         """
         Sample race-flow regime from track-specific distributions.
@@ -324,16 +352,7 @@ class SkeletonNarrative:
         Returns:
             RaceFlowRegime with sampled parameters
         """
-        # Sample n_cautions from Poisson distribution
-        # Use constraint_spec caution_rate if available
-        if self.constraint_spec is not None and self.track_id in self.constraint_spec.tracks:
-            track_constraints = self.constraint_spec.tracks[self.track_id]
-            # Use caution_rate from constraint spec (expected cautions per lap)
-            # Convert to lambda for Poisson: lambda = caution_rate * race_length
-            lambda_cautions = track_constraints.caution_rate * self.race_length
-        else:
-            # Fallback to track_difficulty-based lambda
-            lambda_cautions = 3.0 * self.track_difficulty
+        lambda_cautions = self._caution_lambda()
 
         # Sample n_cautions from Poisson distribution
         if JAX_AVAILABLE:
@@ -342,24 +361,14 @@ class SkeletonNarrative:
             n_cautions = int(random.poisson(lambda_cautions))
         n_cautions = max(0, min(n_cautions, 10))  # Bound to [0, 10]
 
-        # Sample pit_strategy from categorical distribution
-        # Track difficulty influences strategy distribution
-        if self.track_difficulty > 0.7:
-            # High difficulty tracks favor conservative strategy
-            pit_strategy_probs = [0.2, 0.5, 0.3]  # [AGGRESSIVE, STANDARD, CONSERVATIVE]
-        elif self.track_difficulty < 0.3:
-            # Easy tracks allow aggressive strategy
-            pit_strategy_probs = [0.4, 0.4, 0.2]
-        else:
-            # Intermediate tracks have balanced strategy
-            pit_strategy_probs = [0.3, 0.5, 0.2]
+        pit_strategy_probs = self._pit_strategy_probs()
 
         # Sample pit_strategy from categorical distribution
         if JAX_AVAILABLE:
             pit_strategy_idx = int(random.choice(random.PRNGKey(self.random_seed + 11), 3, p=jnp.array(pit_strategy_probs)))
         else:
             pit_strategy_idx = int(random.choice(3, p=pit_strategy_probs))
-        pit_strategy = [PitStrategy.AGGRESSIVE, PitStrategy.STANDARD, PitStrategy.CONSERVATIVE][pit_strategy_idx]
+        pit_strategy = PIT_STRATEGY_ORDER[pit_strategy_idx]
 
         # Sample fuel_window_risk from Beta distribution
         # Higher difficulty tracks have higher fuel mileage race risk
@@ -728,7 +737,12 @@ class SkeletonNarrative:
 
         return scenario
 
-    def generate_scenarios(self, n_scenarios: int = 1000) -> List[ScenarioComponents]:
+    def generate_scenarios(
+        self,
+        n_scenarios: int = 1000,
+        batched: bool = False,
+        random_state: Optional[Union[int, np.random.Generator]] = None,
+    ) -> Union[List[ScenarioComponents], ScenarioBatch]:
         """
         Generate multiple scenarios with kernel conservation validation.
 
@@ -740,10 +754,16 @@ class SkeletonNarrative:
 
         Args:
             n_scenarios: Number of valid scenarios to generate
+            batched: If True, delegate to generate_scenario_batch() and
+                     return a ScenarioBatch (a lazy sequence of scenarios)
+            random_state: Optional seed or numpy Generator (batched mode only)
 
         Returns:
-            List of valid ScenarioComponents
+            List of valid ScenarioComponents, or a ScenarioBatch if batched
         """
+        if batched:
+            return self.generate_scenario_batch(n_scenarios, random_state=random_state)
+
         logger.info(f"Generating {n_scenarios} scenarios for track {self.track_id}")
 
         valid_scenarios = []
@@ -801,6 +821,286 @@ class SkeletonNarrative:
 
         return valid_scenarios[:n_scenarios]
 
+    def generate_scenario_batch(
+        self,
+        n_scenarios: int = 1000,
+        random_state: Optional[Union[int, np.random.Generator]] = None,
+    ) -> ScenarioBatch:
+        """
+        Generate scenarios as stacked arrays with one vectorized validation.
+
+        Batched counterpart of generate_scenarios(). Regimes, Dirichlet
+        laps led, fastest laps, finish permutations, incidents and DNFs are
+        drawn for a whole batch at once. When a kernel is set, the kernel's
+        conservation rules (laps led, fastest laps, position swaps) are
+        checked for the whole batch with batch_conservation_masks() and
+        failing rows are dropped. Rounds are re-sampled until n_scenarios
+        pass, within the same 3x attempt budget as generate_scenarios().
+
+        Args:
+            n_scenarios: Number of valid scenarios to generate
+            random_state: Optional seed or numpy Generator
+
+        Returns:
+            ScenarioBatch of valid scenarios; ScenarioComponents are only
+            built when a scenario is indexed
+        """
+        logger.info(f"Generating {n_scenarios} scenarios for track {self.track_id} (batched)")
+
+        rng = np.random.default_rng(random_state)
+        id_prefix = f"scenario_{self.track_id}_{uuid.uuid4().hex[:8]}"
+
+        max_attempts = n_scenarios * 3  # Same rejection budget as per-scenario path
+        attempts = 0
+        n_valid = 0
+        acceptance = 1.0
+        batches = []
+
+        while n_valid < n_scenarios and attempts < max_attempts:
+            size = math.ceil((n_scenarios - n_valid) / max(acceptance, 1.0 / 3.0))
+            size = min(size, max_attempts - attempts)
+
+            batch = self._sample_scenario_batch(size, rng, id_prefix, first_number=attempts)
+            attempts += size
+
+            valid = batch.validation_passed
+            n_batch_valid = int(np.count_nonzero(valid))
+            acceptance = n_batch_valid / size
+            if n_batch_valid < size:
+                logger.debug(f"Rejected {size - n_batch_valid}/{size} scenarios in batch")
+                batch = batch.take(valid)
+
+            batches.append(batch)
+            n_valid += n_batch_valid
+
+        if not batches:
+            batches.append(self._sample_scenario_batch(0, rng, id_prefix))
+
+        result = ScenarioBatch.concatenate(batches)
+        logger.info(
+            f"Generated {len(result)} valid scenarios in {attempts} attempts (batched)"
+        )
+        return result[:n_scenarios]
+
+    def iter_scenario_batches(
+        self,
+        n_scenarios: int,
+        chunk_size: int = 10000,
+        random_state: Optional[Union[int, np.random.Generator]] = None,
+    ):
+        """
+        Yield valid scenarios as ScenarioBatch chunks of at most chunk_size.
+
+        Lets consumers (e.g. DFS scoring) process large runs chunk by chunk
+        without holding all scenarios at once. Stops early if a chunk comes
+        back short because its rejection budget ran out.
+
+        Args:
+            n_scenarios: Total number of valid scenarios to yield
+            chunk_size: Maximum scenarios per chunk
+            random_state: Optional seed or numpy Generator shared across chunks
+
+        Yields:
+            ScenarioBatch chunks
+        """
+        rng = np.random.default_rng(random_state)
+        remaining = n_scenarios
+
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            batch = self.generate_scenario_batch(size, random_state=rng)
+            if len(batch) > 0:
+                yield batch
+            remaining -= len(batch)
+            if len(batch) < size:
+                logger.warning(
+                    f"Scenario chunk returned {len(batch)}/{size} valid scenarios, stopping"
+                )
+                return
+
+    def _sample_scenario_batch(
+        self,
+        n: int,
+        rng: np.random.Generator,
+        id_prefix: str,
+        first_number: int = 0,
+    ) -> ScenarioBatch:
+        """
+        Draw n scenarios as arrays, mirroring generate_single_scenario().
+
+        Args:
+            n: Number of scenarios to draw
+            rng: NumPy random generator
+            id_prefix: Prefix for scenario IDs
+            first_number: Sequence number of the first scenario
+
+        Returns:
+            ScenarioBatch with validation_passed set from the conservation check
+        """
+        n_drivers = len(self.driver_ids)
+        race_length = self.race_length
+
+        # Step 1: Race-flow regimes
+        n_cautions = np.clip(rng.poisson(self._caution_lambda(), size=n), 0, 10)
+        pit_strategy = rng.choice(3, size=n, p=self._pit_strategy_probs())
+        fuel_window_risk = np.clip(rng.beta(2.0 * self.track_difficulty, 5.0, size=n), 0.0, 1.0)
+        late_race_chaos = np.clip(rng.beta(3.0, 7.0, size=n), 0.0, 1.0)
+
+        estimated_caution_laps = n_cautions * 5  # ~5 laps per caution
+        green_flag_laps = race_length - estimated_caution_laps
+        start_positions = np.arange(1, n_drivers + 1)
+
+        # Step 2: CBN-conditioned outcomes, if the CBN has parameters,
+        # each row conditioned on its own race-flow regime
+        regime_evidence = {
+            "n_cautions": n_cautions,
+            "pit_strategy": np.array([s.value for s in PIT_STRATEGY_ORDER])[pit_strategy],
+            "fuel_window_risk": fuel_window_risk,
+            "late_race_chaos": late_race_chaos,
+        }
+        cbn_outcomes = self._sample_cbn_batch(n, rng, regime_evidence)
+
+        # Step 3: Feasible-by-design dominator allocation
+        if cbn_outcomes is not None:
+            laps_led_alpha = self._cbn_columns(cbn_outcomes, "laps_led", 1.0).astype(float) + 1.0
+        else:
+            laps_led_alpha = np.ones((n, n_drivers))
+        laps_led = _dirichlet_allocate(laps_led_alpha, np.full(n, race_length), rng)
+        fastest_laps = _dirichlet_allocate(
+            np.ones((n, n_drivers)), (green_flag_laps * 0.8).astype(int), rng
+        )
+
+        # Step 4: Finish positions and incidents
+        if cbn_outcomes is not None:
+            finish_positions = self._cbn_columns(cbn_outcomes, "finish_position", None).astype(int)
+            incident = self._cbn_columns(cbn_outcomes, "incident", False).astype(bool)
+        else:
+            finish_positions = np.tile(start_positions, (n, 1))
+            # Shuffle based on regime chaos
+            chaotic = late_race_chaos > 0.5
+            n_chaotic = int(np.count_nonzero(chaotic))
+            if n_chaotic:
+                finish_positions[chaotic] = np.argsort(
+                    rng.random((n_chaotic, n_drivers)), axis=1
+                ) + 1
+            incident_prob = 0.05 + late_race_chaos * 0.1
+            incident = rng.random((n, n_drivers)) < incident_prob[:, None]
+
+        # 30% of incidents result in a DNF at a uniform lap
+        dnf_draw = rng.integers(1, race_length + 1, size=(n, n_drivers))
+        dnf = incident & (rng.random((n, n_drivers)) < 0.3)
+        finish_positions[dnf] = 40
+        if cbn_outcomes is None:
+            # Simplified outcomes: position 40 always carries a DNF lap, which
+            # implies an incident. CBN-sampled 40ths keep their sampled state,
+            # as in generate_single_scenario().
+            dnf |= finish_positions == 40
+        incident |= dnf
+        dnf_lap = np.where(dnf, dnf_draw, 0)
+
+        # Step 5: Vectorized conservation check (replaces per-scenario kernel calls)
+        if self.kernel is not None:
+            laps_ok, fastest_ok, swaps_ok = batch_conservation_masks(
+                laps_led, fastest_laps, start_positions, finish_positions,
+                race_length, green_flag_laps, self.field_size,
+            )
+            validation_passed = laps_ok & fastest_ok & swaps_ok
+        else:
+            validation_passed = np.ones(n, dtype=bool)
+
+        return ScenarioBatch(
+            driver_ids=list(self.driver_ids),
+            track_id=self.track_id,
+            race_length=race_length,
+            field_size=self.field_size,
+            scenario_numbers=np.arange(first_number, first_number + n),
+            n_cautions=n_cautions,
+            pit_strategy=pit_strategy,
+            fuel_window_risk=fuel_window_risk,
+            late_race_chaos=late_race_chaos,
+            green_flag_laps=green_flag_laps,
+            start_positions=start_positions,
+            laps_led=laps_led,
+            fastest_laps=fastest_laps,
+            finish_positions=finish_positions,
+            incident=incident,
+            dnf_lap=dnf_lap,
+            validation_passed=validation_passed,
+            id_prefix=id_prefix,
+        )
+
+    def _sample_cbn_batch(
+        self,
+        n: int,
+        rng: np.random.Generator,
+        regime_evidence: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        """
+        Sample n CBN rows, or None if the CBN cannot be used.
+
+        Every row is conditioned on the batch-wide evidence (track difficulty
+        and driver priors, fetched once per batch) plus its own race-flow
+        regime, as in generate_single_scenario(). Rows are grouped by the
+        CBN state codes of their regime evidence, which determine the
+        conditional distribution, and each group is sampled in one call.
+
+        Args:
+            n: Number of rows
+            rng: NumPy random generator
+            regime_evidence: Per-row evidence arrays of length n, by variable
+
+        Returns:
+            DataFrame of n sampled rows in input order, or None
+        """
+        if self.cbn is None or len(self.cbn.model.get_cpds()) == 0:
+            return None
+
+        nodes = set(self.cbn.structure.nodes())
+        evidence = {"track_difficulty": self.track_difficulty}
+        evidence.update(get_driver_priors(self.ontology_constraints, self.driver_ids))
+        evidence = {var: value for var, value in evidence.items() if var in nodes}
+        regime = {
+            var: np.asarray(values)
+            for var, values in (regime_evidence or {}).items() if var in nodes
+        }
+
+        try:
+            if not regime:
+                return self.cbn.sample_outcomes(n_samples=n, evidence=evidence, random_state=rng)
+
+            sampler = self.cbn.compile_sampler()
+            codes = np.empty((n, len(regime)), dtype=np.int64)
+            for j, (var, values) in enumerate(regime.items()):
+                unique, inverse = np.unique(values, return_inverse=True)
+                codes[:, j] = np.array([sampler.encode(var, v.item()) for v in unique])[inverse]
+
+            _, group_of_row = np.unique(codes, axis=0, return_inverse=True)
+            group_of_row = group_of_row.reshape(-1)
+            frames = []
+            for group in range(group_of_row.max() + 1):
+                rows = np.flatnonzero(group_of_row == group)
+                group_evidence = dict(evidence)
+                group_evidence.update({var: values[rows[0]].item() for var, values in regime.items()})
+                frame = self.cbn.sample_outcomes(
+                    n_samples=len(rows), evidence=group_evidence, random_state=rng
+                )
+                frames.append(frame.set_axis(rows))
+            return pd.concat(frames).sort_index()
+        except Exception as e:
+            logger.warning(f"CBN sampling failed: {e}, falling back to simplified generation")
+            return None
+
+    def _cbn_columns(self, outcomes, suffix: str, default) -> np.ndarray:
+        """Stack per-driver CBN columns into an (n, n_drivers) array."""
+        columns = []
+        for i, driver_id in enumerate(self.driver_ids):
+            col = f"{driver_id}_{suffix}"
+            if col in outcomes.columns:
+                columns.append(outcomes[col].to_numpy())
+            else:
+                columns.append(np.full(len(outcomes), i + 1 if default is None else default))
+        return np.column_stack(columns)
+
     def _scenario_to_dict(self, scenario: ScenarioComponents) -> Dict[str, Any]:
         """
         Convert ScenarioComponents to dict format for kernel validation.
@@ -837,13 +1137,80 @@ class SkeletonNarrative:
         }
 
 
+def _dirichlet_allocate(
+    alpha: np.ndarray,
+    totals: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Split each row's total across drivers with Dirichlet proportions.
+
+    Rows are floored to integers and the rounding remainder goes to the
+    driver with the largest share, so every row sums exactly to its total.
+
+    Args:
+        alpha: Dirichlet concentrations (shape: [n, n_drivers])
+        totals: Integer total per row (shape: [n])
+        rng: NumPy random generator
+
+    Returns:
+        Integer allocations (shape: [n, n_drivers])
+    """
+    gamma = rng.gamma(alpha)
+    proportions = gamma / gamma.sum(axis=1, keepdims=True)
+    allocation = (proportions * totals[:, None]).astype(int)
+    remainder = totals - allocation.sum(axis=1)
+    allocation[np.arange(len(allocation)), allocation.argmax(axis=1)] += remainder
+    return allocation
+
+
+def create_constrained_generator(
+    constraint_spec: 'ConstraintSpec',
+    track_id: str,
+    kernel: Optional['KernelLogic'] = None,
+) -> SkeletonNarrative:
+    """
+    Build a SkeletonNarrative from a compiled ConstraintSpec.
+
+    Uses a mock CBN over the spec's drivers; driver column order follows
+    constraint_spec.drivers.
+
+    Args:
+        constraint_spec: Compiled ConstraintSpec with driver and track constraints
+        track_id: Track identifier for the race
+        kernel: Optional KernelLogic for post-validation
+
+    Returns:
+        SkeletonNarrative configured with the constraint spec
+    """
+    # Create ontology constraints (will use constraint_spec internally)
+    ontology_constraints = OntologyConstraints(None)
+
+    # Extract driver IDs from constraint spec
+    driver_ids = list(constraint_spec.drivers.keys())
+
+    # Create mock CBN
+    cbn = create_mock_cbn(ontology_constraints, driver_ids)
+
+    # Instantiate SkeletonNarrative with constraint_spec
+    return SkeletonNarrative(
+        cbn=cbn,
+        ontology_constraints=ontology_constraints,
+        track_id=track_id,
+        field_size=len(driver_ids),
+        kernel=kernel,
+        constraint_spec=constraint_spec,
+    )
+
+
 def generate_scenarios_with_constraints(
     constraint_spec: 'ConstraintSpec',
     track_id: str,
     n_scenarios: int = 1000,
     kernel: Optional['KernelLogic'] = None,
     random_seed: int = 42,
-) -> List[ScenarioComponents]:
+    batched: bool = False,
+) -> Union[List[ScenarioComponents], ScenarioBatch]:
     """
     Generate scenarios using compiled ConstraintSpec.
 
@@ -857,9 +1224,12 @@ def generate_scenarios_with_constraints(
         n_scenarios: Number of scenarios to generate (default: 1000)
         kernel: Optional KernelLogic for post-validation
         random_seed: Random seed for reproducibility (default: 42)
+        batched: If True, generate with the vectorized batch engine and
+                 return a ScenarioBatch
 
     Returns:
-        List of ScenarioComponents (valid scenarios only)
+        List of ScenarioComponents (valid scenarios only), or a
+        ScenarioBatch if batched
 
     Example:
         >>> from app.constraints.models import ConstraintSpec, DriverConstraints, TrackConstraints
@@ -875,27 +1245,12 @@ def generate_scenarios_with_constraints(
     """
     logger.info(f"Generating {n_scenarios} scenarios with compiled constraints for track {track_id}")
 
-    # Create ontology constraints (will use constraint_spec internally)
-    ontology_constraints = OntologyConstraints(None)
-
-    # Extract driver IDs from constraint spec
-    driver_ids = list(constraint_spec.drivers.keys())
-
-    # Create mock CBN
-    cbn = create_mock_cbn(ontology_constraints, driver_ids)
-
-    # Instantiate SkeletonNarrative with constraint_spec
-    generator = SkeletonNarrative(
-        cbn=cbn,
-        ontology_constraints=ontology_constraints,
-        track_id=track_id,
-        field_size=len(driver_ids),
-        kernel=kernel,
-        constraint_spec=constraint_spec,
-    )
+    generator = create_constrained_generator(constraint_spec, track_id, kernel)
 
     # Generate scenarios
-    scenarios = generator.generate_scenarios(n_scenarios)
+    scenarios = generator.generate_scenarios(
+        n_scenarios, batched=batched, random_state=random_seed
+    )
 
     logger.info(f"Generated {len(scenarios)} scenarios with compiled constraints")
 
@@ -909,7 +1264,8 @@ def generate_scenarios(
     kernel: Optional['KernelLogic'] = None,
     driver_ids: Optional[List[str]] = None,
     constraint_spec: Optional['ConstraintSpec'] = None,
-) -> List[ScenarioComponents]:
+    batched: bool = False,
+) -> Union[List[ScenarioComponents], ScenarioBatch]:
     """
     Standalone function to generate race scenarios.
 
@@ -924,9 +1280,11 @@ def generate_scenarios(
         kernel: Optional KernelLogic for post-validation
         driver_ids: Optional list of driver IDs (defaults to 40 mock drivers)
         constraint_spec: Optional compiled ConstraintSpec (replaces live Neo4j queries)
+        batched: If True, generate with the vectorized batch engine and
+                 return a ScenarioBatch
 
     Returns:
-        List of ScenarioComponents
+        List of ScenarioComponents, or a ScenarioBatch if batched
 
     Example:
         >>> scenarios = generate_scenarios(
@@ -963,7 +1321,7 @@ def generate_scenarios(
     )
 
     # Generate scenarios
-    scenarios = generator.generate_scenarios(n_scenarios)
+    scenarios = generator.generate_scenarios(n_scenarios, batched=batched)
 
     logger.info(f"Generated {len(scenarios)} scenarios")
 
@@ -243,5 +243,96 @@ def test_sampling_without_learned_cpds():
         cbn.sample_outcomes(n_samples=10)
 
 
+def test_seeded_sampling_is_reproducible(simple_cbn):
+    """Test that the same random_state yields identical samples."""
+    samples1 = simple_cbn.sample_outcomes(n_samples=200, random_state=7)
+    samples2 = simple_cbn.sample_outcomes(n_samples=200, random_state=7)
+
+    pd.testing.assert_frame_equal(samples1, samples2)
+
+
+def test_global_seed_makes_unseeded_sampling_reproducible(simple_cbn):
+    """Test that np.random.seed reproduces samples drawn without random_state."""
+    np.random.seed(11)
+    samples1 = simple_cbn.sample_outcomes(n_samples=200)
+    np.random.seed(11)
+    samples2 = simple_cbn.sample_outcomes(n_samples=200)
+
+    pd.testing.assert_frame_equal(samples1, samples2)
+
+
+def test_sample_outcome_array_is_columnar(simple_cbn):
+    """Test that sample_outcome_array returns one code column per variable."""
+    variables, codes = simple_cbn.sample_outcome_array(n_samples=500, random_state=0)
+
+    assert variables[0] == 'skill'
+    assert set(variables) == {'skill', 'laps_led', 'finish_position'}
+    assert codes.shape == (500, 3)
+
+    sampler = simple_cbn.compile_sampler()
+    finish = sampler.decode('finish_position', codes[:, variables.index('finish_position')])
+    assert finish.min() >= 1 and finish.max() <= 40
+
+
+def test_compiled_sampler_matches_multi_parent_cpd():
+    """Test vectorized draws match a two-parent CPD, including reordered parent states."""
+    structure = nx.DiGraph()
+    structure.add_edge('caution', 'incident')
+    structure.add_edge('aggression', 'incident')
+
+    cbn = CausalBayesianNetwork(structure, OntologyConstraints())
+    cbn.model.add_cpds(
+        TabularCPD('caution', 2, [[0.5], [0.5]], state_names={'caution': [0, 1]}),
+        TabularCPD('aggression', 2, [[0.5], [0.5]], state_names={'aggression': ['low', 'high']}),
+        TabularCPD(
+            'incident', 2,
+            # columns: (caution, aggression) = (0,high), (0,low), (1,high), (1,low)
+            [[0.8, 0.95, 0.2, 0.6],
+             [0.2, 0.05, 0.8, 0.4]],
+            evidence=['caution', 'aggression'],
+            evidence_card=[2, 2],
+            state_names={
+                'incident': [0, 1],
+                'caution': [0, 1],
+                'aggression': ['high', 'low'],
+            },
+        ),
+    )
+
+    samples = cbn.sample_outcomes(n_samples=40000, random_state=1)
+    rates = samples.groupby(['caution', 'aggression'])['incident'].mean()
+
+    assert rates[(0, 'high')] == pytest.approx(0.2, abs=0.02)
+    assert rates[(0, 'low')] == pytest.approx(0.05, abs=0.02)
+    assert rates[(1, 'high')] == pytest.approx(0.8, abs=0.02)
+    assert rates[(1, 'low')] == pytest.approx(0.4, abs=0.02)
+
+
+def test_compiled_sampler_rebuilt_after_cpd_change(simple_cbn):
+    """Test that replacing a CPD invalidates the cached sampler."""
+    first = simple_cbn.compile_sampler()
+    assert simple_cbn.compile_sampler() is first
+
+    simple_cbn.model.remove_cpds('skill')
+    simple_cbn.model.add_cpds(TabularCPD(
+        variable='skill',
+        variable_card=2,
+        values=[[0.0], [1.0]],
+        state_names={'skill': [0, 1]}
+    ))
+
+    assert simple_cbn.compile_sampler() is not first
+    samples = simple_cbn.sample_outcomes(n_samples=100, random_state=0)
+    assert all(samples['skill'] == 1)
+
+
+def test_evidence_outside_cpd_states_is_kept(simple_cbn):
+    """Test that an evidence value outside the CPD states is clamped and children fall back to uniform."""
+    samples = simple_cbn.sample_outcomes(n_samples=3000, evidence={'skill': 0.5}, random_state=0)
+
+    assert all(samples['skill'] == 0.5)
+    assert samples['laps_led'].mean() == pytest.approx(1.0, abs=0.1)
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -8,6 +8,7 @@ This test module validates the end-to-end scenario generation flow:
 - Serialization/deserialization
 - Race-flow regime diversity
 """
+import numpy as np
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 from typing import List, Dict
@@ -33,6 +34,7 @@ from axiomatic_sim.narrative import (
     DriverOutcome,
     ConservationMetadata,
     PitStrategy,
+    ScenarioBatch,
     serialize_scenario,
     deserialize_scenario,
     serialize_scenarios_to_parquet,
@@ -533,3 +535,163 @@ def test_kernel_validation_rejection(mock_cbn, mock_ontology_constraints):
     # So if all are rejected, we get 0 scenarios
     assert len(scenarios) == 0, \
         "Should reject all scenarios when kernel validation fails"
+
+
+# ============================================================================
+# Tests: Batched Scenario Generation
+# ============================================================================
+
+def test_batched_generation_arrays_and_conservation(mock_cbn, mock_ontology_constraints, mock_kernel):
+    """Test that batched generation returns stacked arrays that respect conservation."""
+    generator = SkeletonNarrative(
+        cbn=mock_cbn,
+        ontology_constraints=mock_ontology_constraints,
+        track_id='test_track',
+        field_size=40,
+        kernel=mock_kernel,
+    )
+
+    batch = generator.generate_scenarios(n_scenarios=500, batched=True, random_state=0)
+
+    assert isinstance(batch, ScenarioBatch)
+    assert len(batch) == 500
+    assert batch.laps_led.shape == (500, 40)
+    assert (batch.laps_led.sum(axis=1) == 200).all()
+    assert (batch.fastest_laps.sum(axis=1) <= batch.green_flag_laps).all()
+    assert batch.validation_passed.all()
+
+    # Conservation is checked in one vectorized pass, not per-scenario kernel calls
+    assert mock_kernel.validate_dominator_conservation.call_count == 0
+
+    # DNF rows are consistent with DriverOutcome invariants
+    assert ((batch.finish_positions == 40) == (batch.dnf_lap > 0)).all()
+    assert batch.incident[batch.dnf_lap > 0].all()
+
+
+def test_batched_generation_materializes_scenarios_lazily(mock_cbn, mock_ontology_constraints):
+    """Test that indexing a batch builds ScenarioComponents matching its arrays."""
+    generator = SkeletonNarrative(
+        cbn=mock_cbn,
+        ontology_constraints=mock_ontology_constraints,
+        track_id='test_track',
+        field_size=40,
+    )
+
+    batch = generator.generate_scenario_batch(n_scenarios=20, random_state=3)
+    scenario = batch[5]
+
+    assert isinstance(scenario, ScenarioComponents)
+    for j, driver_id in enumerate(batch.driver_ids):
+        outcome = scenario.driver_outcomes[driver_id]
+        assert outcome.laps_led == batch.laps_led[5, j]
+        assert outcome.finish_position == batch.finish_positions[5, j]
+        assert outcome.place_differential == batch.finish_positions[5, j] - (j + 1)
+    assert scenario.conservation_metadata.total_laps_led == 200
+    assert len(list(batch)) == 20
+    assert len({s.scenario_id for s in batch}) == 20
+
+    # Seeded batches are reproducible
+    again = generator.generate_scenario_batch(n_scenarios=20, random_state=3)
+    assert (again.laps_led == batch.laps_led).all()
+
+
+def test_batched_generation_rejects_position_swap_violations(mock_cbn, mock_ontology_constraints, mock_kernel):
+    """Test that rows failing the vectorized kernel rules are dropped and re-sampled."""
+    generator = SkeletonNarrative(
+        cbn=mock_cbn,
+        ontology_constraints=mock_ontology_constraints,
+        track_id='test_track',
+        field_size=40,
+        kernel=mock_kernel,
+    )
+
+    raw = generator._sample_scenario_batch(2000, np.random.default_rng(1), "scenario_test")
+    rejected = np.flatnonzero(~raw.validation_passed)
+    assert len(rejected) > 0
+    assert raw[int(rejected[0])].conservation_metadata.veto_reasons
+
+    batch = generator.generate_scenario_batch(n_scenarios=200, random_state=1)
+    swaps = np.abs(batch.finish_positions - batch.start_positions).sum(axis=1)
+    assert len(batch) == 200
+    assert (swaps <= 40).all()
+
+
+def test_iter_scenario_batches_chunks(mock_cbn, mock_ontology_constraints):
+    """Test that chunked generation yields bounded chunks covering n_scenarios."""
+    generator = SkeletonNarrative(
+        cbn=mock_cbn,
+        ontology_constraints=mock_ontology_constraints,
+        track_id='test_track',
+        field_size=40,
+    )
+
+    chunks = list(generator.iter_scenario_batches(250, chunk_size=100, random_state=0))
+
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+
+
+def test_batched_cbn_outcomes_depend_on_regime(mock_ontology_constraints):
+    """Test that batched CBN rows are conditioned on each scenario's own regime."""
+    import networkx as nx
+    from pgmpy.factors.discrete import TabularCPD
+
+    structure = nx.DiGraph()
+    structure.add_edge('driver_1_skill', 'driver_1_laps_led')
+    structure.add_edge('pit_strategy', 'driver_1_finish_position')
+    cbn = CausalBayesianNetwork(structure, mock_ontology_constraints)
+
+    strategies = [s.value for s in PitStrategy]
+    cbn.model.add_cpds(
+        TabularCPD('driver_1_skill', 2, [[0.5], [0.5]], state_names={'driver_1_skill': [0, 1]}),
+        TabularCPD(
+            'driver_1_laps_led', 2, [[0.5, 0.5], [0.5, 0.5]],
+            evidence=['driver_1_skill'], evidence_card=[2],
+            state_names={'driver_1_laps_led': [0, 1], 'driver_1_skill': [0, 1]},
+        ),
+        TabularCPD('pit_strategy', 3, [[1 / 3], [1 / 3], [1 / 3]], state_names={'pit_strategy': strategies}),
+        # Aggressive pit strategy always finishes 1st, any other strategy 2nd
+        TabularCPD(
+            'driver_1_finish_position', 2,
+            [[1.0 if s == PitStrategy.AGGRESSIVE.value else 0.0 for s in strategies],
+             [0.0 if s == PitStrategy.AGGRESSIVE.value else 1.0 for s in strategies]],
+            evidence=['pit_strategy'], evidence_card=[3],
+            state_names={'driver_1_finish_position': [1, 2], 'pit_strategy': strategies},
+        ),
+    )
+    generator = SkeletonNarrative(
+        cbn=cbn,
+        ontology_constraints=mock_ontology_constraints,
+        track_id='test_track',
+        field_size=1,
+    )
+
+    batch = generator._sample_scenario_batch(300, np.random.default_rng(0), "scenario_test")
+
+    aggressive = batch.pit_strategy == 0
+    assert 0 < aggressive.sum() < 300
+    np.testing.assert_array_equal(batch.finish_positions[:, 0], np.where(aggressive, 1, 2))
+
+
+def test_batched_cbn_last_place_keeps_sampled_incident(mock_cbn, mock_ontology_constraints, monkeypatch):
+    """Test that a CBN-sampled 40th place without an incident is not forced to a DNF."""
+    import pandas as pd
+
+    generator = SkeletonNarrative(
+        cbn=mock_cbn,
+        ontology_constraints=mock_ontology_constraints,
+        track_id='test_track',
+        field_size=40,
+    )
+    n = 50
+    outcomes = pd.DataFrame({
+        f"{driver_id}_{suffix}": np.full(n, value)
+        for i, driver_id in enumerate(generator.driver_ids)
+        for suffix, value in (("finish_position", i + 1), ("incident", False), ("laps_led", 1))
+    })
+    monkeypatch.setattr(generator, "_sample_cbn_batch", lambda *args, **kwargs: outcomes)
+
+    batch = generator._sample_scenario_batch(n, np.random.default_rng(0), "scenario_test")
+
+    assert (batch.finish_positions[:, -1] == 40).all()
+    assert (batch.dnf_lap == 0).all()
+    assert not batch.incident.any()
@@ -18,6 +18,7 @@ from datetime import datetime, timedelta
 import json
 import logging
 import yaml
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 # Configure logging
@@ -27,6 +28,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Finish states counted toward a belief's confidence (states 0-3 are Top 10)
+TOP10_MAX_STATE = 3
+
 # Database models import
 from apps.backend.app.models import (
     Agent, Belief, Proposition, World, Run, Update, Driver, Race, SessionLocal
@@ -65,6 +69,50 @@ class DistributionMath:
                 h -= p * np.log2(p)
         return h
 
+    # Array forms: one row per distribution, one column per state. A boolean
+    # support mask tracks which states are keys of the dict form, so rows
+    # round-trip through to_dict exactly like the dict helpers above.
+
+    @staticmethod
+    def to_matrix(dists: List[Optional[Dict]], n_states: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Stack {state: prob} dicts (JSON string keys allowed) into (probs, support)."""
+        probs = np.zeros((len(dists), n_states))
+        support = np.zeros((len(dists), n_states), dtype=bool)
+        for i, dist in enumerate(dists):
+            for k, v in (dist or {}).items():
+                probs[i, int(k)] = v
+                support[i, int(k)] = True
+        return probs, support
+
+    @staticmethod
+    def to_dict(probs: np.ndarray, support: np.ndarray) -> Dict[int, float]:
+        """Inverse of to_matrix for a single row."""
+        return {int(k): float(probs[k]) for k in np.flatnonzero(support)}
+
+    @staticmethod
+    def normalize_rows(probs: np.ndarray) -> np.ndarray:
+        """Row-wise normalize; all-zero rows are left as they are."""
+        totals = probs.sum(axis=1, keepdims=True)
+        return np.divide(probs, totals, out=probs.copy(), where=totals > 0)
+
+    @staticmethod
+    def bayesian_update_batch(
+        prior: np.ndarray,
+        prior_support: np.ndarray,
+        likelihood: np.ndarray,
+        likelihood_support: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Row-wise bayesian_update; returns (posterior, support)."""
+        likelihood = np.where(likelihood_support, likelihood, 1e-6)  # Small epsilon
+        posterior = DistributionMath.normalize_rows(prior * likelihood)
+        return posterior, prior_support | likelihood_support
+
+    @staticmethod
+    def entropy_batch(probs: np.ndarray) -> np.ndarray:
+        """Row-wise entropy in bits."""
+        logs = np.log2(probs, out=np.zeros_like(probs), where=probs > 0)
+        return -(probs * logs).sum(axis=1)
+
 class HierarchicalModel:
     """Handles hierarchical regularization of beliefs."""
     
@@ -126,6 +174,41 @@ class HierarchicalModel:
             
         return beliefs
 
+    def pool_belief_arrays(
+        self,
+        probs: np.ndarray,
+        support: np.ndarray,
+        teams: List[Any],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Array form of pool_beliefs for stacked distributions.
+
+        Args:
+            probs: Distributions, one row per belief (shape: [n_beliefs, n_states])
+            support: Boolean mask of each distribution's states
+            teams: Team of each belief's driver
+
+        Returns:
+            (pooled probs, pooled support); each row keeps the union of its
+            team's states, as in pool_beliefs
+        """
+        if len(teams) == 0:
+            return probs, support
+
+        codes = {}
+        team_idx = np.array([codes.setdefault(team, len(codes)) for team in teams])
+
+        team_sums = np.zeros((len(codes), probs.shape[1]))
+        np.add.at(team_sums, team_idx, probs)
+        team_support = np.zeros((len(codes), probs.shape[1]), dtype=bool)
+        np.logical_or.at(team_support, team_idx, support)
+        team_means = DistributionMath.normalize_rows(team_sums)
+
+        # Mix individual with team mean
+        alpha = self.pooling_strength.get('team', 0.3)
+        pooled = (1 - alpha) * probs + alpha * team_means[team_idx]
+        return DistributionMath.normalize_rows(pooled), team_support[team_idx]
+
 class EpistemicProjector:
     """
     Main orchestrator for belief projection.
@@ -141,10 +224,28 @@ class EpistemicProjector:
         self.hierarchical_model = HierarchicalModel(self.config)
         self.decay_config = self.config.get('belief', {}).get('time_decay_halflife', {})
 
-    def update_from_simulation(self, run_id: int):
-        """Update beliefs based on MC simulation run."""
+    def update_from_simulation(self, run_id: int, bulk: bool = True):
+        """
+        Update beliefs based on MC simulation run.
+
+        With bulk=True (default), finish PMFs are aggregated in SQL and every
+        belief of the race is updated, pooled and written back in one
+        transaction (see _bulk_update_beliefs). bulk=False runs the
+        per-driver path, which commits once per driver. Runs without a
+        race_id in end_beliefs are skipped.
+        """
         run = self.db_session.query(Run).filter(Run.id == run_id).first()
         if not run: return
+
+        race_id = (run.end_beliefs or {}).get('race_id')
+        if race_id is None:
+            logger.warning(f"Run {run_id} has no race_id in end_beliefs; skipping belief update")
+            return
+
+        if bulk:
+            driver_ids, counts = self._aggregate_finish_counts(race_id)
+            self._bulk_update_beliefs(race_id, driver_ids, counts, "mc_sim")
+            return
         
         # Get simulation distributions
         # In the new simulator, we'd pull from World records or parsing mc_path
@@ -152,7 +253,6 @@ class EpistemicProjector:
         
         # Aggregate from World records associated with this run/race
         # This part assumes we have a way to link Run -> Worlds (via race_id usually)
-        race_id = run.end_beliefs.get('race_id')
         worlds = self.db_session.query(World).filter(
             World.scenario['race_id'].astext == str(race_id)
         ).all()
@@ -176,6 +276,196 @@ class EpistemicProjector:
         # Apply Hierarchical Regularization
         self._apply_hierarchy(race_id)
 
+    def _aggregate_finish_counts(self, race_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Count simulated finish states per driver with one GROUP BY query.
+
+        Returns:
+            (driver_ids, counts) where counts[i, state] is the number of worlds
+            in which driver_ids[i] finished in that state
+        """
+        driver_col = World.scenario['driver_id'].as_integer()
+        state_col = World.scenario['final_position'].as_integer()
+
+        rows = self.db_session.query(driver_col, state_col, func.count(World.id)).filter(
+            World.scenario['race_id'].as_integer() == int(race_id),
+            driver_col.isnot(None),
+            state_col >= 0,
+        ).group_by(driver_col, state_col).all()
+
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.zeros((0, 0))
+
+        data = np.array(rows, dtype=np.int64)
+        driver_ids, driver_index = np.unique(data[:, 0], return_inverse=True)
+        counts = np.zeros((len(driver_ids), data[:, 1].max() + 1))
+        counts[driver_index, data[:, 1]] = data[:, 2]
+        return driver_ids, counts
+
+    def _bulk_update_beliefs(
+        self,
+        race_id: int,
+        driver_ids: np.ndarray,
+        counts: np.ndarray,
+        source: str,
+    ) -> int:
+        """
+        Bayesian-update and pool every belief of a race in one transaction.
+
+        Equivalent to calling _update_driver_belief for each driver and then
+        _apply_hierarchy, but with one query for the race's propositions,
+        beliefs and driver teams, array updates for the posteriors, entropy
+        and team pooling, and one bulk write + commit.
+
+        Args:
+            race_id: Race whose beliefs are updated
+            driver_ids: Drivers with simulated outcomes
+            counts: Finish-state counts per driver (shape: [n_drivers, n_states])
+            source: Source recorded on updated beliefs
+
+        Returns:
+            Number of beliefs whose distribution was Bayesian-updated or created
+        """
+        rows = self.db_session.query(
+            Proposition.id, Proposition.driver_id, Driver.team, Belief.id, Belief.distribution
+        ).join(
+            Driver, Driver.id == Proposition.driver_id
+        ).outerjoin(
+            Belief, Belief.prop_id == Proposition.id
+        ).filter(
+            Proposition.race_id == race_id
+        ).order_by(Proposition.id, Belief.id).all()
+
+        # First proposition per driver and first belief per proposition, as
+        # _get_proposition and the per-driver path pick them
+        prop_for_driver = {}
+        team_for_prop = {}
+        belief_row_for_prop = {}
+        beliefs = []  # (belief_id, prop_id, team, distribution)
+        for prop_id, driver_id, team, belief_id, dist in rows:
+            prop_for_driver.setdefault(driver_id, prop_id)
+            team_for_prop[prop_id] = team
+            if belief_id is None:
+                continue
+            belief_row_for_prop.setdefault(prop_id, len(beliefs))
+            beliefs.append((belief_id, prop_id, team, dist))
+
+        try:
+            # Create missing propositions in one flush (inside this transaction)
+            missing = [int(d) for d in driver_ids if int(d) not in prop_for_driver]
+            if missing:
+                known = dict(self.db_session.query(Driver.id, Driver.team).filter(Driver.id.in_(missing)).all())
+                if len(known) < len(missing):
+                    logger.warning(f"Skipping {len(missing) - len(known)} simulated drivers not in the drivers table")
+                new_props = [
+                    Proposition(
+                        content=f"Driver {driver_id} finish dist",
+                        driver_id=driver_id,
+                        race_id=race_id,
+                        session_type="race"
+                    )
+                    for driver_id in known
+                ]
+                self.db_session.add_all(new_props)
+                self.db_session.flush()
+                prop_for_driver.update({p.driver_id: p.id for p in new_props})
+                team_for_prop.update({p.id: known[p.driver_id] for p in new_props})
+
+            # Target belief row per simulated driver; append new beliefs
+            lik_rows = []
+            target_rows = []
+            created_rows = []
+            for i, driver_id in enumerate(driver_ids):
+                prop_id = prop_for_driver.get(int(driver_id))
+                if prop_id is None:
+                    continue
+                row = belief_row_for_prop.get(prop_id)
+                if row is None:
+                    row = len(beliefs)
+                    belief_row_for_prop[prop_id] = row
+                    beliefs.append((None, prop_id, team_for_prop[prop_id], None))
+                    created_rows.append(row)
+                lik_rows.append(i)
+                target_rows.append(row)
+
+            if not beliefs:
+                self.db_session.commit()
+                return 0
+
+            max_state = max(
+                (int(k) for b in beliefs for k in (b[3] or {})), default=-1
+            )
+            n_states = max(counts.shape[1], max_state + 1)
+            probs, support = DistributionMath.to_matrix([b[3] for b in beliefs], n_states)
+
+            likelihood = np.zeros((len(driver_ids), n_states))
+            likelihood[:, :counts.shape[1]] = DistributionMath.normalize_rows(counts)
+            lik_support = likelihood > 0
+
+            # Bayesian update of the target beliefs; empty or new beliefs take
+            # the likelihood as is
+            target = np.array(target_rows, dtype=np.int64)
+            lik = np.array(lik_rows, dtype=np.int64)
+            posterior, post_support = DistributionMath.bayesian_update_batch(
+                probs[target], support[target], likelihood[lik], lik_support[lik]
+            )
+            empty = ~support[target].any(axis=1)
+            posterior[empty] = likelihood[lik][empty]
+            post_support[empty] = lik_support[lik][empty]
+            probs[target] = posterior
+            support[target] = post_support
+
+            confidence = posterior[:, :TOP10_MAX_STATE + 1].sum(axis=1)
+            epistemic_var = DistributionMath.entropy_batch(posterior)  # Use entropy as var proxy
+
+            # Hierarchical pooling towards team means
+            probs, support = self.hierarchical_model.pool_belief_arrays(
+                probs, support, [b[2] for b in beliefs]
+            )
+
+            # Single bulk write
+            now = datetime.utcnow()
+            created = set(created_rows)
+            stats = {int(row): (float(c), float(v)) for row, c, v in zip(target, confidence, epistemic_var)}
+            updates = []
+            inserts = []
+            for row, (belief_id, prop_id, _, _) in enumerate(beliefs):
+                values = {"distribution": DistributionMath.to_dict(probs[row], support[row])}
+                if row in created:
+                    values.update(
+                        agent_id=1,  # Default agent
+                        prop_id=prop_id,
+                        confidence=0.5,
+                        epistemic_var=1.0,
+                        source=source,
+                    )
+                    inserts.append(values)
+                    continue
+                values["id"] = belief_id
+                if row in stats:
+                    values.update(
+                        confidence=stats[row][0],
+                        epistemic_var=stats[row][1],
+                        source=source,
+                        timestamp=now,
+                    )
+                updates.append(values)
+
+            if updates:
+                self.db_session.bulk_update_mappings(Belief, updates)
+            if inserts:
+                self.db_session.bulk_insert_mappings(Belief, inserts)
+            self.db_session.commit()
+        except Exception:
+            self.db_session.rollback()
+            raise
+
+        logger.info(
+            f"Bulk belief update for race {race_id}: {len(target_rows)} updated "
+            f"({len(created_rows)} new), {len(beliefs)} pooled"
+        )
+        return len(target_rows)
+
     def _update_driver_belief(
         self, 
         driver_id: int, 
@@ -0,0 +1,63 @@
+"""
+Tests for mc_sim.py vectorized race simulation.
+
+simulate_paths draws every lap from the drivers' cumulative transition
+tables; over many seeded simulations the observed lap-to-lap transition
+frequencies must match those tables.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mc_sim import CAUTION_VARIANT, GREEN_VARIANT, NASCARSimulator
+
+N_LAPS = 40
+N_SIMS = 2000
+
+
+def _simulator(caution_probability: float) -> NASCARSimulator:
+    drivers = {101: {"start_pos": 1}, 102: {"start_pos": 20}, 103: {}}
+    track = {"laps": N_LAPS, "stage_breaks": [], "caution_probability": caution_probability}
+    sim = NASCARSimulator(drivers, track, config_path="missing.yaml")
+    sim.fit_transitions(pd.DataFrame(columns=["driver_id", "start_position", "end_position"]))
+    return sim
+
+
+def test_simulate_paths_shape_and_states():
+    sim = _simulator(caution_probability=0.1)
+
+    paths = sim.simulate_paths(200, keep_paths=True, random_state=3)
+    finals = sim.simulate_paths(200, keep_paths=False, random_state=3)
+
+    assert paths.shape == (3, 200, N_LAPS + 1)
+    assert paths.dtype == np.uint8
+    assert paths.max() < sim.n_states
+    # Start column holds each driver's initial state bin
+    np.testing.assert_array_equal(paths[:, :, 0], [[0] * 200, [4] * 200, [5] * 200])
+    # Same seed, same draws: final states equal the paths' last column
+    np.testing.assert_array_equal(finals, paths[:, :, -1])
+    np.testing.assert_array_equal(paths, sim.simulate_paths(200, random_state=3))
+
+
+@pytest.mark.parametrize(
+    "caution_probability, variant", [(0.0, GREEN_VARIANT), (1.0, CAUTION_VARIANT)]
+)
+def test_transition_frequencies_match_tables(caution_probability, variant):
+    sim = _simulator(caution_probability)
+
+    paths = sim.simulate_paths(N_SIMS, random_state=7)
+
+    for i, driver_id in enumerate(sim.drivers_data):
+        cumulative = sim.markov_chains[driver_id].cumulative_transition_tables()[variant]
+        expected = np.diff(cumulative, axis=1, prepend=0.0)
+
+        counts = np.zeros((sim.n_states, sim.n_states))
+        np.add.at(counts, (paths[i, :, :-1].ravel(), paths[i, :, 1:].ravel()), 1)
+
+        for state in np.flatnonzero(counts.sum(axis=1) >= 5000):
+            observed = counts[state] / counts[state].sum()
+            np.testing.assert_allclose(observed, expected[state], atol=0.015)
+
+        # The DNF state is absorbing
+        dnf = sim.n_states - 1
+        assert counts[dnf, :dnf].sum() == 0
@@ -0,0 +1,143 @@
+"""
+Tests for projector.py belief updates.
+
+The bulk update (_bulk_update_beliefs) must leave the database in the same
+state as the per-driver path (_update_driver_belief for each driver, then
+_apply_hierarchy).
+"""
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from apps.backend.app.models import (
+    Agent, Base, Belief, Driver, Proposition, Race, Run, create_all_tables,
+)
+from projector import DistributionMath, EpistemicProjector
+
+N_DRIVERS = 10
+N_STATES = 6
+
+
+def _seed_session():
+    """In-memory race where some drivers have beliefs and some have none."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    agent = Agent(name="projector", type="projector")
+    race = Race(name="Test 500", track="Test", date=datetime(2025, 2, 16), laps=200, status="scheduled")
+    session.add_all([agent, race])
+    session.flush()
+
+    rng = np.random.default_rng(3)
+    for i in range(N_DRIVERS):
+        driver = Driver(
+            name=f"Driver {i}", team=f"Team {i % 3}", car_number=i + 1,
+            salary=5000 + 400 * i, avg_finish=10.0 + i, wins=0, top5=0, top10=0,
+        )
+        session.add(driver)
+        session.flush()
+        if i % 4 == 3:
+            continue  # No proposition yet: created by the update
+        prop = Proposition(content=f"Driver {driver.id} finish dist", driver_id=driver.id,
+                           race_id=race.id, session_type="race")
+        session.add(prop)
+        session.flush()
+        if i % 4 == 2:
+            continue  # Proposition without a belief
+        states = rng.choice(N_STATES, size=4, replace=False)
+        prior = dict(zip(states.tolist(), rng.dirichlet(np.ones(4)).tolist()))
+        session.add(Belief(agent_id=agent.id, prop_id=prop.id, confidence=0.5,
+                           epistemic_var=1.0, distribution=prior, source="prior"))
+    session.commit()
+    return session, race.id
+
+
+def _beliefs_by_driver(session):
+    rows = session.query(Proposition.driver_id, Belief).join(
+        Belief, Belief.prop_id == Proposition.id
+    ).all()
+    return {
+        driver_id: (
+            {int(k): v for k, v in belief.distribution.items()},
+            belief.confidence,
+            belief.epistemic_var,
+            belief.source,
+        )
+        for driver_id, belief in rows
+    }
+
+
+def test_bulk_update_matches_per_driver_update():
+    bulk_session, race_id = _seed_session()
+    scalar_session, _ = _seed_session()
+
+    rng = np.random.default_rng(11)
+    driver_ids = np.arange(1, N_DRIVERS + 1)
+    counts = rng.integers(0, 20, size=(N_DRIVERS, N_STATES)).astype(float)
+    counts[:, 0] += 1  # Every driver overlaps every prior's support somewhere
+    counts[:, 1:] *= rng.random((N_DRIVERS, N_STATES - 1)) < 0.7
+
+    bulk = EpistemicProjector(bulk_session, config_path="missing.yaml")
+    bulk._bulk_update_beliefs(race_id, driver_ids, counts, "mc_sim")
+
+    scalar = EpistemicProjector(scalar_session, config_path="missing.yaml")
+    for driver_id, row in zip(driver_ids, counts):
+        pmf = DistributionMath.normalize({s: c for s, c in enumerate(row) if c > 0})
+        scalar._update_driver_belief(int(driver_id), race_id, pmf, "mc_sim")
+    scalar._apply_hierarchy(race_id)
+
+    expected = _beliefs_by_driver(scalar_session)
+    actual = _beliefs_by_driver(bulk_session)
+
+    assert actual.keys() == expected.keys() == set(driver_ids.tolist())
+    for driver_id, (dist, confidence, epistemic_var, source) in expected.items():
+        assert actual[driver_id][0].keys() == dist.keys()
+        for state, prob in dist.items():
+            assert actual[driver_id][0][state] == pytest.approx(prob)
+        assert actual[driver_id][1] == pytest.approx(confidence)
+        assert actual[driver_id][2] == pytest.approx(epistemic_var)
+        assert actual[driver_id][3] == source
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_run_without_race_id_is_skipped(bulk):
+    session, _ = _seed_session()
+    run = Run(agent_id=1, mc_path=[], start_beliefs={}, end_beliefs={}, status="completed")
+    session.add(run)
+    session.commit()
+    before = _beliefs_by_driver(session)
+
+    EpistemicProjector(session, config_path="missing.yaml").update_from_simulation(run.id, bulk=bulk)
+
+    assert _beliefs_by_driver(session) == before
+
+
+def test_create_all_tables_adds_distribution_to_existing_beliefs():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE beliefs DROP COLUMN distribution"))
+    assert "distribution" not in {c["name"] for c in inspect(engine).get_columns("beliefs")}
+
+    create_all_tables(engine)
+    create_all_tables(engine)  # Idempotent once the column exists
+
+    session = sessionmaker(bind=engine)()
+    agent = Agent(name="projector", type="projector")
+    race = Race(name="Test 500", track="Test", date=datetime(2025, 2, 16), laps=200, status="scheduled")
+    driver = Driver(name="Driver 0", team="Team 0", car_number=1, salary=5000,
+                    avg_finish=10.0, wins=0, top5=0, top10=0)
+    session.add_all([agent, race, driver])
+    session.flush()
+    prop = Proposition(content="finish dist", driver_id=driver.id, race_id=race.id, session_type="race")
+    session.add(prop)
+    session.flush()
+    session.add(Belief(agent_id=agent.id, prop_id=prop.id, confidence=0.5,
+                       epistemic_var=1.0, distribution={"3": 1.0}, source="prior"))
+    session.commit()
+
+    assert session.query(Belief).one().distribution == {"3": 1.0}